@@ -43,8 +43,21 @@ typedef char * cptr;
 /* Tell SWIG about it */
 typedef char * cptr;
 
+/* Strings as before. Blocks of mover.Buffer are bytearrays: any object
+ * supporting the buffer interface is used in place, without copying. */
 %typemap(in) cptr{
-        $1 = PyString_AsString($input);
+        if (PyString_Check($input)) {
+                $1 = PyString_AsString($input);
+        } else {
+                void *buf_ptr;
+                Py_ssize_t buf_len;
+                if (PyObject_AsWriteBuffer($input, &buf_ptr, &buf_len) != 0) {
+                        PyErr_Clear();
+                        if (PyObject_AsReadBuffer($input, (const void **)&buf_ptr, &buf_len) != 0)
+                                return NULL;
+                }
+                $1 = (char *) buf_ptr;
+        }
 }
 
 #else
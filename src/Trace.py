@@ -674,6 +674,80 @@ def trace(severity, message, dolog=1, doalarm=1, out_fp=sys.stdout,
     if doalarm and severity in alarm_levels:
         alarm(severity, msg_truncated, doprint=0)
 
+
+def enabled(severity):
+    """Tell if a trace() message of this severity would be output anywhere
+
+    Use to skip building expensive messages.
+
+    Args:
+        severity (int): Severity of the message (required)
+
+    Returns:
+        bool: True if severity is in print, log or alarm levels
+    """
+    return (severity in print_levels or severity in log_levels or
+            severity in alarm_levels)
+
+
+def lazy_message(message, args):
+    """Make the text of a message passed to tracef() or logf()
+
+    Args:
+        message (str or callable): Format string or function (required)
+        args (tuple): Arguments for the format or the function (required)
+
+    Returns:
+        str: message % args, message(*args) or message if there are no args
+    """
+    if callable(message):
+        return message(*args)
+    if args:
+        return message % args
+    return message
+
+
+def tracef(severity, message, *args, **kwargs):
+    """trace() with the message made only if severity is enabled
+
+    tracef(TR, "ticket %s", ticket) does not spend time on formatting
+    the ticket unless the message is output, which
+    trace(TR, "ticket %s" % (ticket,)) always does.
+
+    Args:
+        severity (int): Severity of the message (required)
+        message (str or callable): Format string, or function returning the message (required)
+        args: Arguments for the format or the function (optional)
+        kwargs: Keyword arguments of trace() (optional)
+
+    Returns:
+        None
+    """
+    if not (severity in print_levels or severity in log_levels or
+            severity in alarm_levels):
+        return
+    trace(severity, lazy_message(message, args), **kwargs)
+
+
+def logf(severity, message, *args, **kwargs):
+    """log() with the message made only if it goes anywhere
+
+    See tracef().
+
+    Args:
+        severity (int): Severity of the message (required)
+        message (str or callable): Format string, or function returning the message (required)
+        args: Arguments for the format or the function (optional)
+        kwargs: Keyword arguments of log() (optional)
+
+    Returns:
+        None
+    """
+    if not (log_func or kwargs.get('force_print') or
+            (kwargs.get('doprint', 1) and severity in print_levels)):
+        return
+    log(severity, lazy_message(message, args), **kwargs)
+
 # Send the message to the standard out (the default) or standard error.
 
 
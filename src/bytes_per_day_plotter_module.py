@@ -7,7 +7,6 @@
 ###############################################################################
 
 # system imports
-import pg
 import os
 import time
 import sys
@@ -31,6 +30,14 @@ WEEK_AGO = time.strftime("%m-%d-%Y",
 DAYS_AGO_START = DAYS_IN_MONTH * 4  #4 months ago to start drawing the plot.
 DAYS_AHEAD_END = DAYS_IN_MONTH    #One month to plot ahead.
 
+#Daily sums of encp_xfer rows are kept between runs in aggregates; the
+# ones per mover and drive type only for the last month.
+AGGREGATE_KEEP = (DAYS_IN_MONTH + 1) * SECONDS_IN_DAY
+AGGREGATE_QUERY = "select date(date) as day,%s,rw,sum(size),count(size) " \
+                  "from encp_xfer " \
+                  "where driver != 'NullDriver' %s" \
+                  "group by day,%s,rw;"
+
 #Set some sane limits to these values.
 if DAYS_AGO_START < DAYS_IN_MONTH:
     DAYS_AGO_START = DAYS_IN_MONTH
@@ -206,7 +213,10 @@ class BytesPerDayPlotterModule(enstore_plotter_module.EnstorePlotterModule):
     #Get the daily information from the DB and write it to a data file.
     def _fill(self, sql_cmd, adb):
         adb_res = adb.query(sql_cmd).getresult() #Get the values from the DB.
+        self._fill_rows(adb_res)
 
+    #Write the daily information of rows (day, key, rw, sum) to a data file.
+    def _fill_rows(self, adb_res):
         self.store_dict = {}
 
         for row in adb_res:
@@ -279,7 +289,10 @@ class BytesPerDayPlotterModule(enstore_plotter_module.EnstorePlotterModule):
     #Get the summary information for the entire time period.
     def _fill2(self, sql_cmd, adb):
         adb_res = adb.query(sql_cmd).getresult() #Get the values from the DB.
+        self._fill2_rows(adb_res)
 
+    #Store the summary rows (key, rw, sum, average, count).
+    def _fill2_rows(self, adb_res):
         for row in adb_res:
             #row[0] is either the mover, drive type or the literal "enstore"
             #row[1] is r for read or w for write
@@ -295,6 +308,50 @@ class BytesPerDayPlotterModule(enstore_plotter_module.EnstorePlotterModule):
                                                  'count' : row[4]}
 
 
+    #Add the daily sums of the encp_xfer rows since the last run per
+    # column (mover, drive_id) to its aggregate and return it.  The
+    # literal "enstore_all" sums all rows.
+    def _update_aggregate(self, frame, adb, column, keep):
+        aggregate = self.get_aggregate(frame, column, keep)
+        since, mark = aggregate.get_interval()
+        interval = "and date <= '%s' " % (mark,)
+        if since:
+            interval = "and date > '%s' %s" % (since, interval)
+        if column == "enstore_all":
+            #Sum per rw only, the case is just a filler for the column.
+            sql_cmd = AGGREGATE_QUERY % ("CASE when 1 = 1 then 'enstore_all' else 'enstore_all' END as enstore_all",
+                                         interval, "enstore_all")
+        else:
+            sql_cmd = AGGREGATE_QUERY % (column, interval, column)
+        rows = []
+        for row in adb.query(sql_cmd).getresult():
+            #day, (column, rw), sum, count
+            rows.append((row[0], (row[1], row[2]), long(row[3]),
+                         long(row[4])))
+        aggregate.update(rows, mark)
+        return aggregate
+
+    #Fill the daily and the summary information from the buckets of an
+    # aggregate.  name replaces the column value of the keys.
+    def _fill_aggregate(self, buckets, name=None):
+        rows = []
+        totals = {}
+        for day, sums in buckets.items():
+            for (key, rw), (size_sum, count) in sums.items():
+                if name:
+                    key = name
+                rows.append((day, key, rw, size_sum))
+                total = totals.setdefault((key, rw), [0L, 0L])
+                total[0] = total[0] + size_sum
+                total[1] = total[1] + count
+        rows.sort()
+        self._fill_rows(rows)
+        rows = []
+        for (key, rw), (size_sum, count) in totals.items():
+            rows.append((key, rw, size_sum, float(size_sum) / count, count))
+        rows.sort()
+        self._fill2_rows(rows)
+
     #######################################################################
     # The following functions must be defined by all plotting modules.
     #######################################################################
@@ -331,94 +388,44 @@ class BytesPerDayPlotterModule(enstore_plotter_module.EnstorePlotterModule):
         #  here we create data points
 
         adb_info = frame.get_configuration_client().get("accounting_server", {})
-        adb = pg.DB(host  = adb_info.get('dbhost', "localhost"),
-                    dbname= adb_info.get('dbname', "enstore"),
-                    port  = adb_info.get('dbport', 5432),
-                    user  = adb_info.get('dbuser_reader', "enstore_reader"))
+        adb = frame.get_db(host  = adb_info.get('dbhost', "localhost"),
+                           dbname= adb_info.get('dbname', "enstore"),
+                           port  = adb_info.get('dbport', 5432),
+                           user  = adb_info.get('dbuser_reader', "enstore_reader"))
 
         ###
         ### Get information from the Enstore Database.
         ###
 
+        #Only the rows since the last run are read, the daily sums of the
+        # older ones are in the aggregates.
+        movers = self._update_aggregate(frame, adb, "mover", AGGREGATE_KEEP)
+        drives = self._update_aggregate(frame, adb, "drive_id",
+                                        AGGREGATE_KEEP)
+        system = self._update_aggregate(frame, adb, "enstore_all", None)
+
+        #The last month is the days after the one 30 days ago.
+        month = time.time() - (DAYS_IN_MONTH - 1) * SECONDS_IN_DAY
+
         #
         #Get the bytes per day for each mover. ######################
         #
-
-        sql_cmd = "select date(encp_xfer.date) as day,mover,rw,sum(size) " \
-                  "from encp_xfer " \
-                  "where date(CURRENT_TIMESTAMP - interval '30 days') < date "\
-                  "      and driver != 'NullDriver' " \
-                  "group by day,mover,rw "\
-                  "order by day,mover,rw;"
-        self._fill(sql_cmd, adb)
-
-        sql_cmd2 = "select mover,rw,sum(size),avg(size),count(size) " \
-                   "from encp_xfer " \
-                   "where date(CURRENT_TIMESTAMP - interval '30 days') < date " \
-                   "      and driver != 'NullDriver' " \
-                   "group by mover,rw " \
-                   "order by mover,rw;"
-        self._fill2(sql_cmd2, adb)
+        self._fill_aggregate(movers.get(month))
 
         #
         #Get the bytes per day for each media_type. ######################
         #
-
-        sql_cmd = "select date(encp_xfer.date) as day,drive_id,rw,sum(size) " \
-                  "from encp_xfer " \
-                  "where date(CURRENT_TIMESTAMP - interval '30 days') < date "\
-                  "      and driver != 'NullDriver' " \
-                  " group by day,drive_id,rw "\
-                  "order by day,drive_id,rw;"
-        self._fill(sql_cmd, adb)
-
-        sql_cmd2 = "select drive_id,rw,sum(size),avg(size),count(size) " \
-                   "from encp_xfer " \
-                   "where date(CURRENT_TIMESTAMP - interval '30 days') < date " \
-                   "      and driver != 'NullDriver' " \
-                   "group by drive_id,rw " \
-                   "order by drive_id,rw;"
-        self._fill2(sql_cmd2, adb)
+        self._fill_aggregate(drives.get(month))
 
         #
         #Get the bytes per day for the system. ######################
         #
-
-        #The case is just a filler in place of the mover or drive type.
-        sql_cmd = "select date(encp_xfer.date) as day,CASE when 1 = 1 then 'enstore' else 'enstore' END as enstore,rw,sum(size) " \
-                  "from encp_xfer " \
-                  "where date(CURRENT_TIMESTAMP - interval '30 days') < date" \
-                  "      and driver != 'NullDriver' " \
-                  "group by day,enstore,rw "\
-                  "order by day,enstore,rw;"
-        self._fill(sql_cmd, adb)
-
-        sql_cmd2 = "select CASE when 1 = 1 then 'enstore' else 'enstore' END as enstore,rw,sum(size),avg(size),count(size) " \
-                   "from encp_xfer " \
-                   "where date(CURRENT_TIMESTAMP - interval '30 days') < date"\
-                   "      and driver != 'NullDriver' " \
-                   "group by enstore,rw " \
-                   "order by enstore,rw;"
-        self._fill2(sql_cmd2, adb)
+        self._fill_aggregate(system.get(month), "enstore")
 
         #
         #Get the bytes per day for the system going back to the beginning. ###
         #
-
-        #The case is just a filler in place of the mover or drive type.
-        sql_cmd = "select date(encp_xfer.date) as day,CASE when 1 = 1 then 'enstore_all' else 'enstore_all' END as enstore_all,rw,sum(size) " \
-                  "from encp_xfer " \
-                  "where driver != 'NullDriver' " \
-                  "group by day,enstore_all,rw "\
-                  "order by day,enstore_all,rw;"
-        self._fill(sql_cmd, adb)
-
-        sql_cmd2 = "select CASE when 1 = 1 then 'enstore_all' else 'enstore_all' END as enstore_all,rw,sum(size),avg(size),count(size) " \
-                   "from encp_xfer " \
-                   "where driver != 'NullDriver' " \
-                   "group by enstore_all,rw " \
-                   "order by enstore_all,rw;"
-        self._fill2(sql_cmd2, adb)
+        self._fill_aggregate(system.get(), "enstore_all")
 
         #Avoid resource leaks.
         for key in self.pts_files_dict.keys():
@@ -21,6 +21,8 @@ import stat
 import multiprocessing
 import shutil
 import string
+import tarfile
+import zipfile
 import qpid.util
 import qpid.messaging
 import Queue
@@ -111,81 +113,119 @@ def file_checkum(f):
     return crc, crc_1_seeded
 
 
-# check files prepared for writing to tape
-# runs in subprocess to deal with
-# .nfs.... files
-# @param package - package complete path
-# exit code maps to True / False
-def _check_packaged_files(archive_area, package, tar_blocking_factor=20):
-    Trace.trace(10, "_check_packaged_files: called with %s %s"%(archive_area, package))
-    # create a temporary directory
-    tmp_dir = os.path.join(archive_area, "tmp_CRC", os.path.dirname(package).lstrip("/"))
-    if not os.path.exists(tmp_dir):
-        try:
-            os.makedirs(tmp_dir)
-        except:
-            Trace.handle_error()
-            Trace.alarm(e_errors.ERROR, "Can not create tmp dir %s"%(tmp_dir,))
-            sys.exit("0")
+# calculate checksum of an open file like object
+# reading it sequentially to the end
+# returns a tuple (0_seeded_crc, 1_seeded_crc)
+def stream_checksum(f_obj, bs=enstore_constants.MB):
+    crc = 0L # will calculate 0 seeded crc
+    size = 0L
+    while True:
+        buf = f_obj.read(bs)
+        if not buf:
+            break
+        crc = checksum.adler32(crc, buf, len(buf))
+        size = size + len(buf)
+    # 1 seeded crc:
+    crc_1_seeded = checksum.convert_0_adler32_to_1_adler32(crc, size)
+    return crc, crc_1_seeded
 
-    # unwind the package into this directory
-    os.chdir(tmp_dir)
+# read README.1st
+# returns a list of (cache_file_name, namespace_file_name, crc)
+def _parse_readme(f_obj):
+    entries = []
+    first = True
+    for l in f_obj.readlines():
+        # skip the first line
+        # it is the header
+        if first:
+            first = False
+            continue
+        lst = l.split(" ")
+        cache_fn, pnfs_fn, crc = lst[0], lst[1], lst[2]
+        entries.append((cache_fn, pnfs_fn, long(crc)))
+    return entries
+
+# read package members one by one
+# yields (member_name, file_like_object)
+# the object is valid only until the next member is requested
+def _package_members(package, tar_blocking_factor=20):
     # guess archiver
     archiver = package.split(".")[-1]
     if archiver == "zip":
-        cmd = "unzip "
+        archive = zipfile.ZipFile(package, "r")
+        try:
+            for info in archive.infolist():
+                if info.filename.endswith("/"): # directory
+                    continue
+                f_obj = archive.open(info)
+                yield info.filename, f_obj
+                f_obj.close()
+        finally:
+            archive.close()
     else: # only zip and tar so far
-        cmd = "tar -b %s --force-local -xf "%(tar_blocking_factor,)
-    rtn = enstore_functions2.shell_command2("%s %s"%(cmd, package,))
-    if rtn[0] != 0: # archiver return code
-        Trace.log(e_errors.ERROR, "Error unwinding tar file %s"%(rtn[2], package)) #stderr
-        sys.exit(1)
+        # stream mode: the package is read once, front to back
+        archive = tarfile.open(package, "r|*",
+                               bufsize=tar_blocking_factor*tarfile.BLOCKSIZE)
+        try:
+            for info in archive:
+                if not info.isfile():
+                    continue
+                yield info.name, archive.extractfile(info)
+        finally:
+            archive.close()
 
-    # create list of files to check
+# verify package against its README.1st
+# the package is read once without extracting it
+# @param package - package complete path
+# @return list of (cache_file_name, expected_crc, crc_0, crc_1, ok)
+#         crc_0 and crc_1 are None for files missing in the package
+def verify_package(package, tar_blocking_factor=20):
+    entries = None
+    crcs = {} # member name: (crc_0, crc_1)
+    for name, f_obj in _package_members(package, tar_blocking_factor):
+        if name == "README.1st":
+            entries = _parse_readme(f_obj)
+        else:
+            crcs[name] = stream_checksum(f_obj)
+            Trace.trace(10, "verify_package: %s %s"%(name, crcs[name]))
+    if entries is None:
+        raise IOError(errno.ENOENT, "README.1st is not found in %s"%(package,))
+    results = []
+    for cache_fn, pnfs_fn, crc in entries:
+        # archivers strip the leading "/"
+        crc_0, crc_1 = crcs.get(cache_fn.lstrip("/"), (None, None))
+        results.append((cache_fn, crc, crc_0, crc_1,
+                        crc_0 is not None and crc in (crc_0, crc_1)))
+    return results
+
+# check files prepared for writing to tape
+# runs in subprocess to keep checksum calculation
+# out of migrator threads
+# @param package - package complete path
+# exit code maps to True / False
+def _check_packaged_files(archive_area, package, tar_blocking_factor=20):
+    Trace.trace(10, "_check_packaged_files: called with %s %s"%(archive_area, package))
     try:
-        f = open("README.1st", "r")
+        results = verify_package(package, tar_blocking_factor)
     except:
         Trace.handle_error()
-        sys.exit("0") # False
+        Trace.log(e_errors.ERROR, "Error reading package %s"%(package,))
+        sys.exit(1)
+
     # Check all files found in README.1st
-    first = True
-    for l in f.readlines():
-        # skip the first line
-        # it is the header
-        if first:
-            first = False
+    check_result = True
+    for fn, crc, crc_0, crc_1, ok in results:
+        if ok:
             continue
-        lst = l.split(" ")
-        Trace.trace(10, "_check_packaged_files: %s, lst %s"%(l, lst))
-        cache_fn, pnfs_fn, crc = lst[0], lst[1], lst[2]
-        fn = cache_fn.lstrip("/")
-        crc = long(crc)
-        crc_0, crc_1 = file_checkum(fn)
-        check_result = True
-        if crc_0 != crc and crc_1 != crc:
-            check_result = False
+        check_result = False
+        if crc_0 is None:
+            Trace.log(e_errors.ERROR, "selective CRC check error on %s. File is not in the package"%(fn,))
+        else:
             Trace.log(e_errors.ERROR, "selective CRC check error on %s. Calculated seed_0 %s seed_1 %s Expected %s"% \
                       (fn, crc_0, crc_1, crc))
-            break
-    # remove these temporary files
-    f.seek(0)
-    first = True
-    Trace.trace(10, "_check_packaged_files: remove temporay files")
-    for l in f.readlines():
-        # skip the first line
-        # it is the header
-        if first:
-            first = False
-            continue
-        lst = l.split(" ")
-        Trace.trace(10, "_check_packaged_files: removing %s, lst %s"%(l, lst))
-        cache_fn, pnfs_fn, crc = lst[0], lst[1], lst[2]
-        fn = cache_fn.lstrip("/")
-        os.remove(fn)
-    os.remove("README.1st")
     Trace.trace(10, "_check_packaged_files: exiting with %s"%(check_result,))
 
-    sys.exit(str(int(check_result))) # process must return a string value
+    sys.exit(int(not check_result))
 
 class StorageArea():
     """
@@ -480,10 +520,7 @@ class Migrator(dispatching_worker.DispatchingWorker, generic_server.GenericServe
     # @return True/False
     # fork the process to check files
     # wait until it returns
-    # this is needed because nfs creates .nfs files which
-    # get removed only when the process exits
-    # so the only way to remove temporay nfs directories is
-    # to terminate the process that leaves .nfs files open
+    # the package is read in place, nothing is extracted
     def check_packaged_files(self, package):
         Trace.trace(10, "check_packaged_files creating _check_packaged_files %s %s %s %s "%(type(self.archive_area),self.archive_area, type(package), package ))
         self.state = CHECKING_CRC
@@ -494,18 +531,7 @@ class Migrator(dispatching_worker.DispatchingWorker, generic_server.GenericServe
         Trace.trace(10, "check_packaged_files _check_packaged_files started")
         proc.join()
         Trace.trace(10, "check_packaged_files: returns %s"%(proc.exitcode))
-
-        # Remove temporary directory
-        # created by _check_packaged_files here
-        # to take care about .nfs.... files
-        tmp_dir = os.path.join(self.archive_area.path, "tmp_CRC", os.path.dirname(package).lstrip("/"))
-        Trace.trace(10, "check_packaged_files: removing temporary directories")
-        try:
-           shutil.rmtree(tmp_dir)
-           return True
-        except OSError, detail:
-           Trace.log(e_errors.ERROR, "check_packaged_files: error removing directory %s: %s"%(tmp_dir, detail,))
-           return False
+        return proc.exitcode == 0
 
     # pack files into a single aggregated file
     # if there are multiple files in request list
@@ -38,10 +38,12 @@ import checksum
 import host_config
 from en_eval import en_eval
 import Interfaces
+import udp_common
 
 MSG_LEN_POSITIONS = 12
 MSG_LEN_POSITIONS_OLD = 8
 PROTOCOL = "PROTO001" # must be 8 caharacters to be used in place of old message length
+STREAM_FRAME_SIZE = 1000 # records in a frame of a streamed reply
 
 """
 class TCPError(socket.error):
@@ -557,14 +559,20 @@ def write_raw(sock, msg, timeout=15*60):
 write_tcp_raw = write_raw
 
 # send a message over the network which is a Python object
-def write_tcp_obj(sock, obj, timeout=15*60):
+# encoded: values of the dictionary obj already encoded with repr(),
+#          see udp_common.r_repr_with()
+def write_tcp_obj(sock, obj, timeout=15*60, encoded=None):
     if type(sock) != types.IntType and not hasattr(sock, "fileno"):
         raise TypeError("expected integer socket file descriptor or "
                         "socket object; received %s instead" % (str(sock),))
 ### When we want to go strictly to cPickle use the following line.
 #    return write_tcp_obj_new(sock, obj, timeout)
 
-    rtn, e = write_tcp_raw(sock, repr(obj), timeout)
+    if encoded:
+        msg = udp_common.r_repr_with(obj, encoded)
+    else:
+        msg = repr(obj)
+    rtn, e = write_tcp_raw(sock, msg, timeout)
 
     if e:
         log_socket_state(sock) #Log the state of the socket.
@@ -590,6 +598,27 @@ def write_tcp_obj_new(sock,obj,timeout=15*60):
 
     return rtn
 
+# send records, from any iterable, as a streamed reply: a sequence of
+# frames, each a pickled list of up to frame_size records, ended by
+# an empty frame.  Neither side has to hold more than a frame in
+# memory.  Returns the number of records sent.
+def write_tcp_obj_stream(sock, records, frame_size=STREAM_FRAME_SIZE,
+                         timeout=15*60):
+    count = 0
+    frame = []
+    for record in records:
+        frame.append(record)
+        if len(frame) >= frame_size:
+            write_tcp_obj_new(sock, frame, timeout)
+            count = count + len(frame)
+            frame = []
+    if frame:
+        write_tcp_obj_new(sock, frame, timeout)
+        count = count + len(frame)
+    # end of stream
+    write_tcp_obj_new(sock, [], timeout)
+    return count
+
 # send a message to a co-process which is a Python object
 def write_obj(fd, obj, timeout=15*60, verbose = True):
     rtn, e = write_raw(fd, cPickle.dumps(obj), timeout)
@@ -703,12 +732,18 @@ def read_raw(fd, timeout=15*60):
     salt= int(tmp[6:])
 
     #Read in the payload and verify it is consistant with what we expected.
-    msg = ""
-    while len(msg) < bytecount:
-        tmp, error_string = timeout_recv(fd, bytecount - len(msg), timeout)
+    # Collect the pieces and join them once, appending to a string
+    # copies everything read so far on every piece.
+    pieces = []
+    nread = 0
+    while nread < bytecount:
+        tmp, error_string = timeout_recv(fd, bytecount - nread, timeout)
         if not tmp:
             break
-        msg = msg+tmp
+        pieces.append(tmp)
+        nread = nread + len(tmp)
+    msg = "".join(pieces)
+    del pieces
     if len(msg)!=bytecount:
         error_string = "%s; read_raw: bytecount mismatch %s != %s" \
                        % (error_string, len(msg), bytecount)
@@ -784,6 +819,17 @@ def read_tcp_obj_new(sock, timeout=15*60, exit_on_no_socket=False):
 
     return cPickle.loads(s)
 
+# receive a streamed reply, see write_tcp_obj_stream(), and yield
+# its records one at a time
+def read_tcp_obj_stream(sock, timeout=15*60):
+    while True:
+        frame = read_tcp_obj_new(sock, timeout)
+        if not frame:
+            # end of stream
+            return
+        for record in frame:
+            yield record
+
 # receive a message from a co-process which is a Python object
 def read_obj(fd, timeout=15*60, verbose = True):
     s, e = read_raw(fd, timeout)
@@ -442,7 +442,8 @@ class ConfigurationClient(generic_client.GenericClient):
         Set copy level in configuration server (may affect server performance).
 
         :type copy_level: :obj:`int`
-        :arg copy_level: 2 = deepcopy, 1 = copy, 0 = direct reference.
+        :arg copy_level: 3 = snapshot, 2 = deepcopy, 1 = copy,
+                        0 = direct reference.
         :type timeout: :obj:`float`
         :arg timeout: reply waiting time
         :type retry: :obj:`int`
@@ -33,12 +33,88 @@ import e_errors
 import hostaddr
 import callback
 import udp_client
+import udp_common
 import host_config
 
 MY_NAME = enstore_constants.CONFIGURATION_SERVER   #"CONFIG_SERVER"
 SEQUENTIAL_QUEUE_SIZE = enstore_constants.SEQUENTIAL_QUEUE_SIZE
 PARALLEL_QUEUE_SIZE = enstore_constants.PARALLEL_QUEUE_SIZE
 MAX_THREADS = enstore_constants.MAX_THREADS
+# Copy level at which the configuration is served from the ConfigSnapshot
+# of the loaded file, neither locked nor copied.
+SNAPSHOT = 3
+# Server roles indexed by ConfigSnapshot, see get_servers_internal().
+SERVER_ROLES = (".library_manager", ".media_changer", ".migrator")
+
+class ConfigSnapshot:
+    """
+    Frozen copy of a loaded configuration.
+
+    Made once by load_config() and never changed afterwards: a reload
+    replaces the whole snapshot.  Readers neither lock nor copy it, and must
+    not modify what they get from it.  The entries and the whole dictionary
+    are also kept encoded with udp_common.r_repr(), ready to be sent, and
+    the movers and SERVER_ROLES servers are indexed.
+    """
+
+    def __init__(self, configdict, serverlist, config_load_timestamp):
+        """
+
+        :type configdict: :obj:`dict`
+        :arg configdict: configuration dictionary
+        :type serverlist: :obj:`dict`
+        :arg serverlist: server name: (host, hostip, port)
+        :type config_load_timestamp: :obj:`float`
+        :arg config_load_timestamp: time the configuration was loaded
+        """
+        self.configdict = copy.deepcopy(configdict)
+        self.keys = self.configdict.keys()
+        self.serverlist = copy.deepcopy(serverlist)
+        self.config_load_timestamp = config_load_timestamp
+        self.encoded = {}
+        for key, value in self.configdict.items():
+            self.encoded[key] = udp_common.r_repr(value)
+        self.encoded_dump = udp_common.r_repr_with(self.configdict,
+                                                   self.encoded)
+        self.index_roles()
+
+    def index_roles(self):
+        # Same matches as the scans in get_movers_internal() and
+        # get_servers_internal().  Entries without the address, on which
+        # the scans fail, are left out.
+        self.movers = []
+        self.library_movers = {}  # library: movers
+        self.servers = {}  # role: name: server
+        for role in SERVER_ROLES:
+            self.servers[role] = {}
+        for key in self.keys:
+            item = self.configdict[key]
+            for role in SERVER_ROLES:
+                index = string.find(key, role)
+                if index != -1 and item.has_key('host') and \
+                       item.has_key('port'):
+                    self.servers[role][key[:index]] = {
+                        'address': (item['host'], item['port']),
+                        'name': key}
+            if string.find(key, ".mover") == -1 or \
+                   not item.has_key('hostip') or not item.has_key('port'):
+                continue
+            mv = {'mover' : key,
+                  'address' : (item['hostip'], item['port'])
+                  }
+            self.movers.append(mv)
+            for lib_key in ('library', 'libraries'):
+                if not item.has_key(lib_key):
+                    continue
+                if type(item[lib_key]) == types.ListType:
+                    libraries = item[lib_key]
+                else:
+                    libraries = [item[lib_key]]
+                for library in libraries:
+                    try:
+                        self.library_movers.setdefault(library, []).append(mv)
+                    except TypeError:
+                        pass  # unhashable, can not be a library name
 
 class ConfigurationDict:
     """
@@ -51,6 +127,7 @@ class ConfigurationDict:
         self.use_thread = 1
         self.system_name = None  #Cache return value from _get_system_name().
         self.cached_domains = None  #Cache return value from _get_domains().
+        self.snapshot = ConfigSnapshot({}, {}, None)
         #The average dump2() execution time, in seconds, for these three
         # copy levels are (n = 9, for each):
         # deepcopy: 0.017653094397633334
@@ -60,7 +137,10 @@ class ConfigurationDict:
         # reference and the way self.configdict is assigned in read_config(),
         # there should be no possible way for any sub-ticket values to
         # be shared between a new and old configdict.
-        self.do_copies = 1 # 2=deepcopy, 1=copy, 0=object reference
+        #Serving the snapshot made at load time skips both the copies and
+        # the locks; the other levels are kept to compare with.
+        self.do_copies = SNAPSHOT # 3=snapshot, 2=deepcopy, 1=copy,
+                                  # 0=object reference
 
         #To keep the code as clean as possible, only ConfigurationDict
         # functions use these locks.  ConfigurationServer class functions use
@@ -202,6 +282,10 @@ class ConfigurationDict:
 
             #We have successfully loaded the config file.
             self.config_load_timestamp = time.time()
+            #Replacing the reference is atomic, readers of the snapshot
+            # see either the old or the new one.
+            self.snapshot = ConfigSnapshot(self.configdict, self.serverlist,
+                                           self.config_load_timestamp)
 
             self.config_lock.release()   #Avoid deadlocks!
             return (e_errors.OK, None)
@@ -221,6 +305,8 @@ class ConfigurationDict:
     ## These are internal functions that pull information out of the
     ## configuration in a thread safe manner.  All other functions should
     ## use these functions instead of accessing self.configdict directly.
+    ## At copy level SNAPSHOT they return the values of the snapshot
+    ## without locking: reading self.do_copies and self.snapshot is atomic.
 
     # __get_config_value() is an internal function used by, get_dict_entry(),
     # get_server_list(), et. al.  The calling function should hold the
@@ -243,7 +329,21 @@ class ConfigurationDict:
 
         return copied_value
 
+    def get_snapshot(self):
+        """
+        Return the ConfigSnapshot of the loaded configuration, or None
+        when the configuration is not served at copy level SNAPSHOT.
+
+        :rtype: :class:`ConfigSnapshot`
+        """
+        if self.do_copies == SNAPSHOT:
+            return self.snapshot
+        return None
+
     def get_dict_entry(self, skeyValue):
+        snapshot = self.get_snapshot()
+        if snapshot:
+            return snapshot.configdict[skeyValue]
         copy_level = self.get_copy_level()  #Avoid holding both locks at once.
         self.config_lock.acquire()
         try:
@@ -256,6 +356,9 @@ class ConfigurationDict:
         return value
 
     def get_config_keys(self):
+        snapshot = self.get_snapshot()
+        if snapshot:
+            return list(snapshot.keys)  #Callers sort it.
         copy_level = self.get_copy_level()  #Avoid holding both locks at once.
         self.config_lock.acquire()
         try:
@@ -268,6 +371,9 @@ class ConfigurationDict:
         return key_list
 
     def get_config_dict(self):
+        snapshot = self.get_snapshot()
+        if snapshot:
+            return snapshot.configdict
         copy_level = self.get_copy_level()  #Avoid holding both locks at once.
         self.config_lock.acquire()
         try:
@@ -282,6 +388,9 @@ class ConfigurationDict:
     ## need to lock two locks to safely update the data member.
 
     def get_server_list(self):
+        snapshot = self.get_snapshot()
+        if snapshot:
+            return snapshot.serverlist
         copy_level = self.get_copy_level()  #Avoid holding both locks at once.
         self.config_lock.acquire()
         try:
@@ -295,6 +404,9 @@ class ConfigurationDict:
     ## The following use member_lock instead of config_lock.
 
     def get_config_load_timestamp(self):
+        snapshot = self.get_snapshot()
+        if snapshot:
+            return snapshot.config_load_timestamp
         copy_level = self.get_copy_level()  #Avoid holding both locks at once.
         self.member_lock.acquire()
         try:
@@ -351,6 +463,17 @@ class ConfigurationDict:
     ####################################################################
 
     def get_movers_internal(self, ticket):
+        snapshot = self.get_snapshot()
+        if snapshot:
+            if not ticket.has_key('library'):
+                return []
+            if not ticket['library']:
+                #If no library was specified, return all movers.
+                return list(snapshot.movers)
+            try:
+                return list(snapshot.library_movers.get(ticket['library'], []))
+            except TypeError:
+                return []
         ret = []
 	if ticket.has_key('library'):
 	    # search for the appearance of this library manager
@@ -385,6 +508,27 @@ class ConfigurationDict:
                                     ret.append(mv)
         return ret
 
+    def get_servers_internal(self, role):
+        """
+        Return the servers with role, one of SERVER_ROLES, in their name.
+
+        :type role: :obj:`str`
+        :arg role: like ".library_manager"
+        :rtype: :obj:`dict` - name without role: {'address': (host, port),
+                'name': configuration key}
+        """
+        snapshot = self.get_snapshot()
+        if snapshot and snapshot.servers.has_key(role):
+            return snapshot.servers[role].copy()
+        ret = {}
+        for key in self.get_config_keys():
+            index = string.find (key, role)
+            if index != -1:
+                item = self.get_dict_entry(key)
+                ret[key[:index]] = {'address':(item['host'],item['port']),
+                                    'name': key}
+        return ret
+
     #This function returns the key in the 'known_config_servers' sub-ticket
     # that corresponds to this system.  If it is not there then a default
     # based on the system name is returned.
@@ -428,7 +572,8 @@ class ConfigurationDict:
         if should_set_now:
             t0 = time.time()
             try:
-                domains = self.get_dict_entry('domains')
+                #The entry is modified below.
+                domains = copy.deepcopy(self.get_dict_entry('domains'))
             except:
                 #domains = None # Some error.
                 domains = {}
@@ -616,9 +761,15 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
             return
 
         # look up in our dictionary the lookup key
+        encoded = {}  #Values in the snapshot are sent encoded there.
+        snapshot = self.get_snapshot()
         try:
             if ticket.get('new', None):
-                ticket[lookup] = self.get_dict_entry(lookup)
+                if snapshot:
+                    ticket[lookup] = snapshot.configdict[lookup]
+                    encoded[lookup] = snapshot.encoded[lookup]
+                else:
+                    ticket[lookup] = self.get_dict_entry(lookup)
                 #The following section places into the udp reply ticket
                 # information to prevent the configuration_client from having
                 # to pull it down seperatly.
@@ -647,10 +798,14 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
         if server_ipv4:
             # replace host_ip with IPV4 address
             ticket['host_ip'] = server_ipv4
-            if 'hostip' in ticket[lookup] and 'host' in ticket[lookup]:
+            if ('hostip' in ticket[lookup] and 'host' in ticket[lookup] and
+                ticket[lookup]['hostip'] != server_ipv4):
                 #ticket[lookup]['hostip'] = ticket[lookup]['host']
+                # make a copy to not back-affect configuration
+                ticket[lookup] = copy.copy(ticket[lookup])
                 ticket[lookup]['hostip'] = server_ipv4
-        self.send_reply(ticket)
+                encoded.pop(lookup, None)
+        self.send_reply(ticket, encoded)
 
 
     def get_keys(self, ticket):
@@ -670,6 +825,8 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
         self.send_reply(ticket)
 
 
+    # Returns the reply and the values in it already encoded, see
+    # udp_common.r_repr_with().
     def __make_dump(self, ticket):
 
         Trace.trace(15, 'DUMP: \n' + str(ticket))
@@ -681,11 +838,19 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
         # to handle.  dump2() could handle it either way, but dump()
         # can not.
         reply=ticket.copy()
-        reply['dump'] = self.get_config_dict()
-        #The following section places into the udp reply ticket information
-        # to prevent the configuration_client from having to pull it
-        # down separately.
-        reply['config_load_timestamp'] = self.get_config_load_timestamp()
+        encoded = {}
+        snapshot = self.get_snapshot()
+        if snapshot:
+            #Take both from the same snapshot.
+            reply['dump'] = snapshot.configdict
+            encoded['dump'] = snapshot.encoded_dump
+            reply['config_load_timestamp'] = snapshot.config_load_timestamp
+        else:
+            reply['dump'] = self.get_config_dict()
+            #The following section places into the udp reply ticket
+            # information to prevent the configuration_client from having
+            # to pull it down separately.
+            reply['config_load_timestamp'] = self.get_config_load_timestamp()
         domains = self._get_domains()['domains']
         if domains != None:
             reply['domains'] = domains
@@ -694,6 +859,8 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
         my_address_family = socket.getaddrinfo(socket.gethostname(), None)[0][0]
         if (len(ticket['r_a'][0][0].split('.'))) == 4 and (my_address_family == socket.AF_INET6):
             # convert all 'hostip' to IPV4
+            reply['dump'] = copy.copy(reply['dump'])
+            encoded = {}
             for key in reply['dump']:
                 if 'host' in reply['dump'][key]:
                     server_ipv4 = None
@@ -706,7 +873,7 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
                         # make a copy to not back-affect configuration
                         reply['dump'][key] = copy.copy(reply['dump'][key])
                         reply['dump'][key]['hostip'] = server_ipv4
-        return reply
+        return reply, encoded
 
     def dump(self, ticket):
         """
@@ -718,7 +885,7 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
 
         if not hostaddr.allow(ticket['callback_addr']):
             return None
-        reply = self.__make_dump(ticket)
+        reply, encoded = self.__make_dump(ticket)
         if reply == None:
             return
         self.reply_to_caller(ticket)
@@ -727,7 +894,7 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
         sock = socket.socket(address_family, socket.SOCK_STREAM)
         try:
             sock.connect(addr)
-            r = callback.write_tcp_obj(sock, reply)
+            r = callback.write_tcp_obj(sock, reply, encoded=encoded)
             sock.close()
             if r:
                Trace.log(e_errors.ERROR,"Error calling write_tcp_obj. Callback addr. %s"%(addr,))
@@ -745,7 +912,8 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
         :type ticket: :obj:`dict`
         :arg ticket: request containing "dump2" work
         """
-        reply = self.__make_dump(ticket)
+        #The long answer is pickled, the encoded dump is of no use.
+        reply = self.__make_dump(ticket)[0]
         if reply == None:
             return
         self.send_reply_with_long_answer(reply)
@@ -906,15 +1074,8 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
 
         __pychecker__ = "unusednames=ticket"
 
-        ret = {}
-        for key in self.get_config_keys():
-            index = string.find (key, ".library_manager")
-            if index != -1:
-                library_name = key[:index]
-                item = self.get_dict_entry(key)
-                ret[library_name] = {'address':(item['host'],item['port']),
-				     'name': key}
-        ticket['library_managers'] = ret
+        ticket['library_managers'] = \
+            self.get_servers_internal(".library_manager")
         ticket['status'] = (e_errors.OK, None)
 	self.reply_to_caller(ticket)
 
@@ -928,16 +1089,7 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
 
         __pychecker__ = "unusednames=ticket"
 
-        ret = {}
-        for key in self.get_config_keys():
-            index = string.find (key, ".media_changer")
-            if index != -1:
-                media_changer_name = key[:index]
-                item = self.get_dict_entry(key)
-                ret[media_changer_name] = {'address':(item['host'],
-                                                      item['port']),
-                                           'name': key}
-        ticket['media_changers'] = ret
+        ticket['media_changers'] = self.get_servers_internal(".media_changer")
         ticket['status'] = (e_errors.OK, None)
 	self.reply_to_caller(ticket)
 
@@ -951,15 +1103,7 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
 
         __pychecker__ = "unusednames=ticket"
 
-        ret = {}
-        for key in self.get_config_keys():
-            index = string.find (key, ".migrator")
-            if index != -1:
-                migrator = key[:index]
-                item = self.get_dict_entry(key)
-                ret[migrator] = {'address':(item['host'],item['port']),
-				     'name': key}
-        ticket['migrators'] = ret
+        ticket['migrators'] = self.get_servers_internal(".migrator")
         ticket['status'] = (e_errors.OK, None)
 	self.reply_to_caller(ticket)
 
@@ -1022,8 +1166,8 @@ class ConfigurationServer(ConfigurationDict, dispatching_worker.DispatchingWorke
         key = ticket.get('copy_level', 2)
         if key:
             key=int(key)
-            if key >= 2:
-                key = 2
+            if key >= SNAPSHOT:
+                key = SNAPSHOT
             elif key <= 0:
                 key = 0
         self.set_copy_level(key)
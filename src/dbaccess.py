@@ -7,6 +7,7 @@
 ###############################################################################
 
 import datetime
+import itertools
 import string
 import time
 
@@ -19,6 +20,10 @@ import e_errors
 
 MAX_NUMBER_OF_RETRIES=10
 TIME_TO_SLEEP=2
+ITERSIZE=2000 # rows fetched at a time by query_dictresult_iter
+
+# server side cursors must have names unique within a connection
+cursor_names = itertools.count()
 
 #
 # this function converts datetime.datetime key in a list of dictionaries
@@ -57,6 +62,31 @@ def generate_insert_query(table_name,keys):
     query=query.format(table_name,string.join(keys, ","),(("%s,")*len(keys))[:-1])
     return query
 
+def generate_insert_many_query(table_name,keys,count):
+    """
+    Generate insert query of count rows given table name
+    and list of fields
+
+    :type table_name: :obj:`str`
+    :arg table_name: Name of the table to insert into
+
+    :keys: :obj:`list`
+    :arg keys: List of column names
+
+    :type count: :obj:`int`
+    :arg count: Number of rows
+
+    :rtype: :obj:`str` - insert query
+
+    """
+    query = """
+    INSERT INTO {} ({}) VALUES {}
+    """
+    row="("+(("%s,")*len(keys))[:-1]+")"
+    query=query.format(table_name,string.join(keys, ","),
+                       string.join([row]*count, ","))
+    return query
+
 def generate_update_query(table_name,keys):
     """
     Generate update query query given table name
@@ -295,6 +325,28 @@ class DatabaseAccess:
         else:
             return self.update(s)
 
+    def insert_many(self,s,keys,rows):
+        """
+        Insert rows with one query, in one transaction
+
+        :type s: :obj:`str`
+        :arg s: Name of the table to insert into
+
+        :type keys: :obj:`list`
+        :arg keys: List of column names
+
+        :type rows: :obj:`list`
+        :arg rows: List of rows, each a sequence of values in the order of keys
+
+        """
+        if not rows:
+            return
+        q=generate_insert_many_query(s,keys,len(rows))
+        values=[]
+        for row in rows:
+            values.extend(row)
+        return self.update(q,values)
+
     def insert_returning_result(self,s,record=None):
         if record:
             q=generate_insert_query(s,record.keys())
@@ -332,6 +384,57 @@ class DatabaseAccess:
             res.append(r)
         return res
 
+    def query_dictresult_iter(self,s,values=None,itersize=ITERSIZE):
+        """
+        Generator over the rows of the query result, in the same format
+        as query_dictresult() returns them. Rows are fetched by itersize
+        from a server side cursor, so that the whole result is not held
+        in memory.
+
+        :type s: :obj:`str`
+        :arg s: query
+        :type values: :obj:`tuple`
+        :arg values: query parameters
+        :type itersize: :obj:`int`
+        :arg itersize: number of rows to fetch at a time
+        """
+        db,cursor=None,None
+        try:
+            db=self.get_connection()
+            cursor=db.cursor("enstore_cursor_{}".format(cursor_names.next()),
+                             cursor_factory=psycopg2.extras.RealDictCursor)
+            if values:
+                cursor.execute(s,values)
+            else:
+                cursor.execute(s)
+            while True:
+                rows=cursor.fetchmany(itersize)
+                if not rows:
+                    break
+                for row in rows:
+                    r={}
+                    for key in row.keys():
+                        if isinstance(row[key],datetime.datetime):
+                            r[key] = row[key].isoformat(' ')
+                        else:
+                            r[key] = row[key]
+                    yield r
+        except psycopg2.Error, msg:
+            #
+            # propagate exception to caller
+            #
+            raise e_errors.EnstoreError(None,
+                                        str(msg),
+                                        e_errors.DATABASE_ERROR)
+        finally:
+            try:
+                for c in (cursor,db):
+                    if c:
+                        c.close()
+            except:
+                # if we failed to close just silently ignore the exception
+                pass
+
     def query_getresult(self,s,values=None):
         if values:
             result=self.query(s,values,cursor_factory=psycopg2.extras.DictCursor)
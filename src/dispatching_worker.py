@@ -71,6 +71,23 @@ def thread_wrapper(function, args=(), after_function=None):
         after_function()
     Trace.trace(5,"dispatching_worker.thread_wrapper: function %s time %s"%(function.__name__,time.time()-t))
 
+def _guard_records(records, status):
+    # Stop a streamed reply on an error in producing the records,
+    # e.g. a failed database query, and keep the error for the
+    # final status in status[0].
+    try:
+        for record in records:
+            yield record
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except:
+        exc, msg = sys.exc_info()[:2]
+        if isinstance(msg, e_errors.EnstoreError):
+            status[0] = (msg.type, str(msg))
+        else:
+            status[0] = (str(exc), str(msg))
+        Trace.log(e_errors.ERROR, "streamed reply stopped: %s" % (status[0],))
+
 def run_in_thread(thread_name, function, args=(), after_function=None):
     """
     Run function in a thread
@@ -829,6 +846,7 @@ class DispatchingWorker(udp_server.UDPServer):
         ticket['address'] = self.server_address
         ticket['status'] = (e_errors.OK, None)
         ticket['pid'] = os.getpid()
+        ticket['allow_cache'] = hostaddr.allow_cache_info() # hits, misses, size
         self.reply_to_caller(ticket)
 
 
@@ -939,10 +957,14 @@ class DispatchingWorker(udp_server.UDPServer):
     ####################################################################
 
     # send back our response
-    def send_reply(self, t):
+    # encoded: ticket values already encoded, see reply_to_caller_encoded()
+    def send_reply(self, t, encoded=None):
         save_copy = copy.copy(t)
         try:
-            self.reply_to_caller(t)
+            if encoded:
+                self.reply_to_caller_encoded(t, encoded)
+            else:
+                self.reply_to_caller(t)
         except:
             # even if there is an error - respond to caller so he can process it
             exc, msg = sys.exc_info()[:2]
@@ -1068,6 +1090,44 @@ class DispatchingWorker(udp_server.UDPServer):
 
         self.send_reply_with_long_answer_part2(control_socket, ticket)
 
+    def send_reply_with_streamed_answer_part2(self, control_socket, ticket,
+                                              key, records):
+        """
+        Alternative to send_reply_with_long_answer_part2() for replies
+        with an arbitrary long list of records, which are sent as they
+        are produced instead of as ticket[key].
+        The ticket, with 'stream_reply' set to key, goes first, then the
+        records in frames (see callback.write_tcp_obj_stream()) and last
+        a ticket with the final status and number of records.
+        Use on requests with ticket['stream'] set, from clients which
+        read the reply with generic_client.GenericClient.send_streamed().
+
+        :type control_socket: :obj:`socket.socket`
+        :arg control_socket: socket from send_reply_with_long_answer_part1()
+        :type ticket: :obj:`dict`
+        :arg ticket: reply ticket, without the records
+        :type key: :obj:`str`
+        :arg key: ticket key the records would be returned in
+        :type records: iterable
+        :arg records: records of the reply, can be a generator
+        """
+        header = copy.copy(ticket)
+        header['stream_reply'] = key
+        status = [(e_errors.OK, None)]
+        try:
+            callback.write_tcp_obj_new(control_socket, header)
+            count = callback.write_tcp_obj_stream(
+                control_socket, _guard_records(records, status))
+            callback.write_tcp_obj_new(control_socket,
+                                       {'status': status[0],
+                                        'count': count})
+        except (socket.error, e_errors.EnstoreError), msg:
+            message = "failed to use control socket: %s" % (str(msg),)
+            Trace.log(e_errors.NET_ERROR, message)
+
+        #Socket cleanup.
+        control_socket.close()
+
     ####################################################################
 
     def restricted_access(self,ticket=None):
@@ -6,7 +6,6 @@
 ###############################################################################
 
 # system imports
-import pg
 import os
 import time
 import string
@@ -92,10 +91,10 @@ class DriveUtilizationPlotterModule(enstore_plotter_module.EnstorePlotterModule)
         #  here we create data points 
 
         acc = frame.get_configuration_client().get(enstore_constants.ACCOUNTING_SERVER, 5, 2)
-        db = pg.DB(host  = acc.get('dbhost', 'localhost'),
-                   dbname= acc.get('dbname', 'accounting'),
-                   port  = acc.get('dbport', 5432),
-                   user  = acc.get('dbuser', 'enstore'))
+        db = frame.get_db(host  = acc.get('dbhost', 'localhost'),
+                          dbname= acc.get('dbname', 'accounting'),
+                          port  = acc.get('dbport', 5432),
+                          user  = acc.get('dbuser', 'enstore'))
 
         #now_time  = time.time()
         #then_time = now_time - self.days_ago*24*3600
@@ -119,10 +118,10 @@ class DriveUtilizationPlotterModule(enstore_plotter_module.EnstorePlotterModule)
                 break
         db.close()
 
-        db = pg.DB(host  = acc.get('dbhost', 'localhost'),
-                   dbname= acc.get('dbname', 'accounting'),
-                   port  = acc.get('dbport', 5432),
-                   user  = acc.get('dbuser', 'enstore'))
+        db = frame.get_db(host  = acc.get('dbhost', 'localhost'),
+                          dbname= acc.get('dbname', 'accounting'),
+                          port  = acc.get('dbport', 5432),
+                          user  = acc.get('dbuser', 'enstore'))
 
         db.query("begin");
         db.query("declare rate_cursor cursor for select to_char(time,'YYYY-MM-DD HH24:MI:SS'), type,  sum(busy), tape_library \
@@ -141,10 +140,10 @@ class DriveUtilizationPlotterModule(enstore_plotter_module.EnstorePlotterModule)
                 break
         db.close()        
 
-        db = pg.DB(host  = acc.get('dbhost', 'localhost'),
-                   dbname= acc.get('dbname', 'accounting'),
-                   port  = acc.get('dbport', 5432),
-                   user  = acc.get('dbuser', 'enstore'))
+        db = frame.get_db(host  = acc.get('dbhost', 'localhost'),
+                          dbname= acc.get('dbname', 'accounting'),
+                          port  = acc.get('dbport', 5432),
+                          user  = acc.get('dbuser', 'enstore'))
 
         db.query("begin");
         db.query("declare rate_cursor cursor for select to_char(time,'YYYY-MM-DD HH24:MI:SS'), type,  sum(busy), tape_library \
@@ -173,6 +173,9 @@ class DbTable:
         self.auto_journal = auto_journal
         self.backup_flag = 1
         self.jouHome = jouHome
+        # called as write_callback(key, value) after a record is written
+        # through this object, value is None if the record is deleted
+        self.write_callback = None
 
         if self.auto_journal:
             self.jou = ejournal.Journal(os.path.join(
@@ -181,6 +184,7 @@ class DbTable:
             self.jou = None
 
         self.retrieve_query = "select * from "+self.table+" where "+self.pkey+" = %s"
+        self.retrieve_many_query = "select * from "+self.table+" where "+self.pkey+" = ANY(%s)"
         self.delete_query = "delete from "+self.table+" where "+self.pkey+" = %s"
 
         self.dbaccess =  dbaccess.DatabaseAccess(maxconnections=max_connections,
@@ -209,6 +213,9 @@ class DbTable:
     def query_dictresult(self,s,values=None):
         return self.dbaccess.query_dictresult(s,values)
 
+    def query_dictresult_iter(self,s,values=None):
+        return self.dbaccess.query_dictresult_iter(s,values)
+
     def query_getresult(self,s,values=None):
         return self.dbaccess.query_getresult(s,values)
 
@@ -230,6 +237,17 @@ class DbTable:
         else:
             return self.export_format(res[0])
 
+    # get_many(keys) -- the records of keys in one query, as a dictionary
+    # {key: record in external format}. Keys without a record are left out.
+    def get_many(self, keys):
+        records = {}
+        if not keys:
+            return records
+        res=self.dbaccess.query_dictresult(self.retrieve_many_query,(list(keys),))
+        for row in res:
+            records[row[self.pkey]] = self.export_format(row)
+        return records
+
     def __setitem__(self, key, value):
         if self.auto_journal:
             self.jou[key] = value
@@ -245,7 +263,8 @@ class DbTable:
                 v=d.values()
                 v.append(key)
                 res = self.dbaccess.update(query,tuple(v))
-
+        if self.write_callback:
+            self.write_callback(key, value)
 
     def insert_new_record(self,key,value):
         """
@@ -263,6 +282,8 @@ class DbTable:
         self.dbaccess.insert(self.table,v1)
         if self.auto_journal:
             self.jou[key] = value
+        if self.write_callback:
+            self.write_callback(key, value)
 
 
     def update_record(self,key,value):
@@ -289,6 +310,8 @@ class DbTable:
         updated_record = self.__getitem__(key)
         if self.auto_journal:
             self.jou[key] = updated_record
+        if self.write_callback:
+            self.write_callback(key, updated_record)
         return updated_record
 
 
@@ -299,6 +322,8 @@ class DbTable:
                 self.jou[key] = self.__getitem__(key)
             del self.jou[key]
         res = self.dbaccess.delete(self.delete_query,(key,))
+        if self.write_callback:
+            self.write_callback(key, None)
 
 
     def keys(self):
@@ -398,6 +423,8 @@ class FileDB(DbTable):
         INNER JOIN volume v ON f.volume = v.id
         AND bfid = %s
         """
+        self.retrieve_many_query = self.retrieve_query.replace("bfid = %s",
+                                                               "bfid = ANY(%s)")
 
     def __setitem__(self, key, value):
         res = self.dbaccess.query_dictresult(self.retrieve_query,(key,))
@@ -627,6 +654,31 @@ class FileDB(DbTable):
                 file["tape_label"]=file.get("label",None)
             return self.export_format(file)
 
+    # Same as __getitem__() for each of the keys, see DbTable.get_many().
+    # The volumes of the packages of the files are found in one more query.
+    def get_many(self, keys):
+        records = {}
+        if not keys:
+            return records
+        res=self.dbaccess.query_dictresult(self.retrieve_many_query,(list(keys),))
+        packages = {}
+        for file in res:
+            package_id = file.get('package_id',None)
+            if package_id and package_id != file['bfid']:
+                packages[package_id] = 1
+            else:
+                file["tape_label"]=file.get("label",None)
+        labels = {}
+        if packages:
+            for package in self.dbaccess.query_dictresult(self.retrieve_many_query,
+                                                          (packages.keys(),)):
+                labels[package['bfid']] = package.get("label",None)
+        for file in res:
+            if not file.has_key("tape_label") and labels.has_key(file['package_id']):
+                file["tape_label"] = labels[file['package_id']]
+            records[file['bfid']] = self.export_format(file)
+        return records
+
 class VolumeDB(DbTable):
     def __init__(self,
                  host='localhost',
@@ -694,6 +746,8 @@ class VolumeDB(DbTable):
         FROM volume
         WHERE label=%s
         """
+        self.retrieve_many_query = self.retrieve_query.replace("label=%s",
+                                                               "label = ANY(%s)")
 
     def import_format(self, s):
         sts = string.split(s['volume_family'],'.') if s.has_key('volume_family') else None
@@ -161,11 +161,11 @@ class EncpRateMultiPlotterModule(enstore_plotter_module.EnstorePlotterModule):
         #  here we create data points
 
         acc = frame.get_configuration_client().get(enstore_constants.ACCOUNTING_SERVER, {})
-        db = pg.DB(host   = acc.get('dbhost', "localhost"),
-                   dbname = acc.get('dbname', "accounting"),
-                   port   = acc.get('dbport', 5432),
-                   user   = acc.get('dbuser', "enstore")
-                   )
+        db = frame.get_db(host   = acc.get('dbhost', "localhost"),
+                          dbname = acc.get('dbname', "accounting"),
+                          port   = acc.get('dbport', 5432),
+                          user   = acc.get('dbuser', "enstore")
+                          )
 
         #max_time = self.get_max_time(db)
         now_time = int(time.time())
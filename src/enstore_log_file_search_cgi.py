@@ -71,8 +71,13 @@ def go():
             # if the period was yesterday, we do not need today
             if logfile == log_client.YESTERDAY:
                 logfile_names = [logfile_names[0],]
-	    # for each name, search the file using the  search string
-	    enstore_utils_cgi.pgrep_html(search_string, logfile_names, 0)
+	    # for each name, search the file using the  search string, bfids,
+	    # volume labels and unique_ids are looked up in the indexes
+	    import log_index
+	    if log_index.is_indexed_word(search_string):
+		enstore_utils_cgi.index_grep_html(search_string, logfile_names)
+	    else:
+		enstore_utils_cgi.pgrep_html(search_string, logfile_names, 0)
     finally:
         print "</BODY></HTML>"
 
@@ -10,34 +10,222 @@
 #
 ###############################################################################
 
+# system imports
+import threading
+import multiprocessing
+import time
+import sys
+import os
+
+# enstore imports
 import configuration_client
 import enstore_plotter_module
 import enstore_functions2
 
+class TimedDB:
+    """
+    pg.DB connection taken from a pool of the framework. The time of its
+    queries is added to the query time of the module it was taken for.
+    close() returns the connection to the pool.
+    """
+    def __init__(self, db, frame, module_name):
+        self.db = db
+        self.frame = frame
+        self.module_name = module_name
+    def query(self, *args):
+        t0 = time.time()
+        try:
+            return self.db.query(*args)
+        finally:
+            self.frame.add_time(self.module_name, 'query', time.time() - t0)
+    def __getattr__(self, name):
+        return getattr(self.db, name)
+
 class EnstorePlotterFramework:
-    def __init__(self):
+    """
+    Runs book, fill and plot of the modules added.
+
+    With fill_threads > 1 the fill of the modules runs in that many
+    threads, a module is filled after the modules named in its
+    dependencies.  The database connections of get_db() are shared by the
+    threads through a pool per database.  With plot_processes > 1 the plot
+    of the modules runs in that many processes.
+    """
+    def __init__(self, fill_threads=1, plot_processes=1):
         self.module_list=[]
         self.csc   = configuration_client.ConfigurationClient((enstore_functions2.default_host(),
                                                               enstore_functions2.default_port()))
+        self.fill_threads = max(fill_threads, 1)
+        self.plot_processes = max(plot_processes, 1)
+        self.pools = {}       # (host, port, dbname, user): PooledPg
+        self.times = {}       # module name: {phase: seconds}
+        self.lock = threading.Lock()
+        # the module filled in this thread
+        self.current = threading.local()
+        # drop the aggregates of the modules and sum all the rows again
+        self.recompute_aggregates = 0
     def get_configuration_client(self):
         return self.csc
     def add(self,module):
         self.module_list.append(module)
+    def get_aggregates_dir(self):
+        """
+        Directory of the aggregates the modules keep between the runs.
+        """
+        cron_dict = self.csc.get("crons", {})
+        return cron_dict.get("plot_aggregates_dir",
+                             os.path.join(cron_dict.get("tmp_dir", "/tmp"),
+                                          "plot_aggregates"))
+
+    def get_db(self, host="localhost", dbname="enstoredb", port=5432,
+               user="enstore"):
+        """
+        Return a pg.DB connection to the database from the pool of the
+        database.  Close it to give it back.
+        """
+        from DBUtils.PooledPg import PooledPg
+        key = (host, port, dbname, user)
+        with self.lock:
+            pool = self.pools.get(key)
+            if not pool:
+                # the idle connections kept, one per fill thread
+                pool = PooledPg(maxcached=self.fill_threads,
+                                host=host, dbname=dbname, port=port,
+                                user=user)
+                self.pools[key] = pool
+        return TimedDB(pool.connection(), self,
+                       getattr(self.current, 'module_name', None))
+
+    def close_pools(self):
+        for pool in self.pools.values():
+            pool.close()
+        self.pools = {}
+
+    def add_time(self, module_name, phase, seconds):
+        with self.lock:
+            times = self.times.setdefault(module_name, {})
+            times[phase] = times.get(phase, 0.) + seconds
+
+    def run_timed(self, module, phase, function, *args):
+        self.current.module_name = module.name
+        t0 = time.time()
+        try:
+            function(*args)
+        finally:
+            self.add_time(module.name, phase, time.time() - t0)
+            self.current.module_name = None
+
+    def active_modules(self):
+        return [module for module in self.module_list if module.isActive() == True]
+
     def book(self):
-        for module in self.module_list:
-            if module.isActive() == True :
-                module.book(self)
+        for module in self.active_modules():
+            self.run_timed(module, 'book', module.book, self)
+
     def fill(self):
-        for module in self.module_list:
-            if module.isActive() == True :
-                module.fill(self)
+        modules = self.active_modules()
+        if self.fill_threads == 1:
+            for module in modules:
+                self.run_timed(module, 'fill', module.fill, self)
+            return
+        names = {}
+        for module in modules:
+            names[module.name] = 1
+        waiting = modules[:]
+        done = {}
+        cond = threading.Condition()
+
+        # return the next module which has its dependencies filled, None
+        # when all modules are taken. cond must be held.
+        def next_module():
+            while waiting:
+                for module in waiting:
+                    for name in module.dependencies:
+                        # dependencies not run are ignored
+                        if names.has_key(name) and not done.has_key(name):
+                            break
+                    else:
+                        waiting.remove(module)
+                        return module
+                cond.wait()
+            return None
+
+        def worker():
+            while 1:
+                with cond:
+                    module = next_module()
+                if not module:
+                    return
+                try:
+                    self.run_timed(module, 'fill', module.fill, self)
+                except:
+                    exc, msg = sys.exc_info()[:2]
+                    print "Filling %s failed: %s %s"%(module.name, exc, msg)
+                with cond:
+                    done[module.name] = 1
+                    cond.notifyAll()
+
+        threads = []
+        for i in range(min(self.fill_threads, len(modules))):
+            thread = threading.Thread(target=worker, name="fill_%s"%(i,))
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
     def plot(self):
+        modules = self.active_modules()
+        if self.plot_processes == 1:
+            for module in modules:
+                self.run_timed(module, 'plot', module.plot)
+            return
+        # the processes are forked, they have the data filled in here
+        running = {}   # process: (module, start time)
+        while modules or running:
+            while modules and len(running) < self.plot_processes:
+                module = modules.pop(0)
+                process = multiprocessing.Process(target=module.plot,
+                                                  name=module.name)
+                process.start()
+                running[process] = (module, time.time())
+            for process in running.keys():
+                if not process.is_alive():
+                    process.join()
+                    module, t0 = running[process]
+                    del running[process]
+                    self.add_time(module.name, 'plot', time.time() - t0)
+                    if process.exitcode:
+                        print "Plotting %s failed: exit code %s"%(module.name,
+                                                                  process.exitcode)
+            if running:
+                time.sleep(0.1)
+
+    def report(self):
+        """
+        Print the time of each module, the longest first.
+        """
+        rows = []
         for module in self.module_list:
-            if module.isActive() == True :
-                module.plot()
+            times = self.times.get(module.name, {})
+            total = times.get('book', 0.) + times.get('fill', 0.) + \
+                    times.get('plot', 0.)
+            rows.append((total, module.name, times))
+        rows.sort()
+        rows.reverse()
+        print "%-30s %10s %10s %10s %10s"%("module", "total", "fill",
+                                           "query", "plot")
+        for total, name, times in rows:
+            print "%-30s %10.1f %10.1f %10.1f %10.1f"%(name, total,
+                                                       times.get('fill', 0.),
+                                                       times.get('query', 0.),
+                                                       times.get('plot', 0.))
 
     def do_work(self):
-        self.book()
-        self.fill()
+        try:
+            self.book()
+            self.fill()
+        finally:
+            self.close_pools()
         self.plot()
+        self.report()
 
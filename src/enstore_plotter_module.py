@@ -10,15 +10,24 @@
 import os
 import errno
 import time
+import cPickle
 
 # enstore imports
 #import enstore_plotter_framework
 
+# time bucket formats of the aggregates
+DAY = "%Y-%m-%d"
+HOUR = "%Y-%m-%d %H"
+TIME = "%Y-%m-%d %H:%M:%S"
+AGGREGATE_LAG = 600   # seconds, rows younger than this are summed next run
+
 class EnstorePlotterModule:
     def __init__(self,name,isActive=True):
         self.name=name
         self.is_active=isActive
         self.parameters = {}
+        # names of the modules which must be filled before this one
+        self.dependencies = []
     def isActive(self):
         return self.is_active
     def setActive(self,isActive=True):
@@ -35,6 +44,18 @@ class EnstorePlotterModule:
         self.parameters[par_name]=par_value
     def get_parameter(self,name):
         return self.parameters.get(name)
+    def get_aggregate(self, frame, name, keep=None, bucket_format=DAY):
+        """
+        Return the aggregate name of this module, kept in the aggregates
+        directory of the framework.  It is invalidated if the framework
+        was asked to recompute the aggregates.
+        """
+        filename = os.path.join(frame.get_aggregates_dir(),
+                                "%s.%s.agg" % (self.name, name))
+        aggregate = Aggregate(filename, keep, bucket_format)
+        if frame.recompute_aggregates:
+            aggregate.invalidate()
+        return aggregate
     def move(self, src, dst):
         #Open the input and output files.
         src_fd = os.open(src, os.O_RDONLY)
@@ -58,6 +79,139 @@ class EnstorePlotterModule:
         #Remove the source file.
         os.remove(src)
 
+class Aggregate:
+    """
+    Sums per time bucket and key of rows of the databases, kept in a file
+    between the runs of a plotter module.
+
+    mark is the time up to which the rows are summed: a run queries only
+    the rows from since() to the new mark and adds them with update().
+    Buckets are time.strftime() strings of bucket_format (DAY, HOUR).
+    Buckets older than keep seconds are dropped, the summed buckets are
+    not queried again unless invalidate() drops them.
+    """
+    def __init__(self, filename, keep=None, bucket_format=DAY):
+        self.filename = filename
+        self.keep = keep
+        self.bucket_format = bucket_format
+        self.mark = None
+        self.buckets = {}    # bucket: {key: [sum, ...]}
+        try:
+            f = open(self.filename, 'rb')
+            try:
+                state = cPickle.load(f)
+            finally:
+                f.close()
+            if state.get('bucket_format') == bucket_format:
+                self.mark = state['mark']
+                self.buckets = state['buckets']
+        except (IOError, OSError, EOFError, cPickle.UnpicklingError,
+                KeyError, AttributeError):
+            # no state yet, or a broken one: sum everything again
+            pass
+
+    def bucket(self, seconds):
+        return time.strftime(self.bucket_format, time.localtime(seconds))
+
+    def bucket_start(self, bucket):
+        return time.mktime(time.strptime(bucket, self.bucket_format))
+
+    def since(self, now=None):
+        """
+        Return the time from which rows are to be summed, None for all.
+        """
+        if now is None:
+            now = time.time()
+        since = self.mark
+        if self.keep is not None:
+            oldest = self.bucket_start(self.bucket(now - self.keep))
+            if since is None or since < oldest:
+                since = oldest
+        return since
+
+    def get_interval(self, now=None):
+        """
+        Return the (since, mark) times as TIME strings for the query of
+        the rows of the next update(), since is None for all rows.
+        """
+        if now is None:
+            now = time.time()
+        mark = now - AGGREGATE_LAG
+        since = self.since(mark)
+        if since is not None:
+            since = time.strftime(TIME, time.localtime(since))
+        return since, time.strftime(TIME, time.localtime(mark))
+
+    def add(self, bucket, key, values):
+        sums = self.buckets.setdefault(bucket, {}).get(key)
+        if sums is None:
+            self.buckets[bucket][key] = list(values)
+        else:
+            for i in range(len(values)):
+                sums[i] = sums[i] + values[i]
+
+    def update(self, rows, mark):
+        """
+        Add rows of (bucket, key, value, ...) summed up to mark (TIME
+        string or seconds) and save the aggregate.
+        """
+        for row in rows:
+            self.add(str(row[0]), row[1], row[2:])
+        if type(mark) == type(""):
+            mark = time.mktime(time.strptime(mark, TIME))
+        self.mark = mark
+        if self.keep is not None:
+            oldest = self.bucket(mark - self.keep)
+            for bucket in self.buckets.keys():
+                if bucket < oldest:
+                    del self.buckets[bucket]
+        self.save()
+
+    def invalidate(self, since=None):
+        """
+        Drop the buckets from the one of since (seconds), all if None, so
+        their rows are summed again by the next update().
+        """
+        if since is None:
+            self.buckets = {}
+            self.mark = None
+            return
+        first = self.bucket(since)
+        for bucket in self.buckets.keys():
+            if bucket >= first:
+                del self.buckets[bucket]
+        start = self.bucket_start(first)
+        if self.mark is not None and self.mark > start:
+            self.mark = start
+
+    def get(self, since=None):
+        """
+        Return {bucket: {key: [sum, ...]}} of the buckets from the one of
+        since (seconds), all if None.
+        """
+        if since is None:
+            return self.buckets
+        first = self.bucket(since)
+        buckets = {}
+        for bucket, sums in self.buckets.items():
+            if bucket >= first:
+                buckets[bucket] = sums
+        return buckets
+
+    def save(self):
+        dirname = os.path.dirname(self.filename)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname)
+        tmp_name = "%s.%s" % (self.filename, os.getpid())
+        f = open(tmp_name, 'wb')
+        try:
+            cPickle.dump({'bucket_format': self.bucket_format,
+                          'mark': self.mark, 'buckets': self.buckets},
+                         f, cPickle.HIGHEST_PROTOCOL)
+        finally:
+            f.close()
+        os.rename(tmp_name, self.filename)
+
 def roundtime(seconds, rounding=None):
     """
     Round the provided time and return it.
@@ -99,6 +99,16 @@ def pgrep_html(pat, files, sensit):
 	    fd.close()
 	print "<HR>"
 
+# search for a bfid, volume label or unique_id using the log file indexes
+def index_grep_html(word, files):
+    import log_index
+    for file in files:
+	filename = string.split(file, "/")[-1]
+	print "<H3>%s</H3><BR>"%(file,)
+	for offset, line in log_index.search(file, [word]):
+	    print '[<B>%s</B>] @%d) %s<BR>' %(filename, offset, line)
+	print "<HR>"
+
 def agrep_html(pat1, pat2, files, sensit):
     patr1 = set_pattern_search(pat1, sensit)
     if pat2:
@@ -6,6 +6,8 @@ import select
 import time
 import string
 import sys
+import errno
+import heapq
 
 import enstore_constants
 import Trace
@@ -33,6 +35,7 @@ DONT_PRINT = "dont_print"
 MAX_TIMEOUTS = 20
 LOG_NAME = "EVRLY"
 YES = 1
+MAX_BATCH = 256   # messages read from the listen socket per select
 
 def get_message_filter_dict(msg_tok):
     filter_d = {}
@@ -58,8 +61,19 @@ class Relay:
     client_timeout = 15*60 #clients recieve messages for this long
 
     def __init__(self, my_port=DEFAULT_PORT):
-        self.clients = {} # key is (host,port), value is time connected
+        self.clients = {} # key is (host,port), value is (time connected, filter)
 	self.timeouts = {} # key is (host,port), value is num times error in send
+        # subscription index: message type -> {(host,port):1}, clients
+        # without a filter are in self.all_types
+        self.subscribers = {}
+        self.all_types = {}
+        # (expiration time, (host,port), time connected), expired clients
+        # are removed when they come up in here
+        self.expirations = []
+        # throughput counters
+        self.events_in = 0L
+        self.datagrams_out = 0L
+        self.drops = 0L
         ##self.listen_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         ##self.send_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 	#self.listen_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -86,19 +100,69 @@ class Relay:
 					    "%H:%M:%S"), time.localtime(time.time())),)
 	print "Subscribed clients : %s"%(self.clients,)
 	print "Timeouts : %s"%(self.timeouts,)
+	print "Counters : %s"%(self.counters(),)
 
     def doQuit(self):
         sys.exit(0)
 
+    # the throughput counters sent in the alive message
+    def counters(self):
+        return "events_in=%s datagrams_out=%s drops=%s"%(self.events_in,
+                                                         self.datagrams_out,
+                                                         self.drops)
+
+    def subscribe(self, key, now, filter_d):
+        # get rid of old info first
+        self.cleanup(key)
+        self.clients[key] = (now, filter_d)
+        if filter_d:
+            for msg_type in filter_d.keys():
+                self.subscribers.setdefault(msg_type, {})[key] = 1
+        else:
+            self.all_types[key] = 1
+        heapq.heappush(self.expirations, (now + self.client_timeout, key, now))
+
     def cleanup(self, key, log=0):
 	if self.clients.has_key(key):
 	    if log:
 		msg = "Cleaning up %s from clients"%(key,)
 		Trace.log(e_errors.INFO, msg, Trace.MSG_EVENT_RELAY)
+            t0, filter_d = self.clients[key]
+            if filter_d:
+                for msg_type in filter_d.keys():
+                    subscribers = self.subscribers[msg_type]
+                    del subscribers[key]
+                    if not subscribers:
+                        del self.subscribers[msg_type]
+            else:
+                del self.all_types[key]
 	    del self.clients[key]
 	if self.timeouts.has_key(key):
 	    del self.timeouts[key]
 
+    # remove the clients which did not subscribe again in client_timeout
+    def expire(self, now):
+        while self.expirations and self.expirations[0][0] < now:
+            expiration, key, t0 = heapq.heappop(self.expirations)
+            client = self.clients.get(key)
+            # the client may have subscribed again since
+            if client and client[0] == t0:
+                self.ev_print("    cleaning up %s"%(key,))
+                self.cleanup(key, YES)
+
+    # return the messages waiting in the listen socket, at most MAX_BATCH
+    def recv_messages(self):
+        msgs = []
+        while len(msgs) < MAX_BATCH:
+            try:
+                msgs.append(self.listen_socket.recv(1024, socket.MSG_DONTWAIT))
+            except socket.error, detail:
+                if detail.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK,
+                                      errno.EINTR):
+                    break
+                raise
+        return msgs
+
     def mainloop(self):
         last_heartbeat = 0
 	try:
@@ -106,73 +170,75 @@ class Relay:
 		readable, junk, junk = select.select([self.listen_socket], [], [], 15)
 		now = time.time()
 		if now - last_heartbeat > heartbeat_interval:
-		    self.send_message(self.alive_msg, 'alive', now)
+		    self.send_message("%s %s"%(self.alive_msg, self.counters()),
+				      'alive', now)
 		    last_heartbeat = now
 		if not readable:
 		    continue
-		msg = self.listen_socket.recv(1024)
-
-		if not msg:
-		    continue
-		tok = string.split(msg)
-		if not tok:
-		    continue
-		if tok[0]==NOTIFY:
-		    try:
-			ip = tok[1]
-			port = int(tok[2])
-			# the rest of the message is the list of message types the
-			# client is interested in.  if there is no list, the client
-			# wants all message types
-			filter_d = get_message_filter_dict(tok)
-			key = (ip, port)
-			# get rid of old info first
-			self.cleanup(key)
-			self.clients[key] = (now, filter_d)
-			#msg = "Subscribe request for %s, (port: %s) for %s."%(ip, port,
-			#						      filter_d)
-			#Trace.log(e_errors.INFO, msg, Trace.MSG_EVENT_RELAY)
-		    except:
-			self.dump()
-                        Trace.handle_error(msg_type=Trace.MSG_EVENT_RELAY)
-			msg = "cannot handle request %s"%(msg,)
-			Trace.log(e_errors.INFO, msg, Trace.MSG_EVENT_RELAY)
-
-		elif tok[0] == UNSUBSCRIBE:
-		    try:
-			ip = tok[1]
-			port = int(tok[2])
-			if not self.clients.has_key((ip, port)):
-			    #msg = "no client subscribed %s"%(msg,)
-                            pass
-			else:
-			    self.cleanup((ip, port))
-			    #msg = "Unsubscribe request for %s, (port: %s)"%(ip, port)
-			#Trace.log(e_errors.INFO, msg, Trace.MSG_EVENT_RELAY)
-		    except:
-			self.dump()
-                        Trace.handle_error(msg_type=Trace.MSG_EVENT_RELAY)
-			msg = "cannot handle request %s"%(msg,)
-			Trace.log(e_errors.INFO, msg, Trace.MSG_EVENT_RELAY)
-
-		elif tok[0] == HEARTBEAT:
-		    self.send_message(self.alive_msg, 'alive', now)
-		elif tok[0] == DUMP:
-		    self.dump()
-                elif tok[0] == QUIT:
-                    self.doQuit()
-		elif tok[0] == DO_PRINT:
-		    self.do_print = YES
-		elif tok[0] == DONT_PRINT:
-		    self.do_print = 0
-		else:
-		    self.send_message(msg, tok[0], now)
+		for msg in self.recv_messages():
+		    self.handle_message(msg, now)
         except SystemExit:
             pass
 	except:
 	    self.dump()
 	    Trace.handle_error(msg_type=Trace.MSG_EVENT_RELAY)
 
+    def handle_message(self, msg, now):
+	if not msg:
+	    return
+	tok = string.split(msg)
+	if not tok:
+	    return
+	if tok[0]==NOTIFY:
+	    try:
+		ip = tok[1]
+		port = int(tok[2])
+		# the rest of the message is the list of message types the
+		# client is interested in.  if there is no list, the client
+		# wants all message types
+		filter_d = get_message_filter_dict(tok)
+		self.subscribe((ip, port), now, filter_d)
+		#msg = "Subscribe request for %s, (port: %s) for %s."%(ip, port,
+		#						      filter_d)
+		#Trace.log(e_errors.INFO, msg, Trace.MSG_EVENT_RELAY)
+	    except:
+		self.dump()
+                Trace.handle_error(msg_type=Trace.MSG_EVENT_RELAY)
+		msg = "cannot handle request %s"%(msg,)
+		Trace.log(e_errors.INFO, msg, Trace.MSG_EVENT_RELAY)
+
+	elif tok[0] == UNSUBSCRIBE:
+	    try:
+		ip = tok[1]
+		port = int(tok[2])
+		if not self.clients.has_key((ip, port)):
+		    #msg = "no client subscribed %s"%(msg,)
+                    pass
+		else:
+		    self.cleanup((ip, port))
+		    #msg = "Unsubscribe request for %s, (port: %s)"%(ip, port)
+		#Trace.log(e_errors.INFO, msg, Trace.MSG_EVENT_RELAY)
+	    except:
+		self.dump()
+                Trace.handle_error(msg_type=Trace.MSG_EVENT_RELAY)
+		msg = "cannot handle request %s"%(msg,)
+		Trace.log(e_errors.INFO, msg, Trace.MSG_EVENT_RELAY)
+
+	elif tok[0] == HEARTBEAT:
+	    self.send_message("%s %s"%(self.alive_msg, self.counters()),
+			      'alive', now)
+	elif tok[0] == DUMP:
+	    self.dump()
+        elif tok[0] == QUIT:
+            self.doQuit()
+	elif tok[0] == DO_PRINT:
+	    self.do_print = YES
+	elif tok[0] == DONT_PRINT:
+	    self.do_print = 0
+	else:
+	    self.events_in = self.events_in + 1
+	    self.send_message(msg, tok[0], now)
+
     def handle_error(self, addr, msg, extra=""):
 	error_msg = "send failed %s (%s) (%s)"%(addr, msg, extra)
 	Trace.log(e_errors.ERROR, error_msg, Trace.MSG_EVENT_RELAY)
@@ -184,27 +250,28 @@ class Relay:
 
     def send_message(self, msg, msg_type, now):
         """Send the message to all clients who care about it"""
-	self.ev_print("%s %s"%(time.ctime(now), msg_type))
-        for addr, (t0, filter_d) in self.clients.items():
-	    self.ev_print("    %s %s"%(addr, filter_d))
-            if now - t0 > self.client_timeout:
-		self.ev_print("    cleaning up %s"%(addr,))
-		self.cleanup(addr, YES)
-            else:
-                # client wants the message if there is no filter or if
-                # the filter contains the message type in its dict.
-                if (not filter_d) or filter_d.has_key(msg_type):
-                    try:
-			self.ev_print("    sending '%s' to %s"%(msg, addr,))
-                        l = self.send_socket.sendto(msg, addr)
-			self.ev_print("    sendto return = %s"%(l,))
-		    except socket.error, detail:
-			extra = "%s"%(detail,)
-			self.ev_print("    ERROR: %s"%(detail,))
-			self.handle_error(addr, msg, extra)
-                    except:
-			self.ev_print("    ERROR: unknown")
-			self.handle_error(addr, msg)
+        self.expire(now)
+        # clients which want all messages and those which want msg_type
+        addrs = self.all_types.keys()
+        addrs.extend(self.subscribers.get(msg_type, {}).keys())
+        if self.do_print:
+            self.ev_print("%s %s"%(time.ctime(now), msg_type))
+            self.ev_print("    sending '%s' to %s"%(msg, addrs,))
+        sendto = self.send_socket.sendto
+        for addr in addrs:
+            try:
+                sendto(msg, addr)
+                self.datagrams_out = self.datagrams_out + 1
+            except socket.error, detail:
+                self.drops = self.drops + 1
+                extra = "%s"%(detail,)
+                self.ev_print("    ERROR: %s"%(detail,))
+                self.handle_error(addr, msg, extra)
+            except:
+                self.drops = self.drops + 1
+                self.ev_print("    ERROR: unknown")
+                self.handle_error(addr, msg)
+
 if __name__ == "__main__":   # pragma: no cover
     R = Relay()
     #R._do_print({'levels':range(5, 400)})
@@ -52,6 +52,18 @@ AMQP_BROKER = "amqp_broker"
 FILES_IN_TRANSITION_CHECK_INTERVAL = enstore_constants.FILES_IN_TRANSITION_CHECK_INTERVAL
 ARCHIVING_FILES_IN_TRANSITION_CHECK_INTERVAL = enstore_constants.FILES_IN_TRANSITION_CHECK_INTERVAL
 
+# columns of a file on tape listed by tape_list
+TAPE_LIST_COLUMNS = ("bfid", "crc", "deleted", "drive", "label",
+                     "location_cookie", "pnfs_path", "pnfs_id",
+                     "sanity_size", "sanity_crc", "size", "package_id",
+                     "archive_status", "cache_status")
+# columns of a package member, location_cookie and label are those
+# of the package file
+TAPE_LIST_MEMBER_COLUMNS = ("bfid", "crc", "deleted", "drive",
+                            "pnfs_path", "pnfs_id", "sanity_size",
+                            "sanity_crc", "size", "package_id",
+                            "archive_status", "cache_status")
+
 SELECT_FILES_IN_TRANSITION = """
 SELECT f.bfid,
        f.cache_status,
@@ -330,6 +342,18 @@ class FileClerkInfoMethods(dispatching_worker.DispatchingWorker):
             bfids.append(i[0])
         return bfids
 
+    # Generator of the bfids get_all_bfids() returns.
+    def __all_bfids_iter(self, external_label):
+        q = """
+        SELECT bfid, location_cookie
+        FROM file, volume
+        WHERE volume.label = %s
+            AND file.volume = volume.id
+        ORDER BY location_cookie
+        """
+        for row in self.filedb_dict.query_dictresult_iter(q, (external_label,)):
+            yield row['bfid']
+
     ####################################################################
 
     ###
@@ -378,6 +402,51 @@ class FileClerkInfoMethods(dispatching_worker.DispatchingWorker):
         Trace.trace(10, "bfid_info bfid=%s" % (bfid,))
         return
 
+    # bfid_info_many -- bfid_info of each of ticket['bfids'], read in one
+    # query.  ticket['files'] is {bfid: record}, each record with the status
+    # bfid_info would reply with.  The answer is sent using
+    # send_reply_with_long_answer().
+    def bfid_info_many(self, ticket):
+
+        bfids = self.extract_value_from_ticket("bfids", ticket, fail_None=True)
+        if bfids == None:
+            return  # extract_value_from_ticket handles its own errors.
+
+        files = {}
+        valid_bfids = []
+        for bfid in bfids:
+            if not bfid:
+                message = "%s: key bfid is None" % (MY_NAME,)
+                files[bfid] = {"bfid": bfid,
+                               "status": (e_errors.KEYERROR, message)}
+            elif not bfid_util.is_bfid(bfid):
+                message = "%s: bfid %s not valid" % (MY_NAME, bfid,)
+                files[bfid] = {"bfid": bfid,
+                               "status": (e_errors.WRONG_FORMAT, message)}
+            else:
+                valid_bfids.append(bfid)
+
+        records = self.filedb_dict.get_many(valid_bfids)
+        for bfid in valid_bfids:
+            record = records.get(bfid)
+            if record:
+                record["status"] = (e_errors.OK, None)
+            else:
+                message = "%s: no such bfid %s" % (MY_NAME, bfid,)
+                record = {"bfid": bfid, "status": (e_errors.NO_FILE, message)}
+            files[bfid] = record
+
+        # send the reply
+        ticket["files"] = files
+        ticket["status"] = (e_errors.OK, None)
+        try:
+            self.send_reply_with_long_answer(ticket)
+        except (socket.error, select.error), msg:
+            Trace.log(e_errors.INFO, "bfid_info_many: %s" % (str(msg),))
+            return
+        Trace.trace(10, "bfid_info_many %s bfids" % (len(bfids),))
+        return
+
     # _find_copies(bfid) -- find all copies
     def _find_copies(self, bfid):
         q = "select alt_bfid from file_copies_map where bfid = %s"
@@ -671,6 +740,19 @@ class FileClerkInfoMethods(dispatching_worker.DispatchingWorker):
         if not external_label or external_label == (None, None):
             return  # extract_external_lable_from_ticket handles its own errors.
 
+        if ticket.get("stream"):
+            ticket["status"] = (e_errors.OK, None)
+            try:
+                control_socket = self.send_reply_with_long_answer_part1(ticket)
+            except (socket.error, select.error), msg:
+                Trace.log(e_errors.INFO, "get_bfids2: %s" % (str(msg),))
+                return
+            if control_socket:
+                self.send_reply_with_streamed_answer_part2(
+                    control_socket, ticket, 'bfids',
+                    self.__all_bfids_iter(external_label))
+            return
+
         # get bfids
         bfid_list = self.get_all_bfids(external_label)
 
@@ -691,8 +773,54 @@ class FileClerkInfoMethods(dispatching_worker.DispatchingWorker):
     # rename the keys from the query.
     # If all_files is False then get list of files, only resided on tape,
     # do not include members of packages.
+    # Members of a package follow the package file in the list.  They are
+    # joined to the package file in the same query, which repeats the
+    # package file row for every member, and get location_cookie and label
+    # of the package.  Rows are read through a server side cursor.
     def __tape_list(self, external_label, export_format=False, all_files=True, skip_unknown=False):
-        q = """
+        return list(self.__tape_list_iter(external_label, export_format,
+                                          all_files, skip_unknown))
+
+    # Generator of the records __tape_list() returns.
+    def __tape_list_iter(self, external_label, export_format=False, all_files=True, skip_unknown=False):
+        if all_files:
+            q = """
+            SELECT f.bfid,
+                f.crc,
+                f.deleted,
+                f.drive,
+                v.label,
+                f.location_cookie,
+                f.pnfs_path,
+                f.pnfs_id,
+                f.sanity_size,
+                f.sanity_crc,
+                f.size,
+                f.package_id,
+                f.archive_status,
+                f.cache_status,
+                m.bfid AS m_bfid,
+                m.crc AS m_crc,
+                m.deleted AS m_deleted,
+                m.drive AS m_drive,
+                m.pnfs_path AS m_pnfs_path,
+                m.pnfs_id AS m_pnfs_id,
+                m.sanity_size AS m_sanity_size,
+                m.sanity_crc AS m_sanity_crc,
+                m.size AS m_size,
+                m.package_id AS m_package_id,
+                m.archive_status AS m_archive_status,
+                m.cache_status AS m_cache_status
+            FROM file f
+                JOIN volume v ON f.volume = v.id
+                LEFT JOIN file m ON f.bfid = f.package_id
+                    AND m.package_id = f.bfid
+                    AND m.bfid <> f.bfid
+            WHERE v.label=%s
+            ORDER BY f.location_cookie, f.bfid
+            """
+        else:
+            q = """
             SELECT f.bfid,
                 f.crc,
                 f.deleted,
@@ -712,55 +840,49 @@ class FileClerkInfoMethods(dispatching_worker.DispatchingWorker):
             WHERE f.volume = v.id
                 AND v.label=%s
             ORDER BY f.location_cookie
-	    """
-        res = self.filedb_dict.query_dictresult(q, (external_label,))
+            """
+        res = self.filedb_dict.query_dictresult_iter(q, (external_label,))
         # convert to external format
-        file_list = []
         location_cookies = {}
-        for file_info in res:
+        bfid = None
+        package_info = None  # package file, which members are being listed
+        for row in res:
+            if row["bfid"] != bfid:
+                # next file on tape
+                bfid = row["bfid"]
+                package_info = None
+                file_info = {}
+                for key in TAPE_LIST_COLUMNS:
+                    file_info[key] = row[key]
+                if export_format:
+                    # used for tape_list3()
+                    value = self.filedb_dict.export_format(file_info)
+                else:
+                    # used for tape_list2()
+                    value = file_info
+                lc = value.get("location_cookie")
+                if value.get("pnfsid"):
+                    location_cookies[lc] = location_cookies.get(lc, 0) + 1
+                if value['deleted'] == 'unknown' and skip_unknown:
+                    continue
+                if not value.has_key('pnfs_name0'):
+                    value['pnfs_name0'] = "unknown"
+                yield value
+                package_info = file_info
+            if package_info is None or row.get("m_bfid") is None:
+                continue
+            finfo = {}
+            for key in TAPE_LIST_MEMBER_COLUMNS:
+                finfo[key] = row["m_" + key]
+            finfo["location_cookie"] = package_info.get("location_cookie", None)
+            finfo["label"] = package_info.get("label", None)
             if export_format:
-                # used for tape_list3()
-                value = self.filedb_dict.export_format(file_info)
+                value = self.filedb_dict.export_format(finfo)
             else:
-                # used for tape_list2()
-                value = file_info
-            lc = value.get("location_cookie")
-            if value.get("pnfsid"):
-                location_cookies[lc] = location_cookies.get(lc, 0) + 1
-            if value['deleted'] == 'unknown' and skip_unknown:
-                continue
+                value = finfo
             if not value.has_key('pnfs_name0'):
                 value['pnfs_name0'] = "unknown"
-            file_list.append(value)
-            if file_info.get("bfid", None) == file_info.get("package_id", None) and all_files:
-                result = self.filedb_dict.query_dictresult("""
-               SELECT f.bfid,
-	              f.crc,
-		      f.deleted,
-		      f.drive,
-		      f.location_cookie,
-                      f.pnfs_path,
-                      f.pnfs_id,
-                      f.sanity_size,
-                      f.sanity_crc,
-                      f.size,
-                      f.package_id,
-                      f.archive_status,
-		      f.cache_status
-               FROM file f
-               WHERE f.package_id=%s
-                   AND f.bfid<>%s
-                      """, (file_info.get("bfid"), file_info.get("bfid")))
-                for finfo in result:
-                    finfo["location_cookie"] = file_info.get("location_cookie", None)
-                    finfo["label"] = file_info.get("label", None)
-                    if export_format:
-                        value = self.filedb_dict.export_format(finfo)
-                    else:
-                        value = finfo
-                    if not value.has_key('pnfs_name0'):
-                        value['pnfs_name0'] = "unknown"
-                    file_list.append(value)
+            yield value
 
         if skip_unknown:
             duplicate_cookies = [cookie for cookie, count in location_cookies.iteritems() if count > 1]
@@ -769,7 +891,6 @@ class FileClerkInfoMethods(dispatching_worker.DispatchingWorker):
                                                                                                    string.join(
                                                                                                        duplicate_cookies,
                                                                                                        " ")))
-        return file_list
 
     #### DONE
     def tape_list(self, ticket):
@@ -862,6 +983,17 @@ class FileClerkInfoMethods(dispatching_worker.DispatchingWorker):
             return
 
         # get reply
+        if ticket.get("stream"):
+            # records are sent as they are read from the db
+            file_info = self.__tape_list_iter(external_label,
+                                              export_format=True,
+                                              all_files=ticket.get("all", True),
+                                              skip_unknown=ticket.get("skip_unknown", False))
+            self.send_reply_with_streamed_answer_part2(control_socket, ticket,
+                                                       'tape_list', file_info)
+            Trace.log(e_errors.INFO, "finish listing " + external_label + " (3)")
+            return
+
         file_info = self.__tape_list(external_label,
                                      export_format=True,
                                      all_files=ticket.get("all", True),
@@ -948,6 +1080,22 @@ class FileClerkInfoMethods(dispatching_worker.DispatchingWorker):
         """
         return self.filedb_dict.query_getresult(q, (external_label,))
 
+    # Generator of the rows __list_active2() returns.
+    def __list_active2_iter(self, external_label):
+        q = """
+          SELECT f.pnfs_path,
+                 f.location_cookie
+        FROM file f, volume v
+        WHERE f.volume = v.id
+        AND v.label = %s
+        AND f.deleted = 'n'
+        AND NOT f.pnfs_path is NULL
+        AND f.pnfs_path != ''
+        ORDER BY f.location_cookie
+        """
+        for row in self.filedb_dict.query_dictresult_iter(q, (external_label,)):
+            yield (row['pnfs_path'], row['location_cookie'])
+
     # list_active2(self, ticket) -- list the active files on a volume
     #	 only the /pnfs path is listed
     #	 the purpose is to generate a list for deletion before the
@@ -1001,6 +1149,12 @@ class FileClerkInfoMethods(dispatching_worker.DispatchingWorker):
             return
 
         # get reply
+        if ticket.get("stream"):
+            self.send_reply_with_streamed_answer_part2(
+                control_socket, ticket, 'active_list',
+                self.__list_active2_iter(external_label))
+            return
+
         file_info = self.__list_active2(external_label)
         ticket['active_list'] = file_info
 
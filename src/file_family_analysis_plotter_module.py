@@ -6,7 +6,6 @@
 ###############################################################################
 
 # system imports
-import pg
 import os
 import time
 import sys
@@ -50,11 +49,11 @@ class FileFamilyAnalysisPlotterModule(enstore_plotter_module.EnstorePlotterModul
         #  here we create data points 
         
         edb = frame.get_configuration_client().get('database', {})
-        db = pg.DB(host   = edb.get('dbhost', "localhost"),
-                   dbname = edb.get('dbname', "enstoredb"),
-                   port   = edb.get('dbport', 5432),
-                   user   = edb.get('dbuser', "enstore"),
-                   )
+        db = frame.get_db(host   = edb.get('dbhost', "localhost"),
+                          dbname = edb.get('dbname', "enstoredb"),
+                          port   = edb.get('dbport', 5432),
+                          user   = edb.get('dbuser', "enstore"),
+                          )
 
         sql_cmd = "select distinct(storage_group) from volume;"
 
@@ -100,16 +99,20 @@ class FileFamilyAnalysisPlotterModule(enstore_plotter_module.EnstorePlotterModul
 
             select_stmt = "select last_access,system_inhibit_1,(1.-remaining_bytes/1024./1024./1024. / (capacity_bytes/1024./1024./1024))*100 as percentage from volume where file_family!='none' and label not like '%deleted' and  capacity_bytes>0 and (1.-remaining_bytes/1024./1024./1024. / (capacity_bytes/1024./1024./1024))>0 and last_access>'1970-12-31 17:59:59' and storage_group='" + sg + "'"
             res = db.query(select_stmt)
+            fractions = []
+            access_times = []
+            access_fractions = []
             for row in res.getresult():
                 if not row:
                     continue
-                h1.fill(row[2])
+                fractions.append(row[2])
                 if (row[1] == 'none'):  
-                    h2.fill(time.mktime(time.strptime(row[0],
-                                                      '%Y-%m-%d %H:%M:%S')))
-                    h3.fill(time.mktime(time.strptime(row[0],
-                                                      '%Y-%m-%d %H:%M:%S')),
-                            row[2])
+                    access_times.append(time.mktime(time.strptime(row[0],
+                                                                  '%Y-%m-%d %H:%M:%S')))
+                    access_fractions.append(row[2])
+            h1.fill_many(fractions)
+            h2.fill_many(access_times)
+            h3.fill_many(access_times, access_fractions)
             
             #Add this to the list to pass to plot().
             self.histograms.append(h1)
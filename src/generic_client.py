@@ -81,6 +81,42 @@ class ClientError(Exception):
         return self.strerror
 
 
+class StreamedReply:
+    """Iterator over the records of a streamed long answer.
+
+    ticket is the reply without the records.  Once all records are read
+    its 'status' is the final status of the reply, check it to tell a
+    complete list from one cut short by an error.  If the server sent
+    the whole answer at once, the records are taken from ticket[key].
+    Records can be iterated over only once.
+    """
+    def __init__(self, ticket, key, sock=None):
+        self.ticket = ticket
+        self.key = key
+        self.sock = sock
+
+    def __iter__(self):
+        if self.sock is None:
+            for record in self.ticket.pop(self.key, None) or []:
+                yield record
+            return
+        try:
+            try:
+                for record in callback.read_tcp_obj_stream(self.sock):
+                    yield record
+                trailer = callback.read_tcp_obj_new(self.sock)
+                self.ticket['status'] = trailer['status']
+                self.ticket['count'] = trailer['count']
+            except (socket.error, select.error, e_errors.EnstoreError) as msg:
+                message = "failed to read from control socket: %s" % \
+                          (str(msg),)
+                self.ticket['status'] = (e_errors.NET_ERROR, message)
+        finally:
+            # Also when the caller stops iterating early.
+            self.sock.close()
+            self.sock = None
+
+
 class GenericClientInterface(option.Interface):
     """Interface that adds local vars for logging, printing, and alarming, as
     well as some accessor functions for client information.
@@ -360,6 +396,93 @@ class GenericClient:
         -------
         Object: TCP Response Object
         """
+        x = self._send_udp(ticket, rcv_timeout, tries)
+
+        # If the short answer says that the real answer is too long, continue
+        # with obtaining the information over TCP.
+        if e_errors.is_ok(x) and \
+                ((long_reply == None and
+                  type(x) == types.DictType and x.get('long_reply', None)) \
+                 or (long_reply != None and long_reply)):
+            x = self.read_long_reply(x)
+
+        return x
+
+    def read_long_reply(self, x):
+        """Read the long answer over TCP, for the short answer x received
+        over UDP, which tells where to connect to.
+
+        Parameters
+        ----------
+        x: dict
+            Short answer with 'long_reply' set
+
+        Returns
+        -------
+        dict: the long answer, or x with the error in x['status']
+        """
+        connect_socket = self._connect_long_reply(x)
+
+        if connect_socket:
+            # Read the data.
+            try:
+                x = callback.read_tcp_obj_new(connect_socket)
+            except (socket.error, select.error, e_errors.EnstoreError) as msg:
+                connect_socket.close()
+                message = "failed to read from control socket: %s" % \
+                          (str(msg),)
+                x['status'] = (e_errors.NET_ERROR, message)
+
+            # Socket cleanup.
+            connect_socket.close()
+
+        return x
+
+    def send_streamed(self, ticket, key, rcv_timeout=0, tries=0):
+        """Send request for a long answer with records streamed by the
+        server, see dispatching_worker.send_reply_with_streamed_answer_part2.
+
+        Parameters
+        ----------
+        ticket: dict
+            Details of work item to send to server
+        key: str
+            Key of the records in the reply ticket
+        rcv_timeout: int, optional
+        tries: int, optional
+
+        Returns
+        -------
+        StreamedReply: iterator over the records
+        """
+        ticket['stream'] = 1
+        x = self._send_udp(ticket, rcv_timeout, tries)
+        if not e_errors.is_ok(x):
+            return StreamedReply(x, key)
+
+        connect_socket = self._connect_long_reply(x)
+        if not connect_socket:
+            return StreamedReply(x, key)
+
+        try:
+            x = callback.read_tcp_obj_new(connect_socket)
+        except (socket.error, select.error, e_errors.EnstoreError) as msg:
+            connect_socket.close()
+            message = "failed to read from control socket: %s" % \
+                      (str(msg),)
+            x['status'] = (e_errors.NET_ERROR, message)
+            return StreamedReply(x, key)
+
+        if x.get('stream_reply', None) != key:
+            # The server sent the whole answer at once.
+            connect_socket.close()
+            return StreamedReply(x, key)
+
+        return StreamedReply(x, key, connect_socket)
+
+    def _send_udp(self, ticket, rcv_timeout, tries):
+        # Send the request and return the (short) answer, or a ticket
+        # with the error.
         try:
             x = self.u.send(ticket, self.server_address, rcv_timeout, tries)
         except (KeyboardInterrupt, SystemExit):
@@ -379,54 +502,38 @@ class GenericClient:
         except ValueError as detail:
              x = {'status' : (e_errors.UNKNOWN,
                                  "%s: %s" % (self.server_name, str(detail)))}
+        return x
 
-        # If the short answer says that the real answer is too long, continue
-        # with obtaining the information over TCP.
-        if e_errors.is_ok(x) and \
-                ((long_reply == None and
-                  type(x) == types.DictType and x.get('long_reply', None)) \
-                 or (long_reply != None and long_reply)):
-
-            if (hasattr(self, "server_address") and
-                    (x['callback_addr'][0] == socket.getaddrinfo(self.server_address[0], None)[0][4][0])):
-                # If this client instance has attribute 'server_addr'
-                # and callback came from this address
-                # there is no need to check if access from this server is allowed
-                pass
-            else:
-                # If the address we are told to connect to is not in the valid
-                # list, give an error.
-                if not hostaddr.allow(x['callback_addr']):
-                    x['status'] = "address %s not allowed" % (x['callback_addr'],)
-                    return x
-
-            try:
-                connect_socket = callback.connect_to_callback(x['callback_addr'])
-                x['status'] = (e_errors.OK, None)
-            except (socket.error) as msg:
-                message = "failed to establish control socket: %s" % (str(msg),)
-                x['status'] = (e_errors.NET_ERROR, message)
-
-            except ValueError as detail:
-                x = {'status' : (e_errors.UNKNOWN,
-                                 "%s: %s" % (self.server_name, str(detail)))}
-
-
-
-            if e_errors.is_ok(x):
-                # Read the data.
-                try:
-                    x = callback.read_tcp_obj_new(connect_socket)
-                except (socket.error, select.error, e_errors.EnstoreError) as msg:
-                    connect_socket.close()
-                    message = "failed to read from control socket: %s" % \
-                              (str(msg),)
-                    x['status'] = (e_errors.NET_ERROR, message)
+    def _connect_long_reply(self, x):
+        # Connect to the server for the long answer, which the short
+        # answer x tells where to connect to.  Returns the socket or
+        # None, with the error in x['status'].
+        if (hasattr(self, "server_address") and
+                (x['callback_addr'][0] == socket.getaddrinfo(self.server_address[0], None)[0][4][0])):
+            # If this client instance has attribute 'server_addr'
+            # and callback came from this address
+            # there is no need to check if access from this server is allowed
+            pass
+        else:
+            # If the address we are told to connect to is not in the valid
+            # list, give an error.
+            if not hostaddr.allow(x['callback_addr']):
+                x['status'] = "address %s not allowed" % (x['callback_addr'],)
+                return None
 
-                # Socket cleanup.
-                connect_socket.close()
+        try:
+            connect_socket = callback.connect_to_callback(x['callback_addr'])
+            x['status'] = (e_errors.OK, None)
+            return connect_socket
+        except (socket.error) as msg:
+            message = "failed to establish control socket: %s" % (str(msg),)
+            x['status'] = (e_errors.NET_ERROR, message)
 
-        return x
+        except ValueError as detail:
+            x.clear()
+            x['status'] = (e_errors.UNKNOWN,
+                           "%s: %s" % (self.server_name, str(detail)))
+        return None
 
     def get_name(self, name):
         """Return the name used for this client/server."""
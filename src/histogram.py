@@ -19,6 +19,13 @@ import time
 import errno
 import string
 
+# fill_many() bins with numpy if it is there
+has_numpy = True
+try:
+    import numpy
+except ImportError:
+    has_numpy = False
+
 CONVERT_COMMAND_LINE_FOR_IMAGE="convert -flatten -background lightgray -rotate 90 -modulate 80 {} {}"
 CONVERT_COMMAND_LINE_FOR_THUMBNAIL="convert -flatten -background lightgray -rotate 90 -geometry 120x120 -modulate 80 {} {}"
 GNUPLOT_HEADER="""
@@ -408,6 +415,44 @@ class Plotter:
                 self.remove(pts_file_name) # remove pts file
         self.remove(gnu_file_name)  # remove gnu file
 
+def find_bins(hist, values, low, high, nbins, all_bins=False):
+    """
+    Bins of values in nbins equal bins from low to high, the underflows
+    and overflows are added to those of hist.  See Histogram1D.find_bins().
+    With numpy and all_bins the bins array has an element for each value,
+    to be used with the mask.
+    """
+    width = high-low
+    if has_numpy:
+        under = values < low
+        over = values > high
+        hist.underflow=hist.underflow+int(under.sum())
+        hist.overflow=hist.overflow+int(over.sum())
+        inside = ~(under | over)
+        if all_bins:
+            # the values out of the range are put in bin 0, see inside
+            x = numpy.where(inside, values, low)
+        else:
+            x = values[inside]
+        bins = (float(nbins)*(x-low)/width).astype(int)
+        bins[bins == nbins] = nbins-1
+        return bins, inside
+    bins = []
+    fnbins = float(nbins)
+    for x in values:
+        if ( x < low ):
+            hist.underflow=hist.underflow+1
+            bins.append(None)
+        elif ( x > high ):
+            hist.overflow=hist.overflow+1
+            bins.append(None)
+        else:
+            bin = int(fnbins*(x-low)/width)
+            if ( bin == nbins ) :
+                bin = bin-1
+            bins.append(bin)
+    return bins
+
 class Histogram1D(BasicHistogram):
 
     def __init__(self, name, title, nbins, xlow, xhigh):
@@ -475,6 +520,8 @@ class Histogram1D(BasicHistogram):
         other.underflow=self.underflow
         other.overflow=self.overflow
         other.mean=self.mean
+        other.reduced_mean=self.reduced_mean
+        other.reduced_rms2=self.reduced_rms2
         other.mean_error=self.mean_error
         other.rms2=self.rms2
         other.variance=self.variance
@@ -783,6 +830,115 @@ class Histogram1D(BasicHistogram):
                 self.maximum=count
             if ( count < self.minimum ) :
                 self.minimum=count
+    def update_statistics(self, n, sum_x, sum_x2):
+        """
+        Add n entries with sum_x and sum_x2, the sums of x-self.low and
+        (x-self.low)**2, to the statistics.
+        """
+        if n == 0:
+            return
+        entries = self.entries+n
+        self.reduced_mean=(self.reduced_mean*float(self.entries)+sum_x)/float(entries)
+        self.reduced_rms2=(self.reduced_rms2*float(self.entries)+sum_x2)/float(entries)
+        self.entries=entries
+        self.variance=self.reduced_rms2-self.reduced_mean*self.reduced_mean
+        self.mean=self.reduced_mean+self.low
+        self.rms2=self.mean*self.mean+self.variance
+        self.variance=math.sqrt(math.fabs(self.variance))
+        self.mean_error=self.variance/math.sqrt(float(self.entries))
+        self.variance_error=self.variance/math.sqrt(2.*float(self.entries))
+
+    def update_extrema(self, bins):
+        for bin in bins:
+            count=self.binarray[bin]
+            if ( count > self.maximum ) :
+                self.maximum=count
+            if ( count < self.minimum ) :
+                self.minimum=count
+
+    def find_bins(self, values):
+        """
+        Return the bins of values, None for those out of the range, and
+        count the underflows and overflows.  values is a numpy array if
+        has_numpy, the bins are then a numpy array of the bins of the
+        values in the range and the mask of these values.
+        """
+        return find_bins(self, values, self.low, self.high, self.nbins)
+
+    def fill_many(self, values, weights=None):
+        """
+        Fill the values, with weights if given, in one pass.  The result
+        is the same as fill() of each value, up to the rounding of the
+        sums; maximum and minimum are those of the bin contents at the end.
+        """
+        if has_numpy:
+            x = numpy.asarray(values, dtype=float)
+            bins, inside = self.find_bins(x)
+            if not len(bins):
+                return
+            if weights is None:
+                w = None
+            else:
+                w = numpy.asarray(weights, dtype=float)[inside]
+            counts = numpy.bincount(bins, w, minlength=self.nbins)
+            touched = numpy.bincount(bins, minlength=self.nbins)
+            for bin in numpy.nonzero(touched)[0]:
+                self.binarray[bin]=self.binarray[bin]+float(counts[bin])
+                if ( self.profile ) :
+                    self.sumarray[bin]=self.sumarray[bin]+int(touched[bin])
+            reduced = x[inside]-self.low
+            self.update_statistics(len(bins), float(reduced.sum()),
+                                   float((reduced*reduced).sum()))
+            self.update_extrema(numpy.nonzero(touched)[0])
+            return
+        if weights is None:
+            weights = [1.]*len(values)
+        binarray = self.binarray
+        sumarray = self.sumarray
+        low = self.low
+        n = 0
+        sum_x = 0.
+        sum_x2 = 0.
+        touched = {}
+        for bin, x, w in zip(self.find_bins(values), values, weights):
+            if bin == None :
+                continue
+            binarray[bin]=binarray[bin]+1.*w
+            if ( self.profile ) :
+                sumarray[bin]=sumarray[bin]+1
+            touched[bin]=1
+            x = x - low
+            sum_x = sum_x + x
+            sum_x2 = sum_x2 + x*x
+            n = n + 1
+        self.update_statistics(n, sum_x, sum_x2)
+        self.update_extrema(touched.keys())
+
+    def merge(self, other):
+        """
+        Add the entries of other, a histogram with the same binning
+        filled separately (e.g. in another worker), to this one.
+        """
+        if not (self == other) :
+            raise ValueError("can not merge %s into %s, binning differs" %
+                             (other.name, self.name))
+        self.underflow=self.underflow+other.underflow
+        self.overflow=self.overflow+other.overflow
+        touched=[]
+        for i in range(self.nbins):
+            if other.binarray[i] or other.sumarray[i] :
+                self.binarray[i]=self.binarray[i]+other.binarray[i]
+                self.sumarray[i]=self.sumarray[i]+other.sumarray[i]
+                touched.append(i)
+        self.update_statistics(other.entries,
+                               other.reduced_mean*float(other.entries),
+                               other.reduced_rms2*float(other.entries))
+        if ( other.maximum > self.maximum ) :
+            self.maximum=other.maximum
+        if ( other.minimum < self.minimum ) :
+            self.minimum=other.minimum
+        self.update_extrema(touched)
+
     #
     # getters
     #
@@ -1132,6 +1288,8 @@ class Histogram2D(Histogram1D):
         other.underflow=self.underflow
         other.overflow=self.overflow
         other.mean=self.mean
+        other.reduced_mean=self.reduced_mean
+        other.reduced_rms2=self.reduced_rms2
         other.mean_error=self.mean_error
         other.rms2=self.rms2
         other.variance_error=self.variance_error
@@ -1201,6 +1359,76 @@ class Histogram2D(Histogram1D):
             if ( count < self.minimum ) :
                 self.minimum=count
 
+    def merge(self, other):
+        """
+        Add the entries of other, a histogram with the same binning
+        filled separately, to this one.  See Histogram1D.merge().
+        """
+        if not (self == other and
+                self.nbins_x == other.nbins_x and
+                self.ylow == other.ylow and
+                self.yhigh == other.yhigh) :
+            raise ValueError("can not merge %s into %s, binning differs" %
+                             (other.name, self.name))
+        self.underflow=self.underflow+other.underflow
+        self.overflow=self.overflow+other.overflow
+        self.entries=self.entries+other.entries
+        touched=[]
+        for i in range(self.nbins):
+            if other.binarray[i] :
+                self.binarray[i]=self.binarray[i]+other.binarray[i]
+                touched.append(i)
+        if ( other.maximum > self.maximum ) :
+            self.maximum=other.maximum
+        if ( other.minimum < self.minimum ) :
+            self.minimum=other.minimum
+        self.update_extrema(touched)
+
+    def fill_many(self, xvalues, yvalues, weights=None):
+        """
+        Fill the (x, y) pairs of xvalues and yvalues, with weights if
+        given, in one pass.  See Histogram1D.fill_many().
+        """
+        if has_numpy:
+            x = numpy.asarray(xvalues, dtype=float)
+            y = numpy.asarray(yvalues, dtype=float)
+            binsx, insidex = find_bins(self, x, self.low, self.high,
+                                       self.nbins_x, all_bins=True)
+            binsy, insidey = find_bins(self, y, self.ylow, self.yhigh,
+                                       self.nbins_y, all_bins=True)
+            inside = insidex & insidey
+            bins = self.nbins_x*binsy[inside]+binsx[inside]
+            if not len(bins):
+                return
+            if weights is None:
+                w = None
+            else:
+                w = numpy.asarray(weights, dtype=float)[inside]
+            counts = numpy.bincount(bins, w, minlength=self.nbins)
+            touched = numpy.nonzero(numpy.bincount(bins,
+                                                   minlength=self.nbins))[0]
+            for bin in touched:
+                self.binarray[bin]=self.binarray[bin]+float(counts[bin])
+            self.entries=self.entries+len(bins)
+            self.update_extrema(touched)
+            return
+        if weights is None:
+            weights = [1.]*len(xvalues)
+        binarray = self.binarray
+        nbins_x = self.nbins_x
+        touched = {}
+        for binx, biny, w in zip(find_bins(self, xvalues, self.low, self.high,
+                                           nbins_x),
+                                 find_bins(self, yvalues, self.ylow,
+                                           self.yhigh, self.nbins_y),
+                                 weights):
+            if (binx != None and biny != None) :
+                bin = nbins_x*biny+binx
+                binarray[bin]=binarray[bin]+1.*w
+                touched[bin]=1
+                self.entries=self.entries+1
+        self.update_extrema(touched.keys())
+
     def get_bin_center(self,bin):
         ny = int(bin/self.nbins_x)
         nx = bin%self.nbins_x
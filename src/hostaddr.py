@@ -16,6 +16,7 @@ import string, re
 import types
 import errno
 import time
+import threading
 
 #Enstore imports
 import Trace
@@ -189,11 +190,16 @@ def __my_gethostbyname(name):
                 return None
     return addr
 
-known_ips = {}
+#Names of addresses are looked up again after NAME_CACHE_TTL seconds, so
+# long running servers (log server, alarm server) see renamed hosts.
+NAME_CACHE_TTL = 3600  # seconds
+known_ips = {}  # address: (name, expiration time)
 def address_to_name(addr):
     ## this will return the address if it can't be resolved into a hostname
-    if addr in known_ips.keys():
-        return known_ips[addr]
+    now = time.time()
+    cached = known_ips.get(addr)
+    if cached and cached[1] > now:
+        return cached[0]
 
     host_info = __my_gethostbyaddr(addr)
     if host_info != None:
@@ -201,7 +207,7 @@ def address_to_name(addr):
     else:
         name = addr
 
-    known_ips[addr] = name
+    known_ips[addr] = (name, now + NAME_CACHE_TTL)
     return name
 
 
@@ -250,23 +256,159 @@ def update_domains(csc_or_dict):
     valid_domains = domains.get('valid_domains', [])
     invalid_domains = domains.get('invalid_domains', [])
 
+    if known_domains['valid_domains'].get(system_name) == valid_domains and \
+       known_domains['invalid_domains'].get(system_name) == invalid_domains:
+        # this is called on every configuration lookup, nothing changed
+        return
+
     known_domains['valid_domains'][system_name] = valid_domains
     known_domains['invalid_domains'][system_name] = invalid_domains
+    clear_allow_cache()
 
     Trace.trace(19, "valid_domains: %s" % known_domains['valid_domains'])
     Trace.trace(19, "invalid_domains: %s" % known_domains['invalid_domains'])
 
+#known_domains compiled into matching rules and the cache of allow() decisions.
+#Both are dropped when known_domains change.
+ALLOW_CACHE_TTL = 300     # seconds
+ALLOW_CACHE_SIZE = 10000  # addresses
+domain_rules = None
+allow_cache = {}  # host: (decision, expiration time)
+allow_cache_stats = {'hits' : 0, 'misses' : 0}
+#allow() is called from the request threads of the servers.
+allow_cache_lock = threading.Lock()
+
+def clear_allow_cache():
+    global domain_rules
+    allow_cache_lock.acquire()
+    try:
+        domain_rules = None
+        allow_cache.clear()
+    finally:
+        allow_cache_lock.release()
+
+def allow_cache_info():
+    allow_cache_lock.acquire()
+    try:
+        return {'hits' : allow_cache_stats['hits'],
+                'misses' : allow_cache_stats['misses'],
+                'size' : len(allow_cache)}
+    finally:
+        allow_cache_lock.release()
+
+def _allow_cache_get(key, now):
+    allow_cache_lock.acquire()
+    try:
+        cached = allow_cache.get(key)
+        if cached and cached[1] > now:
+            allow_cache_stats['hits'] = allow_cache_stats['hits'] + 1
+            return cached
+        allow_cache_stats['misses'] = allow_cache_stats['misses'] + 1
+        return None
+    finally:
+        allow_cache_lock.release()
+
+def _allow_cache_put(key, result, now):
+    allow_cache_lock.acquire()
+    try:
+        if len(allow_cache) >= ALLOW_CACHE_SIZE:
+            for k, v in allow_cache.items():
+                if v[1] <= now:
+                    del allow_cache[k]
+            if len(allow_cache) >= ALLOW_CACHE_SIZE:
+                allow_cache.clear()
+        allow_cache[key] = (result, now + ALLOW_CACHE_TTL)
+    finally:
+        allow_cache_lock.release()
+
+def _address_to_long(address_family, addr):
+    # raises socket.error if addr is not a valid address
+    return long(socket.inet_pton(address_family, addr).encode('hex'), 16)
+
+def _compile_domains(domains_dict):
+    #Return rules for the domains in domains_dict:
+    # (IPV4 prefix trie, IPV6 prefix trie, list of CIDR networks).
+    #Prefix domains, like '131.225' are matched token by token, as they
+    # always were.  Tries are nested dictionaries keyed by address tokens,
+    # None key marks the end of a domain.
+    #CIDR domains, like '131.225.0.0/16', are kept as
+    # (address family, network, mask) tuples.
+    tries = {socket.AF_INET : {}, socket.AF_INET6 : {}}
+    networks = []
+    for domains in domains_dict.values():
+        for v in domains:
+            if type(v) != type(""):
+                continue
+            if '/' in v:
+                try:
+                    net, bits = string.split(v, '/')
+                    if ':' in net:
+                        address_family, width = socket.AF_INET6, 128
+                    else:
+                        address_family, width = socket.AF_INET, 32
+                    bits = int(bits)
+                    mask = ((1L << bits) - 1) << (width - bits)
+                    network = _address_to_long(address_family, net) & mask
+                except (ValueError, socket.error):
+                    Trace.log(e_errors.ERROR, "allow: invalid domain %s" % (v,))
+                    continue
+                networks.append((address_family, network, mask))
+                continue
+            for address_family, separator in ((socket.AF_INET, '.'),
+                                              (socket.AF_INET6, ':')):
+                node = tries[address_family]
+                for t in string.split(v, separator):
+                    node = node.setdefault(t, {})
+                node[None] = 1
+    return tries[socket.AF_INET], tries[socket.AF_INET6], networks
+
+def _match(rules, address_family, tok, addr_long):
+    trie4, trie6, networks = rules
+    if address_family == socket.AF_INET6:
+        node = trie6
+    else:
+        node = trie4
+    for t in tok:
+        if node.has_key(None):
+            return 1
+        node = node.get(t)
+        if node is None:
+            break
+    else:
+        if node.has_key(None):
+            return 1
+    for net_family, network, mask in networks:
+        if net_family == address_family and addr_long & mask == network:
+            return 1
+    return 0
+
+def get_domain_rules():
+    global domain_rules
+    rules = domain_rules
+    if rules is None:
+        rules = {'valid_domains' :
+                 _compile_domains(known_domains.get('valid_domains', {})),
+                 'invalid_domains' :
+                 _compile_domains(known_domains.get('invalid_domains', {}))}
+        domain_rules = rules
+    return rules
+
+class _LookupFailed(Exception):
+    pass
+
 #Return None if no matching rule is explicity found.  Return True if this
 # is a valid address and False if it is not.
 host_name = None
 localhost_addresses = {}
-def _allow(addr):
+def _check(addr):
+    #Raises _LookupFailed if the answer depends on a failed name lookup.
+    global host_name
     if not host_name:
         try:
             host_name = socket.getfqdn()
         except Exception as e:
             Trace.log(e_errors.ERROR, '_allow: getfqdn failed: %s'%(e,))
-            return 0
+            raise _LookupFailed()
     # always allow requests from local host
     try:
         if not localhost_addresses.has_key(addr):
@@ -275,70 +417,56 @@ def _allow(addr):
             return 1
     except Exception as e:
         Trace.log(e_errors.ERROR, '_allow: gethostbyaddr failed for %s: %s'%(addr, e,))
-        return 0
-    valid_domains_dict = known_domains.get('valid_domains', {})
-    invalid_domains_dict = known_domains.get('invalid_domains', {})
+        raise _LookupFailed()
 
-    try:
-        host_info = socket.getaddrinfo(addr, None)
-    except Exception as e:
-        Trace.log(e_errors.ERROR, '_allow: gettaddrinfo failed for %s: %s'%(addr, e,))
-        return 0
-
-    address_family = host_info[0][0]
     #Get the address.
-    if address_family == socket.AF_INET6:
-        try:
-            tok = string.split(addr, ':')
-        except AttributeError:
-            tok = ""
-        if len(tok) == 0:
-            Trace.trace(19, "allow: not allowing 1 %s" % (addr,))
-            return 0
+    if ':' in addr:
+        address_family = socket.AF_INET6
+        tok = string.split(addr, ':')
     else:  # IPV4
-        try:
-            tok = string.split(addr, '.')
-        except AttributeError:
-            tok = ""
+        address_family = socket.AF_INET
+        tok = string.split(addr, '.')
         if len(tok) != 4:
             Trace.trace(19, "allow: not allowing 2 %s" % (addr,))
             return 0
+    try:
+        addr_long = _address_to_long(address_family, addr)
+    except socket.error:
+        Trace.trace(19, "allow: not allowing 1 %s" % (addr,))
+        return 0
+
+    rules = get_domain_rules()
     #Return false if the ip is in a domain we are not allowed to reply to.
-    Trace.trace(19, 'Invalid domains: %s'%(invalid_domains_dict,))
-    for invalid_domains in invalid_domains_dict.values():
-        for v in invalid_domains:
-            try:
-                if address_family == socket.AF_INET6:
-                    vtok = string.split(v, ':')
-                else:
-                    vtok = string.split(v, '.')
-            except AttributeError:
-                Trace.log(19, 'allow: AttributeError')
-                continue
-            if tok[:len(vtok)] == vtok:
-                Trace.log(e_errors.INFO, "allow: in invalid domains, not allowing %s" % (addr,))
-                return 0
+    if _match(rules['invalid_domains'], address_family, tok, addr_long):
+        Trace.log(e_errors.INFO, "allow: in invalid domains, not allowing %s" % (addr,))
+        return 0
 
     #Return true if the ip is in a domain we are allowed to reply to.
-    Trace.trace(19, 'Valid domains: %s'%(valid_domains_dict,))
-    for valid_domains in valid_domains_dict.values():
-        for v in valid_domains:
-            try:
-                if address_family == socket.AF_INET6:
-                    vtok = string.split(v, ':')
-                else:
-                    vtok = string.split(v, '.')
-            except AttributeError:
-                continue
-            if tok[:len(vtok)] == vtok:
-                Trace.trace(19, "allow: allowing %s" % (addr,))
-                return 1
+    if _match(rules['valid_domains'], address_family, tok, addr_long):
+        Trace.trace(19, "allow: allowing %s" % (addr,))
+        return 1
 
     Trace.trace(19, "allow: not allowing 3 %s" % (addr,))
     return None
 
+def _allow(addr):
+    try:
+        return _check(addr)
+    except _LookupFailed:
+        return 0
+
 def allow(addr):
     Trace.trace(19, "allow: checking address %s %s" % (addr, len(addr)))
+    #Decisions are cached by the host part of the address.
+    if type(addr) == type(""):
+        key = addr
+    else:
+        key = addr[0]
+    now = time.time()
+    cached = _allow_cache_get(key, now)
+    if cached:
+        return cached[0]
+
     client_addr = list(addr)
     # If message comes with IPV4 address on IPV6 configured receiver its format is like:
     # '::ffff:193.109.174.113'.
@@ -350,17 +478,16 @@ def allow(addr):
     #Check if the address is of a valid type.  The two valid types are
     # a string (of either the hostname or ip) or a 2-tuple with a string
     # as the first item (tha has the hostname or ip).
-    host_info = socket.getaddrinfo(client_addr[0], None)
-    Trace.trace(19, "allow: host_info %s" % (host_info))
-
-    address_family = host_info[0][0]
     if type(addr) is type(()):
         if len(client_addr) == 2:
             addr = client_addr[0]
-        elif address_family == socket.AF_INET6:
-            addr = host_info[0][4][0]
         else:
-            raise TypeError, "Tuple addr has wrong length %s." % len(addr)
+            host_info = socket.getaddrinfo(client_addr[0], None)
+            Trace.trace(19, "allow: host_info %s" % (host_info))
+            if host_info[0][0] == socket.AF_INET6:
+                addr = host_info[0][4][0]
+            else:
+                raise TypeError, "Tuple addr has wrong length %s." % len(addr)
     if type(addr) != type(""):
         raise TypeError, "Variable addr is of type %s." % type(addr)
 
@@ -376,9 +503,14 @@ def allow(addr):
     except IndexError:
         Trace.trace(19, "allow: not allowing 5 %s" % (addr,))
         return 0
-    #Call the helper _allow() function that test the address against what is
+    #Call the helper _check() function that test the address against what is
     # in known_domains.
-    result = _allow(addr)
+    try:
+        result = _check(addr)
+    except _LookupFailed:
+        return 0 # do not cache, the next lookup may succeed
+
+    _allow_cache_put(key, result, now)
     return result
 
 
@@ -118,6 +118,16 @@ def show_file(f, verbose=0):
         f.get('pnfsid', ""),
         f.get('pnfs_name0', ""))
 
+# streamed list_active3 reply converted to external format
+class _ActiveList:
+    def __init__(self, reply):
+        self.reply = reply
+        self.ticket = reply.ticket
+
+    def __iter__(self):
+        for i in self.reply:
+            yield i[0]
+
 class fileInfoMethods(generic_client.GenericClient):
     def __init__(self, csc, name, server_address=None, flags=0, logc=None,
                  alarmc=None, server_name=None,
@@ -141,6 +151,13 @@ class fileInfoMethods(generic_client.GenericClient):
             del r['work']
         return r
 
+    # bfid_info_many(bfids) -- bfid_info() of each of the bfids in one
+    # request.  The reply has 'files', {bfid: bfid_info reply}.
+    def bfid_info_many(self, bfids, timeout = generic_client.DEFAULT_TIMEOUT,
+                       retry = generic_client.DEFAULT_TRIES):
+        ticket = {"work" : "bfid_info_many", "bfids" : list(bfids)}
+        return self.send(ticket, timeout, retry, long_reply = 1)
+
     # find_copies(bfid) -- find the first generation of copies
     def find_copies(self, bfid, timeout = generic_client.DEFAULT_TIMEOUT,
                     retry = generic_client.DEFAULT_TRIES):
@@ -207,6 +224,15 @@ class fileInfoMethods(generic_client.GenericClient):
         done_ticket = self.send(ticket, long_reply = 1)
         return done_ticket
 
+    # Iterator variant of get_bfids().  The bfids are streamed by the
+    # server, check reply.ticket['status'] after the loop:
+    #     reply = fcc.get_bfids_iter(vol)
+    #     for bfid in reply: ...
+    def get_bfids_iter(self, external_label):
+        ticket = {"work"          : "get_bfids2",
+                  "external_label": external_label}
+        return self.send_streamed(ticket, 'bfids')
+
     def get_children(self, bfid, field=None, timeout = generic_client.DEFAULT_TIMEOUT,
                      retry = generic_client.DEFAULT_TRIES):
         ticket = {"work"          : "get_children",
@@ -232,6 +258,12 @@ class fileInfoMethods(generic_client.GenericClient):
 
         return done_ticket
 
+    # Iterator variant of list_active(), yields pnfs paths.
+    def list_active_iter(self, external_label):
+        ticket = {"work"           : "list_active3",
+                  "external_label" : external_label}
+        return _ActiveList(self.send_streamed(ticket, 'active_list'))
+
     def tape_list(self, external_label, all_files = True,
                   skip_unknown = False,
                   timeout = generic_client.DEFAULT_TIMEOUT,
@@ -247,6 +279,19 @@ class fileInfoMethods(generic_client.GenericClient):
 
         return done_ticket
 
+    # Iterator variant of tape_list(), see get_bfids_iter().
+    def tape_list_iter(self, external_label, all_files = True,
+                       skip_unknown = False,
+                       timeout = generic_client.DEFAULT_TIMEOUT,
+                       retry = generic_client.DEFAULT_TRIES):
+        ticket = {"work"           : "tape_list3",
+                  "external_label" : external_label,
+                  "all" : all_files,
+                  "skip_unknown" : skip_unknown,
+                  }
+        return self.send_streamed(ticket, 'tape_list',
+                                  rcv_timeout = timeout, tries = retry)
+
     def show_bad(self):
         ticket = {"work"          : "show_bad2",
                   #"callback_addr" : (host, port),
@@ -324,6 +369,13 @@ class volumeInfoMethods(generic_client.GenericClient):
                   'external_label' : external_label }
         return self.send(ticket,timeout,retry)
 
+    # inquire_vol() of each of the external_labels in one request.  The reply
+    # has 'volumes', {external_label: inquire_vol reply}.
+    def inquire_vol_many(self, external_labels, timeout=60, retry=10):
+        ticket= { 'work': 'inquire_vol_many',
+                  'external_labels' : list(external_labels) }
+        return self.send(ticket, timeout, retry, long_reply = 1)
+
     # get a list of all volumes
     def get_vols(self, key=None, state=None, not_cond=None):
         ticket = {"work"          : "get_vols3",
@@ -335,6 +387,15 @@ class volumeInfoMethods(generic_client.GenericClient):
         done_ticket = self.send(ticket, long_reply = 1)
         return done_ticket
 
+    # Iterator variant of get_vols(), see fileInfoMethods.get_bfids_iter().
+    def get_vols_iter(self, key=None, state=None, not_cond=None):
+        ticket = {"work"          : "get_vols3",
+                  "key"           : key,
+                  "in_state"      : state,
+                  "not"	          : not_cond,
+                  }
+        return self.send_streamed(ticket, 'volumes')
+
     # get a list of all problem volumes
     def get_pvols(self):
         ticket = {"work"          : "get_pvols2",
@@ -20,6 +20,7 @@ import socket
 import re
 import copy
 import select
+import bisect
 import traceback
 
 # enstore imports
@@ -43,6 +44,7 @@ import volume_family
 import option
 import cleanUDP
 import udp_server
+import udp_client
 import read_write_condition_variable
 
 server_map = {"log_server" : enstore_constants.LOGS,
@@ -102,11 +104,21 @@ RESTRICTED_ACCESS = "RESTRICTED_ACCESS"
 # maximum number of threads to spawn
 #
 MAX_THREADS = 50
+#
+# maximum number of outstanding status queries to movers, migrators and
+# library managers
+#
+MAX_STATUS_QUERIES = 100
+#
+# upper edges of the status reply latency histogram buckets (seconds)
+#
+LATENCY_BUCKETS = (0.01, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0)
 defaults = {'update_interval': 20,
             'alive_rcv_timeout': 5,
             'alive_retries': 2,
             'max_encp_lines': 50,
             'max_threads': MAX_THREADS,
+            'max_status_queries': MAX_STATUS_QUERIES,
 	    enstore_constants.PAGE_THRESHOLDS: {enstore_constants.FILE_LIST: 200}}
 
 # delete a key from a dictionary if it exists
@@ -185,6 +197,58 @@ class EventRelay:
             rtn = 0
         return rtn
 
+# time taken to get the status of the servers each cycle and the time each
+# server took to reply, output by dump
+class StatusTimes:
+
+    def __init__(self):
+        self.cycles = 0
+        self.last_cycle = 0.0
+        self.max_cycle = 0.0
+        self.total_cycle = 0.0
+        # server: number of replies in each LATENCY_BUCKETS bucket, the
+        # last one is for replies slower than the last edge
+        self.latency = {}
+        # server: number of status requests which timed out
+        self.timed_out = {}
+
+    def add_cycle(self, seconds):
+        self.cycles = self.cycles + 1
+        self.last_cycle = seconds
+        self.max_cycle = max(self.max_cycle, seconds)
+        self.total_cycle = self.total_cycle + seconds
+
+    def add_reply(self, name, seconds):
+        if not self.latency.has_key(name):
+            self.latency[name] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency[name][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def add_timed_out(self, name):
+        self.timed_out[name] = self.timed_out.get(name, 0) + 1
+
+    def __repr__(self):
+        if self.cycles:
+            average = self.total_cycle / self.cycles
+        else:
+            average = 0.0
+        lines = ["status cycles : %s, last %.3f s, average %.3f s, max %.3f s"%(
+            self.cycles, self.last_cycle, average, self.max_cycle)]
+        header = ["<=%ss"%(edge,) for edge in LATENCY_BUCKETS]
+        header.append(">%ss"%(LATENCY_BUCKETS[-1],))
+        header.append("timed out")
+        lines.append("%-30s %s"%("server", string.join(["%9s"%(h,) for h in header])))
+        names = self.latency.keys() + self.timed_out.keys()
+        names.sort()
+        last = None
+        for name in names:
+            if name == last:
+                continue
+            last = name
+            counts = self.latency.get(name, [0] * (len(LATENCY_BUCKETS) + 1))
+            counts = counts + [self.timed_out.get(name, 0)]
+            lines.append("%-30s %s"%(name, string.join(["%9s"%(c,) for c in counts])))
+        return "%s\n%s"%(string.join(lines, "\n"), DIVIDER)
+
 
 class InquisitorMethods(dispatching_worker.DispatchingWorker):
 
@@ -217,6 +281,9 @@ class InquisitorMethods(dispatching_worker.DispatchingWorker):
         self.er_lock = threading.Lock()
         self.rw_lock = read_write_condition_variable.ReadWriteConditionVariable()
         self.max_threads=MAX_THREADS
+        self.max_status_queries = MAX_STATUS_QUERIES
+        self.status_u = None
+        self.status_times = StatusTimes()
 
     def get_server(self, name):
 	if type(name) == types.ListType:
@@ -588,6 +655,8 @@ class InquisitorMethods(dispatching_worker.DispatchingWorker):
         self.max_encp_lines = self.get_value(key, self.got_from_cmdline[key])
         key = 'max_threads'
         self.max_threads = self.get_value(key, self.got_from_cmdline[key])
+        key = 'max_status_queries'
+        self.max_status_queries = self.get_value(key, self.got_from_cmdline[key])
 
 	# update any page thresholds
 	# get the thresholds which determine when we need an extra web page or two
@@ -882,8 +951,8 @@ class InquisitorMethods(dispatching_worker.DispatchingWorker):
         if not self.serverfile.text[lib_man.name].has_key(enstore_constants.ACTIVE_VOLUMES):
             self.serverfile.text[lib_man.name][enstore_constants.ACTIVE_VOLUMES] = []
 
-    # get the library manager state and output it
-    def lm_state(self, lib_man, time):
+    # ask the library manager for its state
+    def get_lm_state(self, lib_man):
         enstore_functions.inqTrace(enstore_constants.INQSERVERDBG,
 				   "get new state from %s"%(lib_man.name,))
 	try:
@@ -909,6 +978,15 @@ class InquisitorMethods(dispatching_worker.DispatchingWorker):
 	    Trace.log(e_errors.ERROR, message, e_errors.IOERROR)
 	    return None
 
+	return state
+
+    # get the library manager state and output it.  state is the reply to
+    # get_lm_state if it was already gathered.
+    def lm_state(self, lib_man, time, state=None):
+        if state is None:
+            state = self.get_lm_state(lib_man)
+            if state is None:
+                return None
 	lib_man.check_state(state)
 	lib_man.server_status = state[enstore_constants.STATE]
         self.serverfile.output_lmstate(state, lib_man.name)
@@ -926,11 +1004,11 @@ class InquisitorMethods(dispatching_worker.DispatchingWorker):
         return 1
 
     # get the information from the library manager(s)
-    def update_library_manager(self, lib_man):
+    def update_library_manager(self, lib_man, state=None):
         rtn = 0      # assume will timeout on something
         # get a client and then check if the server is alive
         now = time.time()
-        if self.lm_state(lib_man, now):
+        if self.lm_state(lib_man, now, state):
             if self.suspect_vols(lib_man, now):
                 if self.work_queue(lib_man, now):
                     if self.active_volumes(lib_man, now):
@@ -964,14 +1042,14 @@ class InquisitorMethods(dispatching_worker.DispatchingWorker):
         return rtn
 
     # get the information from the mover
-    def update_mover(self, mover):
+    def update_mover(self, mover, state=None):
         rtn = 1          # assume no timeouts
-        enstore_functions.inqTrace(enstore_constants.INQSERVERDBG,
-				   "get new state from %s"%(mover.name,))
-        mc = mover_client.MoverClient(self.csc, mover.name)
-
-        self.mover_state[mover.name] = mc.status(self.alive_rcv_timeout,
-                                                 self.alive_retries)
+        if state is None:
+            enstore_functions.inqTrace(enstore_constants.INQSERVERDBG,
+                                       "get new state from %s"%(mover.name,))
+            mc = mover_client.MoverClient(self.csc, mover.name)
+            state = mc.status(self.alive_rcv_timeout, self.alive_retries)
+        self.mover_state[mover.name] = state
         enstore_functions.inqTrace(enstore_constants.INQSERVERDBG,
 				   "got new state from %s %s"%(mover.name,
                                                                self.mover_state[mover.name],))
@@ -989,15 +1067,14 @@ class InquisitorMethods(dispatching_worker.DispatchingWorker):
         return rtn
 
     # get the information from the migrator
-    def update_migrator(self, migrator):
+    def update_migrator(self, migrator, state=None):
         rtn = 1          # assume no timeouts
-        enstore_functions.inqTrace(enstore_constants.INQSERVERDBG,
-				   "get new state from %s"%(migrator.name,))
-
-        mc = migrator_client.MigratorClient(self.csc, migrator.name)
-
-        self.migrator_state[migrator.name] = mc.status(self.alive_rcv_timeout,
-                                                       self.alive_retries)
+        if state is None:
+            enstore_functions.inqTrace(enstore_constants.INQSERVERDBG,
+                                       "get new state from %s"%(migrator.name,))
+            mc = migrator_client.MigratorClient(self.csc, migrator.name)
+            state = mc.status(self.alive_rcv_timeout, self.alive_retries)
+        self.migrator_state[migrator.name] = state
         mig_state = self.migrator_state[migrator.name]
 	migrator.check_status_ticket(mig_state)
         self.serverfile.output_migratorstatus(mig_state, migrator.name)
@@ -1204,19 +1281,78 @@ class InquisitorMethods(dispatching_worker.DispatchingWorker):
             server.did_restart_alarm = 0
         return server
 
+    # send the status queries to the movers, migrators and library managers
+    # among names all at once and gather the replies with one deadline, so a
+    # slow or hung server does not hold up the others.  returns a dictionary
+    # of name : status ticket, servers which did not reply in time get a
+    # timed out status.  servers with no address in their configuration are
+    # not in it and are asked one at a time as before.
+    # client of the server name, as used to get its status one at a time
+    def status_client(self, name):
+        if enstore_functions2.is_mover(name):
+            return mover_client.MoverClient(self.csc, name)
+        elif enstore_functions2.is_migrator(name):
+            return migrator_client.MigratorClient(self.csc, name)
+        else:
+            return self.server_d[name].client
+
+    def gather_server_status(self, names):
+        requests = []
+        for name in names:
+            if enstore_functions2.is_mover(name):
+                work = "status"
+            elif enstore_functions2.is_migrator(name):
+                work = "get_status"
+            elif enstore_functions2.is_library_manager(name):
+                work = "get_lm_state"
+            else:
+                continue
+            server = self.server_d[name]
+            if not server.hostip or not server.port:
+                continue
+            requests.append((name, {"work" : work}, (server.hostip, server.port)))
+        if not requests:
+            return {}
+        enstore_functions.inqTrace(enstore_constants.INQSERVERDBG,
+                                   "get new state from %s servers"%(len(requests),))
+        try:
+            replies, latencies, late = self.status_u.scatter_gather(
+                requests, self.alive_rcv_timeout * self.alive_retries,
+                self.max_status_queries, self.alive_retries)
+        except (socket.error, select.error, e_errors.EnstoreError), detail:
+            Trace.log(e_errors.ERROR,
+                      "Error while getting status of servers (%s)"%(detail,),
+                      e_errors.IOERROR)
+            return {}
+        for name, reply in replies.items():
+            # the status did not fit in a datagram, it is sent over TCP
+            if type(reply) == types.DictType and reply.get('long_reply') \
+               and e_errors.is_ok(reply):
+                replies[name] = self.status_client(name).read_long_reply(reply)
+        for name, seconds in latencies.items():
+            self.status_times.add_reply(name, seconds)
+        for name in late:
+            self.status_times.add_timed_out(name)
+            replies[name] = {'status' : (e_errors.TIMEDOUT, name)}
+        enstore_functions.inqTrace(enstore_constants.INQSERVERDBG,
+                                   "got new state from %s servers, %s timed out"%(
+                                       len(requests) - len(late), len(late)))
+        return replies
+
     def get_server_info(self, servers_just_done, success_servers):
         # return a list of servers that we have not processed this time around
         self.er_lock.acquire()
         servers = self.server_er_msg.keys()
         self.er_lock.release()
-        # most times delays are introduced by library managers taking longer as
-        # they have alot to do.  so process any lms first so that the latest alive
-        # time can be set for the other servers/movers.
+        start = time.time()
+        # process any lms first so that the movers queued at them are known
+        # when checking the movers for bad writes.
         lms = []
         for aServer in servers:
             if enstore_functions2.is_library_manager(aServer):
                 lms.append(aServer)
                 servers.remove(aServer)
+        todo = []
         for aServer in lms+servers:
             if aServer not in servers_just_done:
                 servers_just_done.append(aServer)
@@ -1227,50 +1363,35 @@ class InquisitorMethods(dispatching_worker.DispatchingWorker):
                 self.er_lock.acquire()
                 server_time = self.server_er_msg[aServer]
                 self.er_lock.release()
-                server = self.server_is_alive(aServer, server_time)
+                self.server_is_alive(aServer, server_time)
                 success_servers.append(aServer)
-                # if server is a mover, we need to get some extra status
-                if enstore_functions2.is_mover(aServer):
-                    rtn = self.update_mover(server)
-                    self.check_for_bad_writes(server)
-                    # mark the mover alive again as we just got info and it may
-                    # have taken awhile to get it.  only mark it alive if there was
-                    # no problem getting the status
-                    if rtn:
-                        server = self.server_is_alive(aServer)
-                    else:
-                        # do not report it as success
-                        success_servers.remove(aServer)
-
-
-                if enstore_functions2.is_migrator(aServer):
-                    rtn = self.update_migrator(server)
-                    #self.check_for_bad_writes(server)
-                    # mark the mover alive again as we just got info and it may
-                    # have taken awhile to get it.  only mark it alive if there was
-                    # no problem getting the status
-                    if rtn:
-                        server = self.server_is_alive(aServer)
-                    else:
-                        # do not report it as success
-                        success_servers.remove(aServer)
-
-
-
-
-
-                # if server is a library_manager, we need to get some extra status
-                if enstore_functions2.is_library_manager(aServer):
-                    rtn = self.update_library_manager(server)
-                    self.check_for_bad_writes(server)
-                    # mark the lm alive again as we just got info and it may
-                    # have taken awhile to get it.  only mark it alive if there was
-                    # no problem getting the status
-                    if rtn:
-                        server = self.server_is_alive(aServer)
-                    else:
-                        # do not report it as success
-                        success_servers.remove(aServer)
+                todo.append(aServer)
+        # get the extra status of the movers, migrators and library managers
+        states = self.gather_server_status(todo)
+        for aServer in todo:
+            server = self.server_d[aServer]
+            # if server is a mover, we need to get some extra status
+            if enstore_functions2.is_mover(aServer):
+                rtn = self.update_mover(server, states.get(aServer))
+                self.check_for_bad_writes(server)
+            elif enstore_functions2.is_migrator(aServer):
+                rtn = self.update_migrator(server, states.get(aServer))
+            # if server is a library_manager, we need to get some extra status
+            elif enstore_functions2.is_library_manager(aServer):
+                rtn = self.update_library_manager(server, states.get(aServer))
+                self.check_for_bad_writes(server)
+            else:
+                continue
+            # mark the server alive again as we just got info and it may
+            # have taken awhile to get it.  only mark it alive if there was
+            # no problem getting the status
+            if rtn:
+                self.server_is_alive(aServer)
+            else:
+                # do not report it as success
+                success_servers.remove(aServer)
+        if todo:
+            self.status_times.add_cycle(time.time() - start)
         return servers_just_done, success_servers
 
     # this is the routine that is called when a message arrives from the event
@@ -1480,6 +1601,7 @@ class InquisitorMethods(dispatching_worker.DispatchingWorker):
             server = self.server_d[skey]
             print repr(server)
         print repr(self.event_relay)
+        print repr(self.status_times)
         print ""
         import pprint
         pprint.pprint(self.serverfile.text)
@@ -2027,6 +2149,9 @@ class Inquisitor(InquisitorMethods, generic_server.GenericServer):
         self.max_encp_lines = self.get_value('max_encp_lines', max_encp_lines)
         # get max thread count
         self.max_threads = self.get_value('max_threads', max_threads)
+        # get max number of outstanding status queries
+        self.max_status_queries = self.get_value('max_status_queries', NOVALUE)
+        self.status_u = udp_client.UDPClient()
 
         # get the keys that are associated with the web information
         self.www_server = self.config_d.get(enstore_constants.WWW_SERVER, {})
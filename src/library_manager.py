@@ -163,14 +163,14 @@ class Requests:
         """
         Trace.trace(self.trace_level, " Requests: get")
         ret = self.worker.get_request()
-        Trace.trace(self.trace_level, " Requests: get %s" % (ret,))
+        Trace.tracef(self.trace_level, " Requests: get %s", ret)
         return ret
 
     def do_one_request(self):
         """Receive and process one request, possibly blocking."""
         # request is a "(idn,number,ticket)"
         request, client_address = self.get()
-        Trace.trace(self.trace_level, "Requests: do_one_request:get returned %s %s" % (request, client_address))
+        Trace.tracef(self.trace_level, "Requests: do_one_request:get returned %s %s", request, client_address)
         Trace.trace(self.trace_level,
                     "Requests: do_one_request:interval functions %s" % (self.worker.interval_funcs.items()))
         if request is None:  # Invalid request sent in
@@ -186,7 +186,7 @@ class Requests:
             Trace.trace(self.trace_level, "do_one_request: KeyboardInterrupt")
             traceback.print_exc()
         except SystemExit, code:
-            Trace.trace(self.trace_level, "do_one_request: SystemExit %s" % (code,))
+            Trace.tracef(self.trace_level, "do_one_request: SystemExit %s", code)
             # processing may fork (forked process will call exit)
             sys.exit(code)
         except:
@@ -198,7 +198,7 @@ class Requests:
         Cloned from :class:`dispatching_worker.serve_forever` to run on a separate port.
         This needs to run in a thread as it an infinite loop!
         """
-        Trace.trace(self.trace_level, "Requests starting %s" % (self,))
+        Trace.tracef(self.trace_level, "Requests starting %s", self)
         count = 0
         if self.worker.use_raw:
             self.worker.set_out_file()
@@ -225,7 +225,7 @@ class Requests:
                         del self.worker.interval_funcs[func]
                     else:  # record last call time
                         self.worker.interval_funcs[func][1] = now
-                    Trace.trace(self.trace_level, "do_one_request: calling interval function %s" % (func,))
+                    Trace.tracef(self.trace_level, "do_one_request: calling interval function %s", func)
                     func()
 
             self.worker.collect_children()
@@ -252,10 +252,10 @@ class Requests:
         :arg client_address: (:obj:`str`- IP address, :obj:`int` - port)
         """
         t1 = time.time()
-        Trace.trace(self.trace_level, "RequestQeue:process_request %s" % (request,))
+        Trace.tracef(self.trace_level, "RequestQeue:process_request %s", request)
         ticket = udp_server.UDPServer.process_request(self.worker, request,
                                                       client_address)
-        Trace.trace(self.trace_level, "RequestQeue:process_request: ticket %s" % (ticket,))
+        Trace.tracef(self.trace_level, "RequestQeue:process_request: ticket %s", ticket)
         t11 = time.time()
 
         if not ticket:
@@ -275,7 +275,7 @@ class Requests:
             self.worker.done_cleanup(ticket)
             return
 
-        Trace.trace(self.trace_level, "GETTING %s of %s" % (function_name, self.lm_server))
+        Trace.tracef(self.trace_level, "GETTING %s of %s", function_name, self.lm_server)
         try:
             function = getattr(self.lm_server, function_name)
         except (KeyError, AttributeError, TypeError), detail:
@@ -291,12 +291,12 @@ class Requests:
 
         # call the user function
         t = time.time()
-        Trace.trace(self.trace_level, "Requests:process_request: function %s" % (function_name,))
+        Trace.tracef(self.trace_level, "Requests:process_request: function %s", function_name)
 
         if function_name in ('mover_idle', 'mover_bound_volume'):
             if self.lm_server.use_threads:
                 thread_name = ticket['mover']
-                Trace.trace(self.trace_level, "Requests:process_request:thread starting %s" % (thread_name,))
+                Trace.tracef(self.trace_level, "Requests:process_request:thread starting %s", thread_name)
                 # self.lm_server.run_in_thread(thread_name, self.lm_server.request_thread, args = (function, ticket)) # leave here as the alternative, but slower
 
                 thread = threading.Thread(group=None,
@@ -307,15 +307,15 @@ class Requests:
                 thread.start()
                 self.worker.done_cleanup(ticket)
             else:
-                Trace.trace(self.trace_level, "Requests:process_request: calling %s(%s)" % (function, ticket))
+                Trace.tracef(self.trace_level, "Requests:process_request: calling %s(%s)", function, ticket)
                 try:
                     function(ticket)
                 except:
                     exc, msg, tb = sys.exc_info()
-                    Trace.trace(self.trace_level, "Requests:process_request: exception %s %s" % (exc, msg))
+                    Trace.tracef(self.trace_level, "Requests:process_request: exception %s %s", exc, msg)
                     Trace.handle_error(exc, msg, tb)
                 t2 = time.time()
-                Trace.trace(self.trace_level, "Requests:process_request: finished %s(%s)" % (function, ticket))
+                Trace.tracef(self.trace_level, "Requests:process_request: finished %s(%s)", function, ticket)
                 self.worker.done_cleanup(ticket)
                 if t2 - t >= 3.:
                     # leave this for debugging purposes
@@ -371,7 +371,7 @@ class SG_VF:
         """
         rc = 0
         # if not (mover and volume and sg and vf): return
-        Trace.trace(self.trace_level, "SG:delete mover %s, volume %s, sg %s, vf %s" % (mover, volume, sg, vf))
+        Trace.tracef(self.trace_level, "SG:delete mover %s, volume %s, sg %s, vf %s", mover, volume, sg, vf)
         if self.sg.has_key(sg) and (mover, volume) in self.sg[sg]:
             self.sg[sg].remove((mover, volume))
             if len(self.sg[sg]) == 0:
@@ -405,7 +405,7 @@ class SG_VF:
                     m, v = tpl[0], tpl[1]
                     break
             if m and v:
-                Trace.trace(self.trace_level, "delete_mover %s from %s" % (mover, self.sg[key]))
+                Trace.tracef(self.trace_level, "delete_mover %s from %s", mover, self.sg[key])
                 break
         if m and v:
             self.sg[key].remove((m, v))
@@ -423,7 +423,7 @@ class SG_VF:
                     m, v = tpl[0], tpl[1]
                     break
             if m and v:
-                Trace.trace(self.trace_level, "delete_mover %s from %s" % (mover, self.vf[key]))
+                Trace.tracef(self.trace_level, "delete_mover %s from %s", mover, self.vf[key])
                 break
         if m and v:
             self.vf[key].remove((m, v))
@@ -516,10 +516,10 @@ class AtMovers:
         state = mover_info.get('state')
         if state == 'IDLE':
             return
-        Trace.trace(self.trace_level, "AtMovers:put: %s" % (mover_info,))
-        Trace.trace(self.trace_level, "AtMovers put before: at_movers: %s" % (self.at_movers,))
-        Trace.trace(self.trace_level + 1, "AtMovers put before: sg_vf: %s" % (self.sg_vf,))
-        Trace.trace(self.trace_level, "dont_update: %s" % (self.dont_update,))
+        Trace.tracef(self.trace_level, "AtMovers:put: %s", mover_info)
+        Trace.tracef(self.trace_level, "AtMovers put before: at_movers: %s", self.at_movers)
+        Trace.tracef(self.trace_level + 1, "AtMovers put before: sg_vf: %s", self.sg_vf)
+        Trace.tracef(self.trace_level, "dont_update: %s", self.dont_update)
         if not mover_info['external_label']: return
         if not mover_info['volume_family']: return
         if not mover_info['mover']: return
@@ -544,8 +544,8 @@ class AtMovers:
             mover_info['time_started'] = mover_info.get("current_time", time.time())
             self.at_movers[mover] = mover_info
         self.sg_vf.put(mover, mover_info['external_label'], storage_group, vol_family)
-        Trace.trace(self.trace_level, "AtMovers put: at_movers: %s" % (self.at_movers,))
-        Trace.trace(self.trace_level + 1, "AtMovers put: sg_vf: %s" % (self.sg_vf,))
+        Trace.tracef(self.trace_level, "AtMovers put: at_movers: %s", self.at_movers)
+        Trace.tracef(self.trace_level + 1, "AtMovers put: sg_vf: %s", self.sg_vf)
 
     def delete(self, mover_info):
         """
@@ -566,14 +566,14 @@ class AtMovers:
         :rtype: :obj:`int` 0 - success, 1- failure
         """
 
-        Trace.trace(self.trace_level, "AtMovers:delete: %s" % (mover_info,))
-        Trace.trace(self.trace_level, "AtMovers delete. before: %s" % (self.at_movers,))
-        Trace.trace(self.trace_level + 1, "AtMovers delete. before: sg_vf: %s" % (self.sg_vf,))
+        Trace.tracef(self.trace_level, "AtMovers:delete: %s", mover_info)
+        Trace.tracef(self.trace_level, "AtMovers delete. before: %s", self.at_movers)
+        Trace.tracef(self.trace_level + 1, "AtMovers delete. before: sg_vf: %s", self.sg_vf)
         mover = mover_info['mover']
         mover_state = mover_info.get('state', None)
         rc = -1
         if self.at_movers.has_key(mover):
-            Trace.trace(self.trace_level, "MOVER %s" % (self.at_movers[mover],))
+            Trace.tracef(self.trace_level, "MOVER %s", self.at_movers[mover])
             if mover_info.has_key('volume_family') and mover_info['volume_family']:
                 vol_family = mover_info['volume_family']
             else:
@@ -591,7 +591,7 @@ class AtMovers:
             # self.sg_vf.delete(mover, self.at_movers[mover]['external_label'], storage_group, vol_family)
             storage_group = volume_family.extract_storage_group(vol_family)
             rc = self.sg_vf.delete(mover, label, storage_group, vol_family)
-            Trace.trace(self.trace_level, "AtMovers delete. sg_vf.delete returned %s" % (rc,))
+            Trace.tracef(self.trace_level, "AtMovers delete. sg_vf.delete returned %s", rc)
             if (rc < 0 and mover_state == 'IDLE'):
                 # the pair (mover, volume) is wrong.
                 # This usually happens when mover automatically goes to
@@ -601,8 +601,8 @@ class AtMovers:
             self._lock.acquire()
             del (self.at_movers[mover])
             self._lock.release()
-        Trace.trace(self.trace_level + 1, "AtMovers delete: at_movers: %s" % (self.at_movers,))
-        Trace.trace(self.trace_level, "AtMovers delete: sg_vf: %s" % (self.sg_vf,))
+        Trace.tracef(self.trace_level + 1, "AtMovers delete: at_movers: %s", self.at_movers)
+        Trace.tracef(self.trace_level, "AtMovers delete: sg_vf: %s", self.sg_vf)
         return rc
 
     def check(self):
@@ -610,7 +610,7 @@ class AtMovers:
         Check how long movers did not update their state and act according to the rules.
         """
         Trace.trace(self.trace_level + 2, "checking at_movers list")
-        Trace.trace(self.trace_level + 2, "dont_update_list %s" % (self.dont_update,))
+        Trace.tracef(self.trace_level + 2, "dont_update_list %s", self.dont_update)
         now = time.time()
         movers_to_delete = []
         if self.at_movers:
@@ -619,7 +619,7 @@ class AtMovers:
                 # the loop below runs
                 # on the other hand we do not want to lock acess to at_movers
                 for mover in self.at_movers.keys():
-                    Trace.trace(self.trace_level + 2, "Check mover %s now %s" % (self.at_movers[mover], now))
+                    Trace.tracef(self.trace_level + 2, "Check mover %s now %s", self.at_movers[mover], now)
                     if int(now) - int(self.at_movers[mover]['updated']) > 600:
                         # Trace.alarm(e_errors.ALARM,
                         #            "The mover %s has not updated its state for %s minutes, will remove it from at_movers list"%
@@ -629,7 +629,7 @@ class AtMovers:
                                   (mover, int((now - self.at_movers[mover]['updated']) / 60)))
                         movers_to_delete.append(mover)
                     else:
-                        Trace.trace(self.trace_level + 2, "mover %s" % (mover,))
+                        Trace.tracef(self.trace_level + 2, "mover %s", mover)
                         add_to_list = 0
                         time_in_state = int(self.at_movers[mover].get('time_in_state', 0))
                         state = self.at_movers[mover].get('state', 'unknown')
@@ -676,18 +676,18 @@ class AtMovers:
         :arg volume_family_name: string formatted as STORAGE_GROUP.FILE_FAMILY.FILE_FAMILY_WRAPPER
         :rtype: :obj:`tuple` (:obj:`list` - active volumes, :obj:`int` - volumes enabled to write)
         """
-        Trace.trace(self.trace_level + 3, "busy_volumes: family=%s" % (volume_family_name,))
+        Trace.tracef(self.trace_level + 3, "busy_volumes: family=%s", volume_family_name)
         vols = []
         write_enabled = 0
         if not self.sg_vf.vf.has_key(volume_family_name):
             return vols, write_enabled
         # look in the list of work_at_movers
-        Trace.trace(self.trace_level + 3, "busy_volumes: sg_vf %s" % (self.sg_vf,))
+        Trace.tracef(self.trace_level + 3, "busy_volumes: sg_vf %s", self.sg_vf)
         for rec in self.sg_vf.vf[volume_family_name]:
             # self.sg_vf.vf[volume_family_name] is a tuple: (volume, mover)
             vols.append(rec[1])
             if self.at_movers.has_key(rec[0]):
-                Trace.trace(self.trace_level + 3, "busy_volumes: vol info %s" % (self.at_movers[rec[0]],))
+                Trace.tracef(self.trace_level + 3, "busy_volumes: vol info %s", self.at_movers[rec[0]])
                 if self.at_movers[rec[0]]['volume_status'][0][0] in (e_errors.NOACCESS, e_errors.NOTALLOWED):
                     continue
                 if self.at_movers[rec[0]]['volume_status'][0][1] == 'none':
@@ -700,7 +700,7 @@ class AtMovers:
                 elif self.at_movers[rec[0]]['state'] == 'ERROR':
                     if not (enstore_functions2.is_readonly_state(self.at_movers[rec[0]]['volume_status'][0][1])):
                         write_enabled = write_enabled + 1
-        Trace.trace(self.trace_level + 3, "busy_volumes: returning %s %s" % (vols, write_enabled))
+        Trace.tracef(self.trace_level + 3, "busy_volumes: returning %s %s", vols, write_enabled)
         return vols, write_enabled
 
     def active_volumes_in_storage_group(self, storage_group):
@@ -855,7 +855,7 @@ class PostponedRequests:
         else:
             replace = 1
         if replace:
-            Trace.trace(self.trace_level, "postponed_put %s" % (rq,))
+            Trace.tracef(self.trace_level, "postponed_put %s", rq)
             # request with highest priority to this
             # storage group
             # only one request per storage group!
@@ -887,7 +887,7 @@ class PostponedRequests:
                 else:
                     remove_these.append(sg)
             if len(l) > 1: l.sort()
-            Trace.trace(self.trace_level, "sorted sg_list %s" % (l,))
+            Trace.tracef(self.trace_level, "sorted sg_list %s", l)
 
             for sg in remove_these:
                 if self.sg_list.has_key(sg):
@@ -908,7 +908,7 @@ class PostponedRequests:
                 # request for a given storage group was picked
                 # up from postponed requests
                 self.sg_list[sg] = self.sg_list[sg] + 1
-            Trace.trace(self.trace_level, "postponed update %s %s %s" % (sg, deficiency, self.sg_list[sg]))
+            Trace.tracef(self.trace_level, "postponed update %s %s %s", sg, deficiency, self.sg_list[sg])
 
 
 class PostponedBoundRequests:
@@ -934,12 +934,12 @@ class PostponedBoundRequests:
         :arg mover_ticket: :obj:`dict`
         """
 
-        Trace.trace(self.trace_level, 'postponed_bound:put: %s' % (self.rq_list,))
+        Trace.tracef(self.trace_level, 'postponed_bound:put: %s', self.rq_list)
         for item in self.rq_list:
             if mover_ticket['mover'] == item[0]:
                 break
         else:
-            Trace.trace(self.trace_level, "postponed_bound:put %s" % (mover_ticket,))
+            Trace.tracef(self.trace_level, "postponed_bound:put %s", mover_ticket)
             self.rq_list.append((mover_ticket['mover'], mover_ticket))
 
     def get(self):
@@ -949,7 +949,7 @@ class PostponedBoundRequests:
         :rtype: :obj:`dict`
         """
 
-        Trace.trace(self.trace_level, 'postponed_bound:get: %s' % (self.rq_list,))
+        Trace.tracef(self.trace_level, 'postponed_bound:get: %s', self.rq_list)
         if len(self.rq_list) > 0:
             rc = self.rq_list.pop(0)
             return rc[1]
@@ -1063,7 +1063,7 @@ class LibraryManagerMethods:
 
         rc = 0
         try:
-            Trace.trace(self.trace_level + 10, "send_regret %s" % (ticket,))
+            Trace.tracef(self.trace_level + 10, "send_regret %s", ticket)
             host = ticket['wrapper']['machine'][1]
             address_family = socket.getaddrinfo(host, None)[0][0]
             control_socket = socket.socket(address_family, socket.SOCK_STREAM)
@@ -1075,7 +1075,7 @@ class LibraryManagerMethods:
                 # bind control socket to data ip
                 control_socket.bind((host, 0))
                 u = udp_client.UDPClient()
-                Trace.trace(self.trace_level + 10, "sending IP %s to %s" % (host, ticket['routing_callback_addr']))
+                Trace.tracef(self.trace_level + 10, "sending IP %s to %s", host, ticket['routing_callback_addr'])
                 try:
                     x = u.send(ticket, ticket['routing_callback_addr'], 15, 3, 0)
                 except (socket.error, select.error, e_errors.EnstoreError), msg:
@@ -1089,9 +1089,9 @@ class LibraryManagerMethods:
                     self.del_udp_client(u)
                     return 1
                 if x.has_key('callback_addr'): ticket['callback_addr'] = x['callback_addr']
-                Trace.trace(self.trace_level + 10, "encp replied with %s" % (x,))
+                Trace.tracef(self.trace_level + 10, "encp replied with %s", x)
                 self.del_udp_client(u)
-            Trace.trace(self.trace_level + 10, "connecting to %s" % (ticket['callback_addr'],))
+            Trace.tracef(self.trace_level + 10, "connecting to %s", ticket['callback_addr'])
             try:
                 control_socket.connect(ticket['callback_addr'])
             except socket.error, detail:
@@ -1132,7 +1132,7 @@ class LibraryManagerMethods:
             pid = self.fork()
             if pid != 0:
                 # parent
-                Trace.trace(self.trace_level + 10, "forking send_regret %s" % (pid,))
+                Trace.tracef(self.trace_level + 10, "forking send_regret %s", pid)
                 return
             # child
             rc = self.__send_regret(ticket)
@@ -1212,7 +1212,7 @@ class LibraryManagerMethods:
         :arg external_label: remove works for specified volume
         """
 
-        Trace.trace(self.trace_level, "flush_pending_jobs: %s" % (external_label,))
+        Trace.tracef(self.trace_level, "flush_pending_jobs: %s", external_label)
         if not external_label: return
         w = self.pending_work.get(external_label)
         while w:
@@ -1237,7 +1237,7 @@ class LibraryManagerMethods:
         :rtype: :obj:`dict` ticket
         """
 
-        Trace.trace(self.trace_level, 'get_work_at_movers: %s %s' % (external_label, mover))
+        Trace.tracef(self.trace_level, 'get_work_at_movers: %s %s', external_label, mover)
         rc = {}
         if not external_label: return rc
         if not mover: return rc
@@ -1310,11 +1310,11 @@ class LibraryManagerMethods:
         :rtype: :obj:`bool`
         """
 
-        Trace.trace(self.trace_level + 1, 'is_file_available: requested_file_bfid %s' % (requested_file_bfid,))
+        Trace.tracef(self.trace_level + 1, 'is_file_available: requested_file_bfid %s', requested_file_bfid)
         if not requested_file_bfid:
             return False
         ticket = fcc.bfid_info(requested_file_bfid)
-        Trace.trace(self.trace_level + 1, 'bfid info %s' % (ticket,))
+        Trace.tracef(self.trace_level + 1, 'bfid info %s', ticket)
         if ticket['status'][0] == e_errors.OK:
             # This was done as a feasibility study
             # for disk movers as enstore cache.
@@ -1350,14 +1350,14 @@ class LibraryManagerMethods:
         vol_veto_list, wr_en = self.volumes_at_movers.busy_volumes(volume_family_name)
         # look in the list of work_at_movers
         for w in self.work_at_movers.list:
-            Trace.trace(self.trace_level + 1, 'busy_volumes: %s %s' % (w["vc"], w["fc"]))
+            Trace.tracef(self.trace_level + 1, 'busy_volumes: %s %s', w["vc"], w["fc"])
             if w["vc"]["volume_family"] == volume_family_name:
                 if w["fc"]["external_label"] in vol_veto_list:
                     continue  # already processed
                 else:
                     vol_veto_list.append(w["fc"]["external_label"])
                     permissions = w["vc"].get("system_inhibit", None)
-                    Trace.trace(self.trace_level + 1, 'busy_volumes: permissions %s' % (permissions,))
+                    Trace.tracef(self.trace_level + 1, 'busy_volumes: permissions %s', permissions)
 
                     if permissions:
                         if permissions[0] in (e_errors.NOACCESS, e_errors.NOTALLOWED):
@@ -1431,7 +1431,7 @@ class LibraryManagerMethods:
                 else:
                     # actually this file was lost
                     rc = {'status': (e_errors.NO_FILE, None)}
-        Trace.trace(self.trace_level + 1, "is_disk_vol_available rc %s" % (rc,))
+        Trace.tracef(self.trace_level + 1, "is_disk_vol_available rc %s", rc)
         return rc
 
     # set volume clerk client
@@ -1446,7 +1446,7 @@ class LibraryManagerMethods:
         if vol_server_address == None:
             return
         else:
-            Trace.trace(self.trace_level + 1, 'set_vcc %s %s' % (vol_server_address, vol_server_address))
+            Trace.tracef(self.trace_level + 1, 'set_vcc %s %s', vol_server_address, vol_server_address)
             if self.vc_address != None:
                 if self.vc_address == vol_server_address:
                     return
@@ -1515,7 +1515,7 @@ class LibraryManagerMethods:
         :rtype: :obj:`dict` {'status': :obj:`tuple` (:obj:`str` - status, :obj:`None`)}
         """
 
-        Trace.trace(self.trace_level + 2, 'is_vol_available %s' % (self.known_volumes,))
+        Trace.tracef(self.trace_level + 2, 'is_vol_available %s', self.known_volumes)
         # is this mover, volume in suspect mover list?
         if mover is not None:
             suspect_v, suspect_mv = self.is_mover_suspect(mover, label)
@@ -1577,7 +1577,7 @@ class LibraryManagerMethods:
                         if (volume_family.match_volume_families(family, record['volume_family']) or
                                 ff == 'ephemeral'):
                             ret = self.is_volume_full_no_rec(record, size)
-                            Trace.trace(self.trace_level + 2, "is_vol_available: ret1 %s" % (ret,))
+                            Trace.tracef(self.trace_level + 2, "is_vol_available: ret1 %s", ret)
                             if not ret:
                                 ret_stat = (e_errors.OK, None)
                             else:
@@ -1586,7 +1586,7 @@ class LibraryManagerMethods:
                             ret_stat = (e_errors.NOACCESS, None)
                 else:
                     ret_stat = (e_errors.UNKNOWN, None)
-                Trace.trace(self.trace_level + 2, "is_vol_available: ret2 %s" % (ret_stat,))
+                Trace.tracef(self.trace_level + 2, "is_vol_available: ret2 %s", ret_stat)
                 rticket = {'status': ret_stat}
             return rticket
         else:
@@ -1598,7 +1598,7 @@ class LibraryManagerMethods:
             if override_notallowed and rticket["status"][0] == "NOTALLOWED":
                 rticket["status"] = (e_errors.OK, None)
 
-        Trace.trace(self.trace_level + 2, 'is_vol_available %s' % (rticket,))
+        Trace.tracef(self.trace_level + 2, 'is_vol_available %s', rticket)
         return rticket
 
     def inquire_vol(self, external_label, requestor=None, vol_server_address=None):
@@ -1631,13 +1631,13 @@ class LibraryManagerMethods:
             else:
                 self.set_vcc(vol_server_address)
                 vol_info = self.vcc.inquire_vol(external_label, timeout=INQUIRE_VOL_TO, retry=INQUIRE_VOL_RETRY)
-                Trace.trace(self.trace_level + 2, 'inquire_vol %s' % (vol_info,))
+                Trace.tracef(self.trace_level + 2, 'inquire_vol %s', vol_info)
                 if vol_info['status'][0] == e_errors.TIMEDOUT:
                     Trace.alarm(e_errors.INFO, "volume clerk problem inquire_volume %s TIMEDOUT" % (external_label,))
                 if not self.known_volumes.has_key(external_label):
                     self.known_volumes[external_label] = vol_info
-            Trace.trace(self.trace_level + 2, 'inquire_vol %s' % (self.known_volumes,))
-        Trace.trace(self.trace_level + 2, 'inquire_vol returns %s' % (vol_info,))
+            Trace.tracef(self.trace_level + 2, 'inquire_vol %s', self.known_volumes)
+        Trace.tracef(self.trace_level + 2, 'inquire_vol returns %s', vol_info)
 
         return vol_info
 
@@ -1660,7 +1660,7 @@ class LibraryManagerMethods:
         :rtype: :obj:`dict` - volume record containing status
         """
 
-        Trace.trace(self.trace_level + 2, 'write_volumes %s' % (self.write_volumes,))
+        Trace.tracef(self.trace_level + 2, 'write_volumes %s', self.write_volumes)
         if self.mover_type(mover) == 'DiskMover':
             # no new volume needed
             v = {'status': (e_errors.OK, None),
@@ -1678,7 +1678,7 @@ class LibraryManagerMethods:
             start_t = time.time()
             v = self.vcc.next_write_volume(library, size, volume_family, veto_list, first_found, mover,
                                            timeout=self.volume_clerk_to, retry=self.volume_clerk_retry)
-            Trace.trace(self.trace_level + 2, "vcc.next_write_volume, time in state %s" % (time.time() - start_t,))
+            Trace.tracef(self.trace_level + 2, "vcc.next_write_volume, time in state %s", time.time() - start_t)
             if v['status'][0] == e_errors.TIMEDOUT:
                 Trace.alarm(e_errors.INFO, "volume clerk problem next_write_volume: TIMEDOUT")
             if v['status'][0] == e_errors.OK and v['external_label']:
@@ -1732,7 +1732,7 @@ class LibraryManagerMethods:
                     (host, max_permitted, rq_host))
         for w in self.work_at_movers.list:
             host_from_ticket = self.get_host_name_from_ticket(w)
-            Trace.trace(self.trace_level + 3, 'host_from_ticket %s' % (host_from_ticket,))
+            Trace.tracef(self.trace_level + 3, 'host_from_ticket %s', host_from_ticket)
             try:
                 if re.search(host, host_from_ticket):
                     if rq_host:
@@ -1799,7 +1799,7 @@ class LibraryManagerMethods:
 
                 args.append(host_from_ticket)
                 ret = apply(getattr(self, fun), args)
-                Trace.trace(self.trace_level + 3, "client_host_busy returning %s" % (ret,))
+                Trace.tracef(self.trace_level + 3, "client_host_busy returning %s", ret)
 
                 if ret and (action in (e_errors.LOCKED, e_errors.IGNORE, e_errors.PAUSE, e_errors.REJECT)):
                     w["reject_reason"] = ("RESTRICTED_ACCESS", None)
@@ -1830,7 +1830,7 @@ class LibraryManagerMethods:
 
         rc, fun, args, action = self.restrictor.match_found(w)
         args_copy = copy.copy(args)
-        Trace.trace(self.trace_level + 3, "client_host_busy_for_mounted args %s" % (args,))
+        Trace.tracef(self.trace_level + 3, "client_host_busy_for_mounted args %s", args)
         if rc and fun and action:
             w["status"] = (e_errors.OK, None)
             if fun == 'restrict_host_access':
@@ -1858,16 +1858,16 @@ class LibraryManagerMethods:
                             # otherwise reject this request
                             return True
                 mp = args[-1]
-                Trace.trace(self.trace_level + 3, "client_host_busy_for_mounted mp %s" % (mp,))
+                Trace.tracef(self.trace_level + 3, "client_host_busy_for_mounted mp %s", mp)
                 if type(mp) == type(()) and len(mp) == 3:
                     mp1 = (mp[0] + 1, mp[1], mp[2])  # allow 1 more request for bount volume
                 else:
                     mp1 = mp + 1  # allow 1 more request for bount volume
-                Trace.trace(self.trace_level + 3, "client_host_busy_for_mounted mp_1 %s" % (mp,))
+                Trace.tracef(self.trace_level + 3, "client_host_busy_for_mounted mp_1 %s", mp)
                 args[-1] = mp1
 
                 args.append(host_from_ticket)
-                Trace.trace(self.trace_level + 3, "client_host_busy_for_mounted args_1 %s" % (args,))
+                Trace.tracef(self.trace_level + 3, "client_host_busy_for_mounted args_1 %s", args)
                 if ((w['work'] == "read_from_hsm" and w["fc"]["external_label"] == external_label) or
                         (w['work'] == "write_to_hsm" and w["vc"]["volume_family"] == vol_family)):
                     args.append(w['work'])
@@ -1878,7 +1878,7 @@ class LibraryManagerMethods:
                         self.disabled_hosts.append(host_from_ticket)
                     Trace.trace(self.trace_level + 3, "client_host_busy_for_mounted: RESTRICTED_ACCESS")
 
-        Trace.trace(self.trace_level + 3, "client_host_busy_for_mounted returning %s" % (ret,))
+        Trace.tracef(self.trace_level + 3, "client_host_busy_for_mounted returning %s", ret)
         return ret
 
     ############################################
@@ -1898,7 +1898,7 @@ class LibraryManagerMethods:
         :rtype: :obj:`str` - package id or :obj:`None`
         """
 
-        Trace.trace(self.trace_level + 3, "is_packaged fc: %s" % (request['fc'],))
+        Trace.tracef(self.trace_level + 3, "is_packaged fc: %s", request['fc'])
         package_id = request['fc'].get("package_id", None)
         if package_id and package_id == request['fc']['bfid']:  # file is a package itself
             package_id = None
@@ -1944,17 +1944,17 @@ class LibraryManagerMethods:
             return request
         while request:
             rq_id = request.unique_id
-            Trace.trace(self.trace_level + 3, "_get_request: %s" % (request,))
+            Trace.tracef(self.trace_level + 3, "_get_request: %s", request)
             # check if file is part of a package
             package_id = self.is_packaged(request.ticket)
-            Trace.trace(self.trace_level + 3, "_get_request: package_id %s" % (package_id,))
+            Trace.tracef(self.trace_level + 3, "_get_request: package_id %s", package_id)
             if package_id:
                 # Find the any file in the work at movers.
                 # If it is found this means that at least the
                 # package is being staged
                 for w in self.work_at_movers.list:
                     # Check if this is a disk file:
-                    Trace.trace(self.trace_level + 3, "_get_request: w %s" % (w,))
+                    Trace.tracef(self.trace_level + 3, "_get_request: w %s", w)
                     if w['mover_type'] != 'DiskMover':
                         # not a disk file: continue search
                         continue
@@ -1967,13 +1967,13 @@ class LibraryManagerMethods:
                                 w['fc']['cache_status'] == file_cache_status.CacheStatus.CACHED):
                             # the request can be sent to the mover
                             # return here
-                            Trace.trace(self.trace_level + 3, "_get_request: returning %s" % (request,))
+                            Trace.tracef(self.trace_level + 3, "_get_request: returning %s", request)
                             return request
                         else:
                             # get next request
                             kwargs['next'] = 1
                             request = method(*args, **kwargs)
-                            Trace.trace(self.trace_level + 3, "_get_request: next_rq %s" % (request,))
+                            Trace.tracef(self.trace_level + 3, "_get_request: next_rq %s", request)
                             if request and request.unique_id == rq_id:
                                 # if it is the same request
                                 # break, we have no more requests to process
@@ -1984,7 +1984,7 @@ class LibraryManagerMethods:
                     break
             else:
                 break
-        Trace.trace(self.trace_level + 3, "_get_request: returning1 %s" % (request,))
+        Trace.tracef(self.trace_level + 3, "_get_request: returning1 %s", request)
         return request
 
     # allow HIPR request to be sent to the current mover
@@ -2029,7 +2029,7 @@ class LibraryManagerMethods:
         ret = True
 
         if priority and priority[1] >= 0:
-            Trace.trace(self.trace_level + 3, "allow_hi_pri: returning1 %s %s" % (rq, ret))
+            Trace.tracef(self.trace_level + 3, "allow_hi_pri: returning1 %s %s", rq, ret)
             return rq, ret, False
 
         would_preempt = False
@@ -2056,7 +2056,7 @@ class LibraryManagerMethods:
                 Trace.trace(self.trace_level + 3, "There are idle movers. Will not preempt the current one %s" %
                             (self.idle_movers,))
                 ret = False
-        Trace.trace(self.trace_level + 3, "allow_hi_pri: returning %s %s %s" % (rq, ret, would_preempt))
+        Trace.tracef(self.trace_level + 3, "allow_hi_pri: returning %s %s %s", rq, ret, would_preempt)
         return rq, ret, would_preempt
 
     def init_request_selection(self):
@@ -2117,7 +2117,7 @@ class LibraryManagerMethods:
         """
 
         self.sg_exceeded = None
-        Trace.trace(self.trace_level + 4, "fair_share: sg_exceeded %s" % (self.sg_exceeded,))
+        Trace.tracef(self.trace_level + 4, "fair_share: sg_exceeded %s", self.sg_exceeded)
         if (rq.ticket.get('ignore_fair_share', None)):
             # do not count this request against fair share
             # this is an automigration request
@@ -2141,11 +2141,11 @@ class LibraryManagerMethods:
         if not check_key in self.checked_keys:
             self.checked_keys.append(check_key)
         active_volumes = self.volumes_at_movers.active_volumes_in_storage_group(storage_group)
-        Trace.trace(self.trace_level + 4, "fair_share: SG LIMIT %s" % (self.get_sg_limit(storage_group),))
+        Trace.tracef(self.trace_level + 4, "fair_share: SG LIMIT %s", self.get_sg_limit(storage_group))
         if (len(active_volumes) >= self.get_sg_limit(storage_group) + ease) and len(self.idle_movers) == 0:
             rq.ticket["reject_reason"] = ("PURSUING", None)
             self.sg_exceeded = (True, storage_group)
-            Trace.trace(self.trace_level + 4, "fair_share: active work limit exceeded for %s" % (storage_group,))
+            Trace.tracef(self.trace_level + 4, "fair_share: active work limit exceeded for %s", storage_group)
             if rq.adminpri > -1:
                 self.continue_scan = 1
                 return None
@@ -2153,8 +2153,8 @@ class LibraryManagerMethods:
             # see if there are pending requests for different storage group
             start_t = time.time()
             tags = self.pending_work.get_tags()
-            Trace.trace(self.trace_level + 4, "fair_share:tags: %s" % (tags,))
-            Trace.trace(100, "fair_share:TAGS TIME %s" % (time.time() - start_t,))
+            Trace.tracef(self.trace_level + 4, "fair_share:tags: %s", tags)
+            Trace.tracef(100, "fair_share:TAGS TIME %s", time.time() - start_t)
             start_t = time.time()
             Trace.trace(self.trace_level + 4, 'fair_share:postponed rqs %s' % (self.postponed_requests))
             if len(tags) > 1:
@@ -2165,8 +2165,8 @@ class LibraryManagerMethods:
                         if not key in self.checked_keys:
                             self.checked_keys.append(key)
                             if key != check_key:
-                                Trace.trace(self.trace_level + 4, "fair_share: key %s" % (key,))
-                                Trace.trace(100, "fair_share:keys TIME %s" % (time.time() - start_t,))
+                                Trace.tracef(self.trace_level + 4, "fair_share: key %s", key)
+                                Trace.tracef(100, "fair_share:keys TIME %s", time.time() - start_t)
                                 return key
 
         return None
@@ -2200,7 +2200,7 @@ class LibraryManagerMethods:
             Trace.trace(self.trace_level + 4, "process_read_request: VOL_BUSY %s" % (rq.ticket["fc"]["external_label"]))
             return rq, key_to_check
         # otherwise we have found a volume that has read work pending
-        Trace.trace(self.trace_level + 4, "process_read_request: found volume %s" % (rq.ticket,))
+        Trace.tracef(self.trace_level + 4, "process_read_request: found volume %s", rq.ticket)
         # ok passed criteria.
         ## check if there are any discipline restrictions
         host_busy = False
@@ -2262,7 +2262,7 @@ class LibraryManagerMethods:
             # do not continue scan if we have a bound volume.
             self.continue_scan = 0
 
-        Trace.trace(self.trace_level + 4, "process_read_request: returning %s %s" % (rq, key_to_check))
+        Trace.tracef(self.trace_level + 4, "process_read_request: returning %s %s", rq, key_to_check)
         return rq, key_to_check
 
     def process_write_request(self, request, requestor, last_work=None, would_preempt=False):
@@ -2283,9 +2283,9 @@ class LibraryManagerMethods:
 
         self.continue_scan = 0  # disable "scan" of pending queue
         rq = request
-        Trace.trace(self.trace_level + 4, "process_write_request: %s" % (rq,))
+        Trace.tracef(self.trace_level + 4, "process_write_request: %s", rq)
         key_to_check = self.fair_share(rq)  # check this volume label or FF
-        Trace.trace(self.trace_level + 4, "process_write_request: exceeded rqs %s" % (self.sg_exceeded,))
+        Trace.tracef(self.trace_level + 4, "process_write_request: exceeded rqs %s", self.sg_exceeded)
         Trace.trace(self.trace_level + 4,
                     "process_write_request: key %s process for bound %s" % (key_to_check, self.process_for_bound_vol))
         if key_to_check:
@@ -2375,7 +2375,7 @@ class LibraryManagerMethods:
                                 'process_write_request: veto %s, wr_en %s' % (vol_veto_list, wr_en))
                     movers = self.volumes_at_movers.get_active_movers()
                     found_mover = 0
-                    Trace.trace(self.trace_level + 4, 'process_write_request: movers %s' % (movers,))
+                    Trace.tracef(self.trace_level + 4, 'process_write_request: movers %s', movers)
                     for mover in movers:
                         Trace.trace(self.trace_level + 40, "process_write_request: mover %s state %s time %s" % (
                         mover['mover'], mover['state'], mover['time_in_state']))
@@ -2425,7 +2425,7 @@ class LibraryManagerMethods:
                 self.continue_scan = 1
                 return None, key_to_check  # continue with key_to_ckeck
 
-        Trace.trace(self.trace_level + 4, "process_write_request: request next write volume for %s" % (vol_family,))
+        Trace.tracef(self.trace_level + 4, "process_write_request: request next write volume for %s", vol_family)
 
         # before assigning volume check if it is bound for the current family
         bound_vol = self.process_for_bound_vol
@@ -2442,7 +2442,7 @@ class LibraryManagerMethods:
                         bound_vol = None  # this will allow preemption of regular priority requests
         if bound_vol not in vol_veto_list:
             # width not exceeded, ask volume clerk for a new volume.
-            Trace.trace(self.trace_level + 4, "process_write_request for %s" % (rq.ticket,))
+            Trace.tracef(self.trace_level + 4, "process_write_request for %s", rq.ticket)
             self.set_vcc(rq.ticket['vc']['address'])
 
             start_t = time.time()
@@ -2453,8 +2453,8 @@ class LibraryManagerMethods:
                                        first_found=0,
                                        mover=requestor)
 
-            Trace.trace(100, "process_write_request: next_write_volume, time in state %s" % (time.time() - start_t,))
-            Trace.trace(self.trace_level + 4, "process_write_request: next write volume returned %s" % (v,))
+            Trace.tracef(100, "process_write_request: next_write_volume, time in state %s", time.time() - start_t)
+            Trace.tracef(self.trace_level + 4, "process_write_request: next write volume returned %s", v)
 
             # volume clerk returned error
             if v["status"][0] != e_errors.OK:
@@ -2520,7 +2520,7 @@ class LibraryManagerMethods:
             rq = None
             self.continue_scan = 0
             key_to_check = None
-        Trace.trace(self.trace_level + 4, "process_write_request: returning %s %s" % (rq, key_to_check))
+        Trace.tracef(self.trace_level + 4, "process_write_request: returning %s %s", rq, key_to_check)
 
         return rq, key_to_check
 
@@ -2545,11 +2545,11 @@ class LibraryManagerMethods:
         # look in pending work queue for reading or writing work
         # rq=self.pending_work.get(active_volumes=active_vols)
         rq = self._get_request(requestor, self.pending_work.get, active_volumes=active_vols)
-        Trace.trace(self.trace_level + 10, "next_work_any_volume: RQ: %s" % (rq,))
+        Trace.tracef(self.trace_level + 10, "next_work_any_volume: RQ: %s", rq)
         while rq:
             rej_reason = None
 
-            Trace.trace(self.trace_level + 10, "next_work_any_volume: rq %s" % (rq.ticket,))
+            Trace.tracef(self.trace_level + 10, "next_work_any_volume: rq %s", rq.ticket)
             if rq.ticket.has_key('reject_reason'):
                 try:
                     rej_reason = rq.ticket['reject_reason'][0]
@@ -2557,7 +2557,7 @@ class LibraryManagerMethods:
                 except KeyError:
                     exc, msg, tb = sys.exc_info()
                     Trace.handle_error(exc, msg, tb)
-                    Trace.trace(self.trace_level + 10, "next_work_any_volume KeyError: rq %s" % (rq.ticket,))
+                    Trace.tracef(self.trace_level + 10, "next_work_any_volume KeyError: rq %s", rq.ticket)
                     continue
 
             if rq.work == "read_from_hsm":
@@ -2578,7 +2578,7 @@ class LibraryManagerMethods:
                     # rq = self.pending_work.get(next=1, active_volumes=active_vols, disabled_hosts=self.disabled_hosts) # get next request
                     rq = self._get_request(requestor, self.pending_work.get, next=1, active_volumes=active_vols,
                                            disabled_hosts=self.disabled_hosts)  # get next request
-                    Trace.trace(self.trace_level + 41, "next_work_any_volume: new rq %s" % (rq,))
+                    Trace.tracef(self.trace_level + 41, "next_work_any_volume: new rq %s", rq)
 
                     continue
                 break
@@ -2599,7 +2599,7 @@ class LibraryManagerMethods:
                     # rq = self.pending_work.get(next=1, active_volumes=active_vols, disabled_hosts=self.disabled_hosts) # get next request
                     rq = self._get_request(requestor, self.pending_work.get, next=1, active_volumes=active_vols,
                                            disabled_hosts=self.disabled_hosts)  # get next request
-                    Trace.trace(self.trace_level + 41, "next_work_any_volume: new rq %s" % (rq,))
+                    Trace.tracef(self.trace_level + 41, "next_work_any_volume: new rq %s", rq)
                     continue
                 break
 
@@ -2618,7 +2618,7 @@ class LibraryManagerMethods:
             # see if there is a temporary stored request
             Trace.trace(self.trace_level + 10, "next_work_any_volume: using exceeded mover limit request")
             rq, self.postponed_sg = self.postponed_requests.get()
-            Trace.trace(self.trace_level + 10, "next_work_any_volume: get from postponed %s" % (rq,))
+            Trace.tracef(self.trace_level + 10, "next_work_any_volume: get from postponed %s", rq)
             if rq:
                 self.postponed_rq = 1  # request comes from postponed requests list
                 # check postponed request
@@ -2637,13 +2637,13 @@ class LibraryManagerMethods:
                     rq = saved_rq
                     if rq.ticket.has_key('reject_reason'):
                         del rq.ticket['reject_reason']
-                    Trace.trace(self.trace_level + 10, "next_work_any_volume: proceed with rejected %s" % (rq,))
+                    Trace.tracef(self.trace_level + 10, "next_work_any_volume: proceed with rejected %s", rq)
                 elif self.tmp_rq:
                     rq = self.tmp_rq
-                    Trace.trace(self.trace_level + 10, "next_work_any_volume: get from tmp_rq %s" % (rq,))
+                    Trace.tracef(self.trace_level + 10, "next_work_any_volume: get from tmp_rq %s", rq)
                     if rq.work == "write_to_hsm":
                         rq, key = self.process_write_request(rq, requestor)
-                        Trace.trace(self.trace_level + 10, "next_work_any_volume: tmp_rq %s %s" % (rq.ticket, key))
+                        Trace.tracef(self.trace_level + 10, "next_work_any_volume: tmp_rq %s %s", rq.ticket, key)
 
         # check if this volume is ok to work with
         if rq:
@@ -2721,7 +2721,7 @@ class LibraryManagerMethods:
             if (status[0] == e_errors.OK or
                     status[0] == e_errors.NOWORK):
                 if rq and rq.ticket.has_key('reject_reason') and rq.ticket['reject_reason'][0] == "RESTRICTED_ACCESS":
-                    Trace.trace(self.trace_level, "schedule: This request should not get here %s" % (rq,))
+                    Trace.tracef(self.trace_level, "schedule: This request should not get here %s", rq)
                     status = (e_errors.NOWORK, None)
                     rq = None
                 return rq, status
@@ -2753,7 +2753,7 @@ class LibraryManagerMethods:
             ret = self.is_disk_vol_available(rq.work, external_label, requestor)
         else:
             vol_veto_list, wr_en = self.busy_volumes(rq.ticket['vc']['volume_family'])
-            Trace.trace(self.trace_level + 11, "check_write_request: vet_list %s wr_en %s" % (vol_veto_list, wr_en))
+            Trace.tracef(self.trace_level + 11, "check_write_request: vet_list %s wr_en %s", vol_veto_list, wr_en)
             label = rq.ticket['fc'].get('external_label', external_label)
             if label != external_label:
                 # this is a case with admin pri
@@ -2767,7 +2767,7 @@ class LibraryManagerMethods:
                     rq.ticket['status'] = ("VOLS_IN_WORK", None)
                     return rq, rq.ticket['status']
             external_label = label
-            Trace.trace(self.trace_level + 11, "check_write_request %s %s" % (external_label, rq.ticket))
+            Trace.tracef(self.trace_level + 11, "check_write_request %s %s", external_label, rq.ticket)
             if wr_en >= rq.ticket["vc"]["file_family_width"]:
                 if (not external_label in vol_veto_list) and (wr_en > rq.ticket["vc"]["file_family_width"]):
                     # if rq.adminpri < 0: # This allows request with admin pri to go even it exceeds its limit
@@ -2789,7 +2789,7 @@ class LibraryManagerMethods:
                                         fsize,
                                         rq.ticket['vc']['address'],
                                         mover=requestor.get('mover'))
-            Trace.trace(100, "check_write_request: vcc.is_vol_avail, time in state %s" % (time.time() - start_t,))
+            Trace.tracef(100, "check_write_request: vcc.is_vol_avail, time in state %s", time.time() - start_t)
         # this work can be done on this volume
         if ret['status'][0] == e_errors.OK:
             rq.ticket['vc']['external_label'] = external_label
@@ -2826,7 +2826,7 @@ class LibraryManagerMethods:
         :rtype: :obj:`tuple` (:obj:`manage_queue.Request` - request or :obj:`None`,
                               :obj:`str` - key to check next or :obj:`None`)
         """
-        Trace.trace(self.trace_level, "check_read_request %s %s %s" % (rq.work, external_label, requestor))
+        Trace.tracef(self.trace_level, "check_read_request %s %s %s", rq.work, external_label, requestor)
         if self.mover_type(requestor) == 'DiskMover':
             ret = self.is_disk_vol_available(rq.work, external_label, requestor)
         else:
@@ -2837,8 +2837,8 @@ class LibraryManagerMethods:
                                         rq.ticket['vc']['volume_family'],
                                         fsize, rq.ticket['vc']['address'],
                                         mover=requestor.get('mover'))
-            Trace.trace(100, "vcc.is_vol_avail, time in state %s" % (time.time() - start_t,))
-        Trace.trace(self.trace_level + 12, "check_read_request: ret %s" % (ret,))
+            Trace.tracef(100, "vcc.is_vol_avail, time in state %s", time.time() - start_t)
+        Trace.tracef(self.trace_level + 12, "check_read_request: ret %s", ret)
         if ret['status'][0] != e_errors.OK:
             if ret['status'][0] == e_errors.BROKEN:
                 if self.lm_lock != e_errors.BROKEN:
@@ -2846,7 +2846,7 @@ class LibraryManagerMethods:
                                 (self.name, e_errors.BROKEN))
                     self.lm_lock = e_errors.BROKEN
                 return None, ret['status']
-            Trace.trace(self.trace_level + 12, "check_read_request: work can not be done at this volume %s" % (ret,))
+            Trace.tracef(self.trace_level + 12, "check_read_request: work can not be done at this volume %s", ret)
             rq.ticket['status'] = ret['status']
             self.pending_work.delete(rq)
             self.send_regret(rq.ticket)
@@ -2893,7 +2893,7 @@ class LibraryManagerMethods:
 
         self.current_volume_info = self.inquire_vol(label, requestor)
 
-        Trace.trace(self.trace_level, "next_work_this_volume: current volume info: %s" % (self.current_volume_info,))
+        Trace.tracef(self.trace_level, "next_work_this_volume: current volume info: %s", self.current_volume_info)
         if self.current_volume_info['status'][0] == e_errors.TIMEDOUT:
             Trace.log(e_errors.ERROR, "No volume info %s. Do not know how to proceed" %
                       (self.current_volume_info,))
@@ -2948,7 +2948,7 @@ class LibraryManagerMethods:
         checked_request = None
         would_preempt = False  # no preemption of low pri requests by default
         while rq:
-            Trace.trace(self.trace_level + 42, "next_work_this_volume: rq1 %s" % (rq,))
+            Trace.tracef(self.trace_level + 42, "next_work_this_volume: rq1 %s", rq)
 
             # The completed request had a regular priority
             if priority and priority[0] > 0 and priority[1] < 0:
@@ -3014,7 +3014,7 @@ class LibraryManagerMethods:
                                                            disabled_hosts=self.disabled_hosts)  # get next request
                                     continue
 
-            Trace.trace(self.trace_level + 10, "next_work_this_volume: next admin rq %s" % (rq,))
+            Trace.tracef(self.trace_level + 10, "next_work_this_volume: next admin rq %s", rq)
 
             if rq.ticket.has_key('reject_reason'):
                 del (rq.ticket['reject_reason'])
@@ -3039,7 +3039,7 @@ class LibraryManagerMethods:
                                                key=alt_key_for_admin_priority,
                                                next=1,
                                                disabled_hosts=self.disabled_hosts)
-                    Trace.trace(self.trace_level + 10, "next_work_this_volume: continue with %s" % (rq,))
+                    Trace.tracef(self.trace_level + 10, "next_work_this_volume: continue with %s", rq)
                     continue
                 break
             elif rq.work == 'write_to_hsm':
@@ -3067,7 +3067,7 @@ class LibraryManagerMethods:
                                                key=alt_key_for_admin_priority,
                                                next=1,
                                                disabled_hosts=self.disabled_hosts)
-                    Trace.trace(self.trace_level + 10, "next_work_this_volume: continue with %s" % (rq,))
+                    Trace.tracef(self.trace_level + 10, "next_work_this_volume: continue with %s", rq)
                     continue
                 break
         # end while
@@ -3075,10 +3075,10 @@ class LibraryManagerMethods:
         if not rq:
             # no request matching to all criterias
             # use a temporarily stored request
-            Trace.trace(self.trace_level + 10, "next_work_this_volume: use tmp_rq %s" % (self.tmp_rq,))
+            Trace.tracef(self.trace_level + 10, "next_work_this_volume: use tmp_rq %s", self.tmp_rq)
             rq = self.tmp_rq
         if rq:
-            Trace.trace(self.trace_level + 10, "next_work_this_volume: HIPRI processing result %s" % (rq.ticket,))
+            Trace.tracef(self.trace_level + 10, "next_work_this_volume: HIPRI processing result %s", rq.ticket)
             if rq.work == 'read_from_hsm':
                 if checked_request and checked_request.unique_id == rq.unique_id:
                     # This is a case when rq != self.tmp_rq.
@@ -3112,8 +3112,8 @@ class LibraryManagerMethods:
             # process request
             start_t = time.time()
             rq, status = self.schedule(requestor)
-            Trace.trace(self.trace_level + 10, "next_work_this_volume: SCHEDULE RETURNED %s %s" % (rq, status))
-            Trace.trace(100, "next_work_this_volume: SCHEDULE, time in state %s" % (time.time() - start_t,))
+            Trace.tracef(self.trace_level + 10, "next_work_this_volume: SCHEDULE RETURNED %s %s", rq, status)
+            Trace.tracef(100, "next_work_this_volume: SCHEDULE, time in state %s", time.time() - start_t)
             if rq and rq.ticket['encp']['curpri'] > 0:
                 # preempt current low priority request
                 # by request with normal priority
@@ -3172,14 +3172,14 @@ class LibraryManagerMethods:
                     del (rq.ticket['reject_reason'])
 
                 if rq:
-                    Trace.trace(self.trace_level + 10, "next_work_this_volume: s2 rq %s" % (rq.ticket,))
+                    Trace.tracef(self.trace_level + 10, "next_work_this_volume: s2 rq %s", rq.ticket)
                     if rq.work == 'read_from_hsm':
                         rq, key = self.process_read_request(rq, requestor)
                         if self.continue_scan:
                             # before continuing check if it is a request
                             # for v['external_label']
                             if rq and rq.ticket['fc']['external_label'] == external_label:
-                                Trace.trace(self.trace_level + 10, "next_work_this_volume:exc_limit_rq 1 %s" % (rq,))
+                                Trace.tracef(self.trace_level + 10, "next_work_this_volume:exc_limit_rq 1 %s", rq)
                                 exc_limit_rq = rq
                                 checked_request = rq
                                 break
@@ -3251,14 +3251,14 @@ class LibraryManagerMethods:
 
             if rq and rq.work == 'write_to_hsm' and self.mover_type(requestor) != 'DiskMover':
                 while rq:
-                    Trace.trace(self.trace_level + 10, "next_work_this_volume: LABEL %s RQ %s" % (external_label, rq))
+                    Trace.tracef(self.trace_level + 10, "next_work_this_volume: LABEL %s RQ %s", external_label, rq)
                     # regular write request must have the same volume label
                     rq.ticket['fc']['external_label'] = external_label
                     if checked_request and checked_request.unique_id == rq.unique_id:
                         status = (e_errors.OK, None)
                     else:
                         rq, status = self.check_write_request(external_label, rq, requestor)
-                    Trace.trace(self.trace_level + 10, "next_work_this_volume: RQ %s STAT %s" % (rq, status))
+                    Trace.tracef(self.trace_level + 10, "next_work_this_volume: RQ %s STAT %s", rq, status)
                     if rq: Trace.trace(self.trace_level + 10, "next_work_this_volume: TICK %s" % (rq.ticket,))
                     if rq and status[0] == e_errors.OK:
                         return rq, status
@@ -3269,7 +3269,7 @@ class LibraryManagerMethods:
                                            disabled_hosts=self.disabled_hosts)
             # return read work
             if rq:
-                Trace.trace(self.trace_level + 10, "next_work_this_volume: s4 rq %s" % (rq.ticket,))
+                Trace.tracef(self.trace_level + 10, "next_work_this_volume: s4 rq %s", rq.ticket)
                 if checked_request and checked_request.unique_id == rq.unique_id:
                     status = (e_errors.OK, None)
                 else:
@@ -3306,7 +3306,7 @@ class LibraryManagerMethods:
         external_label, self.suspect_volumes.list))
         for vol in self.suspect_volumes.list:
             if external_label == vol['external_label']:
-                Trace.trace(self.trace_level + 11, "is_volume_suspect: returning %s" % (vol,))
+                Trace.tracef(self.trace_level + 11, "is_volume_suspect: returning %s", vol)
                 return vol
         Trace.trace(self.trace_level + 11, "is_volume_suspect: returning None")
         return None
@@ -3325,16 +3325,16 @@ class LibraryManagerMethods:
                               :obj:`str`- mover name or :obj:`None`)
         """
 
-        Trace.trace(self.trace_level + 11, "is_mover_suspect: %s %s" % (mover, external_label))
+        Trace.tracef(self.trace_level + 11, "is_mover_suspect: %s %s", mover, external_label)
         vol = self.is_volume_suspect(external_label)
         if vol:
             for mov in vol['movers']:
                 if mover == mov:
                     break
             else:
-                Trace.trace(self.trace_level + 11, "is_mover_suspect: returning %s, None" % (vol,))
+                Trace.tracef(self.trace_level + 11, "is_mover_suspect: returning %s, None", vol)
                 return vol, None
-            Trace.trace(self.trace_level + 11, "is_mover_suspect: returning %s %s" % (vol, mov))
+            Trace.tracef(self.trace_level + 11, "is_mover_suspect: returning %s %s", vol, mov)
             return vol, mov
         else:
             Trace.trace(self.trace_level + 11, "is_mover_suspect: returning None, None")
@@ -3517,7 +3517,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
         t0 = time.time()
         apply(function, (ticket,))
         dt = time.time() - t0
-        Trace.trace(5, 'request_thread:thread finished %s %s %s' % (ticket['work'], ticket['mover'], dt))
+        Trace.tracef(5, 'request_thread:thread finished %s %s %s', ticket['work'], ticket['mover'], dt)
         """
         if dt >= 3.:
             Trace.trace(5,"request_thread:process_mover_request: changing logging")
@@ -3532,7 +3532,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
 
         '''
         if (function, ticket) in self.mover_rq_in_progress:
-            Trace.trace(5, 'removing %s from %s'%((function, ticket), self.mover_rq_in_progress))
+            Trace.tracef(5, 'removing %s from %s', (function, ticket), self.mover_rq_in_progress)
             self.mover_rq_in_progress.remove((function, ticket))
         '''
 
@@ -3546,7 +3546,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
             rc = 0
         else:
             rc = 1
-        Trace.trace(self.my_trace_level + 100, "accept_request: rc %s" % (rc,))
+        Trace.tracef(self.my_trace_level + 100, "accept_request: rc %s", rc)
         return rc
 
     # check startup flag
@@ -3615,7 +3615,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
         :rtype: :obj:`int` 1 - allowed, 0 - not allowed
         """
         self.allow_access = self.keys.get('allow', None)  # allow host access on a per storage group
-        Trace.trace(self.my_trace_level + 100, 'access_granted: allow_access %s' % (self.allow_access,))
+        Trace.tracef(self.my_trace_level + 100, 'access_granted: allow_access %s', self.allow_access)
         if self.allow_access == None:
             return 1
         if ticket['vc'].has_key('storage_group'):
@@ -3848,7 +3848,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
         ## check if there are any additional restrictions
         rc, fun, args, action = self.restrictor.match_found(ticket)
 
-        Trace.trace(self.my_trace_level + 100, "write_to_hsm:match returned %s %s %s %s" % (rc, fun, args, action))
+        Trace.tracef(self.my_trace_level + 100, "write_to_hsm:match returned %s %s %s %s", rc, fun, args, action)
         if fun == 'restrict_host_access' and action != e_errors.REJECT:
             action = None  # do nothing here
         if rc and fun and action:
@@ -3988,7 +3988,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
             return
         ## check if there are any additional restrictions
         rc, fun, args, action = self.restrictor.match_found(ticket)
-        Trace.trace(self.my_trace_level + 100, "read_from_hsm: match returned %s %s %s %s" % (rc, fun, args, action))
+        Trace.tracef(self.my_trace_level + 100, "read_from_hsm: match returned %s %s %s %s", rc, fun, args, action)
         if fun == 'restrict_host_access' and action != e_errors.REJECT:
             action = None  # do nothing here
         if rc and fun and action:
@@ -4120,14 +4120,14 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
         t = time.time()
         saved_reply_address = mticket.get('r_a', None)
         nowork = {'work': 'no_work', 'r_a': saved_reply_address}
-        Trace.trace(5, "mover_idle: %s" % (mticket['mover'],))
+        Trace.tracef(5, "mover_idle: %s", mticket['mover'])
         if self.lm_lock == e_errors.MOVERLOCKED:
-            Trace.trace(5, "mover_idle: mover request in progress sending nowork %s" % (nowork,))
+            Trace.tracef(5, "mover_idle: mover request in progress sending nowork %s", nowork)
             self.reply_to_caller(nowork)
         else:
             if self.use_threads:
                 if not self.in_progress_lock.acquire(False):
-                    Trace.trace(5, "mover_idle: mover request in progress sending nowork %s" % (nowork,))
+                    Trace.tracef(5, "mover_idle: mover request in progress sending nowork %s", nowork)
                     self.reply_to_caller(nowork)
                 else:
                     # the lock was acquired
@@ -4157,8 +4157,8 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
         :arg mticket: mover request
         """
 
-        Trace.trace(self.my_trace_level, "_mover_idle:IDLE RQ %s" % (mticket,))
-        Trace.trace(self.my_trace_level, "_mover_idle:idle movers %s" % (self.idle_movers,))
+        Trace.tracef(self.my_trace_level, "_mover_idle:IDLE RQ %s", mticket)
+        Trace.tracef(self.my_trace_level, "_mover_idle:idle movers %s", self.idle_movers)
 
         # thread safe
         saved_reply_address = mticket.get('r_a', None)
@@ -4177,7 +4177,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
         # This code requires a new key in the mover ticket
         if mticket.has_key("current_time"):
             mover = mticket['mover']
-            Trace.trace(11, "_mover_idle: active movers: %s" % (self.volumes_at_movers.at_movers.keys(),))
+            Trace.tracef(11, "_mover_idle: active movers: %s", self.volumes_at_movers.at_movers.keys())
             if mover in self.volumes_at_movers.at_movers:
                 # how idle mover can be in the active list?
                 # continue checking. This check requires synchronization between LM and mover machines.
@@ -4202,7 +4202,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
             return
 
         if self.lm_lock in (e_errors.PAUSE, e_errors.BROKEN):
-            Trace.trace(self.my_trace_level, "mover_idle: LM state is %s no mover request processing" % (self.lm_lock,))
+            Trace.tracef(self.my_trace_level, "mover_idle: LM state is %s no mover request processing", self.lm_lock)
             self.reply_to_caller(nowork)
             return
 
@@ -4215,7 +4215,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
 
         # find mover in the work_at_movers
         found = 0
-        Trace.trace(self.my_trace_level + 1, "mover_idle: work_at_movers: %s" % (self.work_at_movers.list,))
+        Trace.tracef(self.my_trace_level + 1, "mover_idle: work_at_movers: %s", self.work_at_movers.list)
         for wt in self.work_at_movers.list:
             Trace.trace(self.my_trace_level,
                         "mover_idle:work_at_movers: mover %s id %s" % (wt['mover'], wt['unique_id']))
@@ -4240,7 +4240,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
             # check if it is a backed up request
             if ((mover_rq_unique_id and mover_rq_unique_id != work_at_mover_unique_id) and
                     (mticket["time_in_state"] < 60)):  # allow 60 s for possible communication re-tries
-                Trace.trace(self.my_trace_level + 1, "mover_idle: found backed up mover %s" % (mticket['mover'],))
+                Trace.tracef(self.my_trace_level + 1, "mover_idle: found backed up mover %s", mticket['mover'])
                 Trace.trace(self.my_trace_level + 1, "mover_idle: mover_rq_unique_id %s work_at_mover_unique_id %s" % (
                 mover_rq_unique_id, work_at_mover_unique_id))
                 self.reply_to_caller(nowork)  # AM!!!!!
@@ -4252,8 +4252,8 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
 
         start_t = time.time()
         rq, status = self.schedule(mticket)
-        Trace.trace(self.my_trace_level, "mover_idle: SCHEDULE RETURNED %s %s" % (rq, status))
-        Trace.trace(100, "mover_idle: SHEDULE, time in state %s" % (time.time() - start_t,))
+        Trace.tracef(self.my_trace_level, "mover_idle: SCHEDULE RETURNED %s %s", rq, status)
+        Trace.tracef(100, "mover_idle: SHEDULE, time in state %s", time.time() - start_t)
 
         # no work means we're done
         if status[0] == e_errors.NOWORK:
@@ -4364,7 +4364,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
                 # If file is a part of a package open the corresponding package istead of opening a requested file.
                 # This guaraties that the files in the package will be opened syncronously.
                 bfid_to_open = self.is_packaged(w)  # package id
-                Trace.trace(self.my_trace_level + 1, "_mover_idle: bfid_to_open %s" % (bfid_to_open,))
+                Trace.tracef(self.my_trace_level + 1, "_mover_idle: bfid_to_open %s", bfid_to_open)
 
                 if not bfid_to_open:
                     bfid_to_open = w['fc']['bfid']
@@ -4380,7 +4380,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
         Trace.trace(self.my_trace_level, "mover_idle: File Family = %s" % (w['vc']['file_family']))
 
         log_add_to_wam_queue(w['vc'])
-        Trace.trace(self.my_trace_level, "mover_idle: appending to work_at_movers %s" % (w,))
+        Trace.tracef(self.my_trace_level, "mover_idle: appending to work_at_movers %s", w)
         if not w in self.work_at_movers.list:
             self.work_at_movers.append(w)
         else:
@@ -4417,9 +4417,9 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
                                         vol_info.get('user_inhibit', ['Unknown', 'Unknown']))
             if "Unknown" in mticket['volume_status'][0] or "Unknown" in mticket['volume_status'][1]:
                 # sometimes it happens: why?
-                Trace.trace(e_errors.ERROR, "mover_idle:Unknown! %s" % (vol_info,))
+                Trace.tracef(e_errors.ERROR, "mover_idle:Unknown! %s", vol_info)
 
-        Trace.trace(self.my_trace_level + 1, "mover_idle: Mover Ticket %s" % (mticket,))
+        Trace.tracef(self.my_trace_level + 1, "mover_idle: Mover Ticket %s", mticket)
         self.volumes_at_movers.put(mticket)
         Trace.trace(self.my_trace_level + 1, "mover_idle:IDLE:postponed%s %s" % (
         self.postponed_requests.sg_list, self.postponed_requests.rq_list))
@@ -4459,7 +4459,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
         :arg mticket: mover request
         """
 
-        Trace.trace(self.my_trace_level, "_mover_busy: BUSY RQ %s" % (mticket,))
+        Trace.tracef(self.my_trace_level, "_mover_busy: BUSY RQ %s", mticket)
         library = mticket.get('library', None)
         if library and library != self.name.split(".")[0] and not self.share_movers:
             # this mover is currently assigned to another library
@@ -4471,7 +4471,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
                     movers_to_delete.append(mv)
             if movers_to_delete:
                 for mv in movers_to_delete:
-                    Trace.trace(self.my_trace_level + 1, "mover_busy: removing from at movers %s" % (mv,))
+                    Trace.tracef(self.my_trace_level + 1, "mover_busy: removing from at movers %s", mv)
                     self.volumes_at_movers.delete(mv)
             return
         state = mticket.get('state', None)
@@ -4490,13 +4490,13 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
                     mticket['volume_status'] = (vol_info.get('system_inhibit', ['none', 'none']),
                                                 vol_info.get('user_inhibit', ['none', 'none']))
 
-                    Trace.trace(self.my_trace_level, "mover_busy: updated mover ticket: %s" % (mticket,))
+                    Trace.tracef(self.my_trace_level, "mover_busy: updated mover ticket: %s", mticket)
                     self.volumes_at_movers.put(mticket)
                 else:
                     Trace.log(e_errors.ERROR, "mover_busy: can't update volume info, status:%s" %
                               (vol_info['status'],))
             else:
-                Trace.trace(self.my_trace_level, "mover_busy: updated mover ticket: %s" % (mticket,))
+                Trace.tracef(self.my_trace_level, "mover_busy: updated mover ticket: %s", mticket)
                 self.volumes_at_movers.put(mticket)
 
         # do not reply to mover as it does not
@@ -4514,10 +4514,10 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
         t = time.time()
         saved_reply_address = mticket.get('r_a', None)
         nowork = {'work': 'no_work', 'processing_requests': True, 'r_a': saved_reply_address}
-        Trace.trace(5, "mover_bound_volume %s" % (mticket['mover'],))
+        Trace.tracef(5, "mover_bound_volume %s", mticket['mover'])
         if self.use_threads:
             if not self.in_progress_lock.acquire(False):
-                Trace.trace(5, "mover_bound_volume: mover request in progress sending nowork %s" % (nowork,))
+                Trace.tracef(5, "mover_bound_volume: mover request in progress sending nowork %s", nowork)
                 """
                 The following code is commented, but may be needed for
                 debugging.
@@ -4525,7 +4525,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
                 for thread in threads:
                     if thread.isAlive():
                         thread_name = thread.getName()
-                        Trace.trace(5, "active threads: %s"%(thread_name,))
+                        Trace.tracef(5, "active threads: %s", thread_name)
                 """
                 self.postponed_bound_requests.put(mticket)
             else:
@@ -4555,8 +4555,8 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
         :arg mticket: mover request
         """
 
-        Trace.trace(self.my_trace_level, "mover_bound_volume for %s: request: %s" % (mticket['mover'], mticket))
-        Trace.trace(self.my_trace_level, "_mover_bound_volume:idle movers %s" % (self.idle_movers,))
+        Trace.tracef(self.my_trace_level, "mover_bound_volume for %s: request: %s", mticket['mover'], mticket)
+        Trace.tracef(self.my_trace_level, "_mover_bound_volume:idle movers %s", self.idle_movers)
         # thread safe
         saved_reply_address = mticket.get('r_a', None)
         nowork = {'work': 'no_work', 'r_a': saved_reply_address}
@@ -4617,7 +4617,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
                     mticket['volume_status'] = (vol_info.get('system_inhibit', ['none', 'none']),
                                                 vol_info.get('user_inhibit', ['none', 'none']))
 
-                    Trace.trace(self.my_trace_level, "mover_bound_volume: updated mover ticket: %s" % (mticket,))
+                    Trace.tracef(self.my_trace_level, "mover_bound_volume: updated mover ticket: %s", mticket)
                 else:
                     Trace.log(e_errors.ERROR, "mover_bound_volume: can not update volume info, status:%s" %
                               (vol_info['status'],))
@@ -4663,7 +4663,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
                             "_mover_bound_volume %s %s" % (mticket['unique_id'], w['unique_id']))
                 self.reply_to_caller(nowork)  # AM !!!!!!!
                 return
-            Trace.trace(self.my_trace_level + 1, "_mover_bound_volume: removing %s  from the queue" % (w,))
+            Trace.tracef(self.my_trace_level + 1, "_mover_bound_volume: removing %s  from the queue", w)
             # file family may be changed by VC during the volume
             # assignment. Set file family to what VC has returned
             if mticket['external_label']:
@@ -4710,7 +4710,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
             Trace.log(e_errors.INFO, "HAVE_BOUND:sending %s %s to mover %s %s DEL_DISM %s" %
                       (w['work'], w['wrapper']['pnfsFilename'], mticket['mover'],
                        mticket['address'], w['encp']['delayed_dismount']))
-            Trace.trace(self.my_trace_level, "HAVE_BOUND: Ticket %s" % (w,))
+            Trace.tracef(self.my_trace_level, "HAVE_BOUND: Ticket %s", w)
             self.pending_work.delete(rq)
             Trace.trace(self.my_trace_level + 1, "_mover_bound_volume: HAVE_BOUND: DELETED")
             w['times']['lm_dequeued'] = time.time()
@@ -4726,7 +4726,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
                     w['vc'].update(vol_info)
             log_add_to_wam_queue(w['vc'])
             # self.work_at_movers.append(w)
-            Trace.trace(self.my_trace_level + 1, "mover_bound_volume: appending to work_at_movers %s" % (w,))
+            Trace.tracef(self.my_trace_level + 1, "mover_bound_volume: appending to work_at_movers %s", w)
             if not w in self.work_at_movers.list:
                 self.work_at_movers.append(w)
             else:
@@ -4762,7 +4762,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
                                                 vol_info.get('user_inhibit', ['Unknown', 'Unknown']))
                     if "Unknown" in mticket['volume_status'][0] or "Unknown" in mticket['volume_status'][1]:
                         # sometimes it happens: why?
-                        Trace.trace(e_errors.ERROR, "mover_bund_volume:Unknown! %s" % (vol_info,))
+                        Trace.tracef(e_errors.ERROR, "mover_bund_volume:Unknown! %s", vol_info)
 
             # create new mover_info
             mticket['status'] = (e_errors.OK, None)
@@ -4827,7 +4827,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
         """
 
         Trace.log(e_errors.ERROR, "MOVER ERROR RQ %s" % (mticket,))
-        Trace.trace(self.my_trace_level, "mover_error: %s" % (mticket,))
+        Trace.tracef(self.my_trace_level, "mover_error: %s", mticket)
         library = mticket.get('library', None)
         if library and library != self.name.split(".")[0]:
             return
@@ -4839,7 +4839,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
             # mover error request comes with mover state != IDLE
             self.remove_idle_mover(mticket["mover"])
             self.volumes_at_movers.put(mticket)
-        Trace.trace(self.my_trace_level, "mover_error:idle movers %s" % (self.idle_movers,))
+        Trace.tracef(self.my_trace_level, "mover_error:idle movers %s", self.idle_movers)
 
         # get the work ticket for the volume
         w = {}
@@ -4851,7 +4851,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
             # In this case external label from mover and external label in at_movers list
             # may be different.
             w = self.get_work_at_movers_m(mticket['mover'])
-        Trace.trace(self.my_trace_level, "mover_error: work_at_movers %s" % (w,))
+        Trace.tracef(self.my_trace_level, "mover_error: work_at_movers %s", w)
         if w:
             self.work_at_movers.remove(w)
         if ((mticket['state'] == mover_constants.OFFLINE) or  # mover finished request and went offline
@@ -4860,13 +4860,13 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
                   (mticket['status'][0] == e_errors.DISMOUNTFAILED)) and  # preempted volume dismount failed
                  mticket['state'] != 'HAVE_BOUND')):
             rc = self.volumes_at_movers.delete(mticket)
-            Trace.trace(self.my_trace_level, "mover_error: volumes_at_movers.delete returned %s" % (rc,))
+            Trace.tracef(self.my_trace_level, "mover_error: volumes_at_movers.delete returned %s", rc)
             if mticket['status'][0] == e_errors.DISMOUNTFAILED:
                 if rc != 0:
                     # check what kind of request was the last request, sent to this mover
                     if w:
                         admin_pri = w.get('encp', {}).get('adminpri', -1)
-                        Trace.trace(self.my_trace_level, "mover_error: admin_pri %s" % (admin_pri,))
+                        Trace.tracef(self.my_trace_level, "mover_error: admin_pri %s", admin_pri)
                         if admin_pri > 0:
                             # There was an attempt to preempt a mounted volume
                             # with admin. priority request.
@@ -4948,7 +4948,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
 
                         # remove entry from suspect volume list
                         self.suspect_volumes.remove(vol)
-                        Trace.trace(self.my_trace_level, "mover_error: removed from suspect volume list %s" % (vol,))
+                        Trace.tracef(self.my_trace_level, "mover_error: removed from suspect volume list %s", vol)
 
                         self.flush_pending_jobs(e_errors.NOACCESS, label)
                 else:
@@ -5378,7 +5378,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
 
         Trace.log(e_errors.INFO, "(Re)initializing server")
         self.keys = self.csc.get(self.name)
-        Trace.trace(self.my_trace_level + 2, "reinit:new keys %s" % (self.keys,))
+        Trace.tracef(self.my_trace_level + 2, "reinit:new keys %s", self.keys)
 
         self.allow_access = self.keys.get('allow', None)
         self.pri_sel.read_config()
@@ -5390,7 +5390,7 @@ class LibraryManager(dispatching_worker.DispatchingWorker,
         # if restrict_access_in_bound is True then restrict simultaneous host access
         # as specified in discipline
         self.restrict_access_in_bound = self.keys.get('restrict_access_in_bound', None)
-        Trace.trace(self.my_trace_level + 2, "reinit:restrict_access_in_bound %s" % (self.restrict_access_in_bound,))
+        Trace.tracef(self.my_trace_level + 2, "reinit:restrict_access_in_bound %s", self.restrict_access_in_bound)
         c_lock = self.lm_lock
         self.lm_lock = self.get_lock()
         if not self.lm_lock:
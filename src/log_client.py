@@ -400,6 +400,20 @@ class LoggerClient(generic_client.GenericClient):
 	                 rcv_timeout, tries )
         return x
 
+    # find the log lines of period with all the words (bfids, volume
+    # labels, unique_ids), severity, host, sender and message type given.
+    # start and end (seconds of the day) limit the search to that time.
+    # the lines are returned in ticket['matches'] as
+    # (log file name, offset, line)
+    def query(self, words=(), severity=None, host=None, sender=None,
+              msg_type=None, period="today", start=None, end=None,
+              rcv_timeout=0, tries=0):
+        ticket = {'work':'query_log', 'words':list(words),
+                  'severity':severity, 'host':host, 'sender':sender,
+                  'msg_type':msg_type, 'period':period,
+                  'start':start, 'end':end}
+        return self.send(ticket, rcv_timeout, tries, long_reply=1)
+
 class TCPLoggerClient(LoggerClient):
     def __init__(self, csc, name = MY_NAME, server_name = MY_SERVER,
                  server_address = None, flags = 0, alarmc = None,
@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+"""
+Index of the Enstore log files.
+
+For each log file LOG-YYYY-MM-DD[.N] the log server keeps an index file
+index/LOG-YYYY-MM-DD[.N].idx in the log directory.  It lists, for every
+10 minute bucket of the day, the byte offsets of the lines with a given
+severity, host, sender, message type or word that looks like a bfid, a
+tape label or an encp unique_id.  A search reads the index and seeks
+straight to the matching lines instead of reading the whole log file.
+
+Index file lines are
+    bucket key offset,delta,delta,...
+      postings of key: first offset and then offset - previous offset
+    . offset
+      marker: the log file is indexed up to offset
+Keys are S:severity, H:host, N:sender, T:message type and W:word.
+
+The part of a log file after the last marker (not indexed yet, or
+indexed by a log server which died) is read and matched line by line.
+
+usage: log_index.py [--search word [--severity S] [--host H] [--sender N]
+                    [--type T]] logfile ...
+       log_index.py --rebuild logfile ...
+"""
+
+# system imports
+import os
+import re
+import sys
+import string
+
+# enstore imports
+import Trace
+
+INDEX_DIR = "index"
+INDEX_SUFFIX = ".idx"
+BUCKET = 600              # seconds of the day in a time bucket
+MAX_PENDING = 20000       # offsets kept in memory before they are written
+MARKER = "."
+
+# words of the message text which are indexed
+WORD_RE = re.compile(
+    r"(?<![A-Za-z0-9.-])("
+    r"[A-Za-z0-9][A-Za-z0-9.-]*-[0-9]{9,10}-[0-9]+-[0-9]+"      # unique_id
+    r"|[A-Za-z]{0,8}[0-9]{11,19}L?"                              # bfid
+    r"|(?=[A-Z]*[0-9])[A-Z0-9]{6}(?:L[0-9]|M[0-9]|JC|JY|J)?"     # tape label
+    r")(?![A-Za-z0-9])")
+
+SEVERITY = "S:"
+HOST = "H:"
+SENDER = "N:"
+MSG_TYPE = "T:"
+WORD = "W:"
+
+def index_name(logfile_name):
+    dirname, filename = os.path.split(logfile_name)
+    return os.path.join(dirname, INDEX_DIR, "%s%s"%(filename, INDEX_SUFFIX))
+
+def is_indexed_word(word):
+    m = WORD_RE.match(word)
+    return m is not None and m.end() == len(word)
+
+# return the keys of a log file line
+#    HH:MM:SS HOST PID USER SEVERITY SENDER MESSAGE
+def line_keys(line):
+    if line[8:31] == " last message repeated ":
+        return []
+    fields = string.split(line, None, 6)
+    if len(fields) < 6:
+        return []
+    keys = [SEVERITY+fields[4], HOST+fields[1], SENDER+fields[5]]
+    if len(fields) == 7:
+        text = fields[6]
+        i = string.find(text, Trace.MSG_TYPE)
+        if i != -1:
+            msg_type = string.split(text[i+len(Trace.MSG_TYPE):], None, 1)
+            if msg_type:
+                keys.append(MSG_TYPE+msg_type[0])
+        for word in WORD_RE.findall(text):
+            key = WORD+word
+            if key not in keys:
+                keys.append(key)
+    return keys
+
+# return the time bucket of a log file line
+def line_bucket(line):
+    try:
+        return (int(line[0:2])*3600 + int(line[3:5])*60 + int(line[6:8])) / BUCKET
+    except ValueError:
+        return None
+
+# return the keys to look up for a search
+def search_keys(words=(), severity=None, host=None, sender=None, msg_type=None):
+    keys = []
+    for word in words:
+        keys.append(WORD+word)
+    for prefix, value in ((SEVERITY, severity), (HOST, host),
+                          (SENDER, sender), (MSG_TYPE, msg_type)):
+        if value:
+            keys.append(prefix+value)
+    return keys
+
+class LogIndexer:
+    """
+    Postings of the lines written to one log file.  They are appended to
+    the index file when the time bucket changes and when MAX_PENDING of
+    them are kept.  flush() also writes the marker; call it only after the
+    log file itself was flushed, so that the marker never covers lines
+    which are not on disk.
+    """
+
+    def __init__(self, logfile_name):
+        self.logfile_name = logfile_name
+        self.index_name = index_name(logfile_name)
+        self.postings = {}      # key: list of offsets, in the current bucket
+        self.pending = 0
+        self.bucket = None
+        dirname = os.path.dirname(self.index_name)
+        if not os.path.exists(dirname):
+            os.makedirs(dirname)
+        self.offset = read_marker(self.index_name)
+        self.marked = self.offset
+        self.index_file = open(self.index_name, 'a+')
+        # do not append to a line left unfinished by a crash
+        self.index_file.seek(0, 2)
+        if self.index_file.tell() > 0:
+            self.index_file.seek(-1, 2)
+            if self.index_file.read(1) != "\n":
+                self.index_file.write("\n")
+        # index what was written to the log file since the last marker
+        try:
+            logfile = open(logfile_name, 'r')
+        except IOError:
+            return
+        logfile.seek(self.offset)
+        for line in logfile:
+            self.add(line)
+        logfile.close()
+        self.flush()
+
+    # index a line written to the log file at self.offset
+    def add(self, line):
+        bucket = line_bucket(line)
+        if bucket is not None:
+            if bucket != self.bucket:
+                self.write_postings()
+                self.bucket = bucket
+            for key in line_keys(line):
+                self.postings.setdefault(key, []).append(self.offset)
+                self.pending = self.pending + 1
+        self.offset = self.offset + len(line)
+        if self.pending >= MAX_PENDING:
+            self.write_postings()
+
+    def write_postings(self):
+        if not self.pending:
+            return
+        lines = []
+        for key, offsets in self.postings.items():
+            deltas = [str(offsets[0])]
+            for i in range(1, len(offsets)):
+                deltas.append(str(offsets[i] - offsets[i-1]))
+            lines.append("%s %s %s\n"%(self.bucket, key, string.join(deltas, ",")))
+        self.index_file.write(string.join(lines, ""))
+        self.postings = {}
+        self.pending = 0
+
+    # write out the postings and mark the log file indexed up to self.offset
+    def flush(self):
+        self.write_postings()
+        if self.offset != self.marked:
+            self.index_file.write("%s %s\n"%(MARKER, self.offset))
+            self.marked = self.offset
+        self.index_file.flush()
+
+    def close(self):
+        self.flush()
+        self.index_file.close()
+
+# return the offset of the log file up to which index_name indexes it
+def read_marker(index_name):
+    try:
+        f = open(index_name, 'r')
+    except IOError:
+        return 0L
+    # the marker is normally the last line, look at the end of the file
+    f.seek(0, 2)
+    size = f.tell()
+    offset = 0L
+    tail = 4096
+    while 1:
+        f.seek(max(size - tail, 0))
+        lines = string.split(f.read(), "\n")
+        for line in lines:
+            if line[:2] == MARKER + " ":
+                try:
+                    offset = max(offset, long(line[2:]))
+                except ValueError:
+                    pass
+        if offset or tail >= size:
+            break
+        tail = tail * 16
+    f.close()
+    return offset
+
+# return the list of log file offsets of the postings of keys in index_name,
+# which are in the buckets from start to end (seconds of the day), and the
+# offset up to which the log file is indexed.
+def read_postings(index_name, keys, start=None, end=None):
+    if start is not None:
+        start = start / BUCKET
+    if end is not None:
+        end = end / BUCKET
+    found = {}
+    for key in keys:
+        found[key] = {}
+    marker = 0L
+    try:
+        f = open(index_name, 'r')
+    except IOError:
+        return [], 0L
+    for line in f:
+        fields = string.split(line)
+        if len(fields) == 2 and fields[0] == MARKER:
+            try:
+                marker = max(marker, long(fields[1]))
+            except ValueError:
+                pass
+            continue
+        if len(fields) != 3 or not found.has_key(fields[1]):
+            continue
+        try:
+            bucket = int(fields[0])
+            if (start is not None and bucket < start) or \
+               (end is not None and bucket > end):
+                continue
+            offset = 0L
+            postings = found[fields[1]]
+            for delta in string.split(fields[2], ","):
+                offset = offset + long(delta)
+                postings[offset] = 1
+        except ValueError:
+            continue
+    f.close()
+    if not keys:
+        return [], marker
+    offsets = found[keys[0]]
+    for key in keys[1:]:
+        other = found[key]
+        offsets = dict([(o, 1) for o in offsets.keys() if other.has_key(o)])
+    offsets = offsets.keys()
+    offsets.sort()
+    return offsets, marker
+
+def line_matches(line, keys, start=None, end=None):
+    if start is not None or end is not None:
+        bucket = line_bucket(line)
+        if bucket is None or \
+           (start is not None and bucket < start / BUCKET) or \
+           (end is not None and bucket > end / BUCKET):
+            return 0
+    line_k = line_keys(line)
+    for key in keys:
+        if key not in line_k:
+            return 0
+    return 1
+
+def search(logfile_name, words=(), severity=None, host=None, sender=None,
+           msg_type=None, start=None, end=None):
+    """
+    Find the lines of a log file with all of the words (which must look
+    like bfids, tape labels or unique_ids), the severity, host, sender and
+    message type asked for.  start and end limit the search to the time
+    buckets of these times (seconds of the day).
+
+    :rtype: :obj:`list` of (:obj:`long` offset, :obj:`str` line)
+    """
+    keys = search_keys(words, severity, host, sender, msg_type)
+    if not keys:
+        raise ValueError("nothing to search for")
+    offsets, marker = read_postings(index_name(logfile_name), keys,
+                                    start, end)
+    matches = []
+    logfile = open(logfile_name, 'r')
+    try:
+        for offset in offsets:
+            if offset >= marker:
+                break
+            logfile.seek(offset)
+            line = logfile.readline()
+            # check the line, in case the log file was replaced
+            if line and line_matches(line, keys):
+                matches.append((offset, line))
+        # read what is not indexed yet
+        logfile.seek(marker)
+        offset = marker
+        while 1:
+            line = logfile.readline()
+            if not line:
+                break
+            if line_matches(line, keys, start, end):
+                matches.append((offset, line))
+            offset = offset + len(line)
+    finally:
+        logfile.close()
+    return matches
+
+def build_index(logfile_name):
+    """
+    Make the index of an existing log file, replacing its index if any.
+    """
+    name = index_name(logfile_name)
+    if os.path.exists(name):
+        os.unlink(name)
+    indexer = LogIndexer(logfile_name)
+    indexer.close()
+    return name
+
+
+if __name__ == "__main__":   # pragma: no cover
+    args = sys.argv[1:]
+    if not args or args[0] in ("-h", "--help"):
+        print __doc__
+        sys.exit(0)
+    if args[0] == "--rebuild":
+        for logfile_name in args[1:]:
+            print build_index(logfile_name)
+        sys.exit(0)
+    query = {}
+    words = []
+    options = {"--search": None, "--severity": "severity", "--host": "host",
+               "--sender": "sender", "--type": "msg_type"}
+    while args and options.has_key(args[0]):
+        if len(args) < 2:
+            sys.exit("%s needs a value"%(args[0],))
+        if args[0] == "--search":
+            words.append(args[1])
+        else:
+            query[options[args[0]]] = args[1]
+        args = args[2:]
+    for logfile_name in args:
+        for offset, line in search(logfile_name, words, **query):
+            sys.stdout.write("%s:%s: %s"%(os.path.basename(logfile_name),
+                                          offset, line))
@@ -52,6 +52,7 @@ import e_errors
 import hostaddr
 import Trace
 import log_client
+import log_index
 import option
 import callback
 
@@ -59,6 +60,11 @@ MY_NAME = enstore_constants.LOG_SERVER   #"log_server"
 FILE_PREFIX = "LOG-"
 NO_MAX_LOG_FILE_SIZE = -1L
 MAX_TCP_MESSAGE_SIZE = enstore_constants.MB*10
+# log messages are written to the files in groups: the files are flushed
+# when FLUSH_BYTES were written or FLUSH_INTERVAL seconds passed since
+# the last flush, whichever comes first.
+FLUSH_BYTES = 64*enstore_constants.KB
+FLUSH_INTERVAL = 1.0
 
 def format_date(tm=None):
     if not tm:
@@ -93,7 +99,10 @@ class Logger(  dispatching_worker.DispatchingWorker
 								  MY_NAME,
 								  keys)
 
-        self.use_raw_input = keys.get('use_raw_input') # use raw input to buffer incoming messages
+        # use raw input to buffer incoming messages, so that bursts of
+        # messages are queued (up to max_queue_size) and not lost in the
+        # socket while the log files are written
+        self.use_raw_input = keys.get('use_raw_input', 1)
 
         dispatching_worker.DispatchingWorker.__init__(self, (keys['hostip'],
 	                                              keys['port']),
@@ -133,6 +142,14 @@ class Logger(  dispatching_worker.DispatchingWorker
 	self.extra_logfiles = {}
         self.lock = threading.Lock()
 
+        # group commit of the log files
+        self.flush_bytes = keys.get('flush_bytes', FLUSH_BYTES)
+        self.flush_interval = keys.get('flush_interval', FLUSH_INTERVAL)
+        self.unflushed = 0         # bytes written since the last flush
+        self.last_flush = time.time()
+        self.logfile_size = 0L     # size of the current log file
+        self.add_interval_func(self.flush_logfiles, self.flush_interval)
+
         # setup the communications with the event relay task
         self.erc.start([event_relay_messages.NEWCONFIGFILE])
 	# start our heartbeat to the event relay process
@@ -167,7 +184,8 @@ class Logger(  dispatching_worker.DispatchingWorker
 	    filename = self.msg_type_logs[msg_type]
 	    file_path = "%s/%s%s"%(self.logfile_dir_path, filename,
 				    format_date())
-	    self.extra_logfiles[msg_type] = open(file_path, mode)
+	    self.extra_logfiles[msg_type] = open(file_path, mode,
+                                                 int(2*self.flush_bytes))
 
     def close_extra_logs(self):
 	for msg_type in self.msg_type_keys:
@@ -184,10 +202,18 @@ class Logger(  dispatching_worker.DispatchingWorker
             if not os.path.exists(dirname):
                 os.mkdir(dirname)
             with self.lock:
-                self.logfile = open(logfile_name, 'a+')
+                # buffers hold what is written between flushes
+                self.logfile = open(logfile_name, 'a+', int(2*self.flush_bytes))
+                self.logfile_size = os.fstat(self.logfile.fileno()).st_size
+                # index of the log file, catches up with what it does not
+                # cover yet
+                self.log_index = log_index.LogIndexer(logfile_name)
                 if not self.no_debug:
-                    self.debug_logfile = open(debug_file_name, 'a+')
+                    self.debug_logfile = open(debug_file_name, 'a+',
+                                              int(2*self.flush_bytes))
                 self.open_extra_logs('a+')
+                self.unflushed = 0
+                self.last_flush = time.time()
         except Exception, detail:
             message="cannot open log %s: %s"%(logfile_name, detail)
             try:
@@ -211,33 +237,68 @@ class Logger(  dispatching_worker.DispatchingWorker
         ticket["last_logfile_name"] = self.last_logfile_name
         self.send_reply(ticket)
 
-    # return the requested list of logfile names
-    def get_logfiles(self, ticket):
-	ticket["status"] = (e_errors.OK, None)
-	period = ticket.get("period", "today")
+    # return the log file names of period: the latest log files of the
+    # number of days in log_client.VALID_PERIODS, rotated (.N) files
+    # included, or the files matching a LOG* pattern.
+    def select_logfiles(self, period):
 	vperiod_keys = log_client.VALID_PERIODS.keys()
 	if period in vperiod_keys:
-	    num_files_to_get = log_client.VALID_PERIODS[period]
+	    num_days_to_get = log_client.VALID_PERIODS[period]
 	    files = os.listdir(self.logfile_dir_path)
 	    # we want to take the latest files so sort them in reverse order
 	    files.sort()
 	    files.reverse()
-	    num_files = 0
+	    days = {}
 	    lfiles = []
 	    for fname in files:
 		if fname[0:4] == FILE_PREFIX:
+		    day = string.split(fname, ".")[0]
+		    if not days.has_key(day):
+			if len(days) >= num_days_to_get and not period == "all":
+			    break
+			days[day] = 1
 		    lfiles.append("%s/%s"%(self.logfile_dir_path,fname))
-		    num_files = num_files +1
-		    if num_files >= num_files_to_get and  not period == "all":
-			break
 	else:
 	    # it was not a shortcut keyword so we assume it is a string of the
 	    # form LOG*, use globbing to get the list
 	    files = "%s/%s"%(self.logfile_dir_path, period)
 	    lfiles = glob.glob(files)
-	ticket["logfiles"] = lfiles
+	return lfiles
+
+    # return the requested list of logfile names
+    def get_logfiles(self, ticket):
+	ticket["status"] = (e_errors.OK, None)
+	ticket["logfiles"] = self.select_logfiles(ticket.get("period", "today"))
         self.send_reply(ticket)
 
+    # return the log lines of the period which match the words (bfids,
+    # volume labels, unique_ids), severity, host, sender and message type
+    # of the ticket, found with the log file indexes
+    def query_log(self, ticket):
+	ticket["status"] = (e_errors.OK, None)
+	lfiles = self.select_logfiles(ticket.get("period", "today"))
+	lfiles.sort()
+	if self.logfile_name in lfiles:
+	    # make the current log file and its index complete
+	    with self.lock:
+		self.do_flush()
+	matches = []
+	try:
+	    for lfile in lfiles:
+		for offset, line in log_index.search(lfile,
+						     ticket.get('words', ()),
+						     ticket.get('severity'),
+						     ticket.get('host'),
+						     ticket.get('sender'),
+						     ticket.get('msg_type'),
+						     ticket.get('start'),
+						     ticket.get('end')):
+		    matches.append((lfile, offset, line))
+	except (IOError, OSError, ValueError), detail:
+	    ticket["status"] = (e_errors.ERROR, str(detail))
+	ticket["matches"] = matches
+	self.send_reply_with_long_answer(ticket)
+
     def is_encp_xfer_msg(self, msg):
 	if (string.find(msg, Trace.MSG_ENCP_XFER) == -1) and \
 	   (string.find(msg, " E ENCP") == -1):
@@ -254,6 +315,37 @@ class Logger(  dispatching_worker.DispatchingWorker
                 self.extra_logfiles[msg_type].write(message)
                 return
 
+    # write out what was written to the log files since the last flush.
+    # self.lock must be held.
+    def do_flush(self):
+        if not self.unflushed:
+            self.last_flush = time.time()
+            return
+        self.logfile.flush()
+        # the index may cover only what is in the log file
+        self.log_index.flush()
+        if not self.no_debug:
+            self.debug_logfile.flush()
+        for logfile in self.extra_logfiles.values():
+            logfile.flush()
+        self.unflushed = 0
+        self.last_flush = time.time()
+
+    # close the log files and the index
+    def close_logfile(self):
+        with self.lock:
+            self.do_flush()
+            self.log_index.close()
+        self.logfile.close()
+        if not self.no_debug:
+            self.debug_logfile.close()
+
+    # flush the log files if messages came in since the last flush
+    def flush_logfiles(self):
+        if self.unflushed:
+            with self.lock:
+                self.do_flush()
+
     # log the message recieved from the log client
     def log_message(self, ticket) :
         if not ticket.has_key('message'):
@@ -261,22 +353,27 @@ class Logger(  dispatching_worker.DispatchingWorker
         if 'sender' in ticket: # ticket came over tcp
             host = ticket['sender']
         else:
+            # names are cached by hostaddr
             host = hostaddr.address_to_name(self.reply_address[0])
                   ## XXX take care of case where we can't figure out the host name
         # determine what type of message is it
         message_type = string.split(ticket['message'])[2]
         message = "%-8s %s"%(host,ticket['message'])
-        tm = time.localtime(time.time()) # get the local time
+        now = time.time()
+        tm = time.localtime(now) # get the local time
         if message == self.last_message:
             self.repeat_count=self.repeat_count+1
             return
         elif self.repeat_count:
+            repeated = "%.2d:%.2d:%.2d last message repeated %d times\n"% \
+                       (tm[3],tm[4],tm[5], self.repeat_count)
             if message_type != e_errors.sevdict[e_errors.MISC]:
-                self.logfile.write("%.2d:%.2d:%.2d last message repeated %d times\n"%
-                                   (tm[3],tm[4],tm[5], self.repeat_count))
+                self.logfile.write(repeated)
+                self.log_index.add(repeated)
+                self.logfile_size = self.logfile_size + len(repeated)
             if not self.no_debug:
-                self.debug_logfile.write("%.2d:%.2d:%.2d last message repeated %d times\n"%
-                                         (tm[3],tm[4],tm[5], self.repeat_count))
+                self.debug_logfile.write(repeated)
+            self.unflushed = self.unflushed + len(repeated)
             self.repeat_count=0
         self.last_message=message
 
@@ -291,11 +388,16 @@ class Logger(  dispatching_worker.DispatchingWorker
             try:
                 if message_type !=  e_errors.sevdict[e_errors.MISC]:
                     res = self.logfile.write(message)    # write log message to the file
-                    self.logfile.flush()
+                    self.log_index.add(message)
+                    self.logfile_size = self.logfile_size + len(message)
                 if not self.no_debug:
                     res = self.debug_logfile.write(message)    # write log message to the file
                 if message_type !=  e_errors.sevdict[e_errors.MISC]:
                     self.write_to_extra_logfile(message)
+                self.unflushed = self.unflushed + len(message)
+                if self.unflushed >= self.flush_bytes or \
+                   now - self.last_flush >= self.flush_interval:
+                    self.do_flush()
             except:
                 exc, value, tb = sys.exc_info()
                 for l in traceback.format_exception( exc, value, tb ):
@@ -355,6 +457,11 @@ class Logger(  dispatching_worker.DispatchingWorker
         if self.use_raw_input:
         # prepare raw input
             self.set_out_file()
+            if self.allow_callback:
+                # in raw mode get_request does not read the event relay
+                # messages, spawn the thread that does
+                dispatching_worker.run_in_thread("call_back_proc",
+                                                 self.serve_callback)
             self.raw_requests.set_caller_name(self.name)
             self.raw_requests.set_use_queue()
             if self.max_queue_size:
@@ -376,9 +483,7 @@ class Logger(  dispatching_worker.DispatchingWorker
                 # check if day has been changed
                 if day != current_day :
                     # day changed: close the current log file
-                    self.logfile.close()
-                    if not self.no_debug:
-                        self.debug_logfile.close()
+                    self.close_logfile()
 		    self.close_extra_logs()
 	            self.last_logfile_name = self.logfile_name
                     current_day = day;
@@ -391,12 +496,9 @@ class Logger(  dispatching_worker.DispatchingWorker
                 # check if current log file is > config specified value.
                 # if no value in config file, do nothing
                 elif self.max_log_file_size != NO_MAX_LOG_FILE_SIZE:
-                    # get current file size
-                    size = os.stat(self.logfile_name)[6]
-                    if size >= self.max_log_file_size:
-                        self.logfile.close()
-                        if not self.no_debug:
-                            self.debug_logfile.close()
+                    # current file size is counted as messages are written
+                    if self.logfile_size >= self.max_log_file_size:
+                        self.close_logfile()
                         self.close_extra_logs()
                         # and open the new one
                         self.logfile_name = "%s.%s"%(self.logfile_name_orig, self.index)
@@ -406,9 +508,7 @@ class Logger(  dispatching_worker.DispatchingWorker
                 # if test flag is set reopen log file every minute
                 if min1 != current_min :
                     # minute changed: close the current log file
-                    self.logfile.close()
-                    if not self.no_debug:
-                        self.debug_logfile.close()
+                    self.close_logfile()
                     current_min = min;
                     # and open the new one
                     fn = '%s%04d-%02d-%02d' % (FILE_PREFIX, tm[0], tm[1],
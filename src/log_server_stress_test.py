@@ -1,26 +1,72 @@
 #!/usr/bin/env python
+"""
+Load test of the log server.
+Sends max_count log messages from each of senders processes as fast as
+possible, then counts how many of them are in the current log file and
+reports the sustained rate of logged messages and the drop rate.
+Run it on the log server host (the log file is read directly) against
+the old and the new log server to compare them.
+
+usage: log_server_stress_test.py msg max_count [senders]
+"""
 
 import sys
+import os
 import time
 import configuration_client
 import log_client
 import enstore_constants
+import e_errors
 import Trace
 
 msg = sys.argv[1]
 max_count = int(sys.argv[2])
+if len(sys.argv) > 3:
+    senders = int(sys.argv[3])
+else:
+    senders = 1
 intf = log_client.LoggerClientInterface(user_mode=0)
 name="STRESS"
-Trace.init(name)
-logc = log_client.LoggerClient((intf.config_host, intf.config_port), name,
-                               enstore_constants.LOG_SERVER)
+# tag the messages of this run so they can be counted in the log file
+tag = "%s-%s" % (msg, int(time.time()))
 
-logc = log_client.LoggerClient((intf.config_host, intf.config_port), name,
-                               enstore_constants.LOG_SERVER)
+def send_messages(sender):
+    Trace.init(name)
+    logc = log_client.LoggerClient((intf.config_host, intf.config_port), name,
+                                   enstore_constants.LOG_SERVER)
+    count = 0
+    while count < max_count:
+        log_client.logit(logc, "%s %s %s"%(tag, sender, count,))
+        #time.sleep(0.001)
+        count += 1
 
-count = 0
+t0 = time.time()
+pids = []
+for sender in range(senders):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            send_messages(sender)
+        finally:
+            os._exit(0)
+    pids.append(pid)
+for pid in pids:
+    os.waitpid(pid, 0)
+elapsed = time.time() - t0
+sent = max_count * senders
+print "sent %s messages in %.2f s, %.0f messages/s" % (sent, elapsed,
+                                                      sent / elapsed)
 
-while count < max_count:
-    log_client.logit(logc, "%s %s"%(msg, count,))
-    #time.sleep(0.001)
-    count += 1
+# let the log server write out what it has queued and buffered
+time.sleep(5)
+logc = log_client.LoggerClient((intf.config_host, intf.config_port), name,
+                               enstore_constants.LOG_SERVER)
+ticket = logc.get_logfile_name(10, 3)
+if not e_errors.is_ok(ticket):
+    sys.exit("can not get the log file name: %s" % (ticket['status'],))
+logged = 0
+for line in open(ticket['logfile_name']):
+    if line.find(tag) != -1:
+        logged += 1
+print "logged %s messages, %.0f messages/s sustained, drop rate %.2f%%" % (
+    logged, logged / elapsed, 100. * (sent - logged) / sent)
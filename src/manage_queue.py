@@ -6,8 +6,10 @@ import sys
 import string
 import threading
 import time
+import heapq
 
 import mpq  # binary search / put
+import skiplist
 import Trace
 import e_errors
 import hostaddr
@@ -67,6 +69,52 @@ def compare_value(r1, r2):
 
     return cmp(r1.value, r2.value)
 
+# Precomputed sort keys.
+# Each key orders requests exactly as the comparison function above does.
+
+
+def priority_key(r):
+    """
+    Sort key equivalent to :func:`compare_priority`.
+
+    :type r: :class:`Request`
+    :arg r: request
+    :rtype: :obj:`tuple` - sort key
+    """
+
+    return (-r.pri, getattr(r, 'queued', 0), -id(r))
+
+
+def value_key(r):
+    """
+    Sort key equivalent to :func:`compare_value`.
+
+    :type r: :class:`Request`
+    :arg r: request
+    :rtype: sort key
+    """
+
+    return r.value
+
+
+def request_id(r):
+    """
+    Request identifier for the request index of :class:`SortedList`.
+
+    :type r: :class:`Request`
+    :arg r: request
+    :rtype: :obj:`str` - request unique id
+    """
+
+    return r.unique_id
+
+
+# sorted lists with known comparison functions use skiplist
+# with precomputed keys, others use mpq
+SORT_KEYS = {compare_priority: priority_key,
+             compare_value: value_key,
+             }
+
 
 class Request:
     """
@@ -177,7 +225,11 @@ class SortedList:
         :arg name: list name (to make debugging easier)
         """
 
-        self.sorted_list = mpq.MPQ(comparison_function)
+        key_function = SORT_KEYS.get(comparison_function)
+        if key_function:
+            self.sorted_list = skiplist.SkipList(key_function, request_id)
+        else:
+            self.sorted_list = mpq.MPQ(comparison_function, request_id)
         self.last_aging_time = 0
         self.aging_quantum = aging_quantum
         self.ids = set()
@@ -195,6 +247,7 @@ class SortedList:
         self.highest_pri_id = None  # highest priorioty id
         self.updated = False  # flags that self.highest_pri has changed, to use in tags list
         self.queued = time.time()
+        self.next_aging_time = 0  # when Queue needs to update this list next time
         self.lock = threading.Lock()  # to synchronize changes in the list
 
     def test(self, id):
@@ -222,9 +275,9 @@ class SortedList:
 
         if not id in self.ids:
             return None, None
-        for r in self.sorted_list:
-            if r.unique_id == id:
-                return r, e_errors.OK
+        r = self.sorted_list.lookup(id)
+        if r is not None:
+            return r, e_errors.OK
         return None, None
 
     # update delta priority
@@ -250,6 +303,18 @@ class SortedList:
                 self.updated = True
             self.last_aging_time = time_now
 
+    def next_update_time(self):
+        """
+        Time when the list is due for the next update: the top request
+        is re-aged every ``aging_quantum`` seconds, as :meth:`update` does.
+
+        :rtype: :obj:`float` or :obj:`None` if the list is not aged
+        """
+
+        if not self.update_flag or self.agetime <= 0:
+            return None
+        return self.last_aging_time + self.aging_quantum
+
     def put(self, request, key=''):
         """
         Put request into the sorted list.
@@ -642,6 +707,9 @@ class Queue:
         self.queue = {}
         self.aging_quantum = aging_quantum
         self.queue_type = ''
+        # heap of (time, key) when by_priority list of key needs
+        # priority update (see update_priority)
+        self.aging = []
 
     def put(self, priority, ticket):
         """
@@ -654,7 +722,7 @@ class Queue:
         :rtype: :obj:`tuple` (:class:`Request` or :obj:`None`, ``e_errors.OK`` or ``e_errors.WRONGPARAMETER`` or :obj:`None`)
         """
 
-        Trace.trace(TR + 21, "Queue.put: %s %s" % (priority, ticket,))
+        Trace.tracef(TR + 21, "Queue.put: %s %s", priority, ticket)
         # set type of the queue
         if not self.queue_type:
             self.queue_type = ticket['work']
@@ -674,6 +742,8 @@ class Queue:
             self.queue[key] = {'opt': SortedList(compare_value, 0, self.aging_quantum, "opt:%s:" % (key,)),  # no updates
                                'by_priority': SortedList(compare_priority, 1, self.aging_quantum, "by_priority:%s:" % (key,))
                                }
+            # new list gets updated at the next update_priority call
+            heapq.heappush(self.aging, (0, key))
 
         # put request into both queues
         try:
@@ -744,8 +814,8 @@ class Queue:
         if not self.queue:
             Trace.trace(TR + 23, "Queue.get: queue is empty")
             return None
-        Trace.trace(TR + 23, "Queue.get: queue %s" % (self.queue,))
-        Trace.trace(TR + 23, "Queue.get: key %s location %s" % (key, location))
+        Trace.tracef(TR + 23, "Queue.get: queue %s", self.queue)
+        Trace.tracef(TR + 23, "Queue.get: key %s location %s", key, location)
         if key not in self.queue:
             Trace.trace(
                 TR + 23, "Queue.get: key %s is not in the queue" %
@@ -767,7 +837,7 @@ class Queue:
                     (sublist, record))
             else:
                 record = self.queue[key]['by_priority'].get()
-        Trace.trace(TR + 23, "Queue.get: %s" % (repr(record),))
+        Trace.tracef(TR + 23, "Queue.get: %s", repr(record))
         return record
 
     def what_key(self, request):
@@ -803,7 +873,7 @@ class Queue:
             #Trace.log(e_errors.INFO,"manage_queue.delete: no such key %s" %(key,))
             return
         # remove opt entry
-        Trace.trace(TR + 23, "Queue.delete: opt %s %s" % (key, request.ticket))
+        Trace.tracef(TR + 23, "Queue.delete: opt %s %s", key, request.ticket)
 
         self.queue[key]['opt'].delete(request)
         self.queue[key]['by_priority'].delete(request)
@@ -846,14 +916,14 @@ class Queue:
         :rtype: :class:`Request` or :obj:`None`
         """
 
-        Trace.trace(TR + 23, 'Queue.get_next: key %s' % (key,))
+        Trace.tracef(TR + 23, 'Queue.get_next: key %s', key)
 
         if not key:
             return None
         if not self.queue:
             Trace.trace(TR + 23, "Queue.get_next: queue is empty")
             return None
-        Trace.trace(TR + 23, "Queue.get_next: keys %s" % (self.queue.keys(),))
+        Trace.tracef(TR + 23, "Queue.get_next: keys %s", self.queue.keys())
         if key not in self.queue:
             Trace.trace(
                 TR + 23, "Queue.get_next: key %s is not in the queue" %
@@ -866,7 +936,7 @@ class Queue:
             sublist = self.queue[key]['by_priority']
         #Trace.trace(TR+23,"Queue.get_next: sublist %s"%(sublist.sprint(),))
         rc = sublist.get_next(disabled_hosts=disabled_hosts)
-        Trace.trace(TR + 23, "Queue.get_next: sublist returns %s" % (rc,))
+        Trace.tracef(TR + 23, "Queue.get_next: sublist returns %s", rc)
         return rc
 
     def wprint(self):
@@ -948,17 +1018,25 @@ class Queue:
     def update_priority(self):
         """
         Update priority.
+        Only lists which are due for aging (see :meth:`SortedList.next_update_time`)
+        are updated, so the cost does not depend on the number of keys in the queue.
 
         :rtype: :obj:`list` of requests with updated priority
         """
 
         updated_requests = {}
-        for key in self.queue.keys():
-            Trace.trace(TR + 23, 'Queue.update_priority: updating %s' % (key,))
-            try:
-                self.queue[key]['by_priority'].update()
-            except KeyError:
-                Trace.trace(TR + 23, "KeyError %s" % (self.queue,))
+        now = time.time()
+        while self.aging and self.aging[0][0] <= now:
+            due, key = heapq.heappop(self.aging)
+            if key not in self.queue or self.queue[key]['by_priority'].next_aging_time != due:
+                # list was deleted or rescheduled
+                continue
+            Trace.tracef(TR + 23, 'Queue.update_priority: updating %s', key)
+            self.queue[key]['by_priority'].update(True)
+            next_time = self.queue[key]['by_priority'].next_update_time()
+            self.queue[key]['by_priority'].next_aging_time = next_time
+            if next_time is not None:
+                heapq.heappush(self.aging, (next_time, key))
             if self.queue[key]['by_priority'].updated:
                 Trace.trace(
                     TR + 23, 'Queue.update_priority: updated %s' %
@@ -1029,13 +1107,11 @@ class Atomic_Request_Queue:
         :arg key: request key
         """
 
-        Trace.trace(TR + 23, " Atomic_Request_Queue:update:key: %s" % (key,))
-        Trace.trace(
-            TR + 23, " Atomic_Request_Queue:update:tags.keys: %s" %
-            (self.tags.keys,))
+        Trace.tracef(TR + 23, " Atomic_Request_Queue:update:key: %s", key)
+        # do not format all keys here: this is called on every put
         Trace.trace(
-            TR + 23, " Atomic_Request_Queue:update:refs.keys: %s" %
-            (self.ref.keys(),))
+            TR + 23, " Atomic_Request_Queue:update:tags.keys: %s refs.keys: %s" %
+            (len(self.tags.keys), len(self.ref)))
         updated_rq = None
 
         self.lockacquire()
@@ -1083,9 +1159,9 @@ class Atomic_Request_Queue:
             TR + 23, " Atomic_Request_Queue:updated_requests:%s" %
             (updated_requests,))
         if updated_requests:
-            for key in self.tags.keys:
-                Trace.trace(TR + 23, "key %s" % (key,))
-                if key in (updated_requests.keys()):
+            for key in updated_requests:
+                Trace.tracef(TR + 23, "key %s", key)
+                if key in self.tags.keys:
                     tags_toreplace.append((key, updated_requests[key]))
 
             Trace.trace(
@@ -1597,19 +1673,21 @@ class Request_Queue:
                 exc, detail, tb = sys.exc_info()
                 Trace.handle_error(exc, detail, tb)
                 del(tb)
-                Trace.trace(TR + 23, "More Details %s %s" % (basepri, ticket))
+                Trace.tracef(TR + 23, "More Details %s %s", basepri, ticket)
                 rq = None
                 stat = None
             if rq:
                 try:
-                    Trace.trace(TR + 21, "PUT %s" % (self.queue_length,))
+                    Trace.tracef(TR + 21, "PUT %s", self.queue_length)
                     if ticket['work'] == 'write_to_hsm' and 'file_family' in ticket['vc']:
                         if ticket['vc']['file_family'] in self.families:
                             self.families[ticket['vc']['file_family']
                                           ] = self.families[ticket['vc']['file_family']] + 1
                         else:
                             self.families[ticket['vc']['file_family']] = 1
-                        Trace.trace(TR + 21, "PUT. FF %s" % (self.families,))
+                        Trace.trace(TR + 21, "PUT. FF %s %s" %
+                                    (ticket['vc']['file_family'],
+                                     self.families[ticket['vc']['file_family']]))
                     if rq.ticket["vc"]["storage_group"] in self.storage_groups:
                         self.storage_groups[rq.ticket["vc"]["storage_group"]
                                             ] = self.storage_groups[rq.ticket["vc"]["storage_group"]] + 1
@@ -1830,7 +1908,7 @@ class Request_Queue:
                 key, location, active_volumes=active_volumes)
 
         self.admin_rq_returned = False
-        Trace.trace(TR + 22, "admin_queue=0 time %s" % (time.time() - t,))
+        Trace.tracef(TR + 22, "admin_queue=0 time %s", time.time() - t)
 
         if record and not (record in self.processed_requests):
             # allow to remove rq.ticket['fc']['external_label'] only if
@@ -40,6 +40,7 @@ import copy
 import select
 import errno
 import multiprocessing
+import multiprocessing.managers
 import traceback
 import timeofday
 # import ConfigParser - Unused
@@ -106,6 +107,9 @@ ACTION_LOG_LEVEL = 88
 # involves queries.
 QUEUE_COUNT = 2
 
+# How often MTXN_MediaLoader checks if the inventory needs a full refresh, seconds.
+INVENTORY_CHECK_INTERVAL = 10
+
 EMPTY = 'empty'  # volume "name" used in some classes
 BUSY = 'busy'  # to indicate that the slot is under some activity, like dismount into ths slot.
 INUSE = 'in use'  # to indicate that drive is in use
@@ -3345,6 +3349,232 @@ def get_mtx_status(device):
     return message
 
 
+# Parse the output of mtx status.
+# Returns lists of slot and drive elements (dictionaries).
+# busy_slots - indices of slots reserved by a running dismount or insert,
+#              such slots stay BUSY
+def parse_mtx_status(lines, busy_slots=()):
+    slots = []
+    drives = []
+    for line in lines:
+        if '' == line:
+            break
+        try:
+            line = string.strip(line)
+            lel = line.split()
+            if string.find(line, 'Data Transfer Element') != -1:
+                # Expected format:
+                #   Data Transfer Element 257 Phys Loc F2,C1,R2,Z0 SN  00078D2B6E ID ULT3580-TD8 :Empty
+                # or :
+                # Data Transfer Element 270 Phys Loc F2,C4,R4,Z0 SN  00078D2B59 ID ULT3580-TD8 :Full
+                #     (Storage Element 1038 Loaded):VolumeTag = VQ0006L8
+                d = {}
+                d['address'] = int(lel[3])
+                loc_and_zone = lel[6].split(':')[0]
+                zone_index = loc_and_zone.find('Z')
+                d['location'] = loc_and_zone[0:zone_index - 1]  # throw ,Z
+                d['zone'] = loc_and_zone[zone_index:len(loc_and_zone)]
+                d['SN'] = lel[8]
+                d['type'] = lel[10].split(':')[0]
+                d['volume'] = EMPTY
+                if string.find(line, 'Empty') != -1:
+                    pass  # just to leave status as empty
+                elif string.find(line, 'VolumeTag') != -1:
+                    i1 = string.find(line, '=') + 1
+                    i2 = len(line)
+                    d['volume'] = string.strip(line[i1:i2])
+                else:
+                    d['volume'] = 'unlabelled'
+                drives.append(d)
+            elif string.find(line, 'Storage Element') != -1:
+                # Expected format     Storage Element 1025 Phys Loc F08,C02,R01,T00  :Full  :VolumeTag=VQ0033L8
+                # or:
+                # Storage Element 1037 Phys Loc EMPTY :Empty :VolumeTag=
+                d = {}
+                d['address'] = int(lel[2])
+                d['location'] = lel[5]
+                d['volume'] = EMPTY
+                if len(slots) in busy_slots:  # this slot was reserved, leave it BUSY
+                    d['volume'] = BUSY
+                    Trace.log(ACTION_LOG_LEVEL, 'from status: %s' % (line,))
+                if string.find(line, 'Empty') != -1:
+                    pass  # just to leave status as empty
+                elif string.find(line, 'VolumeTag') != -1:
+                    i1 = string.find(line, '=') + 1
+                    i2 = len(line)
+                    d['volume'] = string.strip(line[i1:i2])
+                else:
+                    d['volume'] = 'unlabelled'
+                slots.append(d)
+            else:
+                Trace.log(ACTION_LOG_LEVEL, 'parse_mtx_status: can not interpret line: %s' % (line,))
+        except:
+            Trace.handle_error(severity=ACTION_LOG_LEVEL)
+    return slots, drives
+
+
+############################################################
+## Drives and slots of a library as reported by mtx status
+## indexed by volume, address and location.
+## An instance lives in the InventoryManager server process and
+## is shared by MTXN_MediaLoader and its work processes through
+## a proxy, so that each method call is a single round trip and
+## finding a volume or a drive does not depend on the library size.
+#############################################################
+class LibraryInventory:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._reset([], [])
+
+    def _reset(self, slots, drives):
+        self._slots = slots
+        self._drives = drives
+        self.slot_volumes = {}  # volume: set of storage slot indices
+        self.import_export_volumes = {}  # volume: set of IMPORT/EXPORT slot indices
+        self.slot_addresses = {}  # address: slot index
+        self.drive_volumes = {}  # volume: set of drive indices
+        self.drive_keys = {'address': {}, 'location': {}}  # address or location: drive index
+        for i in range(len(slots)):
+            self._index_slot(i)
+        for i in range(len(drives)):
+            self._index_drive(i)
+
+    def _slot_volumes(self, i):
+        if 'IMPORT/EXPORT' in self._slots[i]['location']:
+            return self.import_export_volumes
+        return self.slot_volumes
+
+    def _index_slot(self, i):
+        self._slot_volumes(i).setdefault(self._slots[i]['volume'], set()).add(i)
+        self.slot_addresses[self._slots[i]['address']] = i
+
+    def _unindex_slot(self, i):
+        volumes = self._slot_volumes(i)
+        volume = self._slots[i]['volume']
+        volumes[volume].discard(i)
+        if not volumes[volume]:
+            del volumes[volume]
+        del self.slot_addresses[self._slots[i]['address']]
+
+    def _index_drive(self, i):
+        self.drive_volumes.setdefault(self._drives[i]['volume'], set()).add(i)
+        for key in self.drive_keys:
+            self.drive_keys[key][self._drives[i][key]] = i
+
+    def _unindex_drive(self, i):
+        volume = self._drives[i]['volume']
+        self.drive_volumes[volume].discard(i)
+        if not self.drive_volumes[volume]:
+            del self.drive_volumes[volume]
+        for key in self.drive_keys:
+            del self.drive_keys[key][self._drives[i][key]]
+
+    # replace the whole inventory
+    # with the result of parse_mtx_status
+    def reset(self, slots, drives):
+        with self.lock:
+            self._reset(slots, drives)
+
+    # elements are returned as copies,
+    # change them with set_slot and set_drive
+    def slot(self, i):
+        with self.lock:
+            return dict(self._slots[i])
+
+    def drive(self, i):
+        with self.lock:
+            return dict(self._drives[i])
+
+    def set_slot(self, i, element):
+        with self.lock:
+            self._unindex_slot(i)
+            self._slots[i] = dict(element)
+            self._index_slot(i)
+
+    def set_drive(self, i, element):
+        with self.lock:
+            self._unindex_drive(i)
+            self._drives[i] = dict(element)
+            self._index_drive(i)
+
+    def slots(self):
+        with self.lock:
+            return [dict(s) for s in self._slots]
+
+    def drives(self):
+        with self.lock:
+            return [dict(d) for d in self._drives]
+
+    def slot_count(self):
+        return len(self._slots)
+
+    # indices of slots reserved by BUSY
+    def busy_slots(self):
+        with self.lock:
+            return sorted(self.slot_volumes.get(BUSY, set()) |
+                          self.import_export_volumes.get(BUSY, set()))
+
+    # Return (slot index, drive index) of volume, -1 if not found.
+    # The first suitable element is returned.
+    # EMPTY is looked for only in storage slots.
+    def locate_volume(self, vol, ignore_addresses=None):
+        with self.lock:
+            if vol == EMPTY:
+                # we do not want to dismount into IMPORT/EXPORT storage element under normal
+                # conditions
+                # and we do not need to look for EMPTY volume in drives
+                candidates = self.slot_volumes.get(vol, ())
+                idx_drive = -1
+            else:
+                candidates = self.slot_volumes.get(vol, set()) | self.import_export_volumes.get(vol, set())
+                idx_drive = min(self.drive_volumes.get(vol, [-1]))
+            idx_slot = -1
+            if not ignore_addresses:
+                if candidates:
+                    idx_slot = min(candidates)
+            else:
+                for i in sorted(candidates):
+                    # We do not want to return addresses we've been asked to ignore.
+                    if self._slots[i]['address'] not in ignore_addresses:
+                        idx_slot = i
+                        break
+            return idx_slot, idx_drive
+
+    # Return index of drive with given address (int) or location, -1 if not found.
+    def locate_drive(self, drive_addr):
+        if isinstance(drive_addr, int):
+            key = 'address'
+        else:
+            key = 'location'
+        with self.lock:
+            return self.drive_keys[key].get(drive_addr, -1)
+
+    # Return index of slot with given address, -1 if not found.
+    def locate_slot(self, address):
+        with self.lock:
+            return self.slot_addresses.get(address, -1)
+
+    # Return index of the first IMPORT/EXPORT slot, empty or full, -1 if not found.
+    def locate_import_export(self, empty):
+        with self.lock:
+            if empty:
+                candidates = self.import_export_volumes.get(EMPTY, ())
+            else:
+                candidates = [i for vol, indices in self.import_export_volumes.items()
+                              if EMPTY not in vol
+                              for i in indices]
+            if candidates:
+                return min(candidates)
+            return -1
+
+
+class InventoryManager(multiprocessing.managers.SyncManager):
+    pass
+
+
+InventoryManager.register('LibraryInventory', LibraryInventory)
+
+
 ############################################################
 ## This class is for drive and slot addresses matching with IBM addresses
 ## It uses direct calls to mtx routines via SWIG interface
@@ -3555,8 +3785,7 @@ class MTXN_MediaLoader(MediaLoaderMethods):
         self.c2pread = None
         self.c2pwrite = None
         self.server = None
-        self.slots = None
-        self.drives = None
+        self.inventory = None
         self.cli_jar_file = None
         self.java_exec = None
         self.ibm_cli_host = None
@@ -3568,8 +3797,6 @@ class MTXN_MediaLoader(MediaLoaderMethods):
         self.query_functions.remove('getVolState')
         self.work_functions.append('getDriveState')
         self.query_functions.remove('getDriveState')
-        # Mark our cached status info as invalid
-        self.status_valid = 0
         self.debug = self.mc_config.get('debug', False)
         self.debug_messaging = self.mc_config.get('debug_messaging', False)
         # Read the device name to use.
@@ -3577,6 +3804,8 @@ class MTXN_MediaLoader(MediaLoaderMethods):
 
         # Read the value for the timeout on status commands.
         self.status_timeout = self.mc_config.get('status_timeout', 300)
+        # Minimal time between two full inventories.
+        self.status_min_interval = self.mc_config.get('status_min_interval', 40)
 
         # Read the value for the timeout on mount commands.
         self.mount_timeout = self.mc_config.get('mount_timeout', 300)
@@ -3586,10 +3815,14 @@ class MTXN_MediaLoader(MediaLoaderMethods):
 
         self.cli_host = self.mc_config.get('remote_cli')  # host where CLI can be run on (used for diagnostics)
         self.use_legacy_status = self.mc_config.get('use_legacy_status', False)
-        self.manager = multiprocessing.Manager()
+        self.manager = InventoryManager()
+        self.manager.start()
+        self.inventory = self.manager.LibraryInventory()
         self.q = multiprocessing.Queue()
         self.mtx_server_started = self.manager.Value('i', 0)
         self.last_updated_db = self.manager.Value('i', 0)
+        # set by work processes when the inventory needs a full refresh
+        self.inventory_stale = self.manager.Value('i', 0)
 
         Trace.log(e_errors.INFO,
                   '%s initialized with device: %s status time limit: %s mount time limit: %s ' %
@@ -3600,6 +3833,7 @@ class MTXN_MediaLoader(MediaLoaderMethods):
             Trace.alarm(e_errors.ERROR, 'can not get initial status, exiting with %s' % (rc,))
             self.server.terminate()
             sys.exit(1)
+        self.add_interval_func(self.check_inventory, INVENTORY_CHECK_INTERVAL)
         print time.ctime(), 'STARTED'
 
     def _mtx_server(self, read_pipe, write_pipe, err_pipe):
@@ -3822,7 +4056,7 @@ class MTXN_MediaLoader(MediaLoaderMethods):
             for line in response:
                 if 'Failed' in line:
                     return e_errors.ERROR, e_errors.ERROR, '', response
-                if e_errors.TIMEDOUT in l:
+                if e_errors.TIMEDOUT in line:
                     return e_errors.ERROR, e_errors.TIMEDOUT, '', response
             if '' in message:
                 return e_errors.OK, e_errors.OK, '', ''
@@ -3951,9 +4185,10 @@ class MTXN_MediaLoader(MediaLoaderMethods):
                     update_db = True
                 retry = True
                 if update_db:
-                    Trace.log(e_errors.INFO, 'will update db')
-                    rt = self.updatedb_on_retry()
-                    Trace.log(e_errors.INFO, 'update db returned %s' % (rt,))
+                    # the inventory can not be trusted until the next full refresh,
+                    # which the failed mount or dismount requests, do not retry with it
+                    Trace.log(e_errors.INFO, 'inventory needs update, will not retry')
+                    retry = False
         except:
             Trace.handle_error()
             retry = True
@@ -3963,8 +4198,29 @@ class MTXN_MediaLoader(MediaLoaderMethods):
             retry = False
         return retry
 
-    def updatedb_on_retry(self):
-        return self.updatedb({'drive': {'address': None}})
+    # Mark the inventory as stale.
+    # The full refresh is done in the background by check_inventory.
+    def request_inventory(self, reason):
+        Trace.log(e_errors.INFO, 'inventory refresh requested: %s' % (reason,))
+        self.inventory_stale.value = 1
+
+    # Interval function.
+    # Start a full refresh of the stale inventory
+    # when no work is being done and not more often than status_min_interval.
+    def check_inventory(self):
+        if not self.inventory_stale.value:
+            return
+        if self.work_list or self.work_query_list:
+            return
+        if int(time.time()) - self.last_updated_db.value <= self.status_min_interval:
+            return
+        self.inventory_stale.value = 0
+        ticket = {'function': 'updatedb',
+                  'drive': {'address': None},
+                  'r_a': ('check_inventory', time.time()),
+                  'no_reply': 1,
+                  }
+        self.DoWork(self.updatedb, ticket)
 
     def insert(self, ticket):
         __pychecker__ = "no-argsused"  # When fixed remove this pychecker line.
@@ -3974,22 +4230,19 @@ class MTXN_MediaLoader(MediaLoaderMethods):
             s, d = self.locate_volume(ticket['external_label'])
             if d >= 0:
                 return (e_errors.ERROR, '%s is in drive %s, can not be inserted' % (
-                        ticket['external_label'], self.drives[d]['address']), None, None)
+                        ticket['external_label'], self.inventory.drive(d)['address']), None, None)
             if s < 0:
                 return e_errors.ERROR, e_errors.MC_VOLNOTFOUND, ticket['external_label'], 'Volume not found'
-            if 'IMPORT/EXPORT' not in self.slots[s]['location']:
+            if 'IMPORT/EXPORT' not in self.inventory.slot(s)['location']:
                 return (e_errors.ERROR,
-                        '%s is not in  IMPORT/EXPORT slot (%s)' % (ticket['external_label'], self.slots[s]['location']),
+                        '%s is not in  IMPORT/EXPORT slot (%s)' % (ticket['external_label'], self.inventory.slot(s)['location']),
                         None, None)
         else:
             # Find first not empty Import/export slot
-            for imp in self.slots:
-                if 'IMPORT/EXPORT' in imp['location'] and EMPTY not in imp['volume']:
-                    volume_to_insert = imp['volume']
-                    s = self.slots.index(imp)
-                    break
-            else:
+            s = self.inventory.locate_import_export(False)
+            if s < 0:
                 return e_errors.ERROR, 'Nothing to import', None, None
+            volume_to_insert = self.inventory.slot(s)['volume']
 
         self.retry_count = 4
         retry = True
@@ -4000,10 +4253,10 @@ class MTXN_MediaLoader(MediaLoaderMethods):
                 return (e_errors.ERROR, '%s can not be inserted, no free slots' % (ticket['external_label'],),
                         None, None)
 
-            stor_el = self.slots[s_slot]
+            stor_el = self.inventory.slot(s_slot)
             stor_el['volume'] = BUSY
-            imp_el = self.slots[s]
-            self.slots[s_slot] = stor_el
+            imp_el = self.inventory.slot(s)
+            self.inventory.set_slot(s_slot, stor_el)
             Trace.log(ACTION_LOG_LEVEL, 'insert:  inserting %s from %s to %s' %
                       (volume_to_insert, imp_el['address'], stor_el['address']))
             rc = self.send_command('Unload,%s,%s,%s' % (stor_el['address'], imp_el['address'], os.getpid()),
@@ -4011,9 +4264,9 @@ class MTXN_MediaLoader(MediaLoaderMethods):
             Trace.trace(ACTION_LOG_LEVEL, "SCOMM RETURNED %s" % (rc,))
             if rc[1] == e_errors.OK:
                 imp_el['volume'] = EMPTY
-                stor_el['volume'] = self.slots[s]['volume']
-                self.slots[s] = imp_el
-                self.slots[s_slot] = stor_el
+                stor_el['volume'] = self.inventory.slot(s)['volume']
+                self.inventory.set_slot(s, imp_el)
+                self.inventory.set_slot(s_slot, stor_el)
                 rc = list(rc)
                 rc[3] = "Imported %s from %s to %s" % (stor_el['volume'], imp_el['address'], stor_el['address'])
                 rc = tuple(rc)
@@ -4022,7 +4275,7 @@ class MTXN_MediaLoader(MediaLoaderMethods):
                 Trace.log(e_errors.INFO, "Unload for insert command returned: %s" % (rc,))
                 if stor_el['volume'] == BUSY:
                     stor_el['volume'] = EMPTY
-                    self.slots[s_slot] = stor_el
+                    self.inventory.set_slot(s_slot, stor_el)
                 retry = self.do_retry(rc, returned_by_mtx_mount=False)
                 if retry:
                     # rc[0] == -1 - timeout
@@ -4042,25 +4295,22 @@ class MTXN_MediaLoader(MediaLoaderMethods):
         s_slot, d = self.locate_volume(external_label)
         if d >= 0:
             return (e_errors.ERROR,
-                    '%s is in drive %s, can not be ejected' % (external_label, self.drives[d]['address']), None, None)
+                    '%s is in drive %s, can not be ejected' % (external_label, self.inventory.drive(d)['address']), None, None)
 
         if s_slot < 0:
             return e_errors.ERROR, e_errors.MC_VOLNOTFOUND, external_label, 'Volume not found'
-        if 'IMPORT/EXPORT' in self.slots[s_slot]['location']:
+        if 'IMPORT/EXPORT' in self.inventory.slot(s_slot)['location']:
             return (e_errors.ERROR,
-                    '%s is in  IMPORT/EXPORT slot (%s)' % (external_label, self.slots[s_slot]['location']), None, None)
+                    '%s is in  IMPORT/EXPORT slot (%s)' % (external_label, self.inventory.slot(s_slot)['location']), None, None)
 
         # Find first empty Import / export slot
-        for imp in self.slots:
-            if 'IMPORT/EXPORT' in imp['location'] and EMPTY in imp['volume']:
-                s = self.slots.index(imp)
-                break
-        else:
+        s = self.inventory.locate_import_export(True)
+        if s < 0:
             return e_errors.ERROR, 'No empty IMPORT/EXPORT slots', None, None
 
-        stor_el = self.slots[s_slot]
-        imp_el = self.slots[s]
-        self.slots[s_slot] = stor_el
+        stor_el = self.inventory.slot(s_slot)
+        imp_el = self.inventory.slot(s)
+        self.inventory.set_slot(s_slot, stor_el)
         retry_count = 4
         rc = None
         while retry_count > 0:
@@ -4068,10 +4318,10 @@ class MTXN_MediaLoader(MediaLoaderMethods):
                                    self.mount_timeout)
             Trace.trace(ACTION_LOG_LEVEL, "SCOMM RETURNED %s" % (rc,))
             if rc[1] == e_errors.OK:
-                imp_el['volume'] = self.slots[s_slot]['volume']
+                imp_el['volume'] = self.inventory.slot(s_slot)['volume']
                 stor_el['volume'] = EMPTY
-                self.slots[s] = imp_el
-                self.slots[s_slot] = stor_el
+                self.inventory.set_slot(s, imp_el)
+                self.inventory.set_slot(s_slot, stor_el)
                 rc = list(rc)
                 rc[3] = "Ejected %s from %s to %s" % (imp_el['volume'], stor_el['address'], imp_el['address'])
                 rc = tuple(rc)
@@ -4101,7 +4351,7 @@ class MTXN_MediaLoader(MediaLoaderMethods):
         retry = True
         while retry:
             try:
-                dr = self.locate_drive(drive)  # index in self.drives
+                dr = self.locate_drive(drive)  # index in inventory drives
             except:
                 Trace.handle_error()
                 Trace.log(e_errors.ERROR, 'mtx_mount unrecognized drive: %s' % (drive,))
@@ -4112,11 +4362,12 @@ class MTXN_MediaLoader(MediaLoaderMethods):
                 return (e_errors.ERROR, e_errors.ERROR, [], '',
                         'mtx_mount unrecognized drive: %s' % (drive,))
 
-            s, d = self.locate_volume(volume)  # indices in self.slots, and self.drives correspondingly
+            s, d = self.locate_volume(volume)  # indices in inventory slots, and drives correspondingly
             if s == -1:
                 if d == -1:
                     Trace.log(e_errors.ERROR,
                               'mtx cant mount tape. Not in library')
+                    self.request_inventory('mount %s: not in library' % (volume,))
                     return (e_errors.ERROR, e_errors.ERROR, [], '',
                             'mtx cant mount tape. Not in library')
                 elif dr == d:
@@ -4128,50 +4379,43 @@ class MTXN_MediaLoader(MediaLoaderMethods):
                             'mtx cant mount tape. Already in drive %d' % (d,))
 
             if not self.is_empty(dr):
-                Trace.log(e_errors.ERROR, 'mtx cant mount tape. Drive %s is not empty: %s' % (dr, self.drives[dr]))
+                Trace.log(e_errors.ERROR, 'mtx cant mount tape. Drive %s is not empty: %s' % (dr, self.inventory.drive(dr)))
                 return (e_errors.ERROR, e_errors.MC_DRVNOTEMPTY, [], '',
-                        'mtx cant mount tape. Drive %s is not empty: %s' % (drive, self.drives[dr]['volume']))
-            Trace.log(e_errors.INFO, 'found %s in slot %s ...mounting' % (volume, self.slots[s]['address']))
+                        'mtx cant mount tape. Drive %s is not empty: %s' % (drive, self.inventory.drive(dr)['volume']))
+            slot_el = self.inventory.slot(s)
+            drive_el = self.inventory.drive(dr)
+            Trace.log(e_errors.INFO, 'found %s in slot %s ...mounting' % (volume, slot_el['address']))
             if not self.test_unit_ready():
                 Trace.log(e_errors.ERROR, 'mount: Unit is not ready. Will try anyway')
             rc = self.send_command(
-                'Load,%s,%s,%s' % (self.slots[s]['address'], self.drives[dr]['address'], os.getpid()),
+                'Load,%s,%s,%s' % (slot_el['address'], drive_el['address'], os.getpid()),
                 self.mount_timeout * self.mount_retries + 10)
             Trace.trace(ACTION_LOG_LEVEL, "Send Command returned %s" % (rc,))
             if rc[1] == e_errors.OK:
                 Trace.trace(ACTION_LOG_LEVEL,
-                            'updating DB: slots[%s]=%s drives[%s]=%s ' % (s, self.slots[s], dr, self.drives[dr]))
-                mutable_dict = self.slots[s]
-                mutable_dict['volume'] = EMPTY
-                self.slots[s] = mutable_dict
-                mutable_dict = self.drives[dr]
-                mutable_dict['volume'] = volume
-                self.drives[dr] = mutable_dict
+                            'updating DB: slots[%s]=%s drives[%s]=%s ' % (s, slot_el, dr, drive_el))
+                slot_el['volume'] = EMPTY
+                self.inventory.set_slot(s, slot_el)
+                drive_el['volume'] = volume
+                self.inventory.set_drive(dr, drive_el)
                 Trace.trace(ACTION_LOG_LEVEL,
-                            'updated DB: slots[%s]=%s drives[%s]=%s' % (s, self.slots[s], dr, self.drives[dr]))
+                            'updated DB: slots[%s]=%s drives[%s]=%s' % (s, slot_el, dr, drive_el))
                 break
             else:
                 Trace.log(e_errors.INFO, "Load returned: %s" % (rc,))
-                if rc[1] == e_errors.TIMEDOUT:
-                    retry = self.do_retry(rc, returned_by_mtx_mount=True)
-                    if retry:
-                        Trace.log(e_errors.INFO, 'retrying mtx_mount %s %s' % (volume, drive))
-                        time.sleep(1)
-                    else:
-                        break
+                retry = self.do_retry(rc, returned_by_mtx_mount=True)
+                if retry:
+                    Trace.log(e_errors.INFO, 'retrying mtx_mount %s %s' % (volume, drive))
+                    time.sleep(1)
+                else:
+                    self.request_inventory('mount %s %s returned %s' % (volume, drive, rc[1]))
+                    break
         Trace.log(ACTION_LOG_LEVEL, 'mtx_mount returning: %s' % (rc,))
         return rc
 
     # is tape drive empty
     def is_empty(self, drive_index):
-        if 0 == self.status_valid:
-            a, b = return_by(self.status_local, (), self.status_timeout)
-            if -1 == a:
-                Trace.log(e_errors.ERROR, 'mtx status request timeout')
-                return False
-            self.status_valid = 1
-
-        if self.drives[drive_index]['volume'] == EMPTY:
+        if self.inventory.drive(drive_index)['volume'] == EMPTY:
             return True
         else:
             return False
@@ -4186,7 +4430,7 @@ class MTXN_MediaLoader(MediaLoaderMethods):
         failed_dismount_addresses = []
         while retry:
             try:
-                dr = self.locate_drive(drive)  # index in self.drives
+                dr = self.locate_drive(drive)  # index in inventory drives
             except:
                 Trace.handle_error()
                 Trace.log(e_errors.ERROR, 'mtx_dismount unrecognized drive: %s' % (drive,))
@@ -4198,11 +4442,11 @@ class MTXN_MediaLoader(MediaLoaderMethods):
                 return (e_errors.ERROR, e_errors.ERROR, [], '',
                         'mtx_dismount unrecognized drive: %s' % (drive,))
 
-            s, d = self.locate_volume(volume)  # indices in self.slots, and self.drives correspondingly
+            s, d = self.locate_volume(volume)  # indices in inventory slots, and drives correspondingly
             if s > -1 and d < 0:
                 # not in drive
                 return (e_errors.ERROR, e_errors.ERROR, [], '',
-                        'mtx unload: Not in drive. In slot %s' % (self.slots[s]['address'],))
+                        'mtx unload: Not in drive. In slot %s' % (self.inventory.slot(s)['address'],))
 
             if self.is_empty(dr):  # no need to dismount
                 return e_errors.OK, 0, None, "", ""
@@ -4217,8 +4461,9 @@ class MTXN_MediaLoader(MediaLoaderMethods):
             ignore, d = self.locate_volume(volume)
 
             if dr != d:
-                Trace.log(e_errors.ERROR, ' mtx unload: %s is in %s, not %s' %
-                          (volume, self.drives[d]['address'], drive))
+                Trace.log(e_errors.ERROR, ' mtx unload: %s is in drive[%s], not %s' %
+                          (volume, d, drive))
+                self.request_inventory('dismount %s: not in %s' % (volume, drive))
                 return (e_errors.ERROR, e_errors.ERROR, [], '',
                         'mtx unload: %s is not in %s' %
                         (volume, drive))
@@ -4231,38 +4476,39 @@ class MTXN_MediaLoader(MediaLoaderMethods):
                 Trace.log(e_errors.ERROR, ' mtx unload: No free slots')
                 return ('ERROR', e_errors.ERROR, [], '',
                         'mtx unload: No free slots')
-            stor_el = self.slots[s]
+            stor_el = self.inventory.slot(s)
             stor_el['volume'] = BUSY
-            self.slots[s] = stor_el
+            self.inventory.set_slot(s, stor_el)
             if not self.test_unit_ready():
                 Trace.log(e_errors.ERROR, 'dismount: Unit is not ready. Will try anyway')
+            drive_el = self.inventory.drive(dr)
             rc = self.send_command(
-                'Unload,%s,%s,%s' % (self.slots[s]['address'], self.drives[dr]['address'], os.getpid()),
+                'Unload,%s,%s,%s' % (stor_el['address'], drive_el['address'], os.getpid()),
                 self.mount_timeout * self.mount_retries + 10)
             Trace.trace(ACTION_LOG_LEVEL, "Send Command returned %s" % (rc,))
 
             if rc[1] == e_errors.OK:
                 Trace.trace(ACTION_LOG_LEVEL,
-                            'updating DB: slots[%s]=%s drives[%s]=%s' % (s, self.slots[s], dr, self.drives[dr]))
-                stor_el = self.slots[s]
+                            'updating DB: slots[%s]=%s drives[%s]=%s' % (s, stor_el, dr, drive_el))
                 stor_el['volume'] = volume
-                self.slots[s] = stor_el
-                drive_el = self.drives[dr]
+                self.inventory.set_slot(s, stor_el)
                 drive_el['volume'] = EMPTY
-                self.drives[dr] = drive_el
+                self.inventory.set_drive(dr, drive_el)
                 Trace.trace(ACTION_LOG_LEVEL,
-                            'updated DB: slots[%s]=%s drives[%s]=%s' % (s, self.slots[s], dr, self.drives[dr]))
+                            'updated DB: slots[%s]=%s drives[%s]=%s' % (s, stor_el, dr, drive_el))
                 break
             else:
                 Trace.log(e_errors.INFO, "Unload command returned: %s" % (rc,))
                 if stor_el['volume'] == BUSY:
                     stor_el['volume'] = EMPTY
+                    self.inventory.set_slot(s, stor_el)
                 retry = self.do_retry(rc, returned_by_mtx_mount=False)
                 if retry:
-                    failed_dismount_addresses.append(self.slots[s]['address'])
-                    Trace.log(e_errors.INFO, 'retrying mtx_dismount %s %s' % (self.drives[dr], stor_el))
+                    failed_dismount_addresses.append(stor_el['address'])
+                    Trace.log(e_errors.INFO, 'retrying mtx_dismount %s %s' % (drive_el, stor_el))
                     time.sleep(1)
                 else:
+                    self.request_inventory('dismount %s %s returned %s' % (volume, drive, rc[1]))
                     break
         Trace.trace(ACTION_LOG_LEVEL, "mtx_dismount: returning %s" % (rc,))
         return rc
@@ -4278,140 +4524,20 @@ class MTXN_MediaLoader(MediaLoaderMethods):
     # function or multiple tapes that have the same label in the
     # library.
     def locate_volume(self, vol, ignore_addresses=None):
-        if ignore_addresses is None:
-            ignore_addresses = []
-        Trace.trace(ACTION_LOG_LEVEL, ' looking for volume %s status_valid %s' % (vol, self.status_valid))
-        if self.status_valid == 0:
-            a, b = return_by(self.status_local, (), self.status_timeout)
-            if a == -1:
-                # retry
-                Trace.log(e_errors.ERROR, 'locate_volume: mtx status request timeout, retrying')
-                a, b = return_by(self.status_local, (), self.status_timeout)
-                if a == -1:
-                    Trace.log(e_errors.ERROR, 'locate_volume: mtx status request timeout')
-                    if self.cli_host:
-                        # record what is seen using CLI
-                        rc = self.setup_cli_command()
-                        if not e_errors.is_ok(rc[0]):
-                            Trace.log(e_errors.INFO, 'setup_cli_command returned %s' % (rc,))
-                            return -1, -1
-                        tm = time.localtime(time.time())
-                        fn = '/var/log/enstore/tmp/enstore/DataCartridges.%s-%s-%s.%s:%s:%s' % \
-                             (tm.tm_year, tm.tm_mon, tm.tm_mday, tm.tm_hour, tm.tm_min, tm.tm_sec)
-                        cmd = '%s -jar %s -ip %s -u %s -p %s --viewDataCartridges' % (
-                            self.java_exec, self.cli_jar_file, self.ibm_cli_host, self.ibm_cli_u, self.ibm_cli_pw)
-                        res = enstore_functions2.shell_command('enrsh -n %s %s ' % (self.cli_host, cmd,))
-                        if not res:
-                            Trace.log(e_errors.ERROR, 'viewDataCartridges: IBM CLI returned %s' % (res[1],))
-                        else:
-                            f = open(fn, 'w')
-                            f.write(res[0])
-                            f.close()
-                            Trace.log(e_errors.INFO, 'viewDataCartridges result is in %s' % (fn,))
-                    return -1, -1
-            self.status_valid = 1
-        found = False
-        if vol == EMPTY:
-            idx_drive = -1  # we do not need to look for EMPTY volume in drives
-        else:
-            idx_drive = 0
-            d = None
-            for d in self.drives:
-                try:
-                    if vol == d['volume']:
-                        found = True
-                        break
-                except KeyError as e:
-                    Trace.log(e_errors.ERROR, 'exception in locate_volume %s %s' % (e, d))
-                    return -1, -1
-            if found:
-                idx_drive = self.drives.index(d)
-
-            if not found:
-                idx_drive = -1
-            else:
-                Trace.trace(ACTION_LOG_LEVEL, 'found in drive %s' % (d['address'],))
-
-        found = False
-        idx_slot = 0
-        s = None
-        for s in self.slots:
-            try:
-                if vol == s['volume']:
-                    if vol == EMPTY:
-                        if 'IMPORT/EXPORT' in s['location']:
-                            # we do not want to dismount into IMPORT/EXPORT storage element under normal
-                            # conditions
-                            continue
-                    if s['address'] in ignore_addresses:
-                        # We do not want to return addresses we've been asked to ignore.
-                        continue
-                    found = True
-                    break
-            except KeyError as e:
-                Trace.log(e_errors.ERROR, 'exception in locate_volume %s %s' % (e, s))
-                return -1, -1
-
-        if found:
-            idx_slot = self.slots.index(s)
-        if not found:
-            idx_slot = -1
-        else:
-            Trace.trace(ACTION_LOG_LEVEL, 'found in slot %s' % (s['address'],))
-
+        Trace.trace(ACTION_LOG_LEVEL, ' looking for volume %s' % (vol,))
+        idx_slot, idx_drive = self.inventory.locate_volume(vol, ignore_addresses)
+        if idx_drive >= 0:
+            Trace.trace(ACTION_LOG_LEVEL, 'found in drive %s' % (idx_drive,))
+        if idx_slot >= 0:
+            Trace.trace(ACTION_LOG_LEVEL, 'found in slot %s' % (idx_slot,))
         return idx_slot, idx_drive
 
     def locate_drive(self, drive_address):
-        Trace.trace(ACTION_LOG_LEVEL, ' looking for drive %s , status_valid %s' % (drive_address, self.status_valid))
-        if self.status_valid == 0:
-            a, b = return_by(self.status_local, (), self.status_timeout)
-            if a == -1:
-                # retry
-                Trace.log(e_errors.ERROR, 'locate_drive: mtx status request timeout, retrying')
-                a, b = return_by(self.status_local, (), self.status_timeout)
-                if a == -1:
-                    Trace.log(e_errors.ERROR, 'locate_drive:  mtx status request timeout')
-                    if self.cli_host:
-                        # record what is seen using CLI
-                        rc = self.setup_cli_command()
-                        if not e_errors.is_ok(rc[0]):
-                            Trace.log(e_errors.INFO, 'setup_cli_command returned %s' % (rc,))
-                            return -1, -1
-                        tm = time.localtime(time.time())
-                        fn = '/var/log/enstore/tmp/enstore/Drives.%s-%s-%s.%s:%s:%s' % \
-                             (tm.tm_year, tm.tm_mon, tm.tm_mday, tm.tm_hour, tm.tm_min, tm.tm_sec)
-                        cmd = '%s -jar %s -ip %s -u %s -p %s --viewDriveSummary' % (
-                            self.java_exec, self.cli_jar_file, self.ibm_cli_host, self.ibm_cli_u, self.ibm_cli_pw)
-
-                        res = enstore_functions2.shell_command('enrsh -n %s %s ' % (self.cli_host, cmd,))
-                        if not res:
-                            Trace.log(e_errors.ERROR, 'viewDriveSummary: IBM CLI returned %s' % (res[1],))
-                        else:
-                            f = open(fn, 'w')
-                            f.write(res[0])
-                            f.close()
-                            Trace.log(e_errors.INFO, 'viewDriveSummary result is in %s' % (fn,))
-                    return -1
-            self.status_valid = 1
-        found = False
-        idx_drive = 0
+        Trace.trace(ACTION_LOG_LEVEL, ' looking for drive %s' % (drive_address,))
         drive_addr = drive_address
         if isinstance(drive_addr, str) and drive_addr.isdigit():
             drive_addr = int(drive_address)
-        if isinstance(drive_addr, int):
-            key = 'address'
-        else:
-            key = 'location'
-        d = None
-        for d in self.drives:
-            if drive_addr == d[key]:
-                found = True
-                break
-        if found:
-            idx_drive = self.drives.index(d)
-
-        if not found:
-            idx_drive = -1
+        idx_drive = self.inventory.locate_drive(drive_addr)
         return idx_drive
 
     #  This method tries to have device 'device' load or unload the tape in
@@ -4459,86 +4585,19 @@ class MTXN_MediaLoader(MediaLoaderMethods):
             msg_e = 'status: Unit is not ready. Will not update database'
             Trace.log(e_errors.ERROR, ' %s' % (msg_e,))
             return e_errors.ERROR, 'msg', ''
-        busy_slots = []
         rc = self.get_mtx_status()
         if not e_errors.is_ok(rc[0]):
             Trace.log(e_errors.ERROR, 'get_mtx_status returned: %s' % (rc[0],))
             return e_errors.ERROR, 'get_mtx_status returned: %s' % (rc[0],)
-        if hasattr(self, 'slots'):  # clear lists
-            # save indexes of busy slots
-            for i, slot_d in enumerate(self.slots):
-                vol = slot_d.get('volume')
-                if vol and vol == BUSY:
-                    Trace.log(ACTION_LOG_LEVEL, 'busy slot: %s %s' % (i, slot_d,))
-                    busy_slots.append(i)
-            Trace.log(ACTION_LOG_LEVEL, 'busy slots: %s' % (busy_slots,))
-            del self.slots[:]
-            del self.drives[:]
-        else:
-            self.slots = self.manager.list()
-            self.drives = self.manager.list()
+        # save indexes of busy slots
+        busy_slots = self.inventory.busy_slots()
+        Trace.log(ACTION_LOG_LEVEL, 'busy slots: %s' % (busy_slots,))
         error_string = ''
         lines = rc[3]
         if lines:
-            index = 0
-            line = lines[index]
-            while '' != line:
-                try:
-                    line = string.strip(line)
-                    lel = line.split()
-                    if string.find(line, 'Data Transfer Element') != -1:
-                        # Expected format:
-                        #   Data Transfer Element 257 Phys Loc F2,C1,R2,Z0 SN  00078D2B6E ID ULT3580-TD8 :Empty
-                        # or :
-                        # Data Transfer Element 270 Phys Loc F2,C4,R4,Z0 SN  00078D2B59 ID ULT3580-TD8 :Full
-                        #     (Storage Element 1038 Loaded):VolumeTag = VQ0006L8
-                        self.drives.append({})  # mutable dictionary
-                        d = self.drives[-1]
-                        d['address'] = int(lel[3])
-                        loc_and_zone = lel[6].split(':')[0]
-                        zone_index = loc_and_zone.find('Z')
-                        d['location'] = loc_and_zone[0:zone_index - 1]  # throw ,Z
-                        d['zone'] = loc_and_zone[zone_index:len(loc_and_zone)]
-                        d['SN'] = lel[8]
-                        d['type'] = lel[10].split(':')[0]
-                        d['volume'] = EMPTY
-                        if string.find(line, 'Empty') != -1:
-                            pass  # just to leave status as empty
-                        elif string.find(line, 'VolumeTag') != -1:
-                            i1 = string.find(line, '=') + 1
-                            i2 = len(line)
-                            d['volume'] = string.strip(line[i1:i2])
-                        else:
-                            d['volume'] = 'unlabelled'
-                        self.drives[-1] = d
-                    elif string.find(line, 'Storage Element') != -1:
-                        # Expected format     Storage Element 1025 Phys Loc F08,C02,R01,T00  :Full  :VolumeTag=VQ0033L8
-                        # or:
-                        # Storage Element 1037 Phys Loc EMPTY :Empty :VolumeTag=
-                        self.slots.append({})  # mutable dictionary
-                        d = self.slots[-1]
-                        d['address'] = int(lel[2])
-                        d['location'] = lel[5]
-                        d['volume'] = EMPTY
-                        if len(self.slots) - 1 in busy_slots:  # this slot was reserved, leave it BUSY
-                            d['volume'] = BUSY
-                            Trace.log(ACTION_LOG_LEVEL, 'from status: %s' % (line,))
-                        if string.find(line, 'Empty') != -1:
-                            pass  # just to leave status as empty
-                        elif string.find(line, 'VolumeTag') != -1:
-                            i1 = string.find(line, '=') + 1
-                            i2 = len(line)
-                            d['volume'] = string.strip(line[i1:i2])
-                        else:
-                            d['volume'] = 'unlabelled'
-                        self.slots[-1] = d
-                    else:
-                        Trace.log(ACTION_LOG_LEVEL, 'status_local: can not interpret line: %s' % (line,))
-                    index = index + 1
-                    line = lines[index]
-                except:
-                    Trace.handle_error(severity=ACTION_LOG_LEVEL)
-            self.status_valid = 1
+            slots, drives = parse_mtx_status(lines, busy_slots)
+            # replace the inventory at once
+            self.inventory.reset(slots, drives)
             self.last_updated_db.value = int(time.time())
         else:
             Trace.log(e_errors.ERROR, 'mtx status returned no result %s' % (rc[0],))
@@ -4558,83 +4617,67 @@ class MTXN_MediaLoader(MediaLoaderMethods):
     def getVolState(self, ticket):
         __pychecker__ = "no-argsused"
         Trace.log(ACTION_LOG_LEVEL, 'getVolstate: %s' % (ticket,))
-        retry_count = 2
-        slot = -1
-        while retry_count > 0:
-            ticket['status'] = e_errors.OK
-            slot, drive = self.locate_volume(ticket['external_label'])
-            Trace.log(ACTION_LOG_LEVEL, 'getVolState slot:%s, drive %s' % (slot, drive,))
-            if (slot < 0 and drive < 0) or (slot > 0 and drive >= 0):
-                # if volume is not in drive and not in slot
-                # or volume is in drive and in slot - retry with inventory
-                retry_count -= 1
-                if retry_count > 0:
-                    self.status_valid = 0  # this will cause an inventory
-                    Trace.log(ACTION_LOG_LEVEL, 'getVolState retrying')
-                ticket['status'] = e_errors.MC_VOLNOTFOUND
-                continue
-            elif slot < 0 <= drive:
-                ticket['state'] = 'M'
-                ticket['phys_location'] = ('%s,%s' % (self.drives[drive]['location'], self.drives[drive]['zone']))
-                ticket['location'] = self.drives[drive]['address']
-                ticket['SN'] = self.drives[drive]['SN']
-            elif slot >= 0:
-                if drive < 0 or ticket['external_label'] == EMPTY:
-                    ticket['state'] = 'O'
-                    ticket['location'] = self.slots[slot]['address']
-                    ticket['phys_location'] = self.slots[slot]['location']
-            retry_count = 0
+        ticket['status'] = e_errors.OK
+        slot, drive = self.locate_volume(ticket['external_label'])
+        Trace.log(ACTION_LOG_LEVEL, 'getVolState slot:%s, drive %s' % (slot, drive,))
+        if (slot < 0 and drive < 0) or (slot > 0 and drive >= 0):
+            # if volume is not in drive and not in slot
+            # or volume is in drive and in slot - refresh inventory
+            self.request_inventory('getVolState %s slot %s drive %s' % (ticket['external_label'], slot, drive))
+            ticket['status'] = e_errors.MC_VOLNOTFOUND
+        elif slot < 0 <= drive:
+            drive_el = self.inventory.drive(drive)
+            ticket['state'] = 'M'
+            ticket['phys_location'] = ('%s,%s' % (drive_el['location'], drive_el['zone']))
+            ticket['location'] = drive_el['address']
+            ticket['SN'] = drive_el['SN']
+        elif slot >= 0:
+            if drive < 0 or ticket['external_label'] == EMPTY:
+                slot_el = self.inventory.slot(slot)
+                ticket['state'] = 'O'
+                ticket['location'] = slot_el['address']
+                ticket['phys_location'] = slot_el['location']
         if ticket['external_label'] == EMPTY and ticket.get('reserve'):
             if slot >= 0:
-                slot_info = self.slots[slot]
+                slot_info = self.inventory.slot(slot)
                 slot_info['volume'] = BUSY
-                self.slots[slot] = slot_info
-                ticket['external_label'] = self.slots[slot]['volume']
+                self.inventory.set_slot(slot, slot_info)
+                ticket['external_label'] = slot_info['volume']
         Trace.log(ACTION_LOG_LEVEL, 'getVolState: returning %s' % (ticket,))
         return (ticket.get('status'), ticket.get('location'), ticket.get('media_type'), ticket.get('state'),
                 ticket.get('external_label'))
 
     def getDriveState(self, ticket):
-        retry_count = 2
-        rc = []
-        while retry_count > 0:
-            ticket['status'] = e_errors.OK
-            try:
-                drive = self.locate_drive(ticket['drive'])
-            except:
-                drive = -1
-            drive_info = {}
-            if drive < 0:
-                retry_count -= 1
-                if retry_count > 0:
-                    self.status_valid = 0  # this will cause an inventory
-                    Trace.log(ACTION_LOG_LEVEL, 'getDriveState retrying')
-                rc = [e_errors.MC_DRVNOTFOUND, 0, 'No such drive', ticket['drive']]
-                drive_info['state'] = 'noinfo'
-                drive_info['status'] = 'N/A'
-                continue
-            if self.drives[drive]['volume'] == EMPTY:
-                drive_info['volume'] = ''
-            else:
-                drive_info['volume'] = self.drives[drive]['volume']
-            drive_info['state'] = 'online'
-            drive_info['type'] = self.drives[drive]['type']
-            drive_info['phys_location'] = ('%s,%s' % (self.drives[drive]['location'], self.drives[drive]['zone']))
-            drive_info['location'] = self.drives[drive]['address']
-            drive_info['SN'] = self.drives[drive]['SN']
-            if drive_info['volume'] == '':
-                drive_info['status'] = 'available'
-            else:
-                drive_info['status'] = 'in use'
-            ticket['drive_info'] = drive_info
-            rc = [e_errors.OK, self.drives[drive]['location'], '', '']
-            retry_count = 0
-        return rc
+        ticket['status'] = e_errors.OK
+        try:
+            drive = self.locate_drive(ticket['drive'])
+        except:
+            drive = -1
+        drive_info = {}
+        if drive < 0:
+            self.request_inventory('getDriveState %s not found' % (ticket['drive'],))
+            return [e_errors.MC_DRVNOTFOUND, 0, 'No such drive', ticket['drive']]
+        drive_el = self.inventory.drive(drive)
+        if drive_el['volume'] == EMPTY:
+            drive_info['volume'] = ''
+        else:
+            drive_info['volume'] = drive_el['volume']
+        drive_info['state'] = 'online'
+        drive_info['type'] = drive_el['type']
+        drive_info['phys_location'] = ('%s,%s' % (drive_el['location'], drive_el['zone']))
+        drive_info['location'] = drive_el['address']
+        drive_info['SN'] = drive_el['SN']
+        if drive_info['volume'] == '':
+            drive_info['status'] = 'available'
+        else:
+            drive_info['status'] = 'in use'
+        ticket['drive_info'] = drive_info
+        return [e_errors.OK, drive_el['location'], '', '']
 
     def listDrives(self, ticket):
         Trace.log(e_errors.INFO, 'MTX listDrives, called %s' % (ticket,))
         drive_list = []
-        for d in self.drives:
+        for d in self.inventory.drives():
             try:
                 drive_info = copy.copy(d)
                 drive_info['name'] = ('%s(%s,%s)' % (d['address'], d['location'], d['zone']))
@@ -4668,7 +4711,7 @@ class MTXN_MediaLoader(MediaLoaderMethods):
         rc = [e_errors.OK, 0, '', '']
         if not ticket['drive']['address']:
             dt = int(time.time()) - self.last_updated_db.value
-            if dt > 40:
+            if dt > self.status_min_interval:
                 # request to re-load status information
                 Trace.log(e_errors.INFO, 'Starting robot inventory')
                 a, b = return_by(self.status_local, (), self.status_timeout)
@@ -4676,6 +4719,10 @@ class MTXN_MediaLoader(MediaLoaderMethods):
                 if -1 == a:
                     Trace.log(e_errors.ERROR, ' mtx status request timeout')
                     rc[0] = e_errors.ERROR
+                    # record what is seen using CLI
+                    self.record_cli_view('viewDataCartridges', 'DataCartridges')
+                    self.record_cli_view('viewDriveSummary', 'Drives')
+                    self.request_inventory('mtx status request timeout')
                 rc[3] = 'Robot inventory finished'
                 if self.debug:
                     self.dumpdb()
@@ -4688,41 +4735,53 @@ class MTXN_MediaLoader(MediaLoaderMethods):
         Trace.trace(ACTION_LOG_LEVEL, 'updatedb: drive index %s' % (drive,))
         if drive < 0:
             return [e_errors.ERROR, 0, 'No such drive', 'No such drive']
-        drive_info = self.drives[drive]
+        drive_info = self.inventory.drive(drive)
 
-        found = False
-        s = None
-        for s in self.slots:
-            try:
-                if ticket['volume']['address'] == s['address']:
-                    found = True
-                    break
-            except:
-                Trace.handle_error()
-                return [e_errors.ERROR, 0, 'exception in updatedb']
-
-        Trace.trace(ACTION_LOG_LEVEL, 'updatedb: slot %s' % (s,))
-        if found:
-            idx_slot = self.slots.index(s)
-        else:
+        idx_slot = self.inventory.locate_slot(ticket['volume']['address'])
+        Trace.trace(ACTION_LOG_LEVEL, 'updatedb: slot index %s' % (idx_slot,))
+        if idx_slot < 0:
             return [e_errors.ERROR, 0, 'No slot with address %s' % (ticket['volume']['address'],), 'No such slot']
-        slot_info = self.slots[idx_slot]
+        slot_info = self.inventory.slot(idx_slot)
         Trace.trace(ACTION_LOG_LEVEL, 'updatedb: slot[%s] %s' % (idx_slot, slot_info,))
 
         drive_info['volume'] = ticket['drive']['volume']
         slot_info['volume'] = ticket['volume']['volume']
-        self.drives[drive] = drive_info
-        self.slots[idx_slot] = slot_info
+        self.inventory.set_drive(drive, drive_info)
+        self.inventory.set_slot(idx_slot, slot_info)
         Trace.trace(ACTION_LOG_LEVEL, 'updatedb: returning %s' % (rc,))
         return rc
 
+    # Save the output of IBM CLI --<view> command
+    # into /var/log/enstore/tmp/enstore/<file_prefix>.<date>.
+    def record_cli_view(self, view, file_prefix):
+        if not self.cli_host:
+            return
+        rc = self.setup_cli_command()
+        if not e_errors.is_ok(rc[0]):
+            Trace.log(e_errors.INFO, 'setup_cli_command returned %s' % (rc,))
+            return
+        tm = time.localtime(time.time())
+        fn = '/var/log/enstore/tmp/enstore/%s.%s-%s-%s.%s:%s:%s' % \
+             (file_prefix, tm.tm_year, tm.tm_mon, tm.tm_mday, tm.tm_hour, tm.tm_min, tm.tm_sec)
+        cmd = '%s -jar %s -ip %s -u %s -p %s --%s' % (
+            self.java_exec, self.cli_jar_file, self.ibm_cli_host, self.ibm_cli_u, self.ibm_cli_pw, view)
+        res = enstore_functions2.shell_command('enrsh -n %s %s ' % (self.cli_host, cmd,))
+        if not res:
+            Trace.log(e_errors.ERROR, '%s: IBM CLI returned %s' % (view, res[1],))
+        else:
+            f = open(fn, 'w')
+            f.write(res[0])
+            f.close()
+            Trace.log(e_errors.INFO, '%s result is in %s' % (view, fn))
+
     def listSlots(self, ticket):
         Trace.trace(ACTION_LOG_LEVEL, 'listSlots')
         slot_list = []
-        total = len(self.slots)
+        slots = self.inventory.slots()
+        total = len(slots)
         used = 0
         free = 0
-        for slot in self.slots:
+        for slot in slots:
             try:
                 if slot['volume'] == EMPTY:
                     free += 1
@@ -4856,7 +4915,7 @@ class MTXN_MediaLoader(MediaLoaderMethods):
     # return formatted text containing volume information
     def _listVolumes(self):
         msg_e = '     volume          state             location\n'
-        for d in self.drives:
+        for d in self.inventory.drives():
             if d['volume'] != EMPTY:
                 msg_e += '%12s %12s %12s (%s,%s)\n' % \
                          (d['volume'],
@@ -4864,7 +4923,7 @@ class MTXN_MediaLoader(MediaLoaderMethods):
                           d['address'],
                           d['location'],
                           d['zone'])
-        for s in self.slots:
+        for s in self.inventory.slots():
             msg_e += '%12s %12s %12s (%s)\n' % \
                      (s['volume'],
                       'home',
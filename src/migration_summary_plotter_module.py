@@ -443,11 +443,11 @@ class MigrationSummaryPlotterModule(enstore_plotter_module.EnstorePlotterModule)
         #  here we create data points
 
         edb = frame.get_configuration_client().get("database", {})
-        db = pg.DB(host   = edb.get('dbhost', "localhost"),
-                   dbname = edb.get('dbname', "enstoredb"),
-                   port   = edb.get('dbport', 5432),
-                   user   = edb.get('dbuser', "enstore")
-                   )
+        db = frame.get_db(host   = edb.get('dbhost', "localhost"),
+                          dbname = edb.get('dbname', "enstoredb"),
+                          port   = edb.get('dbport', 5432),
+                          user   = edb.get('dbuser', "enstore")
+                          )
 
         ###
         ### Lets get the daily values.
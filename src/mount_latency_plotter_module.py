@@ -8,7 +8,6 @@
 #
 ###############################################################################
 
-import pg
 import string
 import sys
 import os
@@ -71,10 +70,10 @@ class MountLatencyPlotterModule(enstore_plotter_module.EnstorePlotterModule):
     def fill(self, frame):
         csc = frame.get_configuration_client()
         acc = csc.get(enstore_constants.ACCOUNTING_SERVER)
-        self.db = pg.DB(host  = acc.get('dbhost', 'localhost'),
-                        dbname= acc.get('dbname', 'accounting'),
-                        port  = acc.get('dbport', 5432),
-                        user  = acc.get('dbuser_reader', 'enstore_reader'))
+        self.db = frame.get_db(host  = acc.get('dbhost', 'localhost'),
+                               dbname= acc.get('dbname', 'accounting'),
+                               port  = acc.get('dbport', 5432),
+                               user  = acc.get('dbuser_reader', 'enstore_reader'))
         #
         # get list of media changers
         #
@@ -8,7 +8,6 @@
 #
 ###############################################################################
 
-import pg
 import string
 import sys
 import os
@@ -69,13 +68,13 @@ class MountsPerRobotPlotterModule(enstore_plotter_module.EnstorePlotterModule):
         if not os.path.exists(self.web_dir):
             os.makedirs(self.web_dir)
 
-    def __fill(self,server_tuple):
+    def __fill(self,frame,server_tuple):
         csc = configuration_client.ConfigurationClient(server_tuple)
         acc = csc.get(enstore_constants.ACCOUNTING_SERVER)
-        db  = pg.DB(host = acc.get('dbhost', 'localhost'),
-                    dbname= acc.get('dbname', 'accounting'),
-                    port  = acc.get('dbport', 5432),
-                    user  = acc.get('dbuser_reader', 'enstore_reader'))
+        db  = frame.get_db(host = acc.get('dbhost', 'localhost'),
+                           dbname= acc.get('dbname', 'accounting'),
+                           port  = acc.get('dbport', 5432),
+                           user  = acc.get('dbuser_reader', 'enstore_reader'))
         #
         # get list of media changers
         #
@@ -132,7 +131,7 @@ class MountsPerRobotPlotterModule(enstore_plotter_module.EnstorePlotterModule):
             return
         del known_config_servers['status']
         for name,server in known_config_servers.iteritems():
-            self.__fill(server)
+            self.__fill(frame,server)
         return
 
     def plot(self):
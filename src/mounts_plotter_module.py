@@ -185,10 +185,10 @@ class MountsPlotterModule(enstore_plotter_module.EnstorePlotterModule):
 
 
 		edb = frame.get_configuration_client().get('database', {})
-		db = pg.DB(host  = edb.get('db_host', "localhost"),
-			   dbname= edb.get('dbname', "enstoredb"),
-			   port  = edb.get('db_port', 5432),
-			   user  = edb.get('dbuser', "enstore"))
+		db = frame.get_db(host  = edb.get('db_host', "localhost"),
+			          dbname= edb.get('dbname', "enstoredb"),
+			          port  = edb.get('db_port', 5432),
+			          user  = edb.get('dbuser', "enstore"))
 
 		# get list of library managers available in config and then select only those to plot
 		libraries = enstore_stop.find_servers_by_type(frame.get_configuration_client(), enstore_constants.LIBRARY_MANAGER)
@@ -22,7 +22,6 @@ import errno
 import socket
 import time
 import string
-import struct
 import select
 import exceptions
 import traceback
@@ -31,6 +30,7 @@ import random
 import copy
 import platform
 import types
+import collections
 
 # enstore modules
 
@@ -202,12 +202,158 @@ def shell_command(command):
         result = None
     return result
 
+class CRCStage:
+    """
+    Calculate checksums of the blocks read into :class:`Buffer` in a separate thread,
+    so that reading from the media does not wait for CRC calculation.
+
+    Blocks are checksummed in the order they were read.
+    A block stays out of the buffer pool until its checksum is calculated.
+    """
+    def __init__(self, buffer, max_bytes):
+        """
+
+        :type buffer: :class:`Buffer`
+        :arg buffer: buffer, which blocks are checksummed
+        :type max_bytes: :obj:`int`
+        :arg max_bytes: maximal number of bytes waiting for CRC calculation
+        """
+        self.buffer = buffer
+        self.max_bytes = max_bytes
+        self._cond = threading.Condition()
+        self._queue = collections.deque() # (block, data_ptr, nbytes, block number)
+        self._queued_bytes = 0
+        self._busy = 0
+        self._pending = {}  # id(block): number of queued descriptors of this block
+        self._released = {} # id(block): block, freed by buffer before its CRC was calculated
+        self._stop = 0
+        self.blocks = 0     # blocks put into the stage
+        self.error = None   # number of the first block with CRC error
+        self.thread = threading.Thread(target=self.run, name="crc_stage")
+        self.thread.setDaemon(1)
+        self.thread.start()
+
+    def put(self, block, data_ptr, nbytes):
+        """
+        Queue block for CRC calculation.
+        Waits if too many bytes are waiting for CRC calculation.
+
+        :type block: :obj:`bytearray`
+        :arg block: data block
+        :type data_ptr: :obj:`int`
+        :arg data_ptr: start of data to checksum in block
+        :type nbytes: :obj:`int`
+        :arg nbytes: number of bytes to checksum
+        :rtype: :obj:`float` time spent waiting
+        """
+        t0 = time.time()
+        self._cond.acquire()
+        while self._queued_bytes and self._queued_bytes + nbytes > self.max_bytes and not self._stop:
+            self._cond.wait(1)
+        t1 = time.time()
+        self._queue.append((block, data_ptr, nbytes, self.blocks))
+        self._queued_bytes = self._queued_bytes + nbytes
+        self._pending[id(block)] = self._pending.get(id(block), 0) + 1
+        self.blocks = self.blocks + 1
+        self._cond.notifyAll()
+        self._cond.release()
+        return t1 - t0
+
+    def release(self, block):
+        """
+        Called by buffer when block is freed.
+
+        :type block: :obj:`bytearray`
+        :arg block: data block
+        :rtype: :obj:`int` 1 if block is still waiting for CRC calculation.
+                It gets returned into the buffer pool later.
+        """
+        self._cond.acquire()
+        pending = self._pending.has_key(id(block))
+        if pending:
+            self._released[id(block)] = block
+        self._cond.release()
+        return pending
+
+    def flush(self):
+        """
+        Wait until all queued blocks are checksummed.
+
+        :rtype: :obj:`float` time spent waiting
+        """
+        t0 = time.time()
+        self._cond.acquire()
+        while (self._queue or self._busy) and not self._stop:
+            self._cond.wait(1)
+        self._cond.release()
+        return time.time() - t0
+
+    def reset(self):
+        """
+        Discard queued blocks and wait for the block being checksummed.
+
+        """
+        self._cond.acquire()
+        self._queue.clear()
+        self._queued_bytes = 0
+        while self._busy and not self._stop:
+            self._cond.wait(1)
+        self._pending = {}
+        self._released = {}
+        self.blocks = 0
+        self.error = None
+        self._cond.notifyAll()
+        self._cond.release()
+
+    def stop(self):
+        self._cond.acquire()
+        self._stop = 1
+        self._queue.clear()
+        self._cond.notifyAll()
+        self._cond.release()
+
+    def run(self):
+        while 1:
+            self._cond.acquire()
+            while not self._queue and not self._stop:
+                self._cond.wait()
+            if self._stop:
+                self._cond.release()
+                return
+            block, data_ptr, nbytes, block_number = self._queue.popleft()
+            self._busy = 1
+            self._cond.release()
+
+            t0 = time.time()
+            try:
+                if self.error is None:
+                    self.buffer.block_crc(block, data_ptr, nbytes)
+            except MoverError:
+                Trace.log(e_errors.ERROR, "CRC stage: CRC error in block %s" % (block_number,))
+                self.error = block_number
+            self.buffer.read_stats[6] = self.buffer.read_stats[6] + time.time() - t0
+
+            self._cond.acquire()
+            self._busy = 0
+            self._queued_bytes = self._queued_bytes - nbytes
+            count = self._pending.get(id(block), 0) - 1
+            if count > 0:
+                self._pending[id(block)] = count
+            else:
+                if self._pending.has_key(id(block)):
+                    del(self._pending[id(block)])
+                if self._released.has_key(id(block)):
+                    del(self._released[id(block)])
+                    self.buffer._freespace(block)
+            self._cond.notifyAll()
+            self._cond.release()
+
 class Buffer:
     """
     Provide memory buffer for incoming and outgoing data.
 
     """
-    def __init__(self, blocksize, min_bytes=0, max_bytes=1*MB, crc_seed=1L):
+    def __init__(self, blocksize, min_bytes=0, max_bytes=1*MB, crc_seed=1L, crc_pipeline=0):
         """
 
         :type blocksize: :obj:`int`
@@ -221,6 +367,10 @@ class Buffer:
 
         :type crc_seed: :obj:`long`
         :arg crc_seed: seed for adler32 checksum calculation
+
+        :type crc_pipeline: :obj:`int`
+        :arg crc_pipeline: if != 0 calculate checksums of blocks read
+                           by :meth:`block_read` in a separate thread (:class:`CRCStage`)
         """
 
         self.blocksize = blocksize
@@ -243,21 +393,30 @@ class Buffer:
         self.write_ok = threading.Event()
 
         self._lock = threading.Lock()
-        self._buf = []
+        # Blocks are bytearrays allocated once, kept in a pool (_freelist)
+        # and reused for the life of the mover. Drivers read and write
+        # them in place, so data is not copied between the driver read
+        # and the network (or tape) write.
+        # _buf holds (block, length) descriptors: partially filled blocks
+        # are pushed with their length rather than sliced.
+        self._buf = collections.deque()
         self._buf_bytes = 0L
-        self._freelist = []
+        self._freelist = collections.deque()
         self._reading_block = None
         self._writing_block = None
         self._read_ptr = 0
         self._write_ptr = 0
+        self._write_length = 0 # valid bytes in _writing_block
         self.wrapper = None
         self.first_block = 1
         self.bytes_for_crc = 0L
         self.trailer_pnt = 0L
         self.client_crc_on = 0
-        self.read_stats = [0, 0, 0, 0, 0] # read block timing stats
+        self.read_stats = [0, 0, 0, 0, 0, 0, 0] # read block timing stats
         self.write_stats = [0, 0, 0, 0, 0] # read block timing stats
         self.buffered_tapemarks = None
+        self.crc_pipeline = crc_pipeline
+        self.crc_stage = None
 
     def set_wrapper(self, wrapper):
         self.wrapper = wrapper
@@ -268,6 +427,7 @@ class Buffer:
         self.saved_writing_block = self._writing_block
         self.saved_read_ptr = self._read_ptr
         self.saved_write_ptr = self._write_ptr
+        self.saved_write_length = self._write_length
         self.saved_complete_crc = self.complete_crc
         self.saved_sanity_crc = self.sanity_crc
         self.saved_sanity_bytes = self.sanity_bytes
@@ -284,6 +444,7 @@ class Buffer:
         self._writing_block = self.saved_writing_block
         self._read_ptr = self.saved_read_ptr
         self._write_ptr = self.saved_write_ptr
+        self._write_length = self.saved_write_length
         self.complete_crc = self.saved_complete_crc
         self.sanity_crc = self.saved_sanity_crc
         self.sanity_bytes = self.saved_sanity_bytes
@@ -299,13 +460,14 @@ class Buffer:
         self.read_ok.set()
         self.write_ok.clear()
 
-        self._buf = []
+        self._buf = collections.deque()
 ##        self._freelist = []   keep this around to save on malloc's
         self._buf_bytes = 0
         self._reading_block = None
         self._writing_block = None
         self._read_ptr = 0
         self._write_ptr = 0
+        self._write_length = 0
         if self.crc_seed == 1L:
             self.complete_crc = self.crc_seed
             self.sanity_crc = self.crc_seed
@@ -322,20 +484,19 @@ class Buffer:
         self.client_crc_on = client_crc_on
         self.wrapper = None
         self.first_block = 1
-        self.read_stats = [0, 0, 0, 0, 0] # read block timing stats
+        self.read_stats = [0, 0, 0, 0, 0, 0, 0] # read block timing stats
         self.write_stats = [0, 0, 0, 0, 0] # read block timing stats
+        if self.crc_stage:
+            self.crc_stage.reset()
 
     def clear(self):
         Trace.trace(10, "clear buffer start")
+        if self.crc_stage:
+            self.crc_stage.stop()
+            self.crc_stage = None
         self._lock.acquire()
-        l = len(self._buf)
-        for i in range(l):
-            d = self._buf.pop(0)
-            del(d)
-        l = len(self._freelist)
-        for i in range(l):
-            d = self._freelist.pop(0)
-            del(d)
+        self._buf.clear()
+        self._freelist.clear()
         Trace.trace(10, "clear buffer finish")
         self._lock.release()
 
@@ -370,33 +531,72 @@ class Buffer:
         if self.nbytes() != 0:
             raise MoverError(BUF_SIZE_CH_ERR)
         self._lock.acquire()
-        self._freelist = []
+        self._freelist = collections.deque()
         self.blocksize = blocksize
         self._lock.release()
 
-    def push(self, data):
+    def push(self, data, length=None):
         """
         Push data into the buffer.
 
-        :type data: :obj:`str`
+        :type data: :obj:`str` or :obj:`bytearray`
         :arg data: portion of the transferring data
+        :type length: :obj:`int`
+        :arg length: number of valid bytes in data, all if None
 
         """
+        if length is None:
+            length = len(data)
         self._lock.acquire()
-        self._buf.append(data)
-        self._buf_bytes = self._buf_bytes + len(data)
+        self._buf.append((data, length))
+        self._buf_bytes = self._buf_bytes + length
         self._lock.release()
 
     def pull(self):
         """
         Pull data out of the buffer.
+        Valid part of partially filled block is returned as a copy.
+
+        """
+        data, length = self.pull_block()
+        if length != len(data):
+            data = data[:length]
+        return data
+
+    def pull_block(self):
+        """
+        Pull block out of the buffer without copying it.
 
+        :rtype: :obj:`tuple` (block, number of valid bytes in block)
         """
         self._lock.acquire()
-        data = self._buf.pop(0)
-        self._buf_bytes = self._buf_bytes - len(data)
+        block, length = self._buf.popleft()
+        self._buf_bytes = self._buf_bytes - length
         self._lock.release()
-        return data
+        return block, length
+
+    def peek(self):
+        """
+        Return a copy of the data in the first block of the buffer.
+        Used for parsing file headers.
+        Raises IndexError if the buffer is empty.
+
+        :rtype: :obj:`str`
+        """
+        self._lock.acquire()
+        try:
+            block, length = self._buf[0]
+        finally:
+            self._lock.release()
+        return str(block[:length])
+
+    def discard(self):
+        """
+        Pull block out of the buffer and return it to the pool.
+
+        """
+        block, length = self.pull_block()
+        self._freespace(block)
 
     def set_crc_seed(self, crc_seed):
         self.crc_seed = crc_seed
@@ -455,8 +655,12 @@ class Buffer:
             do_crc = 1
         else:
             do_crc = 0
+        if self.crc_stage and self.crc_stage.error is not None:
+            # reported by CRC stage for one of the previous blocks
+            Trace.log(e_errors.ERROR, "block_read: CRC_ERROR in block %s" % (self.crc_stage.error,))
+            raise MoverError(e_errors.CRC_ERROR)
         data = None
-        partial = None
+        crc_wait = 0.
         t0 = time.time()
         space = self._getspace()
         t1 = time.time()
@@ -468,14 +672,13 @@ class Buffer:
         if bytes_read == nbytes: #normal case
             data = space
         elif bytes_read <= 0: #error
-            Trace.trace(25, "block_read: read %s" % (bytes_read,))
+            Trace.tracef(25, "block_read: read %s", bytes_read)
             pass #XXX or raise an exception?
         else: #partial block read
             if bytes_read > nbytes:
                 bytes_read = nbytes
-            Trace.trace(25, "partial block (%s/%s) read" % (bytes_read, nbytes))
-            data = space[:bytes_read]
-            partial = 1
+            Trace.tracef(25, "partial block (%s/%s) read", bytes_read, nbytes)
+            data = space # pushed with its length, no slicing
 
         data_ptr = 0
         bytes_for_crc = bytes_read
@@ -485,72 +688,106 @@ class Buffer:
             ##if len(self.buffer._buf) != 1:
             ##        Trace.log(e_errors.ERROR,
             ##                  "block_read: error skipping over cpio header, len(buf)=%s"%(len(self.buffer._buf)))
-            if len(data) >= self.wrapper.min_header_size:
+            if data is not None and bytes_read >= self.wrapper.min_header_size:
+                header = str(data[:bytes_read])
                 try:
-                    header_size = self.wrapper.header_size(data)
+                    header_size = self.wrapper.header_size(header)
                 except (TypeError, ValueError), msg:
-                    Trace.log(e_errors.ERROR, "Invalid header %s" %(data[:self.wrapper.min_header_size]))
+                    Trace.log(e_errors.ERROR, "Invalid header %s" %(header[:self.wrapper.min_header_size]))
                     raise MoverError(WRAPPER_ERROR)
                 data_ptr = header_size
                 bytes_for_cs = min(bytes_read - header_size, self.bytes_for_crc)
             self.first_block = 0
         if do_crc:
-            crc_error = 0
-            try:
-                #Trace.trace(22,"block_read: data_ptr %s, bytes_for_cs %s" % (data_ptr, bytes_for_cs)) #COMMENT THIS
-
-                self.complete_crc = checksum.adler32_o(self.complete_crc,
-                                                       data,
-                                                       data_ptr, bytes_for_cs)
-                if self.sanity_bytes < SANITY_SIZE:
-                    nbytes = min(SANITY_SIZE-self.sanity_bytes, bytes_for_cs)
-                    self.sanity_crc = checksum.adler32_o(self.sanity_crc,
-                                                         data,
-                                                         data_ptr, nbytes)
-                    self.sanity_bytes = self.sanity_bytes + nbytes
-                    #Trace.trace(22, "block_read: sanity cookie %s sanity_crc %s sanity_bytes %s" %
-                    #            (self.sanity_cookie, self.sanity_crc,
-                    #             self.sanity_bytes))
-                else:
-                    # compare sanity crc
-                    crc_error = 0
-                    if self.sanity_cookie and self.sanity_crc != self.sanity_cookie[1]:
-                        if self.sanity_cookie != (None, None):
-                            # (None, None) is a special case to fix bfid db
-                            crc_error = 1
-                            if self.crc_seed == 0:
-                                # try 1 based crc
-                                crc_1_seeded = checksum.convert_0_adler32_to_1_adler32(self.sanity_crc,
-                                                                                       self.sanity_cookie[0])
-                                if crc_1_seeded == self.sanity_cookie[1]:
-                                    self.sanity_crc = crc_1_seeded
-                                    crc_error = 0
-
-                data_ptr = data_ptr + bytes_for_cs
-            except:
-                Trace.log(e_errors.ERROR, "block_read: CRC_ERROR")
-                Trace.handle_error()
-                raise MoverError(e_errors.CRC_ERROR)
-            if crc_error:
-                Trace.log(e_errors.ERROR, "CRC Error: CRC sanity cookie %s, actual (%s,%s)" %
-                          (self.sanity_cookie, self.sanity_bytes, self.sanity_crc))
-                Trace.log(e_errors.ERROR, "block_read: CRC_ERROR")
-                raise MoverError(e_errors.CRC_ERROR)
+            if self.crc_pipeline and data is not None:
+                if not self.crc_stage:
+                    self.crc_stage = CRCStage(self, self.max_bytes)
+                crc_wait = self.crc_stage.put(data, data_ptr, bytes_for_cs)
+            else:
+                self.block_crc(data, data_ptr, bytes_for_cs)
 
         t3 = time.time()
         if data and fill_buffer:
-            self.push(data)
-            if partial:
-                self._freespace(space)
+            self.push(data, bytes_read)
+        else:
+            self._freespace(space)
         t4 = time.time()
         self.read_stats[0] = self.read_stats[0] + t1-t0   # total time in get_space
         self.read_stats[1] = self.read_stats[1] + t2-t1   # total time in read
         self.read_stats[2] = self.read_stats[2] + t3-t2   # total time in check CRC
         self.read_stats[3] = self.read_stats[3] + t4-t3   # total time in push
         self.read_stats[4] = self.read_stats[4] + t4-t0   # total time in block_read
+        self.read_stats[5] = self.read_stats[5] + crc_wait # total time waiting for CRC stage
+        # read_stats[6] total time in CRC stage, updated by CRCStage
 
         return bytes_read
 
+    def block_crc(self, data, data_ptr, bytes_for_cs):
+        """
+        Update complete and sanity checksums with data read by :meth:`block_read`
+        and check the sanity checksum.
+        Raises :class:`MoverError` (:obj:`e_errors.CRC_ERROR`) on CRC error.
+
+        :type data: :obj:`bytearray`
+        :arg data: data block
+        :type data_ptr: :obj:`int`
+        :arg data_ptr: start of data to checksum in block
+        :type bytes_for_cs: :obj:`int`
+        :arg bytes_for_cs: number of bytes to checksum
+        """
+        crc_error = 0
+        try:
+            #Trace.trace(22,"block_read: data_ptr %s, bytes_for_cs %s" % (data_ptr, bytes_for_cs)) #COMMENT THIS
+
+            self.complete_crc = checksum.adler32_o(self.complete_crc,
+                                                   data,
+                                                   data_ptr, bytes_for_cs)
+            if self.sanity_bytes < SANITY_SIZE:
+                nbytes = min(SANITY_SIZE-self.sanity_bytes, bytes_for_cs)
+                self.sanity_crc = checksum.adler32_o(self.sanity_crc,
+                                                     data,
+                                                     data_ptr, nbytes)
+                self.sanity_bytes = self.sanity_bytes + nbytes
+                #Trace.trace(22, "block_read: sanity cookie %s sanity_crc %s sanity_bytes %s" %
+                #            (self.sanity_cookie, self.sanity_crc,
+                #             self.sanity_bytes))
+            else:
+                # compare sanity crc
+                crc_error = 0
+                if self.sanity_cookie and self.sanity_crc != self.sanity_cookie[1]:
+                    if self.sanity_cookie != (None, None):
+                        # (None, None) is a special case to fix bfid db
+                        crc_error = 1
+                        if self.crc_seed == 0:
+                            # try 1 based crc
+                            crc_1_seeded = checksum.convert_0_adler32_to_1_adler32(self.sanity_crc,
+                                                                                   self.sanity_cookie[0])
+                            if crc_1_seeded == self.sanity_cookie[1]:
+                                self.sanity_crc = crc_1_seeded
+                                crc_error = 0
+        except:
+            Trace.log(e_errors.ERROR, "block_read: CRC_ERROR")
+            Trace.handle_error()
+            raise MoverError(e_errors.CRC_ERROR)
+        if crc_error:
+            Trace.log(e_errors.ERROR, "CRC Error: CRC sanity cookie %s, actual (%s,%s)" %
+                      (self.sanity_cookie, self.sanity_bytes, self.sanity_crc))
+            Trace.log(e_errors.ERROR, "block_read: CRC_ERROR")
+            raise MoverError(e_errors.CRC_ERROR)
+
+    def crc_flush(self):
+        """
+        Wait until CRC stage calculates checksums of all blocks read by :meth:`block_read`.
+        Raises :class:`MoverError` (:obj:`e_errors.CRC_ERROR`) if CRC stage found CRC error.
+
+        """
+        if not self.crc_stage:
+            return
+        self.read_stats[5] = self.read_stats[5] + self.crc_stage.flush()
+        if self.crc_stage.error is not None:
+            Trace.log(e_errors.ERROR, "crc_flush: CRC_ERROR in block %s" % (self.crc_stage.error,))
+            raise MoverError(e_errors.CRC_ERROR)
+
     def block_write(self, nbytes, driver):
         """
         Write data using specified driver.
@@ -572,10 +809,10 @@ class Buffer:
         #Trace.trace(22,"block_write: header size %s"%(self.header_size,))
         #Trace.trace(22,"block_write: do_crc %s"%(do_crc,))
         t0 = t1 = t2 = t3 = t4 = time.time()
-        data = self.pull()
+        data, length = self.pull_block()
         t1 = time.time()
-        if len(data) != nbytes:
-            raise ValueError, "asked to write %s bytes, buffer has %s" % (nbytes, len(data))
+        if length != nbytes:
+            raise ValueError, "asked to write %s bytes, buffer has %s" % (nbytes, length)
         bytes_written = driver.write(data, 0, nbytes)
         t2 = time.time()
         if bytes_written == nbytes: #normal case
@@ -589,7 +826,7 @@ class Buffer:
                     data_ptr = data_ptr + self.header_size
                     number_to_skip = self.header_size
                     #bytes_for_cs = bytes_for_cs - self.header_size
-                    if len(data) <= self.header_size:
+                    if length <= self.header_size:
                         raise MoverError(WRAPPER_ERROR)
                     self.first_block = 0
                 #Trace.trace(22, "block_write: written in this shot %s" % (bytes_written,))
@@ -630,14 +867,14 @@ class Buffer:
             self.bytes_written = self.bytes_written + bytes_written
 
         else: #XXX raise an exception?
-            Trace.trace(22, "actually written %s" % (bytes_written,))
+            Trace.tracef(22, "actually written %s", bytes_written)
             self._freespace(data)
         self.write_stats[0] = self.write_stats[0] + t1-t0   # total time in pull
         self.write_stats[1] = self.write_stats[1] + t2-t1   # total time in write
         self.write_stats[2] = self.write_stats[2] + t3-t2   # total time in check CRC
         self.write_stats[3] = self.write_stats[3] + t4-t3   # total time in freespace
         self.write_stats[4] = self.write_stats[4] + t4-t0   # total time in block_write
-        Trace.trace(122, "WS %s"%(self.write_stats,))
+        Trace.tracef(122, "WS %s", self.write_stats)
         return bytes_written
 
 
@@ -712,10 +949,9 @@ class Buffer:
         return bytes_read
 
     def eof_read(self):
-        Trace.trace(10, "EOF reached, %s"%(self._read_ptr,))
+        Trace.tracef(10, "EOF reached, %s", self._read_ptr)
         if self._reading_block and self._read_ptr:
-            data = self._reading_block[:self._read_ptr]
-            self.push(data)
+            self.push(self._reading_block, self._read_ptr)
             self._reading_block = None
             self._read_ptr = None
 
@@ -736,19 +972,19 @@ class Buffer:
             do_crc = 1
         else:
             do_crc = 0
-        Trace.trace(108, "stream_write do_crc %s bytes %s"%(do_crc, nbytes))
+        Trace.tracef(108, "stream_write do_crc %s bytes %s", do_crc, nbytes)
         if not self._writing_block:
             if self.empty():
                 Trace.trace(10, "stream_write: buffer empty")
                 return 0
-            self._writing_block = self.pull()
+            self._writing_block, self._write_length = self.pull_block()
             self._write_ptr = 0
-        bytes_to_write = min(len(self._writing_block)-self._write_ptr, nbytes)
-        Trace.trace(135, "bytes_to_write %s write_ptr %s"%(bytes_to_write, self._write_ptr))
+        bytes_to_write = min(self._write_length-self._write_ptr, nbytes)
+        Trace.tracef(135, "bytes_to_write %s write_ptr %s", bytes_to_write, self._write_ptr)
 
         if driver:
             bytes_written = driver.write(self._writing_block, self._write_ptr, bytes_to_write)
-            Trace.trace(124, "BYTES WRITTEN %s"%(bytes_written,))
+            Trace.tracef(124, "BYTES WRITTEN %s", bytes_written)
             if bytes_written != bytes_to_write:
                 msg = "encp gone? bytes to write %s, bytes written %s"%(bytes_to_write, bytes_written)
                 Trace.log(e_errors.ERROR, msg)
@@ -784,8 +1020,8 @@ class Buffer:
         else:
             bytes_written = bytes_to_write #discarding header stuff
         self._write_ptr = self._write_ptr + bytes_written
-        Trace.trace(135, "write_ptr %s len w_b %s"%(self._write_ptr,len(self._writing_block)))
-        if self._write_ptr == len(self._writing_block): #finished sending out this block
+        Trace.tracef(135, "write_ptr %s len w_b %s", self._write_ptr,self._write_length)
+        if self._write_ptr == self._write_length: #finished sending out this block
             self._freespace(self._writing_block)
             self._writing_block = None
             self._write_ptr = 0
@@ -794,15 +1030,17 @@ class Buffer:
     def _getspace(self):
         self._lock.acquire()
         if self._freelist:
-            r = self._freelist.pop(0)
+            r = self._freelist.popleft()
         else:
-            r = struct.pack("%ss" % (self.blocksize,), '')
+            r = bytearray(self.blocksize)
         self._lock.release()
         return r
 
     def _freespace(self, s):
-        if len(s) != self.blocksize:
-            return # don't need this partial block around!
+        if type(s) is not bytearray or len(s) != self.blocksize:
+            return # not a pool block (data pushed from outside or old block size)
+        if self.crc_stage and self.crc_stage.release(s):
+            return # CRC stage returns it into the pool when done
         self._lock.acquire()
         self._freelist.append(s)
         self._lock.release()
@@ -992,7 +1230,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         if attr != 'state':
             self.__dict__[attr] = val
             return
-        Trace.trace(10, "setattr: %s to %s" % (attr, val))
+        Trace.tracef(10, "setattr: %s to %s", attr, val)
         try:
             cur_val = getattr(self, 'state', None)
             if val != cur_val:
@@ -1016,11 +1254,11 @@ class Mover(dispatching_worker.DispatchingWorker,
                 self.reset_interval(self.update_lm, interval)
         except:
             exc, msg, tb = sys.exc_info()
-            Trace.trace(10,"Exception setting attr %s: %s %s"%(attr, exc, msg))
+            Trace.tracef(10, "Exception setting attr %s: %s %s", attr, exc, msg)
             del(tb)
             pass #don't want any errors here to stop us
         self.__dict__[attr] = val
-        Trace.trace(10, "set state old: %s new: %s %s" % (cur_val, state_name(val), self.__dict__['state_change_time'] ))
+        Trace.tracef(10, "set state old: %s new: %s %s", cur_val, state_name(val), self.__dict__['state_change_time'])
 
 
     def dump(self, ticket):
@@ -1129,7 +1367,8 @@ class Mover(dispatching_worker.DispatchingWorker,
         if self.buffer:
             self.buffer.clear()
             del(self.buffer)
-        self.buffer = Buffer(0, self.min_buffer, self.max_buffer, crc_seed=self.crc_seed)
+        self.buffer = Buffer(0, self.min_buffer, self.max_buffer, crc_seed=self.crc_seed,
+                             crc_pipeline=self.crc_pipeline)
         if self.log_mover_state:
             cmd = "EPS | grep %s"%(self.name,)
             result = shell_command(cmd)
@@ -1157,7 +1396,7 @@ class Mover(dispatching_worker.DispatchingWorker,
             else:
                 thread_name = None
             Trace.log(e_errors.INFO, "LOG: CurThread %s"%(thread_name))
-            Trace.trace(87, "LOG: PS %s"%(result,))
+            Trace.tracef(87, "LOG: PS %s", result)
             #self.dump_vars()
 
             # see what threads are running
@@ -1575,7 +1814,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         mcc_reply = self.mcc.list_drives(ticket)
         if not e_errors.is_ok(mcc_reply):
             return None
-        Trace.trace(e_errors.INFO, 'list_drives returned SN %s'%(mcc_reply,))
+        Trace.tracef(e_errors.INFO, 'list_drives returned SN %s', mcc_reply)
         for d in mcc_reply['drive_list']:
             if serial_num == d.get('SN'):
                 return d.get('address'), d.get('location')
@@ -1839,6 +2078,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         self.stop =  self.config.get('stop_mover',None)
         self.check_first_written_enabled =self.config.get("check_first_written_file", 0)
         self.max_idle_mem = self.config.get('max_idle_mem', 10) # pecentage of memory usage in idle state
+        self.crc_pipeline = self.config.get('crc_pipeline', 0) # calculate CRC of blocks read from media in a separate thread
 
         if self.check_sched_down() or self.check_lockfile():
             self.state = OFFLINE
@@ -2363,7 +2603,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         No work is no work.
 
         """
-        Trace.trace(98, "nowork %s"%(ticket,))
+        Trace.tracef(98, "nowork %s", ticket)
         if self.control_socket:
             try:
                 self.control_socket.close()
@@ -2386,7 +2626,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         This is to process library manager no_work request.
 
         """
-        Trace.trace(98, "no_work %s"%(ticket,))
+        Trace.tracef(98, "no_work %s", ticket)
         if self.state == HAVE_BOUND:
             if 'processing_requests' in ticket:
                 # Library manager sends 'processing_requests' in reply to 'mover_bound_volume' mover request
@@ -2405,10 +2645,10 @@ class Mover(dispatching_worker.DispatchingWorker,
         """
         x = tb # to trick pychecker
         Trace.log(e_errors.ERROR, "handle mover error %s %s"%(exc, msg))
-        Trace.trace(10, "%s %s" %(self.current_work_ticket, state_name(self.state)))
+        Trace.tracef(10, "%s %s", self.current_work_ticket, state_name(self.state))
         if self.current_work_ticket:
             try:
-                Trace.trace(10, "handle error: calling transfer failed, str(msg)=%s"%(str(msg),))
+                Trace.tracef(10, "handle error: calling transfer failed, str(msg)=%s", str(msg))
                 self.transfer_failed(exc, msg)
             except:
                 pass
@@ -2428,7 +2668,7 @@ class Mover(dispatching_worker.DispatchingWorker,
 
         """
 
-        Trace.trace(20,"update_lm: dont_update=%s" % (self.dont_update_lm,))
+        Trace.tracef(20, "update_lm: dont_update=%s", self.dont_update_lm)
         if self.state == IDLE:
             # check memory usage and if bad restart
             self.memory_usage()
@@ -2437,13 +2677,13 @@ class Mover(dispatching_worker.DispatchingWorker,
         self.need_lm_update = (0, None, 0, None)
         if state is None:
             state = self.state
-        Trace.trace(20,"update_lm: %s %s" % (state_name(state), self.unique_id))
+        Trace.tracef(20, "update_lm: %s %s", state_name(state), self.unique_id)
         thread = threading.currentThread()
         if thread:
             thread_name = thread.getName()
         else:
             thread_name = None
-        Trace.trace(20, "update_lm: thread %s"% (thread_name,))
+        Trace.tracef(20, "update_lm: thread %s", thread_name)
         if (thread_name == 'MainThread') and self.restart_flag:
             self.restart()
 
@@ -2496,14 +2736,14 @@ class Mover(dispatching_worker.DispatchingWorker,
                     # try to delay the alarm
                     if self.delay_alarm_for_tape_thread:
                         Trace.log(DEBUG_LOG, 'delaying alarm for tape thread running in %s for %s s'%(state_name(self.state),t_in_state))
-                        Trace.trace(10, 'delaying alarm for tape thread running in %s for %s s'%(state_name(self.state),t_in_state)) # repeat for stdio
+                        Trace.tracef(10, 'delaying alarm for tape thread running in %s for %s s', state_name(self.state),t_in_state) # repeat for stdio
                         time.sleep(1)
                         self.delay_alarm_for_tape_thread = False
                     else:
                         Trace.alarm(e_errors.ALARM,
                                     "Tape thread is running in the state %s. Will offline the mover"%
                                     (state_name(self.state),))
-                        Trace.trace(10, 'tape thread is running in %s for %s s'%(state_name(self.state),t_in_state))
+                        Trace.tracef(10, 'tape thread is running in %s for %s s', state_name(self.state),t_in_state)
                         self.watch_syslog()
                         self.log_state(logit=1)
                         Trace.log(e_errors.INFO, "Trying to dismount volume %s"%(self.current_volume,))
@@ -2516,7 +2756,7 @@ class Mover(dispatching_worker.DispatchingWorker,
 
         now = time.time()
         transfer_stuck = 0
-        Trace.trace(20, "reset_timer %s"%(reset_timer,))
+        Trace.tracef(20, "reset_timer %s", reset_timer)
         if reset_timer:
             self.reset_interval_timer(self.update_lm)
 
@@ -2531,7 +2771,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                 (self.state in (SETUP, SEEK, MOUNT_WAIT, DISMOUNT_WAIT, ERROR, FINISH_WRITE, ACTIVE))):
                 send_alarm = True
                 if self.state == ACTIVE:
-                    Trace.trace(8, "bytes read last %s bytes read %s"%(self.bytes_read_last, self.bytes_read))
+                    Trace.tracef(8, "bytes read last %s bytes read %s", self.bytes_read_last, self.bytes_read)
                     if self.bytes_read_last == self.bytes_read:
                         if self.mode in (WRITE, ASSERT):
                             if self.bytes_written == self.bytes_to_write:
@@ -2594,8 +2834,8 @@ class Mover(dispatching_worker.DispatchingWorker,
 
                 self.time_in_state = time_in_state
                 self.in_state_to_cnt = self.in_state_to_cnt+1
-                Trace.trace(8, "in state cnt %s"%(self.in_state_to_cnt,))
-                Trace.trace(8, "in_state_to_cnt %s max_in_state_cnt %s"%(self.in_state_to_cnt, self.max_in_state_cnt,))
+                Trace.tracef(8, "in state cnt %s", self.in_state_to_cnt)
+                Trace.tracef(8, "in_state_to_cnt %s max_in_state_cnt %s", self.in_state_to_cnt, self.max_in_state_cnt)
 
                 if ((self.in_state_to_cnt >= self.max_in_state_cnt) and
                     (self.state != ERROR) and
@@ -2622,8 +2862,8 @@ class Mover(dispatching_worker.DispatchingWorker,
 
         #ticket = self.format_lm_ticket(state=state, error_source=error_source)
         # if mover is offline or active send LM update less often
-        Trace.trace(20, "BEFORE: STATE %s udp_sent %s"%(state_name(self.state), self.udp_cm_sent))
-        Trace.trace(20, "send_update_cnt %s method %s"%(self.send_update_cnt, self.method))
+        Trace.tracef(20, "BEFORE: STATE %s udp_sent %s", state_name(self.state), self.udp_cm_sent)
+        Trace.tracef(20, "send_update_cnt %s method %s", self.send_update_cnt, self.method)
         send_rq = 1
         use_state = 1
         if ((self.state == self._last_state) and
@@ -2637,7 +2877,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         if self.method and self.method == 'read_next' and self.udp_cm_sent:
             send_rq = 0
         set_cm_sent = 1 # tape ingest, initially enable
-        Trace.trace(20, "send_rq %s"%(send_rq,))
+        Trace.tracef(20, "send_rq %s", send_rq)
 
         if send_rq:
             libraries = copy.deepcopy(self.libraries)
@@ -2650,10 +2890,10 @@ class Mover(dispatching_worker.DispatchingWorker,
                 else:
                     ticket = self.format_lm_ticket(state=self.state, error_source=error_source)
 
-                Trace.trace(20, "ticket %s"%(ticket,))
+                Trace.tracef(20, "ticket %s", ticket)
                 if state != self._last_state:
-                    Trace.trace(10, "update_lm: %s to %s" % (ticket, addr))
-                Trace.trace(20, "addr %s lm_addr %s"%(addr, self.lm_address,))
+                    Trace.tracef(10, "update_lm: %s to %s", ticket, addr)
+                Trace.tracef(20, "addr %s lm_addr %s", addr, self.lm_address)
                 self._last_state = self.state
                 # only main thread is allowed to send messages to LM
                 # exception is a mover_busy and mover_error works
@@ -2681,7 +2921,7 @@ class Mover(dispatching_worker.DispatchingWorker,
 
                                 request_from_lm = self.udpc.send(ticket, addr, rcv_timeout=to, max_send=retry)
                                 #request_from_lm = self.udpc.send(ticket, addr, rcv_timeout=30)
-                                Trace.trace(41, "Request turn around time %s"%(time.time() - t0,))
+                                Trace.tracef(41, "Request turn around time %s", time.time() - t0)
                                 #self.waiting_for_lm_response = 1
                             except:
                                 exc, msg, tb = sys.exc_info()
@@ -2699,16 +2939,16 @@ class Mover(dispatching_worker.DispatchingWorker,
                                             return
                                 else:
                                     x = {'status' : (str(exc), str(msg))}
-                                Trace.trace(10, "update_lm: got %s" %(x,))
+                                Trace.tracef(10, "update_lm: got %s", x)
                                 continue
                             work = request_from_lm.get('work')
-                            Trace.trace(20, "update_lm: WORK %s" %(work,))
+                            Trace.tracef(20, "update_lm: WORK %s", work)
                             if addr == self.udp_control_address:
                                 set_cm_sent = 0
                             if not work:
                                 continue
                             method = getattr(self, work, None)
-                            Trace.trace(20, "update_lm: METHOD %s" %(method,))
+                            Trace.tracef(20, "update_lm: METHOD %s", method)
                             if method:
                                 use_state = 0
                                 try:
@@ -2726,12 +2966,12 @@ class Mover(dispatching_worker.DispatchingWorker,
                         set_cm_sent = 0
                         pass
                     else:
-                        Trace.trace(20,"update_lm: send with no wait %s to %s"%(ticket['work'],addr))
+                        Trace.tracef(20, "update_lm: send with no wait %s to %s", ticket['work'],addr)
                         self.udpc.send_no_wait(ticket, addr)
             if self.method and self.method == 'read_next' and set_cm_sent:
                 self.udp_cm_sent = 1
         self.check_dismount_timer()
-        Trace.trace(20, "STATE %s udp_sent %s"%(state_name(self.state), self.udp_cm_sent))
+        Trace.tracef(20, "STATE %s udp_sent %s", state_name(self.state), self.udp_cm_sent)
 
 
     def need_update(self):
@@ -2740,7 +2980,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         # second - state
         # third -  reset timer
         # fourth - error source
-        Trace.trace(20," need_update %s"%(self.need_lm_update,))
+        Trace.tracef(20, " need_update %s", self.need_lm_update)
         if self.need_lm_update[0]:
             Trace.trace(20," need_update calling update_lm")
             self.update_lm(state = self.need_lm_update[1],
@@ -2765,7 +3005,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         if self.state is HAVE_BOUND and self.dismount_time and now>self.dismount_time:
             self.state = DISMOUNT_WAIT
             self.unlock_state()
-            Trace.trace(10,"Dismount time expired %s"% (self.current_volume,))
+            Trace.tracef(10, "Dismount time expired %s", self.current_volume)
             Trace.log(e_errors.INFO, "Trying to dismount volume (2) %s"%(self.current_volume,))
             self.run_in_thread('media_thread', self.dismount_volume, after_function=self.idle)
         else:
@@ -2850,7 +3090,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         :arg client_crc_on: controls crc check
         """
 
-        Trace.trace(22, "reset: client_crc_on %s"%(client_crc_on,))
+        Trace.tracef(22, "reset: client_crc_on %s", client_crc_on)
         self.current_work_ticket = None
         self.init_data_buffer()
         self.buffer.reset(sanity_cookie, client_crc_on)
@@ -2864,11 +3104,11 @@ class Mover(dispatching_worker.DispatchingWorker,
 
         The work was not done.
         """
-        Trace.trace(21, "return_work_to_lm %s"%(ticket,))
+        Trace.tracef(21, "return_work_to_lm %s", ticket)
         try:
             lm_address = ticket['lm']['address']
         except KeyError, msg:
-            Trace.trace(21, "return_work_to_lm failed %s"%(msg,))
+            Trace.tracef(21, "return_work_to_lm failed %s", msg)
             self.malformed_ticket(ticket, "[lm][address]")
             return
 
@@ -2885,7 +3125,7 @@ class Mover(dispatching_worker.DispatchingWorker,
 
         """
 
-        Trace.trace(8, "read_client starting,  bytes_to_read=%s" % (self.bytes_to_read,))
+        Trace.tracef(8, "read_client starting,  bytes_to_read=%s", self.bytes_to_read)
         driver = self.net_driver
         if self.bytes_read == 0 and self.header: #splice in cpio headers, as if they came from client
             nbytes = self.buffer.header_size
@@ -2926,7 +3166,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                 #Trace.handle_error(exc, detail, tb)
                 self.transfer_failed(e_errors.ENCP_GONE, msg, error_source=NETWORK)
                 return
-            Trace.trace(134, "read_client: bytes read %s"%(bytes_read,))
+            Trace.tracef(134, "read_client: bytes read %s", bytes_read)
 
             if bytes_read <= 0:  #  The client went away!
                 if bytes_read == 0:
@@ -2966,14 +3206,14 @@ class Mover(dispatching_worker.DispatchingWorker,
                     bytes_to_read = self.buffer.trailer_size - trailer_bytes_read
                     bytes_read = self.buffer.stream_read(bytes_to_read, trailer_driver)
                     trailer_bytes_read = trailer_bytes_read + bytes_read
-                    Trace.trace(8, "read %s bytes of trailer" % (trailer_bytes_read,))
+                    Trace.tracef(8, "read %s bytes of trailer", trailer_bytes_read)
             if self.tr_failed:
                 driver.close()
                 return
             self.buffer.eof_read() #pushes last partial block onto the fifo
             self.buffer.write_ok.set()
         self.bytes_read_last = self.bytes_read
-        Trace.trace(8, "read_client exiting, read %s/%s bytes" %(self.bytes_read, self.bytes_to_read))
+        Trace.tracef(8, "read_client exiting, read %s/%s bytes", self.bytes_read, self.bytes_to_read)
 
 
     def position_for_crc_check(self):
@@ -3012,7 +3252,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                                  error_source=TAPE)
             return
 
-        Trace.trace(22,"save location %s" % (save_location,))
+        Trace.tracef(22, "save location %s", save_location)
         if have_tape != 1:
             Trace.alarm(e_errors.ERROR, "error positioning tape %s for selective CRC check. Position %s"%
                         (self.current_volume,save_location))
@@ -3083,7 +3323,7 @@ class Mover(dispatching_worker.DispatchingWorker,
             # self.crc_check_percent_complete can not be 0. If it is, encp interrupts transfer.
 
             self.crc_check_percent_completed -= 1
-        Trace.trace(20, "send_client_update: percent done %s"%(self.crc_check_percent_completed,))
+        Trace.tracef(20, "send_client_update: percent done %s", self.crc_check_percent_completed)
         self.current_work_ticket['status'] = (e_errors.MOVER_BUSY,  self.crc_check_percent_completed)
         Trace.log(e_errors.INFO, "Sending update to client: %s"%(self.current_work_ticket['status'],))
         try:
@@ -3108,7 +3348,7 @@ class Mover(dispatching_worker.DispatchingWorker,
 
         self.buffer.save_settings()
         self.bytes_read = self.bytes_read_last = 0L
-        Trace.trace(20,"selective_crc_check: header size %s" % (self.buffer.header_size,))
+        Trace.tracef(20, "selective_crc_check: header size %s", self.buffer.header_size)
         bytes_to_read = self.bytes_to_transfer
         header_size = self.buffer.header_size
         # setup buffer for reads
@@ -3119,7 +3359,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                            self.buffer.sanity_crc),
                           client_crc_on=1) # always calculate crc before writing to tape
         self.buffer.set_wrapper(saved_wrapper)
-        Trace.trace(22, "selective_crc_check: starting check after write, bytes_to_read=%s" % (bytes_to_read,))
+        Trace.tracef(22, "selective_crc_check: starting check after write, bytes_to_read=%s", bytes_to_read)
         driver = self.tape_driver
         first_block = 1
         block_counter = 0
@@ -3144,10 +3384,8 @@ class Mover(dispatching_worker.DispatchingWorker,
 
                 # clean buffer
                 #Trace.trace(22,"write_tape: clean buffer")
-                self.buffer._writing_block = self.buffer.pull()
-                if self.buffer._writing_block:
-                    #Trace.trace(22,"write_tape: freeing block")
-                    self.buffer._freespace(self.buffer._writing_block)
+                #Trace.trace(22,"write_tape: freeing block")
+                self.buffer.discard()
 
             except MoverError, detail:
                 detail = str(detail)
@@ -3201,9 +3439,16 @@ class Mover(dispatching_worker.DispatchingWorker,
                 block_counter = 0
             else:
                 block_counter += 1
-            Trace.trace(22, "selective_crc_check: bytes_read %s bytes_read_last %s"%(self.bytes_read, self.bytes_read_last))
+            Trace.tracef(22, "selective_crc_check: bytes_read %s bytes_read_last %s", self.bytes_read, self.bytes_read_last)
         # end while
-        Trace.trace(22,"selective_crc_check: total blocks %s"%(total_block_counter,))
+        if not failed:
+            try:
+                self.buffer.crc_flush()
+            except MoverError, detail:
+                Trace.alarm(e_errors.ERROR, "selective CRC check error")
+                self.transfer_failed(e_errors.WRITE_ERROR, str(detail), error_source=DRIVE)
+                failed = 1
+        Trace.tracef(22, "selective_crc_check: total blocks %s", total_block_counter)
 
         Trace.trace(22,"write_tape: read CRC %s write CRC %s"%
                     (self.buffer.complete_crc, saved_complete_crc))
@@ -3287,7 +3532,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         """
 
         Trace.log(e_errors.INFO, "write_tape starting, bytes_to_write=%s" % (self.bytes_to_write,))
-        Trace.trace(8, "bytes_to_transfer=%s" % (self.bytes_to_transfer,))
+        Trace.tracef(8, "bytes_to_transfer=%s", self.bytes_to_transfer)
         driver = self.tape_driver
         if self.config['product_id'] in ("T10000C", "T10000D") and self.compression:
             # special code for setting compression for T10000C tape drives
@@ -3323,7 +3568,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                     self.set_volume_noaccess(self.current_volume, "Tape is at BOT, can not write")
                     return
             else:
-                Trace.trace(31, "cur %s, initial %s, last %s"%(self.bloc_loc, self.initial_abslute_location, self.last_absolute_location))
+                Trace.tracef(31, "cur %s, initial %s, last %s", self.bloc_loc, self.initial_abslute_location, self.last_absolute_location)
                 if (self.bloc_loc <= self.initial_abslute_location) or (self.bloc_loc != self.last_absolute_location):
                     Trace.alarm(e_errors.ERROR, "Write error on %s. Wrong position. See log for details"%(self.current_volume,))
                     self.log_processes(logit=1)
@@ -3414,10 +3659,10 @@ class Mover(dispatching_worker.DispatchingWorker,
         while self.state in (ACTIVE, ) and self.bytes_written<self.bytes_to_write:
             loop_start = time.time()
 
-            Trace.trace(133,"total_bytes %s total_bytes_written %s"%(self.bytes_to_write, self.bytes_written))
+            Trace.tracef(133, "total_bytes %s total_bytes_written %s", self.bytes_to_write, self.bytes_written)
             if self.tr_failed:
                 self.tape_driver.flush() # to empty buffer and to release device from this thread
-                Trace.trace(27,"write_tape: tr_failed %s"%(self.tr_failed,))
+                Trace.tracef(27, "write_tape: tr_failed %s", self.tr_failed)
                 break
             self.bytes_written_last = self.bytes_written
             empty = self.buffer.empty()
@@ -3453,7 +3698,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                                self.max_time_in_state, empty,
                                defer_write,self.bytes_read, self.bytes_to_read)) #!!! REMOVE WHEN PROBLEM is fixed
                     buffer_empty_t = now
-                    Trace.trace(9, "buf empty cnt %s max %s"%(buffer_empty_cnt, self.max_in_state_cnt))
+                    Trace.tracef(9, "buf empty cnt %s max %s", buffer_empty_cnt, self.max_in_state_cnt)
                     if buffer_empty_cnt >= self.max_in_state_cnt:
                         msg = "data transfer from client stuck. Client host %s. Breaking connection"%(self.current_work_ticket['wrapper']['machine'][1],)
                         self.tape_driver.flush() # to empty buffer and to release device from this thread
@@ -3490,7 +3735,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                         optimal_buf = min(optimal_buf, 0.5 * self.max_buffer)
                         optimal_buf = max(optimal_buf, self.min_buffer)
                         optimal_buf = int(optimal_buf)
-                        Trace.trace(112,"netrate = %.3g, taperate=%.3g" % (netrate, taperate))
+                        Trace.tracef(112, "netrate = %.3g, taperate=%.3g", netrate, taperate)
                         if self.buffer.min_bytes != optimal_buf:
                             Trace.trace(12,"Changing buffer size from %s to %s"%
                                         (self.buffer.min_bytes, optimal_buf))
@@ -3503,7 +3748,7 @@ class Mover(dispatching_worker.DispatchingWorker,
             try:
                 bytes_written = self.buffer.block_write(nbytes, driver)
                 nblocks = nblocks+1
-                Trace.trace(133,"bytes_to_write %s bytes_written %s"%(nbytes,bytes_written))
+                Trace.tracef(133, "bytes_to_write %s bytes_written %s", nbytes,bytes_written)
             except:
                 exc, detail, tb = sys.exc_info()
                 Trace.handle_error(exc, detail, tb)
@@ -3600,7 +3845,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                 ##of them.
                 self.eof_labels = self.wrapper.eof_labels(self.buffer.complete_crc)
                 if self.single_filemark or self.eof_labels:
-                    Trace.trace(23, "single fm %s eof labels %s"%(self.single_filemark, self.eof_labels))
+                    Trace.tracef(23, "single fm %s eof labels %s", self.single_filemark, self.eof_labels)
                     Trace.trace(23, "write fm")
                     if self.buffered_tapemarks:
                         self.tape_driver.writefm_buffered()
@@ -3618,7 +3863,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                      Trace.trace(23, "skip fm -1")
                      self.tape_driver.skipfm(-1)
                      Trace.trace(23, "fm done")
-                Trace.trace(10, "complete CRC %s"%(self.buffer.complete_crc,))
+                Trace.tracef(10, "complete CRC %s", self.buffer.complete_crc)
                 self.eof_labels = self.wrapper.eof_labels(self.buffer.complete_crc)
                 if self.eof_labels:
                     bytes_written = driver.write(self.eof_labels, 0, len(self.eof_labels))
@@ -3642,7 +3887,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                     else:
                         self.tape_driver.writefm()
                     if not self.single_filemark:
-                        Trace.trace(5, "single fm %s"%(self.single_filemark,))
+                        Trace.tracef(5, "single fm %s", self.single_filemark)
                         Trace.trace(23, "write fm")
                         if self.buffered_tapemarks:
                            self.tape_driver.writefm_buffered()
@@ -3698,7 +3943,7 @@ class Mover(dispatching_worker.DispatchingWorker,
 
                     self.tape_driver.flush()
                     self.media_transfer_time = self.media_transfer_time + (time.time()-t1) # include filemarks into drive time
-                    Trace.trace(31, "cur %s, initial %s, last %s, blocks %s, headers %s trailers %s"%(new_bloc_loc, self.initial_abslute_location, self.current_absolute_location,self.last_blocks_written, len(self.header_labels), len(self.eof_labels)))
+                    Trace.tracef(31, "cur %s, initial %s, last %s, blocks %s, headers %s trailers %s", new_bloc_loc, self.initial_abslute_location, self.current_absolute_location,self.last_blocks_written, len(self.header_labels), len(self.eof_labels))
 
                 if self.header_labels and self.eof_labels:
                     extra = 4
@@ -3801,7 +4046,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                      (self.shortname, -self.bytes_read,
                       self.bytes_to_read, self.buffer.nbytes(), time.time(), self.draining))
 
-        Trace.trace(24, "state %s read %s to_read %s"%(state_name(self.state),self.bytes_read, self.bytes_to_read))
+        Trace.tracef(24, "state %s read %s to_read %s", state_name(self.state),self.bytes_read, self.bytes_to_read)
         t_started = time.time()
         idle_time = 0. # accumulative time when not reading
         break_here = 0
@@ -3809,8 +4054,8 @@ class Mover(dispatching_worker.DispatchingWorker,
 
         while self.state in (ACTIVE, ) and self.bytes_read < self.bytes_to_read:
             loop_start = time.time()
-            Trace.trace(133,"total_bytes_to_read %s total_bytes_read %s"%(self.bytes_to_read, self.bytes_read))
-            Trace.trace(127,"read_tape: tr_failed %s"%(self.tr_failed,))
+            Trace.tracef(133, "total_bytes_to_read %s total_bytes_read %s", self.bytes_to_read, self.bytes_read)
+            Trace.tracef(127, "read_tape: tr_failed %s", self.tr_failed)
             if self.tr_failed:
                 break
 
@@ -3859,7 +4104,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                 buffer_full_t = 0
                 buffer_full_cnt = 0
 
-            Trace.trace(124, "btr %s br %s bs %s"%(self.bytes_to_read, self.bytes_read, self.buffer.blocksize))
+            Trace.tracef(124, "btr %s br %s bs %s", self.bytes_to_read, self.bytes_read, self.buffer.blocksize)
             nbytes = min(self.bytes_to_read - self.bytes_read, self.buffer.blocksize)
             self.buffer.bytes_for_crc = nbytes
             if self.bytes_read == 0 and nbytes<self.buffer.blocksize: #first read, try to read a whole block
@@ -3872,7 +4117,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                 nblocks = nblocks + 1
                 self.media_transfer_time = self.media_transfer_time + (time.time()-t1)
                 idle_time = idle_time + t1 - loop_start
-                Trace.trace(133,"bytes to read %s, bytes read %s"%(nbytes, bytes_read))
+                Trace.tracef(133, "bytes to read %s, bytes read %s", nbytes, bytes_read)
             except MemoryError:
                 #raise exceptions.MemoryError # to test this thread
                 exc, detail, tb = sys.exc_info()
@@ -3897,7 +4142,7 @@ class Mover(dispatching_worker.DispatchingWorker,
 
                 self.read_tape_done.set()
                 failed = 1
-                Trace.trace(24, "MODE %s"%(mode_name(self.mode),))
+                Trace.tracef(24, "MODE %s", mode_name(self.mode))
                 if self.mode == ASSERT:
                     self.assert_return = e_errors.CRC_ERROR
                     return
@@ -3941,7 +4186,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                         break
 
                 else:
-                    Trace.trace(33,"Exception %s %s"%(e_errors.READ_ERROR,str(detail)))
+                    Trace.tracef(33, "Exception %s %s", e_errors.READ_ERROR,str(detail))
                     self.read_tape_done.set()
 
                     self.transfer_failed(e_errors.READ_ERROR, detail, error_source=TAPE)
@@ -3949,14 +4194,14 @@ class Mover(dispatching_worker.DispatchingWorker,
                     break
             except:
                 exc, detail,tb = sys.exc_info()
-                Trace.trace(33,"Exception %s %s"%(str(exc),str(detail)))
+                Trace.tracef(33, "Exception %s %s", str(exc),str(detail))
                 Trace.handle_error(exc, detail, tb)
                 self.read_tape_done.set()
                 self.transfer_failed(e_errors.READ_ERROR, detail, error_source=TAPE)
                 failed = 1
                 break
             if bytes_read <= 0:
-                Trace.trace(98, "method %s bytes %s"%(self.method,bytes_read))
+                Trace.tracef(98, "method %s bytes %s", self.method,bytes_read)
                 if bytes_read == 0 and self.method == 'read_next':
                     pass
                 else:
@@ -3970,7 +4215,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                     Trace.log(e_errors.ERROR,
                               "read_tape: error skipping over cpio header, len(buf)=%s"%(len(self.buffer._buf)))
                 try:
-                    b0 = self.buffer._buf[0]
+                    b0 = self.buffer.peek()
                 except IndexError, detail:
                     self.transfer_failed(e_errors.READ_ERROR, "%s"%(detail,), error_source=TAPE)
                     failed = 1
@@ -4028,6 +4273,21 @@ class Mover(dispatching_worker.DispatchingWorker,
                 break
 
 
+        if do_crc and not failed:
+            try:
+                self.buffer.crc_flush()
+            except MoverError, detail:
+                Trace.alarm(e_errors.ERROR, "CRC error reading tape",
+                            {'outfile':self.current_work_ticket['outfile'],
+                             'infile':self.current_work_ticket['infile'],
+                             'location_cookie':self.current_work_ticket['fc']['location_cookie'],
+                             'external_label':self.current_work_ticket['vc']['external_label']})
+                self.transfer_failed(e_errors.CRC_ERROR, error_source=TAPE)
+                self.read_tape_done.set()
+                failed = 1
+                if self.mode == ASSERT:
+                    self.assert_return = e_errors.CRC_ERROR
+                    return
         Trace.log(e_errors.INFO, "read bytes %s/%s, blocks %s header %s" %(self.bytes_read, self.bytes_to_read, nblocks, header_size))
         try:
             location, block = self.tape_driver.tell()
@@ -4083,7 +4343,7 @@ class Mover(dispatching_worker.DispatchingWorker,
             self.bytes_to_write = self.bytes_read # set correct size for bytes to write
         if self.tr_failed:
             self.read_tape_done.set()
-            Trace.trace(127,"read_tape: tr_failed %s"%(self.tr_failed,))
+            Trace.tracef(127, "read_tape: tr_failed %s", self.tr_failed)
             return
         if failed:
             self.read_tape_done.set()
@@ -4135,7 +4395,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                         self.current_work_ticket['fc'].update(self.file_info)
                         self.current_work_ticket['bfid'] = self.file_info['bfid']
                         self.lock_file_info = 0
-                        Trace.trace(98, "updated file db %s"%(self.current_work_ticket['fc'],))
+                        Trace.tracef(98, "updated file db %s", self.current_work_ticket['fc'])
                         # update volume DB and volume info
                         self.vcc.update_counts(self.current_volume, wr_access=1)
                         self.vol_info['eod_cookie'] = loc_to_cookie(self.current_location)
@@ -4159,7 +4419,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                             return
                         self.vol_info.update(self.vcc.inquire_vol(self.current_volume))
                         self.current_work_ticket['vc'].update(self.vol_info)
-                        Trace.trace(98, "updated volume db %s"%(self.current_work_ticket['vc'],))
+                        Trace.tracef(98, "updated volume db %s", self.current_work_ticket['vc'])
 
                     else:
                         Trace.log(e_errors.WARNING, "found complete CRC set to None in file DB for %s. Changing cookie to %s and CRC to %s" %
@@ -4180,7 +4440,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                         crc_error = 0
                     if crc_error:
                         # this is for crc check in ASSERT mode
-                        Trace.trace(24, "MODE %s"%(mode_name(self.mode),))
+                        Trace.tracef(24, "MODE %s", mode_name(self.mode))
                         if self.mode == ASSERT:
                             self.assert_return = e_errors.CRC_ERROR
                             return
@@ -4205,13 +4465,15 @@ class Mover(dispatching_worker.DispatchingWorker,
         Trace.log(e_errors.INFO, "read_tape exiting, read %s/%s bytes" %
                     (self.bytes_read, self.bytes_to_read))
 
-        Trace.log(e_errors.INFO, "read_tape timing:get_space %s read %s crc_check %s push %s block_read %s idle %s" %
+        Trace.log(e_errors.INFO, "read_tape timing:get_space %s read %s crc_check %s push %s block_read %s idle %s crc_stage_wait %s crc_stage %s" %
                   (self.buffer.read_stats[0],
                    self.buffer.read_stats[1],
                    self.buffer.read_stats[2],
                    self.buffer.read_stats[3],
                    self.buffer.read_stats[4],
-                   idle_time))
+                   idle_time,
+                   self.buffer.read_stats[5],
+                   self.buffer.read_stats[6]))
 
 
         # this is for crc check in ASSERT mode
@@ -4227,7 +4489,7 @@ class Mover(dispatching_worker.DispatchingWorker,
 
         """
 
-        Trace.trace(8, "write_client starting, bytes_to_write=%s" % (self.bytes_to_write,))
+        Trace.tracef(8, "write_client starting, bytes_to_write=%s", self.bytes_to_write)
         if not self.buffer.client_crc_on:
             # calculate checksum when writing to
             # the network (see comment in setup_transfer)
@@ -4257,8 +4519,8 @@ class Mover(dispatching_worker.DispatchingWorker,
                       time.time(), self.draining))
         cnt = 0
         while 1:
-            Trace.trace(133, "state %s cnt %s"%(state_name(self.state),cnt))
-            Trace.trace(133, "bytes_written %s bytes to write %s"%(self.bytes_written,self.bytes_to_write))
+            Trace.tracef(133, "state %s cnt %s", state_name(self.state),cnt)
+            Trace.tracef(133, "bytes_written %s bytes to write %s", self.bytes_written,self.bytes_to_write)
             if self.state in (ACTIVE, ) and self.bytes_written < self.bytes_to_write:
                 #Trace.trace(33, "bytes_written %s bytes to write %s"%(self.bytes_written,self.bytes_to_write))
                 if self.tr_failed:
@@ -4316,12 +4578,12 @@ class Mover(dispatching_worker.DispatchingWorker,
                     failed = 1
                     break
                 if bytes_written != nbytes:
-                    Trace.trace(22, "write_client: !!! bytes written %s bytes to write %s"%(bytes_written, nbytes))
+                    Trace.tracef(22, "write_client: !!! bytes written %s bytes to write %s", bytes_written, nbytes)
                     if self.client_socket:
                         # get netstat for this socket
                         data_port = self.client_socket.getsockname()[1]
                         rc = shell_command("netstat -t | grep %s"%(data_port,))
-                        Trace.trace(22, "write_client: netstat: %s"%(rc,))
+                        Trace.tracef(22, "write_client: netstat: %s", rc)
                     pass
                 self.bytes_written = self.bytes_written + bytes_written
                 if not self.buffer.full():
@@ -4411,7 +4673,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         :arg ticket: ticket received from library manager.
         """
         Trace.log(e_errors.INFO, "WRITE_TO_HSM. Mover state %s"%(state_name(self.state),))
-        Trace.trace(10, "State %s"%(state_name(self.state),))
+        Trace.tracef(10, "State %s", state_name(self.state))
         if ticket.has_key('copy') and not ticket['fc'].has_key('original_bfid'):
             # this is a file copy request
             self.transfer_failed(e_errors.ERROR,"Cannot assign new bit file ID. No original_bfid key in ticket")
@@ -4449,7 +4711,7 @@ class Mover(dispatching_worker.DispatchingWorker,
 
         Trace.log(e_errors.INFO,"READ FROM HSM. Mover state %s"%(state_name(self.state),))
         self.method = ticket.get("method", None)
-        Trace.trace(98, "read_from_hsm %s"%(ticket,))
+        Trace.tracef(98, "read_from_hsm %s", ticket)
         if self.method and self.method == "read_next":
             self.udp_cm_sent = 0
         self.setup_transfer(ticket, mode=READ)
@@ -4481,16 +4743,16 @@ class Mover(dispatching_worker.DispatchingWorker,
         for thread in threads:
             if thread.isAlive():
                 thread_name = thread.getName()
-                Trace.trace(87,"setup_transfer: Thread %s is running" % (thread_name,))
+                Trace.tracef(87, "setup_transfer: Thread %s is running", thread_name)
             else:
-                Trace.trace(87,"setup_transfer: Thread %s is dead"%(thread_name,))
+                Trace.tracef(87, "setup_transfer: Thread %s is dead", thread_name)
 
         self.net_driver = net_driver.NetDriver()
         self._error = None
         self._error_source = None
         self.lock_state()
         self.save_state = self.state
-        Trace.trace(24, "setup_transfer: save_state %s"%(state_name(self.save_state),))
+        Trace.tracef(24, "setup_transfer: save_state %s", state_name(self.save_state))
         self.udp_cm_sent = 0
         self.unique_id = ticket['unique_id']
         self.uid = -1
@@ -4502,7 +4764,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         if self.method and self.method == "read_next" and self.udp_control_address:
             self.lm_address = self.udp_control_address
             self.lm_address_saved = self.lm_address
-            Trace.trace(98, "LM address %s"%(self.lm_address,))
+            Trace.tracef(98, "LM address %s", self.lm_address)
             self.libraries = [("get", self.lm_address)]
 
         else:
@@ -4517,7 +4779,7 @@ class Mover(dispatching_worker.DispatchingWorker,
             client_hostname = ''
         self.client_hostname = client_hostname
 
-        Trace.trace(10, "setup transfer1 %s"%(ticket,))
+        Trace.tracef(10, "setup transfer1 %s", ticket)
         self.tr_failed = False
         self.current_library = ticket['vc'].get('library', None)
         if not self.current_library:
@@ -4530,7 +4792,7 @@ class Mover(dispatching_worker.DispatchingWorker,
             self.return_work_to_lm(ticket)
             self.unlock_state()
             return
-        Trace.trace(10, "setup transfer11 %s"%(ticket,))
+        Trace.tracef(10, "setup transfer11 %s", ticket)
         if (self.save_state == HAVE_BOUND and self.single_filemark and self.mode == WRITE and self.setup_mode == READ
             and self.write_counter > 0): # there was at least one successful write since tape mount
             # switching from write to read write additional fm
@@ -4635,15 +4897,15 @@ class Mover(dispatching_worker.DispatchingWorker,
         percent_completed = -1. # to have 1st notify sent when 0 bytes were transferred
         self.bytes_read_last = 0
         while self.mode == ASSERT:
-            Trace.trace(40, "check_connection mode %s"%(mode_name(self.mode),))
+            Trace.tracef(40, "check_connection mode %s", mode_name(self.mode))
             try:
                 if self.control_socket:
                     r, w, ex = select.select([self.control_socket], [self.control_socket], [], 10)
-                    Trace.trace(40, "check_connection1 %s %s %s"%(r, w, ex))
-                    Trace.trace(40, "r= %s"%(r,))
+                    Trace.tracef(40, "check_connection1 %s %s %s", r, w, ex)
+                    Trace.tracef(40, "r= %s", r)
                     if r:
                         # r - read socket appears when client connection gets closed
-                        Trace.trace(40, "media_validate= %s"%(self.media_validate,))
+                        Trace.tracef(40, "media_validate= %s", self.media_validate)
                         if self.media_validate:
                             # Stop media validation.
                             # Effective only for T10000C and D drives
@@ -4697,7 +4959,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                     break
 
 
-        Trace.trace(40, "check_connection exits %s" % (mode_name(self.mode),))
+        Trace.tracef(40, "check_connection exits %s", mode_name(self.mode))
 
 
     def assert_vol(self):
@@ -4803,12 +5065,12 @@ class Mover(dispatching_worker.DispatchingWorker,
                 file_info = {}
                 fc_address = ticket['fc']['address']
                 ticket['return_file_list'] = {}
-                Trace.trace(24, 'ticket %s'%(ticket,))
+                Trace.tracef(24, 'ticket %s', ticket)
                 if ticket.has_key('parameters') and type(ticket['parameters']) == type([]) and ticket['parameters']:
                     # Initialize return list
                     for lc in ticket['parameters']:
                        rec = info_c.find_file_by_location(ticket['vc']['external_label'], lc)
-                       Trace.trace(24, "find_file_by_location returned %s"%(rec,))
+                       Trace.tracef(24, "find_file_by_location returned %s", rec)
                        if rec['status'][0] != e_errors.OK:
                            self.transfer_failed(rec['status'][0], rec['status'][1])
                            return
@@ -4832,7 +5094,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                         file_list = info_c.tape_list(ticket['vc']['external_label'], all_files = False, skip_unknown = True, timeout = 300, retry = 2)
 
                         Trace.log(e_errors.INFO, "tape_list returned")
-                        Trace.trace(24, "file List %s:: %s"%(type(file_list), file_list))
+                        Trace.tracef(24, "file List %s:: %s", type(file_list), file_list)
                         if file_list['status'][0] != e_errors.OK:
                             self.transfer_failed(file_list['status'][0], file_list['status'][1])
                             return
@@ -4844,9 +5106,9 @@ class Mover(dispatching_worker.DispatchingWorker,
                     for entry in file_list['tape_list']:
                         ticket['return_file_list'][entry['location_cookie']] = e_errors.UNKNOWN
                         file_info[entry['location_cookie']] = entry
-                    Trace.trace(24, "file_info %s"%(file_info,))
+                    Trace.tracef(24, "file_info %s", file_info)
 
-                Trace.trace(24, 'ticket %s'%(ticket,))
+                Trace.tracef(24, 'ticket %s', ticket)
                 keys = ticket['return_file_list'].keys()
                 keys.sort()
                 start_from = cookie_to_long(ticket['fc']['location_cookie'])
@@ -4866,7 +5128,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                             del(ticket['return_file_list'][loc_c])
                         else:
                             keys.append(loc_c)
-                Trace.trace(24, 'keys %s'%(keys,))
+                Trace.tracef(24, 'keys %s', keys)
                 stat = e_errors.OK
                 # start client network monitor to detect
                 # that client is gone and interruprt assert
@@ -4881,14 +5143,14 @@ class Mover(dispatching_worker.DispatchingWorker,
                     self.assert_return = e_errors.OK
                     self.reset(None, 1)
                     self.current_work_ticket = ticket
-                    Trace.trace(24, "t1 %s"%(type(self.current_work_ticket),))
-                    Trace.trace(24, "t11 %s"%(type(self.current_work_ticket['fc']),))
-                    Trace.trace(24, "t2 %s"%(type(file_info),))
-                    Trace.trace(24, "t21 %s"%(type(file_info.get(loc_cookie)),))
-                    Trace.trace(24, "t22 %s"%(ticket,))
+                    Trace.tracef(24, "t1 %s", type(self.current_work_ticket))
+                    Trace.tracef(24, "t11 %s", type(self.current_work_ticket['fc']))
+                    Trace.tracef(24, "t2 %s", type(file_info))
+                    Trace.tracef(24, "t21 %s", type(file_info.get(loc_cookie)))
+                    Trace.tracef(24, "t22 %s", ticket)
                     self.current_work_ticket['fc'] = file_info[loc_cookie]
                     self.current_work_ticket['fc']['address'] = fc_address
-                    Trace.trace(24, "t23 %s"%(self.current_work_ticket,))
+                    Trace.tracef(24, "t23 %s", self.current_work_ticket)
                     self.finish_transfer_setup()
                     Trace.trace(24, "t31 starting seek thread" )
                     self.run_in_thread('seek_thread', self.seek_to_location,
@@ -4903,7 +5165,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                     self.assert_ok.clear()
                     self.net_driver.close()
                     self.network_write_active = False # reset to indicate no network activity
-                    Trace.trace(24, "assert return: %s tr_failed %s'"%(self.assert_return, self.tr_failed))
+                    Trace.tracef(24, "assert return: %s tr_failed %s'", self.assert_return, self.tr_failed)
                     ticket['return_file_list'][loc_cookie] = self.assert_return
                     if self.assert_return != e_errors.OK:
                         stat = self.assert_return
@@ -4927,7 +5189,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                     if self.tr_failed:
                         stat = self._error
                         ticket['return_file_list'][loc_cookie] = stat
-                        Trace.trace(24, "ticket!: %s"%(ticket['return_file_list'][loc_cookie],))
+                        Trace.tracef(24, "ticket!: %s", ticket['return_file_list'][loc_cookie])
                         self.transfer_completed(stat)
                         break
 
@@ -4977,8 +5239,8 @@ class Mover(dispatching_worker.DispatchingWorker,
         Complete data transfer setup.
 
         """
-        Trace.trace(10, "client connect returned: %s %s" % (self.control_socket, self.client_socket))
-        Trace.trace(24, "finish_transfer_setup %s %s"%(mode_name(self.mode), mode_name(self.setup_mode)))
+        Trace.tracef(10, "client connect returned: %s %s", self.control_socket, self.client_socket)
+        Trace.tracef(24, "finish_transfer_setup %s %s", mode_name(self.mode), mode_name(self.setup_mode))
         ticket = self.current_work_ticket
         if not self.client_socket:
             if self.mode != ASSERT:
@@ -5004,8 +5266,8 @@ class Mover(dispatching_worker.DispatchingWorker,
         vc = ticket['vc']
         self.vol_info = vc
         self.file_info = fc
-        Trace.trace(24, "VOL_INFO %s"%(self.vol_info,))
-        Trace.trace(24, "FILE_INFO %s"%(self.file_info,))
+        Trace.tracef(24, "VOL_INFO %s", self.vol_info)
+        Trace.tracef(24, "FILE_INFO %s", self.file_info)
         self.volume_family=vc['volume_family']
         delay = 0
         sanity_cookie = ticket['fc'].get('sanity_cookie', None)
@@ -5024,7 +5286,7 @@ class Mover(dispatching_worker.DispatchingWorker,
         #if ticket.has_key('client_crc'):
         #    client_crc_on = ticket['client_crc']
 
-        Trace.trace(22, "crc_control %s"%(self.read_crc_control,))
+        Trace.tracef(22, "crc_control %s", self.read_crc_control)
         self.reset(sanity_cookie, client_crc_on)
         # restore self.current_work_ticket after it gets cleaned in the reset()
         self.current_work_ticket = ticket
@@ -5117,7 +5379,7 @@ class Mover(dispatching_worker.DispatchingWorker,
             # in case if seed 0 crc check fails
             self.buffer.set_crc_seed(0L)
 
-        Trace.trace(24, "FC %s"%(fc,))
+        Trace.tracef(24, "FC %s", fc)
         bytes = fc.get('size', None)
         if bytes == None:
             self.bytes_to_transfer = None
@@ -5131,7 +5393,7 @@ class Mover(dispatching_worker.DispatchingWorker,
             self.expected_transfer_time = self.bytes_to_transfer / self.max_rate
         self.bytes_to_write = self.bytes_to_transfer
         self.bytes_to_read = self.bytes_to_transfer
-        Trace.trace(24, "BYTES TO READ %s"%(self.bytes_to_read,))
+        Trace.tracef(24, "BYTES TO READ %s", self.bytes_to_read)
         self.real_transfer_time  = 0.
         if (self.bytes_to_transfer == None) or (self.bytes_to_transfer < 0L) :
             self.transfer_failed(e_errors.BAD_FILE_SIZE, "bad file size is %s"%(self.bytes_to_transfer,), error_source=USER, dismount_allowed=0)
@@ -5168,15 +5430,15 @@ class Mover(dispatching_worker.DispatchingWorker,
             self.target_location = None
 
         self.buffered_tapemarks = ticket.get('buffered_tape_marks', False) and enstore_functions2.is_migration_file_family(volume_family.extract_file_family(self.vol_info['volume_family']))
-        Trace.trace(10, "finish_transfer_setup: label %s state %s"%(volume_label, state_name(self.save_state)))
-        Trace.trace(10, "finish_transfer_setup: ticket %s"%(self.current_work_ticket,))
-        Trace.trace(10, "finish_transfer_setup: buffered tapemarks%s"%(self.buffered_tapemarks,))
+        Trace.tracef(10, "finish_transfer_setup: label %s state %s", volume_label, state_name(self.save_state))
+        Trace.tracef(10, "finish_transfer_setup: ticket %s", self.current_work_ticket)
+        Trace.tracef(10, "finish_transfer_setup: buffered tapemarks%s", self.buffered_tapemarks)
         # this is for crc check in ASSERT mode
-        Trace.trace(24, "finish_transfer_setup MODE %s"%(mode_name(self.mode),))
+        Trace.tracef(24, "finish_transfer_setup MODE %s", mode_name(self.mode))
         if self.mode == ASSERT:
             return
         #######
-        Trace.trace(24, "setup_transfer: save_state %s volume %s cur %s "%(state_name(self.save_state),volume_label, self.current_volume))
+        Trace.tracef(24, "setup_transfer: save_state %s volume %s cur %s ", state_name(self.save_state),volume_label, self.current_volume)
 
         if volume_label == self.current_volume and self.save_state == HAVE_BOUND: #no mount needed
             self.timer('mount_time')
@@ -5288,7 +5550,7 @@ class Mover(dispatching_worker.DispatchingWorker,
             label_tape = 1
 
         if self.mode == WRITE:
-            Trace.trace(24, "target location %s EOD cookie %s"%(self.target_location, eod))
+            Trace.tracef(24, "target location %s EOD cookie %s", self.target_location, eod)
             if self.target_location is None:
                 self.target_location = eod
             if self.target_location != eod:
@@ -5342,7 +5604,7 @@ class Mover(dispatching_worker.DispatchingWorker,
                     if self.driver_type == 'FTTDriver':
                         time.sleep(3)
                         stats = self.tape_driver.get_stats()
-                        Trace.trace(10,"WRITE_PROT=%s"%(stats[self.ftt.WRITE_PROT],))
+                        Trace.tracef(10, "WRITE_PROT=%s", stats[self.ftt.WRITE_PROT])
                         write_prot = stats[self.ftt.WRITE_PROT]
                         if type(write_prot) is type(''):
                             write_prot = string.atoi(write_prot)
@@ -5625,7 +5887,7 @@ n the drive"%(self.current_volume,))
         # if encp is gone there is no need to dismount a tape
         dism_allowed = not encp_gone
         dism_allowed = dism_allowed & dismount_allowed
-        Trace.trace(26,"current thread %s encp_gone %s"%(cur_thread_name, encp_gone))
+        Trace.tracef(26, "current thread %s encp_gone %s", cur_thread_name, encp_gone)
         # to avoid false mover restart in state have bound
         # when transfer_failed is called from the net thread
         # use dont_update_lm flag
@@ -5642,15 +5904,15 @@ n the drive"%(self.current_volume,))
             if act_thread_name:
                 self.dont_update_lm = 1
                 # check if tape_thread is active before allowing dismount
-                Trace.trace(26,"checking thread %s"%(alt_thread_name,))
+                Trace.tracef(26, "checking thread %s", alt_thread_name)
                 thread = getattr(self, alt_thread_name, None)
                 for wait in range(60):
                     if thread and thread.isAlive():
-                        Trace.trace(26, "thread %s is already running, waiting %s" % (alt_thread_name, wait))
+                        Trace.tracef(26, "thread %s is already running, waiting %s", alt_thread_name, wait)
                         time.sleep(1)
                     else:
                         break
-        Trace.trace(26,"dismount_allowed %s after_dismount %s"%(dism_allowed, after_dismount_function))
+        Trace.tracef(26, "dismount_allowed %s after_dismount %s", dism_allowed, after_dismount_function)
         if encp_gone:
             last_location = self.current_location
             try:
@@ -5673,7 +5935,7 @@ n the drive"%(self.current_volume,))
                 # the current location will be 1 more than in
                 # case of cpio wrapper, which is not separated from
                 # data with fm
-                Trace.trace(10, "for cern wrapper will set loc to %s"%(last_location,))
+                Trace.tracef(10, "for cern wrapper will set loc to %s", last_location)
                 self.current_location = last_location
 
             self.dismount_time = time.time() + self.delay
@@ -5772,7 +6034,7 @@ n the drive"%(self.current_volume,))
         self.lock_file_info = 0
         self.consecutive_failures = 0
         self.timer('transfer_time')
-        Trace.trace(24, "transfer_completed. ticket %s"%(self.current_work_ticket,))
+        Trace.tracef(24, "transfer_completed. ticket %s", self.current_work_ticket)
         ticket = self.current_work_ticket
         if not ticket.has_key('times'):
             ticket['times']={}
@@ -5855,7 +6117,7 @@ n the drive"%(self.current_volume,))
             th = getattr(self, 'tape_thread', None)
             for wait in range(60):
                 if th and th.isAlive():
-                    Trace.trace(26, "thread %s is already running, waiting %s" % ('tape_thread', wait))
+                    Trace.tracef(26, "thread %s is already running, waiting %s", 'tape_thread', wait)
                     time.sleep(2)
                 else:
                     break
@@ -5926,7 +6188,7 @@ n the drive"%(self.current_volume,))
         r0 = self.vol_info['remaining_bytes']  #value prior to this write
         r1 = r0 - self.bytes_written           #value derived from simple subtraction
         r2 = r1                                #value reported from drive, if possible
-        Trace.trace(24, "remainingbytes info in DB %s" % (r2,))
+        Trace.tracef(24, "remainingbytes info in DB %s", r2)
         ## XXX OO: this should be a driver method
         if self.driver_type == 'FTTDriver' and self.rem_stats:
             stats = None
@@ -5934,7 +6196,7 @@ n the drive"%(self.current_volume,))
             try:
                 stats = self.tape_driver.get_stats()
                 r2 = long(stats[self.ftt.REMAIN_TAPE]) * 1024L
-                Trace.trace(24, "reported remaining %s" % (r2,))
+                Trace.tracef(24, "reported remaining %s", r2)
             except self.ftt.FTTError, detail:
                 failed = 1
             except:
@@ -6034,7 +6296,7 @@ n the drive"%(self.current_volume,))
         while finish_writing:
             Trace.trace(26,"sending set_remaining_bytes")
             reply = self.vcc.set_remaining_bytes(self.current_volume, remaining, eod, bfid)
-            Trace.trace(26,"set_remaining_bytes returned %s"%(reply,))
+            Trace.tracef(26, "set_remaining_bytes returned %s", reply)
             if reply['status'][0] != e_errors.OK or reply['eod_cookie'] != eod:
                 if reply['status'][0] == e_errors.TIMEDOUT:
                     # keep trying
@@ -6069,7 +6331,7 @@ n the drive"%(self.current_volume,))
 
         """
         Trace.trace(13, "send_client_done %s"%(self.control_socket))
-        Trace.trace(13, "send_client_done status %s error_info %s ticket %s"%(status, error_info, ticket))
+        Trace.tracef(13, "send_client_done status %s error_info %s ticket %s", status, error_info, ticket)
         if self.control_socket == None:
             return
         ticket['status'] = (status, error_info)
@@ -6133,7 +6395,7 @@ n the drive"%(self.current_volume,))
         self.host = None
         ticket = self.current_work_ticket
         data_ip=self.config.get("data_ip",None)
-        Trace.trace(10, "data ip %s"%(data_ip,))
+        Trace.tracef(10, "data ip %s", data_ip)
 
         # Coordinate IP protocol (IPV4 or IPV6) with client
         host_ip = None
@@ -6202,7 +6464,7 @@ n the drive"%(self.current_volume,))
                     u = udp_client.UDPClient()
                     Trace.trace(10, "sending IP %s to %s. whole ticket %s"%
                                 (host, ticket['routing_callback_addr'], ticket))
-                    Trace.trace(10, "callback socket %s" % (u.get_tsd().socket.getsockname(),))
+                    Trace.tracef(10, "callback socket %s", u.get_tsd().socket.getsockname())
                     try:
                         x= u.send(ticket,ticket['routing_callback_addr'] , self.connect_to, self.connect_retry, 0)
                     except (socket.error, select.error, e_errors.EnstoreError), msg:
@@ -6235,7 +6497,7 @@ n the drive"%(self.current_volume,))
                         self.client_socket = None
                         self.run_in_thread('finish_transfer_setup_thread', self.finish_transfer_setup)
                         return
-                    Trace.trace(10, "encp called back with %s"%(x,))
+                    Trace.tracef(10, "encp called back with %s", x)
                     if x.has_key('callback_addr'): ticket['callback_addr'] = x['callback_addr']
                     self.del_udp_client(u)
                     #del u
@@ -6246,11 +6508,11 @@ n the drive"%(self.current_volume,))
                         self.reset_interval_timer(self.update_lm)
                         self.lm_address_saved = self.lm_address
                         self.lm_address = self.udp_control_address
-                        Trace.trace(98, "LM address %s"%(self.lm_address,))
+                        Trace.tracef(98, "LM address %s", self.lm_address)
                         self.state = IDLE
                         self.udp_ext_control_address =("get", self.lm_address)
                         self.libraries = [self.udp_ext_control_address]
-                Trace.trace(10, "connecting to %s" % (ticket['callback_addr'],))
+                Trace.tracef(10, "connecting to %s", ticket['callback_addr'])
                 try:
                     self.control_socket.connect(ticket['callback_addr'])
                 except socket.error, detail:
@@ -6279,7 +6541,7 @@ n the drive"%(self.current_volume,))
                         return
 
                 #Check if the socket is open for reading and/or writing.
-                Trace.trace(10, 'connect_client: waiting on %s for %s' % (self.control_socket, self.connect_to*self.connect_retry))
+                Trace.tracef(10, 'connect_client: waiting on %s for %s', self.control_socket, self.connect_to*self.connect_retry)
 
                 r, w, ex = select.select([self.control_socket], [self.control_socket], [], self.connect_to*self.connect_retry)
 
@@ -6360,7 +6622,7 @@ n the drive"%(self.current_volume,))
                     """
                     Trace.log (e_errors.INFO,"SENDING %s"%(ticket,))
                     rtn = callback.write_tcp_obj(self.control_socket, ticket, timeout=10)
-                    Trace.trace(10,"SENDING RC %s"%(rtn,))
+                    Trace.tracef(10, "SENDING RC %s", rtn)
                     if null_err:
                         # just for a case
                         try:
@@ -6406,7 +6668,7 @@ n the drive"%(self.current_volume,))
             # establish a data connection
             Trace.trace(10, "select: listening for client callback")
             read_fds,write_fds,exc_fds=select.select([self.listen_socket],[],[],20) # 20 s TO
-            Trace.trace(10, "select returned %s" % ((self.listen_socket in read_fds),))
+            Trace.tracef(10, "select returned %s", (self.listen_socket in read_fds))
 
             if self.listen_socket in read_fds:
                 Trace.trace(10, "accepting client connection")
@@ -6447,7 +6709,7 @@ n the drive"%(self.current_volume,))
                         Trace.trace(10, "pass")
                         pass
                     else:
-                        Trace.trace(10, "bind client socket to %s"%(data_interface,))
+                        Trace.tracef(10, "bind client socket to %s", data_interface)
                         status=socket_ext.bindtodev(self.client_socket.fileno(),data_interface)
                         if status:
                             Trace.log(e_errors.ERROR, "bindtodev(%s): %s"%(data_interface,os.strerror(status)))
@@ -6577,7 +6839,7 @@ n the drive"%(self.current_volume,))
             if now - self.state_change_time > 900:
                 self.unique_id = None
 
-        Trace.trace(20, "format_lm_ticket: volume info %s"%(self.vol_info,))
+        Trace.tracef(20, "format_lm_ticket: volume info %s", self.vol_info)
         if not self.vol_info:
             volume_status = (['none', 'none'], ['none','none'])
         else:
@@ -6633,14 +6895,14 @@ n the drive"%(self.current_volume,))
         thread = getattr(self, thread_name, None)
         for wait in range(5):
             if thread and thread.isAlive():
-                Trace.trace(20, "thread %s is already running, waiting %s" % (thread_name, wait))
+                Trace.tracef(20, "thread %s is already running, waiting %s", thread_name, wait)
                 time.sleep(1)
         if thread and thread.isAlive():
                 Trace.log(e_errors.ERROR, "thread %s is already running" % (thread_name))
                 return -1
         if after_function:
             args = args + (after_function,)
-        Trace.trace(20, "create thread: target %s name %s args %s" % (function, thread_name, args))
+        Trace.tracef(20, "create thread: target %s name %s args %s", function, thread_name, args)
         thread = threading.Thread(group=None, target=function,
                                   name=thread_name, args=args, kwargs={})
         setattr(self, thread_name, thread)
@@ -6664,7 +6926,7 @@ n the drive"%(self.current_volume,))
             if after_function:
                 after_function()
             return
-        Trace.trace(10, "state %s"%(state_name(self.state),))
+        Trace.tracef(10, "state %s", state_name(self.state))
         will_mount = self.will_mount
         self.will_mount = None
         self.just_mounted = 0
@@ -6906,7 +7168,7 @@ n the drive"%(self.current_volume,))
                 if self.state != ERROR:
                     self.idle()
                    #self.state = IDLE
-                Trace.trace(20,"after function %s" % (after_function,))
+                Trace.tracef(20, "after function %s", after_function)
                 after_function()
 
         ###XXX aml-specific hack! Media changer should provide a layer of abstraction
@@ -7024,7 +7286,7 @@ n the drive"%(self.current_volume,))
                 "unique_id": self.unique_id,
                 "work": "mover_busy",
                 }
-            Trace.trace(14,"mount_volume: after dismount %s"%(ticket,))
+            Trace.tracef(14, "mount_volume: after dismount %s", ticket)
             for lib, addr in self.libraries:
                 self.udpc.send_no_wait(ticket, addr)
 
@@ -7073,7 +7335,7 @@ n the drive"%(self.current_volume,))
 
         self.current_location = 0L
         vi = self.vol_info
-        Trace.trace(12, "override_ro_mount %s"%(self.override_ro_mount,))
+        Trace.tracef(12, "override_ro_mount %s", self.override_ro_mount)
         if self.override_ro_mount:
             vi['system_inhibit'][1] = 'none'
             vi['user_inhibit'][1] = 'none'
@@ -7094,7 +7356,7 @@ n the drive"%(self.current_volume,))
             else:
                 break
 
-        Trace.trace(10, 'mc replies %s' % (status,))
+        Trace.tracef(10, 'mc replies %s', status)
 
         #Do another query volume, just to make sure its status has not changed
         self.vol_info.update(self.vcc.inquire_vol(volume_label))
@@ -7140,12 +7402,12 @@ n the drive"%(self.current_volume,))
             self.media_life_alarmed = False
 
             if self.mount_delay:
-                Trace.trace(25, "waiting %s seconds after mount"%(self.mount_delay,))
+                Trace.tracef(25, "waiting %s seconds after mount", self.mount_delay)
                 time.sleep(self.mount_delay)
             self.just_mounted = 1
             self.write_counter = 0 # this flag is used in write_tape to verify tape position
             if after_function:
-                Trace.trace(10, "mount: calling after function %s"%(after_function,))
+                Trace.tracef(10, "mount: calling after function %s", after_function)
                 after_function()
         else: #Mount failure, do not attempt to recover
             Trace.log(e_errors.ERROR, "mount %s: %s" % (volume_label, status))
@@ -7233,7 +7495,7 @@ n the drive"%(self.current_volume,))
         :arg after_function: function to run after seek is done.
         """
 
-        Trace.trace(24, "seeking to %s, after_function=%s"%(location,after_function))
+        Trace.tracef(24, "seeking to %s, after_function=%s", location,after_function)
         failed=0
         thread = getattr(self, 'tape_thread', None)
         retries = 10
@@ -7348,7 +7610,7 @@ n the drive"%(self.current_volume,))
             return
 
         if after_function and not failed:
-            Trace.trace(10, "seek calling after function %s" % (after_function,))
+            Trace.tracef(10, "seek calling after function %s", after_function)
             after_function()
 
     def start_transfer(self):
@@ -7584,7 +7846,7 @@ n the drive"%(self.current_volume,))
 
         ##elif self.state is HAVE_BOUND:
         ##    self.state = DRAINING # XXX CGW should dismount here. fix this
-        Trace.trace(e_errors.INFO, "The mover is set to state %s"%(state_name(self.state),))
+        Trace.tracef(e_errors.INFO, "The mover is set to state %s", state_name(self.state))
         self.create_lockfile()
         out_ticket = {'status':(e_errors.OK,None),'state':state_name(self.state), 'pid': os.getpid()}
         ticket.update(out_ticket)
@@ -7610,9 +7872,9 @@ n the drive"%(self.current_volume,))
         self.reply_to_caller(ticket)
         ## XXX here we need to check if tape is mounted
         ## if yes go to have bound, NOT idle AM
-        Trace.trace(11,"check lockfile %s"%(self.check_lockfile(),))
+        Trace.tracef(11, "check lockfile %s", self.check_lockfile())
         self.remove_lockfile()
-        Trace.trace(11,"check lockfile %s"%(self.check_lockfile(),))
+        Trace.tracef(11, "check lockfile %s", self.check_lockfile())
         if do_restart:
             Trace.log(e_errors.INFO,"restarting %s"% (self.name,))
         self.restart(do_restart)
@@ -7632,7 +7894,7 @@ n the drive"%(self.current_volume,))
                 self.stop_draining(ticket)
             elif self.state != ERROR:
                 time.sleep(2)
-                Trace.trace(11,"waiting in state %s for OFFLINE" % (self.state,))
+                Trace.tracef(11, "waiting in state %s for OFFLINE", self.state)
             else:
                 Trace.alarm(e_errors.ERROR, "can not restart. State: %s" % (self.state,))
 
@@ -7657,7 +7919,7 @@ n the drive"%(self.current_volume,))
                 self.stop_draining(ticket, do_restart=0)
             elif self.state != ERROR:
                 time.sleep(2)
-                Trace.trace(11,"waiting in state %s for OFFLINE" % (self.state,))
+                Trace.tracef(11, "waiting in state %s for OFFLINE", self.state)
             else:
                 Trace.alarm(e_errors.ERROR, "can not restart. State: %s" % (self.state,))
 
@@ -7767,7 +8029,7 @@ class DiskMover(Mover):
 
     def no_work(self, ticket):
         #x = ticket # to trick pychecker
-        Trace.trace(98, "no_work %s"%(ticket,))
+        Trace.tracef(98, "no_work %s", ticket)
         # no_work is No work: do nothing.
         self.nowork()
 
@@ -7776,8 +8038,8 @@ class DiskMover(Mover):
         Overriden from :meth:`Mover.write_tape`.
 
         """
-        Trace.trace(8, "write_tape starting, bytes_to_write=%s" % (self.bytes_to_write,))
-        Trace.trace(8, "bytes_to_transfer=%s" % (self.bytes_to_transfer,))
+        Trace.tracef(8, "write_tape starting, bytes_to_write=%s", self.bytes_to_write)
+        Trace.tracef(8, "bytes_to_transfer=%s", self.bytes_to_transfer)
         driver = self.tape_driver
         count = 0
         defer_write = 1
@@ -7805,7 +8067,7 @@ class DiskMover(Mover):
 
         while self.state in (ACTIVE,) and self.bytes_written<self.bytes_to_write:
             if self.tr_failed:
-                Trace.trace(27,"write_tape: tr_failed %s"%(self.tr_failed,))
+                Trace.tracef(27, "write_tape: tr_failed %s", self.tr_failed)
                 break
             empty = self.buffer.empty()
             if (empty or
@@ -7837,7 +8099,7 @@ class DiskMover(Mover):
                         optimal_buf = min(optimal_buf, 0.5 * self.max_buffer)
                         optimal_buf = max(optimal_buf, self.min_buffer)
                         optimal_buf = int(optimal_buf)
-                        Trace.trace(112,"netrate = %.3g, taperate=%.3g" % (netrate, taperate))
+                        Trace.tracef(112, "netrate = %.3g, taperate=%.3g", netrate, taperate)
                         if self.buffer.min_bytes != optimal_buf:
                             Trace.trace(12,"Changing buffer size from %s to %s"%
                                         (self.buffer.min_bytes, optimal_buf))
@@ -7875,10 +8137,10 @@ class DiskMover(Mover):
             if not self.buffer.full():
                 self.buffer.read_ok.set()
         if self.tr_failed:
-            Trace.trace(27,"write_tape: tr_failed %s"%(self.tr_failed,))
+            Trace.tracef(27, "write_tape: tr_failed %s", self.tr_failed)
             return
 
-        Trace.trace(8, "write_tape exiting, wrote %s/%s bytes" %( self.bytes_written, self.bytes_to_write))
+        Trace.tracef(8, "write_tape exiting, wrote %s/%s bytes", self.bytes_written, self.bytes_to_write)
 
         if failed: return
         if self.bytes_written == self.bytes_to_write:
@@ -7895,7 +8157,7 @@ class DiskMover(Mover):
 
                 self.buffer.save_settings()
                 bytes_read = 0L
-                Trace.trace(20,"write_tape: header size %s" % (self.buffer.header_size,))
+                Trace.tracef(20, "write_tape: header size %s", self.buffer.header_size)
                 #bytes_to_read = self.bytes_to_transfer + self.buffer.header_size
                 bytes_to_read = self.bytes_to_transfer
                 header_size = self.buffer.header_size
@@ -7905,7 +8167,7 @@ class DiskMover(Mover):
                 saved_complete_crc = self.buffer.complete_crc
                 self.buffer.reset((self.buffer.sanity_bytes, self.buffer.sanity_crc), client_crc_on=1)
                 self.buffer.set_wrapper(saved_wrapper)
-                Trace.trace(22, "starting check after write, bytes_to_read=%s" % (bytes_to_read,))
+                Trace.tracef(22, "starting check after write, bytes_to_read=%s", bytes_to_read)
                 driver = self.tape_driver
                 first_block = 1
                 while bytes_read < bytes_to_read:
@@ -7919,10 +8181,8 @@ class DiskMover(Mover):
 
                         # clean buffer
                         #Trace.trace(22,"write_tape: clean buffer")
-                        self.buffer._writing_block = self.buffer.pull()
-                        if self.buffer._writing_block:
-                            #Trace.trace(22,"write_tape: freeing block")
-                            self.buffer._freespace(self.buffer._writing_block)
+                        #Trace.trace(22,"write_tape: freeing block")
+                        self.buffer.discard()
 
                     except MoverError, detail:
                         detail = str(detail)
@@ -7962,6 +8222,13 @@ class DiskMover(Mover):
                     if bytes_read > bytes_to_read: #this is OK, we read a cpio trailer or something
                         bytes_read = bytes_to_read
 
+                if not failed:
+                    try:
+                        self.buffer.crc_flush()
+                    except MoverError, detail:
+                        Trace.alarm(e_errors.ERROR, "selective CRC check error")
+                        self.transfer_failed(e_errors.WRITE_ERROR, str(detail), error_source=TAPE)
+                        failed = 1
                 Trace.trace(22,"write_tape: read CRC %s write CRC %s"%
                             (self.buffer.complete_crc, saved_complete_crc))
                 if failed:
@@ -7983,7 +8250,7 @@ class DiskMover(Mover):
         """
         Overriden from :meth:`Mover.read_tape`.
         """
-        Trace.trace(8, "read_tape starting, bytes_to_read=%s" % (self.bytes_to_read,))
+        Trace.tracef(8, "read_tape starting, bytes_to_read=%s", self.bytes_to_read)
         if self.buffer.client_crc_on:
             # calculate checksum when reading from
             # tape (see comment in setup_transfer)
@@ -8002,7 +8269,7 @@ class DiskMover(Mover):
                       self.bytes_to_read, self.buffer.nbytes(), time.time(), self.draining))
 
         while self.state in (ACTIVE,) and self.bytes_read < self.bytes_to_read:
-            Trace.trace(27,"read_tape: tr_failed %s"%(self.tr_failed,))
+            Trace.tracef(27, "read_tape: tr_failed %s", self.tr_failed)
             if self.tr_failed:
                 break
             if self.buffer.full():
@@ -8059,7 +8326,7 @@ class DiskMover(Mover):
                     failed = 1
                     self.transfer_failed(e_errors.READ_ERROR, "Invalid file header ", error_source=TAPE)
                     break
-                b0 = self.buffer._buf[0]
+                b0 = self.buffer.peek()
                 if len(b0) >= self.wrapper.min_header_size:
                     try:
                         header_size = self.wrapper.header_size(b0)
@@ -8088,8 +8355,19 @@ class DiskMover(Mover):
 
             if not self.buffer.empty():
                 self.buffer.write_ok.set()
+        if do_crc and not failed:
+            try:
+                self.buffer.crc_flush()
+            except MoverError, detail:
+                Trace.alarm(e_errors.ERROR, "CRC error reading tape",
+                            {'outfile':self.current_work_ticket['outfile'],
+                             'infile':self.current_work_ticket['infile'],
+                             'location_cookie':self.current_work_ticket['fc']['location_cookie'],
+                             'external_label':self.current_work_ticket['vc']['external_label']})
+                self.transfer_failed(e_errors.CRC_ERROR, error_source=TAPE)
+                failed = 1
         if self.tr_failed:
-            Trace.trace(27,"read_tape: tr_failed %s"%(self.tr_failed,))
+            Trace.tracef(27, "read_tape: tr_failed %s", self.tr_failed)
             return
         if failed:
             return
@@ -8172,7 +8450,7 @@ class DiskMover(Mover):
         except KeyError:
             client_hostname = ''
         self.client_hostname = client_hostname
-        Trace.trace(10, "setup transfer1 %s"%(ticket,))
+        Trace.tracef(10, "setup transfer1 %s", ticket)
         self.tr_failed = False
         self.current_library = ticket['vc'].get('library', None)
         if not self.current_library:
@@ -8203,7 +8481,7 @@ class DiskMover(Mover):
             ticket['fc']['external_label'] = ticket['vc']['external_label']
         self.current_work_ticket = ticket
         Trace.log(DEBUG_LOG, "CURR TICK: %s"%(self.current_work_ticket,))
-        Trace.trace(DEBUG_LOG, "CURR PACK %s"%(self.current_package,))
+        Trace.tracef(DEBUG_LOG, "CURR PACK %s", self.current_package)
         self.run_in_thread('client_connect_thread', self.connect_client)
 
     def finish_transfer_setup(self):
@@ -8211,7 +8489,7 @@ class DiskMover(Mover):
         Overriden from :meth:`Mover.finish_transfer_setup`.
 
         """
-        Trace.trace(10, "client connect returned: %s %s" % (self.control_socket, self.client_socket))
+        Trace.tracef(10, "client connect returned: %s %s", self.control_socket, self.client_socket)
         ticket = self.current_work_ticket
         if not self.client_socket:
             Trace.trace(20, "finish_transfer_setup: connection to client failed")
@@ -8351,7 +8629,7 @@ class DiskMover(Mover):
             self.buffer.file_size = self.bytes_to_write
             self.buffer.trailer_pnt = self.buffer.file_size - len(self.trailer)
 
-        Trace.trace(29,"FILE NAME %s"%(self.file,))
+        Trace.tracef(29, "FILE NAME %s", self.file)
         self.position_media(work_file)
 
     # check connection in READ mode
@@ -8362,12 +8640,12 @@ class DiskMover(Mover):
         """
         Trace.trace(40, "check_connection started")
         if self.mode == READ:
-            Trace.trace(40, "check_connection mode %s"%(mode_name(self.mode),))
+            Trace.tracef(40, "check_connection mode %s", mode_name(self.mode))
             try:
                 if self.control_socket:
                     r, w, ex = select.select([self.control_socket], [self.control_socket], [], 10)
-                    Trace.trace(40, "check_connection1 %s %s %s"%(r, w, ex))
-                    Trace.trace(40, "r= %s"%(r,))
+                    Trace.tracef(40, "check_connection1 %s %s %s", r, w, ex)
+                    Trace.tracef(40, "r= %s", r)
                     if r:
                         # r - read socket appears when client connection gets closed
                         return False
@@ -8418,7 +8696,7 @@ class DiskMover(Mover):
                                                              'archive_status': None,
                                                              'cache_location': None}])
                     rv = None
-                Trace.trace(10, "set_cache_status: set_cache_status 1 returned %s"%(rc,))
+                Trace.tracef(10, "set_cache_status: set_cache_status 1 returned %s", rc)
                 if not e_errors.is_ok(rc['status']):
                     Trace.log(e_errors.ERROR, "Error setting cache status for %s: %s"%(self.file_info['bfid'],rc))
                     return None
@@ -8643,7 +8921,7 @@ class DiskMover(Mover):
         else:
             cur_thread_name = None
 
-        Trace.trace(26,"current thread %s"%(cur_thread_name,))
+        Trace.tracef(26, "current thread %s", cur_thread_name)
         if self.draining:
             self.offline()
         else:
@@ -8696,7 +8974,7 @@ class DiskMover(Mover):
                 self.offline()
                 return
 
-        Trace.trace(10, "transfer complete state0 %s"%(state_name(self.state),))
+        Trace.tracef(10, "transfer complete state0 %s", state_name(self.state))
         now = time.time()
         self.dismount_time = now + self.delay
         self.current_work_ticket['fc']['external_label'] = self.current_work_ticket['vc']['external_label']
@@ -8705,14 +8983,14 @@ class DiskMover(Mover):
         if hasattr(self,'too_long_in_state_sent'):
             del(self.too_long_in_state_sent)
 
-        Trace.trace(10, "transfer complete mode %s"%(self.mode,))
+        Trace.tracef(10, "transfer complete mode %s", self.mode)
         self.state = HAVE_BOUND
         Trace.log(e_errors.INFO, "transfer complete state %s"%(state_name(self.state),))
-        Trace.trace(10, "transfer complete 11 state %s"%(state_name(self.state),))
+        Trace.tracef(10, "transfer complete 11 state %s", state_name(self.state))
         if self.draining:
             self.offline()
         self.log_state()
-        Trace.trace(10, "transfer complete  22 state %s"%(state_name(self.state),))
+        Trace.tracef(10, "transfer complete  22 state %s", state_name(self.state))
         self.need_lm_update = (1, None, 1, None)
 
 
@@ -8753,7 +9031,7 @@ class DiskMover(Mover):
             fc_ticket['original_bfid'] = original_bfid
 
         #Get the volume information. If necessary create a new one.
-        Trace.trace(15,"inquire volume %s"%(self.current_volume,))
+        Trace.tracef(15, "inquire volume %s", self.current_volume)
         v = self.vcc.inquire_vol(self.current_volume)
         if v['status'][0] == e_errors.NO_VOLUME:
             # volume does not exist, create it!
@@ -8809,9 +9087,9 @@ class DiskMover(Mover):
         work = None
         if state is None:
             state = self.state
-        Trace.trace(20,"format_lm_ticket: state %s"%(state_name(state),))
+        Trace.tracef(20, "format_lm_ticket: state %s", state_name(state))
         volume_label = self.current_volume
-        Trace.trace(20,"format_lm_ticket: CV %s lv %s vf %s lvf %s"%(self.current_volume, self.last_volume, self.volume_family, self.last_volume_family))
+        Trace.tracef(20, "format_lm_ticket: CV %s lv %s vf %s lvf %s", self.current_volume, self.last_volume, self.volume_family, self.last_volume_family)
         if self.current_volume:
             volume_label = self.current_volume
             volume_family = self.volume_family
@@ -8917,7 +9195,7 @@ class DiskMover(Mover):
         if self.draining:
             self.offline()
         elif after_function:
-            Trace.trace(20,"after function %s" % (after_function,))
+            Trace.tracef(20, "after function %s", after_function)
             after_function()
         else:
             self.idle()
@@ -9004,7 +9282,7 @@ def identify_mc_device(device):
     ret = None
     ds = device[12:]
     device_host = ds[:ds.find('d')]
-    Trace.trace(10, 'device %s, device host %s'%(ds, device_host,))
+    Trace.tracef(10, 'device %s, device host %s', ds, device_host)
 
     # now look in dmesg
 
@@ -9018,8 +9296,8 @@ def identify_mc_device(device):
         sg = os.listdir(os.path.join(path_to_classes, ch, 'device/scsi_generic'))[0]
         with open(os.path.join(path_to_classes, ch, 'device/type'), 'r') as f:
             sg_type = f.readline()[:-1]
-        Trace.trace(10, 'host=%s sg=%s sg type=%s'%(host , sg, sg_type))
-        Trace.trace(10, 'host=%s sg=%s sg type=%s'%(host , sg, sg_type))
+        Trace.tracef(10, 'host=%s sg=%s sg type=%s', host , sg, sg_type)
+        Trace.tracef(10, 'host=%s sg=%s sg type=%s', host , sg, sg_type)
 
         if device_host == host and sg_type == '8': # 8 is the media changer device type
             ret = sg
@@ -9028,7 +9306,7 @@ def identify_mc_device(device):
     # check if corresponding device exists
     if ret:
         changer_dev = '/dev/changer-%s'%(ret,)
-        Trace.trace(10, ' changer device %s'%(changer_dev,))
+        Trace.tracef(10, ' changer device %s', changer_dev)
         if os.path.exists(changer_dev):
             Trace.log(e_errors.INFO, 'media changer device %s'%(changer_dev,))
             return changer_dev
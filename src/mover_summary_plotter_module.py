@@ -7,7 +7,6 @@
 ###############################################################################
 
 # system imports
-import pg
 import os
 import time
 import types
@@ -52,10 +51,10 @@ class MoverSummaryPlotterModule(enstore_plotter_module.EnstorePlotterModule):
         # histograms are booked(aka created) in advance, and then filled. We
         # need to get values for lowest and highest bins first
         #
-        db = pg.DB(host  = acc.get('dbhost', 'localhost'),
-                   dbname= acc.get('dbname', 'accounting'),
-                   port  = acc.get('dbport', 5432),
-                   user  = acc.get('dbuser_reader', 'enstore_reader'))
+        db = frame.get_db(host  = acc.get('dbhost', 'localhost'),
+                          dbname= acc.get('dbname', 'accounting'),
+                          port  = acc.get('dbport', 5432),
+                          user  = acc.get('dbuser_reader', 'enstore_reader'))
 
         res = db.query(SELECT_MIN_MAX).getresult()
         if res[0][0] is None or res[0][1] is None:
@@ -105,10 +104,10 @@ class MoverSummaryPlotterModule(enstore_plotter_module.EnstorePlotterModule):
 
     def fill(self, frame):
         acc = frame.get_configuration_client().get(enstore_constants.ACCOUNTING_SERVER)
-        db = pg.DB(host  = acc.get('dbhost', 'localhost'),
-                   dbname= acc.get('dbname', 'accounting'),
-                   port  = acc.get('dbport', 5432),
-                   user  = acc.get('dbuser_reader', 'enstore_reader'))
+        db = frame.get_db(host  = acc.get('dbhost', 'localhost'),
+                          dbname= acc.get('dbname', 'accounting'),
+                          port  = acc.get('dbport', 5432),
+                          user  = acc.get('dbuser_reader', 'enstore_reader'))
         for mover in self.mover_list:
             h=self.drive_rate_histograms.get(mover['name'])
             n=self.drive_rate_ntuples.get(mover['name'])
@@ -123,10 +122,10 @@ class MoverSummaryPlotterModule(enstore_plotter_module.EnstorePlotterModule):
 
 
         drv = frame.get_configuration_client().get(enstore_constants.DRIVESTAT_SERVER)
-        db = pg.DB(host  = drv.get('dbhost', 'localhost'),
-                   dbname= drv.get('dbname', 'drivestat'),
-                   port  = drv.get('dbport', 5432),
-                   user  = drv.get('dbuser_reader', 'enstore_reader'))
+        db = frame.get_db(host  = drv.get('dbhost', 'localhost'),
+                          dbname= drv.get('dbname', 'drivestat'),
+                          port  = drv.get('dbport', 5432),
+                          user  = drv.get('dbuser_reader', 'enstore_reader'))
         for mover in self.mover_list:
             e=self.drive_error_ntuples.get(mover['name'])
             q=Q1%(mover['name'])
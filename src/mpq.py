@@ -53,9 +53,10 @@ def _bisect(a, x, compare, lo=0, hi=None):
 
 class MPQ:
 
-    def __init__(self, comparator):
+    def __init__(self, comparator, id_function=id):
         self.items = []
         self.comparator = comparator
+        self.id_function = id_function
 
     def insort(self, item):
         _insort(self.items, item, self.comparator)
@@ -70,6 +71,13 @@ class MPQ:
             exc, msg = sys.exc_info()[:2]
             print "remove: error", exc, msg
 
+    def lookup(self, ident):
+        # return item with specified identifier or None
+        for item in self.items:
+            if self.id_function(item) == ident:
+                return item
+        return None
+
     def __getitem__(self, index):
         return self.items[index]
 
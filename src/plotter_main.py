@@ -56,17 +56,21 @@ def usage(cmd):
     print "\t -L [--library-mounts]  : plot tape library mounts"
     print "\t -l [--latencies]       : plot latencies plot"
     print "\t -S [--sfa-stats]       : plot Small Files Aggregation Statistics"
+    print "\t -j [--fill-threads] n  : fill the plots in n threads (default 1)"
+    print "\t -P [--plot-processes] n : make the plots in n processes (default 1)"
+    print "\t -R [--recompute]       : sum all database rows again, not only the new ones"
     print "\t -h [--help]            : show this message"
 
 if __name__ == "__main__":   # pragma: no cover
     try:
-        short_args = "hmrudDHspfFWeqtibMlLS"
+        short_args = "hmrudDHspfFWeqtibMlLSRj:P:"
         long_args = ["help", "mounts", "rate", "utilization", "drives",
                      "drive-hours", "drive-hours-sep", "slots", "pnfs-backup",
                      "file-family-analysis", "files-rw", "files-rw-sep",
                      "quotas", "tapes-burn-rate", "migration-summary",
                      "bytes-per-day", "mover-summary", "latencies",
-                     "library-mounts", "sfa-stats"]
+                     "library-mounts", "sfa-stats", "fill-threads=",
+                     "plot-processes=", "recompute"]
         opts, args = getopt.getopt(sys.argv[1:], short_args, long_args)
     except getopt.GetoptError, msg:
         print msg
@@ -78,12 +82,28 @@ if __name__ == "__main__":   # pragma: no cover
         usage(sys.argv[0])
         sys.exit(1)
 
+    fill_threads = 1
+    plot_processes = 1
+    recompute = 0
     for o, a in opts:
         if o in ("-h", "--help"):
             usage(sys.argv[0])
             sys.exit(1)
+        if o in ("-R", "--recompute"):
+            recompute = 1
+        try:
+            if o in ("-j", "--fill-threads"):
+                fill_threads = int(a)
+            if o in ("-P", "--plot-processes"):
+                plot_processes = int(a)
+        except ValueError:
+            print "%s needs a number"%(o,)
+            usage(sys.argv[0])
+            sys.exit(2)
 
-    f = enstore_plotter_framework.EnstorePlotterFramework()
+    f = enstore_plotter_framework.EnstorePlotterFramework(fill_threads,
+                                                          plot_processes)
+    f.recompute_aggregates = recompute
 
     for o, a in opts:
 
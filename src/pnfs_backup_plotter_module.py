@@ -6,7 +6,6 @@
 ###############################################################################
 
 # system imports
-import pg
 import os
 import time
 import sys
@@ -94,11 +93,11 @@ class PnfsBackupPlotterModule(enstore_plotter_module.EnstorePlotterModule):
         #  here we create data points
 
         acc = frame.get_configuration_client().get(enstore_constants.ACCOUNTING_SERVER, {})
-        db = pg.DB(host   = acc.get('dbhost', "localhost"),
-                   dbname = acc.get('dbname', "accounting"),
-                   port   = acc.get('dbport', 5432),
-                   user   = acc.get('dbuser', "enstore")
-                   )
+        db = frame.get_db(host   = acc.get('dbhost', "localhost"),
+                          dbname = acc.get('dbname', "accounting"),
+                          port   = acc.get('dbport', 5432),
+                          user   = acc.get('dbuser', "enstore")
+                          )
 
         sql_cmd = "select start,finish - start as duration from event " \
                    "where name = 'pnfsFastBackup' and " \
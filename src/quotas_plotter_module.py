@@ -6,7 +6,6 @@
 ###############################################################################
 
 # system imports
-import pg
 import os
 import time
 import sys
@@ -105,11 +104,11 @@ class QuotasPlotterModule(enstore_plotter_module.EnstorePlotterModule):
         #  here we create data points
 
         edb = frame.get_configuration_client().get("database", {})
-        db = pg.DB(host   = edb.get('dbhost', "localhost"),
-                   dbname = edb.get('dbname', "enstoredb"),
-                   port   = edb.get('dbport', 5432),
-                   user   = edb.get('dbuser', "enstore")
-                   )
+        db = frame.get_db(host   = edb.get('dbhost', "localhost"),
+                          dbname = edb.get('dbname', "enstoredb"),
+                          port   = edb.get('dbport', 5432),
+                          user   = edb.get('dbuser', "enstore")
+                          )
 
         #Get the current volume count and quota information.  Let's
         # also skip null and deleted volumes.
@@ -134,11 +133,11 @@ class QuotasPlotterModule(enstore_plotter_module.EnstorePlotterModule):
 
         acc = frame.get_configuration_client().get(
             enstore_constants.ACCOUNTING_SERVER, {})
-        acc_db = pg.DB(host   = acc.get('dbhost', "localhost"),
-                       dbname = acc.get('dbname', "accounting"),
-                       port   = acc.get('dbport', 5432),
-                       user   = acc.get('dbuser', "enstore")
-                       )
+        acc_db = frame.get_db(host   = acc.get('dbhost', "localhost"),
+                              dbname = acc.get('dbname', "accounting"),
+                              port   = acc.get('dbport', 5432),
+                              user   = acc.get('dbuser', "enstore")
+                              )
 
         for row in self.db_result:
 
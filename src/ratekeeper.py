@@ -15,9 +15,11 @@ import string
 import time
 import threading
 import types
-import pg
+import fcntl
 
 # enstore import
+import dbaccess
+from en_eval import en_eval
 #import configuration_client
 import dispatching_worker
 import generic_server
@@ -49,6 +51,13 @@ DRVBUSY_INTERVAL = 900 #15 minutes
 SLOTS_INTERVAL = 21600 #6 hours
 MVR_RETRY_INTERVAL = 10
 MVR_RETRIES=1
+SPOOL_FILE = "ratekeeper.spool"
+
+RATE_COLUMNS = ("time", "read", "write", "read_null", "write_null")
+DRIVE_UTILIZATION_COLUMNS = ("time", "tape_library", "type",
+                             "storage_group", "total", "busy")
+SLOTS_USAGE_COLUMNS = ("time", "tape_library", "location", "media_type",
+                       "total", "free", "used", "disabled")
 
 def endswith(s1,s2):
     return s1[-len(s2):] == s2
@@ -73,6 +82,72 @@ def next_minute(t=None):
     t = time.mktime((Y, M, D, h, m, 0, wd, jd, dst))
     return t
 
+def db_time(t):
+    return time.strftime("%m-%d-%Y %H:%M:%S %Z", time.localtime(t))
+
+class InsertSpool:
+    """
+    Append-only journal of the rows that could not be inserted into the
+    accounting DB, a batch per line: repr((table, columns, rows)).
+    The ratekeeper and its forked children append to it, replay() inserts
+    the batches in order once the DB takes inserts again.  Both hold an
+    exclusive lock on the file.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def _open(self, mode):
+        f = open(self.filename, mode)
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return f
+
+    def append(self, table, columns, rows):
+        f = self._open("a")
+        try:
+            f.write("%r\n" % ((table, tuple(columns), map(tuple, rows)),))
+        finally:
+            f.close()
+
+    def pending(self):
+        try:
+            return os.path.getsize(self.filename) > 0
+        except OSError:
+            return False
+
+    # Insert the spooled batches with acc_db, a dbaccess.DatabaseAccess.
+    # Stops at the first batch that fails, it and the following ones stay
+    # in the journal.  Returns the number of batches inserted.
+    def replay(self, acc_db):
+        f = self._open("a+")
+        try:
+            f.seek(0)
+            lines = f.readlines()
+            remaining = []
+            count = 0
+            for i in range(len(lines)):
+                try:
+                    table, columns, rows = en_eval(lines[i])
+                except:
+                    #Not all of the line was written.
+                    Trace.log(e_errors.ERROR, "dropping malformed spooled"
+                              " batch: %s" % (lines[i][:200],))
+                    continue
+                try:
+                    acc_db.insert_many(table, columns, rows)
+                except e_errors.EnstoreError:
+                    remaining = lines[i:]
+                    break
+                count = count + 1
+            f.truncate(0)
+            f.writelines(remaining)
+        finally:
+            f.close()
+        if count:
+            Trace.log(e_errors.INFO, "inserted %d spooled batches, %d left"
+                      % (count, len(remaining)))
+        return count
+
 class Ratekeeper(dispatching_worker.DispatchingWorker,
                  generic_server.GenericServer):
 
@@ -84,11 +159,9 @@ class Ratekeeper(dispatching_worker.DispatchingWorker,
                                               )
         Trace.init(self.log_name)
 
-        #We need to obtain access to the accounting DB.  Don't define
-        # the interface object to the acounting DB here.  Only get the
-        # information to contact it here.  The access to the DBs needs to
-        # be done locally in the code to avoid threading/forking releated
-        # problems.
+        #We need to obtain access to the accounting DB.  The forked
+        # children do not use self.acc_db, they make their own with
+        # new_acc_db() to avoid threading/forking releated problems.
         self.connect()
 
         #
@@ -135,6 +208,9 @@ class Ratekeeper(dispatching_worker.DispatchingWorker,
             self.output_dir = ratekeeper_dir
         else:
             self.output_dir = None
+        #Rows the accounting DB could not take wait here.
+        spool_dir = ratekeep.get('spool_dir', self.output_dir or '.')
+        self.spool = InsertSpool(os.path.join(spool_dir, SPOOL_FILE))
         self.outfile = None
         self.ymd = None #Year, month, date
         self.last_ymd = None
@@ -195,17 +271,9 @@ class Ratekeeper(dispatching_worker.DispatchingWorker,
     # to in the future, then this function is ready to go.
     def ratekeeper_error_handler(self, exc, msg, tb):
         __pychecker__ = "unusednames=tb"
-        # is it PostgreSQL connection error?
-        #
-        # This is indeed a OR condition implemented in if-elif-elif-...
-        # so that each one can be specified individually
-        if exc == pg.ProgrammingError and str(msg)[:13] == 'server closed':
-            self.reconnect()
-        elif exc == ValueError and str(msg)[:13] == 'server closed':
-            self.reconnect()
-        elif exc == TypeError and str(msg)[:10] == 'Connection':
-            self.reconnect()
-        elif exc == ValueError and str(msg)[:13] == 'no connection':
+        # is it PostgreSQL error?
+        if exc == e_errors.EnstoreError and \
+               getattr(msg, 'type', None) == e_errors.DATABASE_ERROR:
             self.reconnect()
         self.reply_to_caller({'status':(str(exc),str(msg), 'error'),
             'exc_type':str(exc), 'exc_value':str(msg)} )
@@ -218,34 +286,49 @@ class Ratekeeper(dispatching_worker.DispatchingWorker,
         print time.ctime(), "Done reestablishing connection to database."
 
     # establish connection to the database
+    # The connections are made when used, and made again if they break.
     def connect(self):
-        self.acc_db = None
-        while not self.acc_db:
-            self.acc_conf = self.csc.get(enstore_constants.ACCOUNTING_SERVER)
-            if not e_errors.is_ok(self.acc_conf):
-                message = "Unable to get accounting database information: %s" \
-                          (self.acc_conf['status'],)
-                Trace.log(e_errors.ERROR, message)
+        self.acc_conf = self.csc.get(enstore_constants.ACCOUNTING_SERVER)
+        if not e_errors.is_ok(self.acc_conf):
+            message = "Unable to get accounting database information: %s" \
+                      % (self.acc_conf['status'],)
+            Trace.log(e_errors.ERROR, message)
+        self.acc_db = self.new_acc_db()
+
+    def new_acc_db(self):
+        return dbaccess.DatabaseAccess(
+            maxconnections = 1,
+            host     = self.acc_conf.get('dbhost', "localhost"),
+            port     = self.acc_conf.get('dbport', 5432),
+            database = self.acc_conf.get('dbname', "accounting"),
+            user     = self.acc_conf.get('dbuser', "enstore"),
+            )
+
+    # Insert rows into table with one query, in one transaction.  If the
+    # DB can not take them, they are spooled to be inserted later.
+    def insert_rows(self, acc_db, table, columns, rows):
+        if not rows:
+            return True
+        try:
+            Trace.trace(10, 'Inserting %d rows into %s' % (len(rows), table))
+            acc_db.insert_many(table, columns, rows)
+        except e_errors.EnstoreError:
+            exc, msg = sys.exc_info()[:2]
             try:
-                self.acc_db   = pg.DB(
-                    host   = self.acc_conf.get('dbhost', "localhost"),
-                    port   = self.acc_conf.get('dbport', 5432),
-                    dbname = self.acc_conf.get('dbname', "accounting"),
-                    user   = self.acc_conf.get('dbuser', "enstore"),
-                    )
-            except (pg.ProgrammingError, pg.InternalError):
-                exc_type, exc_value = sys.exc_info()[:2]
-                message = str(exc_type)+' '+str(exc_value)+' IS POSTMASTER RUNNING?'
-                Trace.log(e_errors.ERROR, message.replace("\n", "  "))
-                time.sleep(30)
-                continue
-            except:
-                exc_type, exc_value = sys.exc_info()[:2]
-                message = str(exc_type)+' '+str(exc_value)
-                Trace.log(e_errors.ERROR, message)
-                message = "CAN NOT ESTABLISH DATABASE CONNECTION ... QUIT!"
-                Trace.log(e_errors.ERROR, message)
-                sys.exit(1)
+                sys.stderr.write("%s: Can not update DB, spooling %d rows"
+                                 " of %s: (%s, %s)\n" %
+                                 (time.ctime(), len(rows), table, exc, msg))
+                sys.stderr.flush()
+            except IOError:
+                pass
+            try:
+                self.spool.append(table, columns, rows)
+            except (OSError, IOError):
+                exc, msg = sys.exc_info()[:2]
+                Trace.log(e_errors.ERROR, "Can not spool %d rows of %s: %s"
+                          % (len(rows), table, msg))
+            return False
+        return True
 
     # These need confirmation
     def quit(self, ticket):
@@ -398,39 +481,23 @@ class Ratekeeper(dispatching_worker.DispatchingWorker,
                 except:
                     busy_count[(drive['type'], sg)]  =   1
 
-        try:
-            acc_db = pg.DB(host  = self.acc_conf.get('dbhost', "localhost"),
-                           port  = self.acc_conf.get('dbport', 5432),
-                           dbname= self.acc_conf.get('dbname', "accounting"),
-                           user  = self.acc_conf.get('dbuser', "enstore"))
-
-            ## Put the information into the accounting DB.
-            Trace.trace(10, 'Total count %s. Busy Count %s' % (total_count, busy_count))
-            for drive_type in total_count.keys():
-                for k in busy_count.keys():
-                    if k[0] == drive_type:
-                        q="insert into drive_utilization \
-                        (time, tape_library, type, storage_group, total, busy) values \
-                        ('%s', '%s', '%s',  '%s', %d,  %d)" % \
-                        (time.strftime("%m-%d-%Y %H:%M:%S %Z",
-                                       time.localtime(now)),
-                         tape_library,
-                         drive_type,
-                         k[1],
-                         total_count[drive_type],
-                         busy_count[k],
-                         )
-                        Trace.trace(10, 'Executing %s ' % (q,))
-                        acc_db.query(q)
-            acc_db.close()
-        except (pg.ProgrammingError, pg.InternalError):
-            exc, msg, tb = sys.exc_info()
-            try:
-                sys.stderr.write("%s: Can not update DB: (%s, %s)\n" %
-                                 (time.ctime(), exc, msg))
-                sys.stderr.flush()
-            except IOError:
-                pass
+        ## Put the information into the accounting DB.
+        Trace.trace(10, 'Total count %s. Busy Count %s' % (total_count, busy_count))
+        rows = []
+        for drive_type in total_count.keys():
+            for k in busy_count.keys():
+                if k[0] == drive_type:
+                    rows.append((db_time(now),
+                                 tape_library,
+                                 drive_type,
+                                 k[1],
+                                 total_count[drive_type],
+                                 busy_count[k],
+                                 ))
+        acc_db = self.new_acc_db()
+        self.insert_rows(acc_db, "drive_utilization",
+                         DRIVE_UTILIZATION_COLUMNS, rows)
+        acc_db.close()
         Trace.trace(10, 'update_DRVBusy for %s finished' % (mcc.name,))
 
     def update_slots(self, mcc):
@@ -449,30 +516,17 @@ class Ratekeeper(dispatching_worker.DispatchingWorker,
             slots_list = slots_dict['slot_list']
 
         try:
-
-            ## Put the information into the accounting DB.
-            acc_db = pg.DB(host  = self.acc_conf.get('dbhost', "localhost"),
-                           port  = self.acc_conf.get('dbport', 5432),
-                           dbname= self.acc_conf.get('dbname', "accounting"),
-                           user  = self.acc_conf.get('dbuser', "enstore"))
-
+            rows = []
             for slot_info in slots_list:
-                q="insert into tape_library_slots_usage (time, tape_library, \
-                location, media_type, total, free, used, disabled) values \
-                ('%s', '%s', '%s', '%s', %d, %d, %d, %d)" % \
-                   (time.strftime("%m-%d-%Y %H:%M:%S %Z", time.localtime(now)),
-                    tape_library,
-                    slot_info['location'],
-                    slot_info['media_type'],
-                    slot_info['total'],
-                    slot_info['free'],
-                    slot_info['used'],
-                    slot_info['disabled'])
-
-                acc_db.query(q)
-
-            acc_db.close()
-        except (pg.ProgrammingError, pg.InternalError,KeyError, TypeError):
+                rows.append((db_time(now),
+                             tape_library,
+                             slot_info['location'],
+                             slot_info['media_type'],
+                             slot_info['total'],
+                             slot_info['free'],
+                             slot_info['used'],
+                             slot_info['disabled']))
+        except (KeyError, TypeError):
             exc, msg, tb = sys.exc_info()
             try:
                 sys.stderr.write("%s: Can not update DB: (%s, %s)\n" %
@@ -480,6 +534,13 @@ class Ratekeeper(dispatching_worker.DispatchingWorker,
                 sys.stderr.flush()
             except IOError:
                 pass
+            return slots_list
+
+        ## Put the information into the accounting DB.
+        acc_db = self.new_acc_db()
+        self.insert_rows(acc_db, "tape_library_slots_usage",
+                         SLOTS_USAGE_COLUMNS, rows)
+        acc_db.close()
         return slots_list
 
     def check_outfile(self, now=None):
@@ -604,38 +665,23 @@ class Ratekeeper(dispatching_worker.DispatchingWorker,
                     except IOError:
                         pass
                 ###########################################################
-                # Insert the rate data into the DB.
+                # Insert the rate data into the DB.  If that fails the
+                # sample is spooled; once the DB takes inserts again the
+                # spooled ones follow.
                 acc_db_lock.acquire()
                 try:
-                    q="insert into rate (time, read, write, read_null, write_null) values \
-                       ('%s', %d,  %d,  %d,  %d)"%(time.strftime("%m-%d-%Y %H:%M:%S %Z",
-                                                                 time.localtime(now)),
-                                                   bytes_read_dict.get("REAL", 0),
-                                                   bytes_written_dict.get("REAL", 0),
-                                                   bytes_read_dict.get("NULL", 0),
-                                                   bytes_written_dict.get("NULL", 0),)
-                    self.acc_db.query(q)
-                except (pg.ProgrammingError, pg.InternalError):
-                    exc, msg, tb = sys.exc_info()
-                    try:
-                        sys.stderr.write("%s: Can not update DB: (%s, %s)\n" %
-                                         (time.ctime(), exc, msg))
-                        sys.stderr.flush()
-                    except IOError:
-                        pass
-                    #Attempt to reconnect in 5 seconds.
-                    time.sleep(5)
-                    self.reconnect()
-                    #Wait for the next minute.
-                    self.start_next_minute()
-                    N = 1L #Reset this back now that self.start_time is reset.
+                    row = (db_time(now),
+                           bytes_read_dict.get("REAL", 0),
+                           bytes_written_dict.get("REAL", 0),
+                           bytes_read_dict.get("NULL", 0),
+                           bytes_written_dict.get("NULL", 0),)
+                    if self.insert_rows(self.acc_db, "rate", RATE_COLUMNS,
+                                        [row]) and self.spool.pending():
+                        self.spool.replay(self.acc_db)
+                finally:
                     #Avoid resource leaks, release the locks.
                     acc_db_lock.release()
                     rate_lock.release()
-                    continue
-
-                acc_db_lock.release()
-                rate_lock.release()
 
                 for key in bytes_read_dict.keys():
                     bytes_read_dict[key] = 0L
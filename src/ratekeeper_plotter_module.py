@@ -105,10 +105,10 @@ class RateKeeperPlotterModule(enstore_plotter_module.EnstorePlotterModule):
        #  here we create data points
 
         acc = frame.get_configuration_client().get(enstore_constants.ACCOUNTING_SERVER, {})
-        db = pg.DB(host  = acc.get('dbhost', "localhost"),
-                   dbname= acc.get('dbname', "accounting"),
-                   port  = acc.get('dbport', 5432),
-                   user  = acc.get('dbuser', "enstore"))
+        db = frame.get_db(host  = acc.get('dbhost', "localhost"),
+                          dbname= acc.get('dbname', "accounting"),
+                          port  = acc.get('dbport', 5432),
+                          user  = acc.get('dbuser', "enstore"))
         now_time  = time.time()
         then_time = now_time - self.time_in_days*24*3600
         db.query("begin");
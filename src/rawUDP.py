@@ -27,6 +27,11 @@ SHUFFLE_THRESHOLD = 1000 # reinsert at the lower index beginning with this queue
 def get_id(request):
     # request is a string like
     # ('131.225.13.187-42240-1240336133.248870-25246-134719808', 13L, {'work': 'alive'})
+    if udp_common.is_binary(request):
+        try:
+            return udp_common.b_eval(request)[0]
+        except:
+            return None
     rarr = request.split("'")
     try:
         # the fist element is a first part of request id
@@ -40,6 +45,15 @@ def get_id(request):
 # get a keyword from message
 # message is a str(dictionary)
 def get_keyword(request, keyword):
+    if udp_common.is_binary(request):
+        # binary encoded (client id, number, ticket)
+        try:
+            value = udp_common.b_eval(request)[2].get(keyword)
+        except:
+            return None
+        if type(value) != type(""):
+            return None
+        return value
     rarr = request.split("'")
     try:
         if keyword in rarr:
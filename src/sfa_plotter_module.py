@@ -8,7 +8,6 @@
 ###############################################################################
 
 # system imports
-import pg
 import os
 import sys
 import time
@@ -53,10 +52,10 @@ class SFAStatsPlotterModule(enstore_plotter_module.EnstorePlotterModule):
         #Open conection to the Enstore DB.
         try:
             # proper default values are supplied by edb.FileDB constructor
-            self.db = pg.DB(host  = dbInfo.get('dbhost', 'localhost'),
-                            dbname= dbInfo.get('dbname', 'enstoredb'),
-                            port  = dbInfo.get('dbport', 5432),
-                            user  = dbInfo.get('dbuser_reader', 'enstore_reader'))
+            self.db = frame.get_db(host  = dbInfo.get('dbhost', 'localhost'),
+                                   dbname= dbInfo.get('dbname', 'enstoredb'),
+                                   port  = dbInfo.get('dbport', 5432),
+                                   user  = dbInfo.get('dbuser_reader', 'enstore_reader'))
         except:
             exc_type, exc_value = sys.exc_info()[:2]
             message = str(exc_type)+' '+str(exc_value)+' IS POSTMASTER RUNNING?'
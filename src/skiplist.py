@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+"""An indexable skiplist ordered by precomputed sort keys"""
+###############################################################################
+#
+# $Id$
+#
+###############################################################################
+
+# This is a drop-in replacement for mpq.MPQ for large queues.
+# mpq.MPQ keeps items in a python list, calls a python comparison
+# function on every bisection step and removes items with a linear
+# list.remove.
+# Here the sort key of an item is computed once, when the item is
+# inserted, and keys are compared natively as tuples.
+# Every link of the skiplist carries its width (number of level 0 steps
+# it spans) so that positional access is O(log n) as well.
+# An index maps item identifiers (unique_id for library manager requests)
+# to skiplist nodes, which makes membership tests and lookups O(1)
+# and removal O(log n).
+import sys
+import random
+
+MAX_LEVEL = 32  # enough for 2**32 items
+
+
+class _Node(object):
+    __slots__ = ('key', 'item', 'next', 'width')
+
+    def __init__(self, key, item, level):
+        self.key = key
+        self.item = item
+        self.next = [None] * level
+        self.width = [1] * level
+
+
+class SkipList:
+
+    def __init__(self, key_function, id_function=id):
+        """
+        :type key_function: :obj:`callable`
+        :arg key_function: returns sort key for an item. Items are kept in
+                           ascending key order. Items with equal keys are
+                           kept in the order of insertion.
+        :type id_function: :obj:`callable`
+        :arg id_function: returns identifier of an item, used in item index.
+                          Identifiers must be unique for the items in the list.
+        """
+        self.key_function = key_function
+        self.id_function = id_function
+        self.nil = _Node(None, None, 0)
+        self.head = _Node(None, None, MAX_LEVEL)
+        self.head.next = [self.nil] * MAX_LEVEL
+        self.levels = 1  # number of levels in use
+        self.size = 0
+        self.seq = 0  # insertion counter, keeps equal keys in FIFO order
+        self.index = {}  # item id -> node
+
+    def _random_level(self):
+        # geometric distribution with p = 1/2
+        bits = random.getrandbits(MAX_LEVEL - 1)
+        level = 1
+        while bits & 1:
+            level = level + 1
+            bits = bits >> 1
+        return level
+
+    def insort(self, item):
+        key = (self.key_function(item), self.seq)
+        self.seq = self.seq + 1
+        nil = self.nil
+        head = self.head
+        levels = self.levels
+        d = self._random_level()
+        if d > levels:
+            # new levels start at the head and span the whole list
+            for level in xrange(levels, d):
+                head.width[level] = self.size + 1
+            levels = self.levels = d
+        chain = [head] * levels
+        steps_at_level = [0] * levels
+        node = head
+        for level in xrange(levels - 1, -1, -1):
+            nxt = node.next[level]
+            steps = 0
+            while nxt is not nil and nxt.key <= key:
+                steps = steps + node.width[level]
+                node = nxt
+                nxt = node.next[level]
+            steps_at_level[level] = steps
+            chain[level] = node
+        new_node = _Node(key, item, d)
+        steps = 0
+        for level in xrange(d):
+            prev = chain[level]
+            new_node.next[level] = prev.next[level]
+            prev.next[level] = new_node
+            new_node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps = steps + steps_at_level[level]
+        for level in xrange(d, levels):
+            chain[level].width[level] = chain[level].width[level] + 1
+        self.index[self.id_function(item)] = new_node
+        self.size = self.size + 1
+
+    def bisect(self, item):
+        # position after the last item with the key not greater than
+        # the key of item.
+        # As mpq.MPQ.bisect does, never returns position past the last item.
+        key = (self.key_function(item), sys.maxint)
+        nil = self.nil
+        node = self.head
+        position = 0
+        for level in xrange(self.levels - 1, -1, -1):
+            nxt = node.next[level]
+            while nxt is not nil and nxt.key <= key:
+                position = position + node.width[level]
+                node = nxt
+                nxt = node.next[level]
+        if position >= self.size:
+            position = max(self.size - 1, 0)
+        return position
+
+    def remove(self, item):
+        node = self.index.get(self.id_function(item))
+        if node is None or node.item is not item:
+            print "remove: error", ValueError, "SkipList.remove(x): x not in list"
+            return
+        key = node.key
+        nil = self.nil
+        prev = self.head
+        for level in xrange(self.levels - 1, -1, -1):
+            nxt = prev.next[level]
+            while nxt is not nil and nxt.key < key:
+                prev = nxt
+                nxt = prev.next[level]
+            if nxt is node:
+                prev.width[level] = prev.width[level] + node.width[level] - 1
+                prev.next[level] = node.next[level]
+            else:
+                prev.width[level] = prev.width[level] - 1
+        del(self.index[self.id_function(item)])
+        self.size = self.size - 1
+        while self.levels > 1 and self.head.next[self.levels - 1] is nil:
+            self.levels = self.levels - 1
+
+    def lookup(self, ident):
+        # return item with specified identifier or None
+        node = self.index.get(ident)
+        if node is None:
+            return None
+        return node.item
+
+    def __getitem__(self, index):
+        if index < 0:
+            index = index + self.size
+        if index < 0 or index >= self.size:
+            raise IndexError("SkipList index out of range")
+        node = self.head
+        index = index + 1
+        for level in xrange(self.levels - 1, -1, -1):
+            while node.width[level] <= index:
+                index = index - node.width[level]
+                node = node.next[level]
+        return node.item
+
+    def __iter__(self):
+        nil = self.nil
+        node = self.head.next[0]
+        while node is not nil:
+            yield node.item
+            node = node.next[0]
+
+    def __contains__(self, item):
+        node = self.index.get(self.id_function(item))
+        return node is not None and node.item is item
+
+    def __len__(self):
+        return self.size
+
+    def __nonzero__(self):
+        return self.size != 0
+
+    def __repr__(self):
+        return str(list(self))
@@ -98,11 +98,11 @@ class SlotUsagePlotterModule(enstore_plotter_module.EnstorePlotterModule):
         self.data=[]
         acc = {}
         acc = frame.get_configuration_client().get(enstore_constants.ACCOUNTING_SERVER, 5, 2)
-        db = pg.DB(host  = acc.get('dbhost', "localhost"),
-                   dbname= acc.get('dbname', "accounting"),
-                   port  = acc.get('dbport', 5432),
-                   user  = acc.get('dbuser', "enstore")
-                   )
+        db = frame.get_db(host  = acc.get('dbhost', "localhost"),
+                          dbname= acc.get('dbname', "accounting"),
+                          port  = acc.get('dbport', 5432),
+                          user  = acc.get('dbuser', "enstore")
+                          )
 
         for row in db.query("select distinct tape_library,location,media_type from tape_library_slots_usage").getresult():
             if not row :
@@ -110,10 +110,10 @@ class SummaryBpdPlotterModule(bytes_per_day_plotter_module.BytesPerDayPlotterMod
             ###
             adb = csc.get("accounting_server", {})
             try:
-                adb = pg.DB(host  = adb.get('dbhost', "localhost"),
-                           dbname = adb.get('dbname', "enstore"),
-                           port   = adb.get('dbport', 5432),
-                           user   = adb.get('dbuser_reader', "enstore_reader"))
+                adb = frame.get_db(host  = adb.get('dbhost', "localhost"),
+                                  dbname = adb.get('dbname', "enstore"),
+                                  port   = adb.get('dbport', 5432),
+                                  user   = adb.get('dbuser_reader', "enstore_reader"))
             except pg.InternalError, msg:
                 message = "Unable to contact (%s, %s): %s\n" % \
                           (adb['dbhost'], adb['dbport'], msg)
@@ -131,10 +131,10 @@ class SummaryBurnRatePlotterModule(#enstore_plotter_module.EnstorePlotterModule,
             ###
             edb = csc.get("database", {})
             try:
-                edb = pg.DB(host  = edb.get('dbhost', "localhost"),
-                           dbname= edb.get('dbname', "enstore"),
-                           port  = edb.get('dbport', 5432),
-                           user  = edb.get('dbuser_reader', "enstore_reader"))
+                edb = frame.get_db(host  = edb.get('dbhost', "localhost"),
+                                  dbname= edb.get('dbname', "enstore"),
+                                  port  = edb.get('dbport', 5432),
+                                  user  = edb.get('dbuser_reader', "enstore_reader"))
             except pg.InternalError, msg:
                 message = "Unable to contact (%s, %s): %s\n" % \
                           (edb['dbhost'], edb['dbport'], msg)
@@ -222,10 +222,10 @@ class SummaryBurnRatePlotterModule(#enstore_plotter_module.EnstorePlotterModule,
             ###
             drs = csc.get(enstore_constants.DRIVESTAT_SERVER, {})
             try:
-                db = pg.DB(host  = drs.get('dbhost', "localhost"),
-                           dbname= drs.get('dbname', "drivestat"),
-                           port  = drs.get('dbport', 5432),
-                           user  = drs.get('dbuser_reader', "enstore_reader"))
+                db = frame.get_db(host  = drs.get('dbhost', "localhost"),
+                                  dbname= drs.get('dbname', "drivestat"),
+                                  port  = drs.get('dbport', 5432),
+                                  user  = drs.get('dbuser_reader', "enstore_reader"))
             except pg.InternalError:
                 db = None
 
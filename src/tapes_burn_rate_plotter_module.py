@@ -252,10 +252,10 @@ class TapesBurnRatePlotterModule(enstore_plotter_module.EnstorePlotterModule):
         #  here we create data points
 
         edb_info = frame.get_configuration_client().get("database", {})
-        edb = pg.DB(host  = edb_info.get('dbhost', "localhost"),
-                   dbname= edb_info.get('dbname', "enstore"),
-                   port  = edb_info.get('dbport', 5432),
-                   user  = edb_info.get('dbuser_reader', "enstore_reader"))
+        edb = frame.get_db(host  = edb_info.get('dbhost', "localhost"),
+                          dbname= edb_info.get('dbname', "enstore"),
+                          port  = edb_info.get('dbport', 5432),
+                          user  = edb_info.get('dbuser_reader', "enstore_reader"))
 
         ###
         ### Get the current list of libraries known to this Enstore system.
@@ -385,10 +385,10 @@ class TapesBurnRatePlotterModule(enstore_plotter_module.EnstorePlotterModule):
         ###
         drs = frame.get_configuration_client().get(enstore_constants.DRIVESTAT_SERVER, {})
         try:
-            db = pg.DB(host  = drs.get('dbhost', "localhost"),
-                       dbname= drs.get('dbname', "drivestat"),
-                       port  = drs.get('dbport', 5432),
-                       user  = drs.get('dbuser_reader', "enstore_reader"))
+            db = frame.get_db(host  = drs.get('dbhost', "localhost"),
+                              dbname= drs.get('dbname', "drivestat"),
+                              port  = drs.get('dbport', 5432),
+                              user  = drs.get('dbuser_reader', "enstore_reader"))
         except pg.InternalError:
             db = None
 
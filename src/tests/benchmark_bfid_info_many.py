@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Benchmark of edb.FileDB.get_many, the query behind bfid_info_many.
+Fills scratch tables the way benchmark_file_clerk_tape_list.py does, then
+reads the records of the package members in batches, once with a query per
+bfid (FileDB.__getitem__, as bfid_info does) and once with a query per batch
+(FileDB.get_many).  Both must return the same records.
+
+Never run against a production database: the tables are dropped
+and re-created.
+
+usage: benchmark_bfid_info_many.py [members [batch [host [port [user [database]]]]]]
+"""
+import sys
+import time
+
+import edb
+from benchmark_file_clerk_tape_list import DATABASE, populate
+
+
+def main():
+    members = 20000
+    batch = 100
+    host = 'localhost'
+    port = 5432
+    user = 'enstore'
+    database = DATABASE
+    args = sys.argv[1:]
+    if len(args) > 0:
+        members = int(args[0])
+    if len(args) > 1:
+        batch = int(args[1])
+    if len(args) > 2:
+        host = args[2]
+    if len(args) > 3:
+        port = int(args[3])
+    if len(args) > 4:
+        user = args[4]
+    if len(args) > 5:
+        database = args[5]
+    if database == 'enstoredb':
+        print "refusing to run against %s, use a scratch database" % (database,)
+        sys.exit(1)
+
+    filedb = edb.FileDB(host=host, port=port, user=user, database=database,
+                        auto_journal=0)
+    populate(filedb, members, 100)
+    bfids = ['BENCHM%010d' % (n,) for n in xrange(members)]
+
+    t0 = time.time()
+    one = {}
+    for bfid in bfids:
+        one[bfid] = filedb[bfid]
+    one_t = time.time() - t0
+    t0 = time.time()
+    many = {}
+    for i in xrange(0, members, batch):
+        many.update(filedb.get_many(bfids[i:i + batch]))
+    many_t = time.time() - t0
+    if one != many:
+        print "records differ"
+        sys.exit(1)
+    print "%s files  per bfid %8.2f s (%8.0f/s)  per %s %8.2f s (%8.0f/s)" % (
+        members, one_t, members / one_t, batch, many_t, members / many_t)
+    filedb.close()
+
+
+if __name__ == "__main__":   # pragma: no cover
+    main()
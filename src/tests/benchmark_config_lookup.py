@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Benchmark of the configuration server read path.
+Loads the configuration in tests/fixtures/csc.prod.dump and answers lookup
+requests for all of its keys, spread over threads, and dump requests, at
+copy levels 0, 1 and 2 and from the snapshot (copy level 3).  The replies
+are encoded as they would be sent, to a socket that keeps only the last
+one, and must decode to the same tickets at every level.  Also lists the
+movers of every library, as get_movers does.  Reports lookups/sec,
+dumps/sec and get_movers/sec.
+
+usage: benchmark_config_lookup.py [lookups [threads]]
+"""
+import ast
+import new
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import configuration_server
+import udp_common
+
+LEVELS = (0, 1, 2, configuration_server.SNAPSHOT)
+
+
+class NullSocket:
+
+    def __init__(self):
+        self.last = None
+
+    def sendto(self, msg, address):
+        self.last = msg
+
+    def close(self):
+        pass
+
+
+def make_server(config_file):
+    server = new.instance(configuration_server.ConfigurationServer, {})
+    configuration_server.ConfigurationDict.__init__(server)
+    status = server.load_config(config_file)
+    if status[0] != 'ok':
+        print "can not load configuration: %s" % (status,)
+        sys.exit(1)
+    server.server_socket = NullSocket()
+    server.request_dict = {}
+    server.binary_clients = {}
+    server.max_packet_size = 16384
+    server._lock = threading.Lock()
+    server.cached_domains = {'domains': {'valid_domains': []}}
+    # the replies that do not fit in a datagram are not part of this
+    server.send_reply_with_long_answer = lambda ticket: None
+    return server
+
+
+def lookups(server, keys, count):
+    for i in xrange(count):
+        key = keys[i % len(keys)]
+        # not an IPv4 client, the lookup does not resolve the host
+        server.lookup({'work': 'lookup', 'lookup': key, 'new': 1,
+                       'r_a': (('::1', 7000), i, 'client')})
+
+
+def main():
+    count = 100000
+    threads = 4
+    if len(sys.argv) > 1:
+        count = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        threads = int(sys.argv[2])
+    fixture = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'fixtures', 'csc.prod.dump')
+    configdict = ast.literal_eval(open(fixture).read())['dump']
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        config_file = os.path.join(tmp_dir, 'config')
+        f = open(config_file, 'w')
+        f.write("configdict = %r\n" % (configdict,))
+        f.close()
+        server = make_server(config_file)
+    finally:
+        shutil.rmtree(tmp_dir)
+    keys = server.get_config_keys()
+    keys.sort()
+    print "%s keys, dump %s bytes" % (len(keys),
+                                      len(server.snapshot.encoded_dump))
+    libraries = [key for key in keys
+                 if key.endswith('.library_manager')] * 10
+
+    replies = {}
+    for level in LEVELS:
+        server.set_copy_level(level)
+        workers = [threading.Thread(target=lookups,
+                                    args=(server, keys, count / threads))
+                   for i in range(threads)]
+        t0 = time.time()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        lookup_t = time.time() - t0
+
+        ticket = {'work': 'dump', 'r_a': (('::1', 7000), 1L, 'client')}
+        t0 = time.time()
+        for i in xrange(20):
+            reply, encoded = server._ConfigurationServer__make_dump(ticket)
+            msg = udp_common.r_repr_with(reply, encoded)
+        dump_t = (time.time() - t0) / 20
+
+        movers = []
+        t0 = time.time()
+        for library in libraries:
+            movers.append(server.get_movers_internal({'library': library}))
+        movers_t = (time.time() - t0) / len(libraries)
+        # in the order of the configuration keys
+        movers = [sorted(m) for m in movers]
+
+        lookups(server, keys[:1], 1)
+        last = udp_common.r_eval(server.server_socket.last)[1]
+        replies[level] = (last, udp_common.r_eval(msg), movers)
+        print "copy level %s  %10.0f lookups/s  %8.1f dumps/s  " \
+              "%8.0f get_movers/s" % (
+            level, count / threads * threads / lookup_t, 1 / dump_t,
+            1 / movers_t)
+    for level in LEVELS:
+        if replies[level] != replies[LEVELS[0]]:
+            print "replies differ at copy level %s" % (level,)
+            sys.exit(1)
+
+
+if __name__ == "__main__":   # pragma: no cover
+    main()
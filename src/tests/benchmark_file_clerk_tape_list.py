@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+"""
+Benchmark of file_clerk tape_list on a volume with packaged files.
+Creates minimal volume and file tables in a scratch PostgreSQL database,
+fills one volume with packages of small files and compares
+FileClerkInfoMethods.__tape_list (one streamed query joining package
+members) against the former query per package.
+Both must return the same list.
+
+Never run against a production database: the tables are dropped
+and re-created.
+
+usage: benchmark_file_clerk_tape_list.py [members [per_package [host [port [user [database]]]]]]
+"""
+import sys
+import time
+import new
+
+import edb
+import file_clerk
+
+LABEL = 'BENCH0L8'
+DATABASE = 'tape_list_bench'
+
+SCHEMA = """
+DROP TABLE IF EXISTS file;
+DROP TABLE IF EXISTS volume;
+CREATE TABLE volume (id serial PRIMARY KEY, label varchar UNIQUE);
+CREATE TABLE file (bfid varchar PRIMARY KEY,
+                   crc bigint DEFAULT -1,
+                   deleted char(1) DEFAULT 'n',
+                   drive varchar,
+                   volume integer REFERENCES volume(id),
+                   location_cookie varchar,
+                   pnfs_path varchar,
+                   pnfs_id varchar,
+                   sanity_size bigint DEFAULT -1,
+                   sanity_crc bigint DEFAULT -1,
+                   size bigint,
+                   uid integer DEFAULT -1,
+                   gid integer DEFAULT -1,
+                   update timestamp DEFAULT now(),
+                   package_id varchar,
+                   package_files_count integer DEFAULT 0,
+                   active_package_files_count integer DEFAULT 0,
+                   cache_status varchar,
+                   archive_status varchar,
+                   cache_mod_time timestamp,
+                   archive_mod_time timestamp,
+                   cache_location varchar,
+                   original_library varchar,
+                   file_family_width integer,
+                   tape_label varchar);
+CREATE INDEX file_volume_idx ON file(volume);
+CREATE INDEX file_package_id_idx ON file(package_id);
+"""
+
+
+def populate(filedb, members, per_package):
+    filedb.update(SCHEMA)
+    filedb.update("INSERT INTO volume (label) VALUES (%s)", (LABEL,))
+    vid = filedb.query_getresult("SELECT id FROM volume WHERE label=%s", (LABEL,))[0][0]
+    packages = (members + per_package - 1) / per_package
+    n = 0
+    for p in xrange(packages):
+        package = 'BENCHP%010d' % (p,)
+        filedb.update("""INSERT INTO file (bfid, volume, location_cookie,
+                         pnfs_path, pnfs_id, size, package_id, drive,
+                         cache_status, archive_status)
+                         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'PURGED', 'ARCHIVED')""",
+                      (package, vid, '0000_000000000_%07d' % (p + 1,),
+                       '/pnfs/fs/usr/bench/package-%s.tar' % (p,),
+                       'P%023d' % (p,), per_package * 1024, package,
+                       'bench:/dev/null'))
+        rows = []
+        for m in xrange(min(per_package, members - n)):
+            bfid = 'BENCHM%010d' % (n,)
+            rows.append("('%s', NULL, '/pnfs/fs/usr/bench/f%s', 'M%023d', 1024, '%s', 'PURGED', 'ARCHIVED')" %
+                        (bfid, n, n, package))
+            n = n + 1
+        filedb.update("""INSERT INTO file (bfid, volume, pnfs_path, pnfs_id,
+                         size, package_id, cache_status, archive_status)
+                         VALUES %s""" % (",".join(rows),))
+    filedb.update("ANALYZE")
+    return packages
+
+
+def old_tape_list(filedb, external_label, export_format=False):
+    # query per package file, as file_clerk used to do
+    q = """
+        SELECT f.bfid,
+            f.crc,
+            f.deleted,
+            f.drive,
+            v.label,
+            f.location_cookie,
+            f.pnfs_path,
+            f.pnfs_id,
+            f.sanity_size,
+            f.sanity_crc,
+            f.size,
+            f.package_id,
+            f.archive_status,
+            f.cache_status
+        FROM file f,
+            volume v
+        WHERE f.volume = v.id
+            AND v.label=%s
+        ORDER BY f.location_cookie
+        """
+    file_list = []
+    for file_info in filedb.query_dictresult(q, (external_label,)):
+        if export_format:
+            value = filedb.export_format(file_info)
+        else:
+            value = file_info
+        if not value.has_key('pnfs_name0'):
+            value['pnfs_name0'] = "unknown"
+        file_list.append(value)
+        if file_info.get("bfid", None) == file_info.get("package_id", None):
+            result = filedb.query_dictresult("""
+                SELECT f.bfid,
+                    f.crc,
+                    f.deleted,
+                    f.drive,
+                    f.location_cookie,
+                    f.pnfs_path,
+                    f.pnfs_id,
+                    f.sanity_size,
+                    f.sanity_crc,
+                    f.size,
+                    f.package_id,
+                    f.archive_status,
+                    f.cache_status
+                FROM file f
+                WHERE f.package_id=%s
+                    AND f.bfid<>%s
+                """, (file_info.get("bfid"), file_info.get("bfid")))
+            for finfo in result:
+                finfo["location_cookie"] = file_info.get("location_cookie", None)
+                finfo["label"] = file_info.get("label", None)
+                if export_format:
+                    value = filedb.export_format(finfo)
+                else:
+                    value = finfo
+                if not value.has_key('pnfs_name0'):
+                    value['pnfs_name0'] = "unknown"
+                file_list.append(value)
+    return file_list
+
+
+def by_bfid(file_list):
+    # members of a package are not ordered by either query
+    return sorted(file_list, key=lambda f: f['bfid'])
+
+
+def main():
+    members = 100000
+    per_package = 100
+    host = 'localhost'
+    port = 5432
+    user = 'enstore'
+    database = DATABASE
+    args = sys.argv[1:]
+    if len(args) > 0:
+        members = int(args[0])
+    if len(args) > 1:
+        per_package = int(args[1])
+    if len(args) > 2:
+        host = args[2]
+    if len(args) > 3:
+        port = int(args[3])
+    if len(args) > 4:
+        user = args[4]
+    if len(args) > 5:
+        database = args[5]
+    if database == 'enstoredb':
+        print "refusing to run against %s, use a scratch database" % (database,)
+        sys.exit(1)
+
+    filedb = edb.FileDB(host=host, port=port, user=user, database=database,
+                        auto_journal=0)
+    t0 = time.time()
+    packages = populate(filedb, members, per_package)
+    print "%s members in %s packages on %s, populated in %.1f s" % (
+        members, packages, LABEL, time.time() - t0)
+
+    clerk = new.instance(file_clerk.FileClerkInfoMethods, {'filedb_dict': filedb})
+    tape_list = clerk._FileClerkInfoMethods__tape_list
+    for export_format in (False, True):
+        t0 = time.time()
+        old = old_tape_list(filedb, LABEL, export_format)
+        old_t = time.time() - t0
+        t0 = time.time()
+        res = tape_list(LABEL, export_format=export_format)
+        new_t = time.time() - t0
+        if by_bfid(old) != by_bfid(res):
+            print "export_format=%s: lists differ" % (export_format,)
+            sys.exit(1)
+        print "export_format=%-5s %7s files  per package %8.2f s  joined %8.2f s" % (
+            export_format, len(res), old_t, new_t)
+    filedb.close()
+
+
+if __name__ == "__main__":   # pragma: no cover
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark of histogram filling.
+Fills a Histogram1D and a Histogram2D with the same entries one by one with
+fill() and at once with fill_many(), checks that the results agree and
+reports entries/sec.  fill_many() uses numpy if it can be imported.
+
+usage: benchmark_histogram_fill.py [entries]
+"""
+import random
+import sys
+import time
+
+import histogram
+
+
+def check(h, other):
+    assert h.binarray == other.binarray, "bins differ"
+    assert (h.entries, h.underflow, h.overflow) == \
+        (other.entries, other.underflow, other.overflow), "counts differ"
+    assert abs(h.mean - other.mean) <= 1e-9 * max(abs(h.mean), 1.), \
+        "means differ %s %s" % (h.mean, other.mean)
+
+
+def main():
+    count = 1000000
+    if len(sys.argv) > 1:
+        count = int(sys.argv[1])
+    random.seed(17)
+    xs = [random.gauss(50., 20.) for i in xrange(count)]
+    ys = [random.uniform(-10., 110.) for i in xrange(count)]
+    print "numpy: %s" % (histogram.has_numpy,)
+
+    h1 = histogram.Histogram1D("h1", "h1", 100, 0., 100.)
+    t0 = time.time()
+    for x in xs:
+        h1.fill(x)
+    t = time.time() - t0
+    print "%-10s %-10s %10.0f entries/sec" % ("1D", "fill", count / t)
+    h2 = histogram.Histogram1D("h1", "h1", 100, 0., 100.)
+    t0 = time.time()
+    h2.fill_many(xs)
+    t = time.time() - t0
+    print "%-10s %-10s %10.0f entries/sec" % ("1D", "fill_many", count / t)
+    check(h1, h2)
+
+    h1 = histogram.Histogram2D("h2", "h2", 50, 0., 100., 50, 0., 100.)
+    t0 = time.time()
+    for x, y in zip(xs, ys):
+        h1.fill(x, y)
+    t = time.time() - t0
+    print "%-10s %-10s %10.0f entries/sec" % ("2D", "fill", count / t)
+    h2 = histogram.Histogram2D("h2", "h2", 50, 0., 100., 50, 0., 100.)
+    t0 = time.time()
+    h2.fill_many(xs, ys)
+    t = time.time() - t0
+    print "%-10s %-10s %10.0f entries/sec" % ("2D", "fill_many", count / t)
+    check(h1, h2)
+
+
+if __name__ == "__main__":   # pragma: no cover
+    main()
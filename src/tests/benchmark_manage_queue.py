@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Benchmark of manage_queue sorted list engines: mpq.MPQ and skiplist.SkipList.
+Fills by priority and by value lists with synthetic read and write requests
+and measures put / get / find / delete throughput.
+
+usage: benchmark_manage_queue.py [entries [operations]]
+"""
+import sys
+import time
+import random
+
+import mpq
+import skiplist
+import manage_queue
+
+
+def mk_ticket(i):
+    ticket = {'unique_id': 'host-%s-%s' % (i, time.time()),
+              'encp': {'basepri': random.randrange(1, 1000), 'adminpri': -1},
+              'times': {'t0': time.time()},
+              'fc': {'external_label': 'VOL%03d' % (i % 500,),
+                     'location_cookie': '0000_000000000_%07d' % (random.randrange(10000),)},
+              'vc': {'storage_group': 'sg%s' % (i % 20,),
+                     'file_family': 'ff%s' % (i % 200,),
+                     'wrapper': 'cpio_odc',
+                     'volume_family': 'sg%s.ff%s.cpio_odc' % (i % 20, i % 200)},
+              'wrapper': {'size_bytes': random.randrange(1, 1 << 32),
+                          'pnfsFilename': '/pnfs/fs/usr/test/f%s' % (i,)},
+              }
+    if i % 2:
+        ticket['work'] = 'write_to_hsm'
+        value = ticket['wrapper']['size_bytes']
+    else:
+        ticket['work'] = 'read_from_hsm'
+        value = ticket['fc']['location_cookie']
+    return manage_queue.Request(ticket['encp']['basepri'], value, ticket,
+                                ticket['times']['t0'])
+
+
+def make_engines(name):
+    if name == 'mpq':
+        return (mpq.MPQ(manage_queue.compare_priority, manage_queue.request_id),
+                mpq.MPQ(manage_queue.compare_value, manage_queue.request_id))
+    return (skiplist.SkipList(manage_queue.priority_key, manage_queue.request_id),
+            skiplist.SkipList(manage_queue.value_key, manage_queue.request_id))
+
+
+def rate(count, t):
+    if t <= 0:
+        return float('inf')
+    return count / t
+
+
+def run(name, requests, operations):
+    by_priority, opt = make_engines(name)
+    t0 = time.time()
+    for rq in requests:
+        by_priority.insort(rq)
+        opt.insort(rq)
+    put_t = time.time() - t0
+
+    samples = random.sample(requests, operations)
+    t0 = time.time()
+    for rq in samples:
+        # what SortedList.get does for a given priority / location
+        probe = manage_queue.Request(rq.pri, rq.value, {})
+        by_priority[by_priority.bisect(probe)]
+        opt[opt.bisect(probe)]
+    get_t = time.time() - t0
+
+    t0 = time.time()
+    for rq in samples:
+        by_priority.lookup(rq.unique_id)
+    find_t = time.time() - t0
+
+    t0 = time.time()
+    for rq in samples:
+        # what SortedList.rm does
+        if rq in by_priority:
+            by_priority.remove(rq)
+        if rq in opt:
+            opt.remove(rq)
+    delete_t = time.time() - t0
+
+    print "%-10s put %10.0f/s get %10.0f/s find %10.0f/s delete %10.0f/s" % (
+        name, rate(len(requests), put_t), rate(operations, get_t),
+        rate(operations, find_t), rate(operations, delete_t))
+
+
+def main():
+    entries = 100000
+    operations = 100
+    if len(sys.argv) > 1:
+        entries = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        operations = int(sys.argv[2])
+    operations = min(operations, entries)
+    random.seed(0)
+    requests = [mk_ticket(i) for i in xrange(entries)]
+    print "%s requests, %s get/find/delete operations" % (entries, operations)
+    for name in ('mpq', 'skiplist'):
+        run(name, requests, operations)
+
+
+if __name__ == "__main__":   # pragma: no cover
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Scaling benchmark of manage_queue.Request_Queue.put.
+Fills the queue with write requests for a growing number of
+volume families and measures latency of further puts,
+each of which replaces the tag of its volume family and so
+triggers priority aging (Atomic_Request_Queue.update).
+
+usage: benchmark_manage_queue_aging.py [puts]
+"""
+import sys
+import time
+
+import manage_queue
+
+FAMILIES = (100, 1000, 5000, 10000, 20000)
+
+UID = 0
+
+
+def mk_ticket(family, pri):
+    global UID
+    UID = UID + 1
+    return {'unique_id': 'host-%s' % (UID,),
+            'work': 'write_to_hsm',
+            'encp': {'basepri': pri, 'adminpri': -1},
+            'times': {'t0': time.time()},
+            'fc': {},
+            'vc': {'storage_group': 'sg%s' % (family % 20,),
+                   'file_family': 'ff%s' % (family,),
+                   'wrapper': 'cpio_odc'},
+            'wrapper': {'size_bytes': 1024 * UID,
+                        'pnfsFilename': '/pnfs/fs/usr/test/f%s' % (UID,)},
+            }
+
+
+def run(families, puts):
+    q = manage_queue.Request_Queue()
+    for family in xrange(families):
+        q.put(mk_ticket(family, 1))
+    t0 = time.time()
+    for i in xrange(puts):
+        # higher priority than anything in the family
+        q.put(mk_ticket(i % families, 2 + i))
+    t = time.time() - t0
+    print "%6s volume families: %8.1f us/put" % (families, t / puts * 1e6)
+
+
+def main():
+    puts = 2000
+    if len(sys.argv) > 1:
+        puts = int(sys.argv[1])
+    for families in FAMILIES:
+        run(families, puts)
+
+
+if __name__ == "__main__":   # pragma: no cover
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Throughput benchmark of mover.Buffer with null_driver on both sides.
+Tape to network (read_from_hsm): Buffer.block_read from /dev/zero,
+Buffer.stream_write to /dev/null.
+Network to tape (write_to_hsm): Buffer.stream_read from /dev/zero,
+Buffer.block_write to /dev/null.
+Tape to network is also run with CRC calculated on tape reads,
+inline and in the CRC stage (crc_pipeline).
+Blocks are one byte short of blocksize on reads from "tape"
+if "partial" is specified, as happens with the last block of a file.
+
+usage: benchmark_mover_buffer.py [megabytes [blocksize [partial]]]
+"""
+import sys
+import time
+
+import mover
+import null_driver
+import null_wrapper
+
+MB = 1024 * 1024
+BUFFERED_BLOCKS = 8
+
+
+def mk_buffer(blocksize, client_crc_on, crc_pipeline=0):
+    buf = mover.Buffer(blocksize, max_bytes=BUFFERED_BLOCKS * blocksize,
+                       crc_pipeline=crc_pipeline)
+    buf.reset(None, client_crc_on)
+    buf.set_wrapper(null_wrapper)
+    buf.header_size = 0
+    buf.trailer_pnt = sys.maxint
+    return buf
+
+
+def report(name, nbytes, t, stats):
+    print "%-14s %8.1f MB/s  %s" % (name, nbytes / t / MB,
+                                    ' '.join(['%.3f' % (s,) for s in stats]))
+
+
+def tape_to_network(name, total, blocksize, partial, client_crc_on=0, crc_pipeline=0):
+    reader = null_driver.NullDriver()
+    reader.open(mode=0)
+    writer = null_driver.NullDriver()
+    writer.open(mode=1)
+    buf = mk_buffer(blocksize, client_crc_on, crc_pipeline)
+    nbytes = blocksize - partial
+    done = 0L
+    t0 = time.time()
+    while done < total:
+        while not buf.full() and done + buf.nbytes() < total:
+            buf.block_read(nbytes, reader)
+        while not buf.empty():
+            done = done + buf.stream_write(blocksize, writer)
+    buf.crc_flush()
+    t = time.time() - t0
+    reader.close()
+    writer.close()
+    buf.clear()
+    report(name, done, t, buf.read_stats)
+
+
+def network_to_tape(total, blocksize):
+    reader = null_driver.NullDriver()
+    reader.open(mode=0)
+    writer = null_driver.NullDriver()
+    writer.open(mode=1)
+    buf = mk_buffer(blocksize, 1)
+    done = 0L
+    t0 = time.time()
+    while done < total:
+        while not buf.full() and done + buf.nbytes() < total:
+            buf.stream_read(blocksize, reader)
+        while not buf.low():
+            done = done + buf.block_write(blocksize, writer)
+    t = time.time() - t0
+    reader.close()
+    writer.close()
+    report("network->tape", done, t, buf.write_stats)
+
+
+def main():
+    megabytes = 4096
+    blocksize = MB
+    partial = 0
+    if len(sys.argv) > 1:
+        megabytes = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        blocksize = int(sys.argv[2])
+    if len(sys.argv) > 3 and sys.argv[3] == 'partial':
+        partial = 1
+    total = long(megabytes) * MB
+    print "%s MB, block size %s, read / write stats: getspace|pull read|write crc push|freespace total [crc_stage_wait crc_stage]" % (
+        megabytes, blocksize)
+    tape_to_network("tape->network", total, blocksize, partial)
+    tape_to_network("  crc inline", total, blocksize, partial, client_crc_on=1)
+    tape_to_network("  crc stage", total, blocksize, partial, client_crc_on=1, crc_pipeline=1)
+    network_to_tape(total, blocksize)
+
+
+if __name__ == "__main__":   # pragma: no cover
+    main()
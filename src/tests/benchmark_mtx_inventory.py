@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Benchmark of volume and drive lookups of MTXN_MediaLoader.
+Parses a simulated mtx status output of a large library and looks up
+volumes and drives, once the old way, scanning multiprocessing.Manager()
+lists element by element, and once through LibraryInventory shared by
+InventoryManager.  Both must find the same elements.
+
+usage: benchmark_mtx_inventory.py [slots [drives [lookups]]]
+"""
+import random
+import sys
+import time
+
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import multiprocessing
+import media_changer
+from media_changer import EMPTY
+
+
+def mtx_status(n_slots, n_drives):
+    lines = ['Storage Changer /dev/changer:%s Drives, %s Slots ( 0 Import/Export )' %
+             (n_drives, n_slots)]
+    for i in xrange(n_drives):
+        lines.append('Data Transfer Element %s Phys Loc F1,C%s,R%s,Z0 SN  %010d ID ULT3580-TD8 :Empty' %
+                     (i, i / 16, i % 16, i))
+    for i in xrange(n_slots):
+        if i % 10 == 9:
+            lines.append('Storage Element %s Phys Loc F2,C%s,R%s,T00  :Empty :VolumeTag=' %
+                         (1000 + i, i / 100, i % 100))
+        else:
+            lines.append('Storage Element %s Phys Loc F2,C%s,R%s,T00  :Full  :VolumeTag=VQ%04dL8' %
+                         (1000 + i, i / 100, i % 100, i))
+    lines.append('')
+    return lines
+
+
+# the lookups as MTXN_MediaLoader did them on manager lists
+def list_locate_volume(slots, drives, vol):
+    idx_drive = -1
+    for d in drives:
+        if vol == d['volume']:
+            idx_drive = drives.index(d)
+            break
+    idx_slot = -1
+    for s in slots:
+        if vol == s['volume']:
+            idx_slot = slots.index(s)
+            break
+    return idx_slot, idx_drive
+
+
+def list_locate_drive(drives, address):
+    for d in drives:
+        if address == d['address']:
+            return drives.index(d)
+    return -1
+
+
+def main():
+    n_slots = 20000
+    n_drives = 64
+    lookups = 20
+    args = sys.argv[1:]
+    if len(args) > 0:
+        n_slots = int(args[0])
+    if len(args) > 1:
+        n_drives = int(args[1])
+    if len(args) > 2:
+        lookups = int(args[2])
+    random.seed(21)
+    slots, drives = media_changer.parse_mtx_status(mtx_status(n_slots, n_drives))
+    volumes = [s['volume'] for s in random.sample([s for s in slots if s['volume'] != EMPTY], lookups)]
+    addresses = [d['address'] for d in random.sample(drives, min(lookups, n_drives))]
+
+    manager = multiprocessing.Manager()
+    list_slots = manager.list(slots)
+    list_drives = manager.list(drives)
+    t0 = time.time()
+    old = [list_locate_volume(list_slots, list_drives, v) for v in volumes]
+    old += [list_locate_drive(list_drives, a) for a in addresses]
+    old_t = time.time() - t0
+    manager.shutdown()
+
+    manager = media_changer.InventoryManager()
+    manager.start()
+    inventory = manager.LibraryInventory()
+    t0 = time.time()
+    inventory.reset(slots, drives)
+    reset_t = time.time() - t0
+    t0 = time.time()
+    new = [inventory.locate_volume(v) for v in volumes]
+    new += [inventory.locate_drive(a) for a in addresses]
+    new_t = time.time() - t0
+    free_t = time.time()
+    inventory.locate_volume(EMPTY)
+    free_t = time.time() - free_t
+    manager.shutdown()
+    if old != new:
+        print "lookups differ"
+        sys.exit(1)
+
+    n = len(new)
+    print "%s slots %s drives %s lookups" % (n_slots, n_drives, n)
+    print "manager lists  %10.6f s/lookup" % (old_t / n,)
+    print "inventory      %10.6f s/lookup  (reset %.3f s, free slot %.6f s)" % (
+        new_t / n, reset_t, free_t)
+
+
+if __name__ == "__main__":   # pragma: no cover
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Benchmark of lazy trace message formatting.
+Runs the test_manage_queue unit tests with trace levels disabled, first
+with Trace.tracef (format only if enabled) and then with a tracef that
+formats the message up front, as Trace.trace(lvl, fmt % args) did.
+
+usage: benchmark_trace_lazy.py [rounds]
+"""
+import sys
+import time
+import unittest
+import StringIO
+
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import Trace
+import test_manage_queue
+
+
+def eager_tracef(severity, message, *args, **kwargs):
+    Trace.trace(severity, Trace.lazy_message(message, args), **kwargs)
+
+
+def run(rounds):
+    suite = unittest.defaultTestLoader.loadTestsFromModule(test_manage_queue)
+    out = StringIO.StringIO()
+    t0 = time.time()
+    for i in xrange(rounds):
+        result = unittest.TextTestRunner(stream=out, verbosity=0).run(suite)
+        if not result.wasSuccessful():
+            sys.exit(out.getvalue())
+    return time.time() - t0
+
+
+def main(rounds=20):
+    Trace.print_levels = {}
+    Trace.log_levels = {}
+    Trace.alarm_levels = {}
+    lazy_tracef = Trace.tracef
+    lazy = run(rounds)
+    Trace.tracef = eager_tracef
+    try:
+        eager = run(rounds)
+    finally:
+        Trace.tracef = lazy_tracef
+    print "rounds %s" % (rounds,)
+    print "eager formatting %.3f s" % (eager,)
+    print "lazy formatting  %.3f s (%.1f%% faster)" % (
+        lazy, 100. * (eager - lazy) / eager)
+
+
+if __name__ == "__main__":   # pragma: no cover
+    main(*[int(a) for a in sys.argv[1:2]])
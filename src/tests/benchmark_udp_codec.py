@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark of udp_common message codecs.
+Round-trips encp and mover tickets the way UDPClient and UDPServer do:
+client encodes (id, number, ticket) with CRC, server decodes and checks it,
+server encodes the reply and client decodes it.
+Reports messages/sec for the repr and binary codecs.
+
+usage: benchmark_udp_codec.py [messages]
+"""
+import sys
+import time
+
+import checksum
+import udp_common
+
+CLIENT_ID = '131.225.13.187-42240-1240336133.248870-25246-134719808'
+
+MOVER_IDLE = {'work': 'mover_idle',
+              'mover': 'LTO8_21.mover',
+              'address': ('131.225.191.22', 7055),
+              'state': 'IDLE',
+              'status': ('ok', None),
+              'volume_family': None,
+              'volume_status': (('none', 'none'), ('none', 'none')),
+              'operation': '',
+              'error_source': None,
+              'returned_work': None,
+              'external_label': None,
+              'current_location': 0L,
+              'current_volume': None,
+              'time_in_state': 125.3,
+              'library': 'CD-LTO8F1.library_manager',
+              'mover_type': 'Mover',
+              'unique_id': None,
+              'send_ts': 1660000000.123,
+              }
+
+ENCP_READ = {'work': 'read_from_hsm',
+             'callback_addr': ('131.225.13.187', 38210),
+             'unique_id': '131.225.13.187-1660000000-12345-0',
+             'encp': {'basepri': 1, 'adminpri': -1, 'delpri': 0,
+                      'agetime': 0, 'curpri': 1, 'delayed_dismount': None},
+             'times': {'t0': 1660000000.5, 'in_queue': 0.0,
+                       'job_queued': 0.0, 'lm_dequeued': 0.0},
+             'fc': {'bfid': 'CDMS166000000000000', 'external_label': 'FL1234L8',
+                    'location_cookie': '0000_000000000_0001234',
+                    'size': 2147483648L, 'complete_crc': 3571219485L,
+                    'sanity_cookie': (65536L, 1234567890L),
+                    'pnfsid': '0000A1B2C3D4E5F60718293A4B5C6D7E8F90',
+                    'deleted': 'no', 'drive': 'ULTRIUM-TD8'},
+             'vc': {'volume_family': 'cms.raw.cpio_odc', 'storage_group': 'cms',
+                    'file_family': 'raw', 'wrapper': 'cpio_odc',
+                    'library': 'CD-LTO8F1', 'media_type': 'LTO8',
+                    'system_inhibit': ['none', 'full'],
+                    'user_inhibit': ['none', 'none'],
+                    'remaining_bytes': 1024L, 'blocksize': 131072},
+             'wrapper': {'fullname': '/pnfs/fs/usr/cms/raw/2022/file_1234.root',
+                         'pnfsFilename': '/pnfs/fs/usr/cms/raw/2022/file_1234.root',
+                         'size_bytes': 2147483648L, 'uid': 1234, 'gid': 5678,
+                         'uname': 'cmsprod', 'machine': ('Linux', 'cmsnode1.fnal.gov',
+                                                         '3.10.0', '#1 SMP', 'x86_64')},
+             'infile': '/pnfs/fs/usr/cms/raw/2022/file_1234.root',
+             'outfile': '/data/cms/file_1234.root',
+             'retry': 0, 'resend': {'max_retry': 3, 'retry': 0, 'resubmits': 0},
+             'version': 'v3_11c CVS $Revision$ encp',
+             'send_ts': 1660000000.6,
+             }
+
+
+def round_trip(ticket, codec, number):
+    # client: UDPClient.protocolize
+    body = udp_common.encode((CLIENT_ID, number, ticket), codec)
+    crc = checksum.adler32(0L, body, len(body))
+    message = udp_common.encode((body, crc), codec)
+    # server: UDPServer._get_message and process_request
+    request, in_crc = udp_common.r_eval(message)
+    if checksum.adler32(0L, request, len(request)) != in_crc:
+        raise ValueError("bad CRC")
+    idn, n, t = udp_common.r_eval(request)
+    t['status'] = ('ok', None)
+    t['r_a'] = (('131.225.13.187', 38210), n, idn)
+    # server: UDPServer.reply_with_list
+    reply = udp_common.encode((n, t, time.time()), codec)
+    # client: UDPClient.send
+    return udp_common.r_eval(reply)
+
+
+def main():
+    count = 20000
+    if len(sys.argv) > 1:
+        count = int(sys.argv[1])
+    for name, ticket in (('mover_idle', MOVER_IDLE), ('encp read', ENCP_READ)):
+        for codec in (udp_common.REPR, udp_common.BINARY):
+            t0 = time.time()
+            for i in xrange(count):
+                round_trip(ticket, codec, long(i))
+            t = time.time() - t0
+            print "%-10s %-6s %8.0f messages/sec (%s bytes)" % (
+                name, codec, count / t,
+                len(udp_common.encode((CLIENT_ID, 1L, ticket), codec)))
+
+
+if __name__ == "__main__":   # pragma: no cover
+    main()
@@ -223,6 +223,38 @@ class TestTrace(unittest.TestCase):
                     'spurious' in std_err.getvalue(), "t2:%s" %
                     (std_err.getvalue()))
 
+    def test_tracef(self):
+        ticket = mock.MagicMock()
+        dont_print(55)
+        dont_log(55)
+        dont_alarm(55)
+        self.assertFalse(enabled(55))
+        with mock.patch('Trace.trace') as _trace:
+            tracef(55, 'not formatted: %s', ticket)
+            self.assertFalse(_trace.called)
+            self.assertFalse(ticket.__str__.called)
+            do_print(55)
+            self.assertTrue(enabled(55))
+            tracef(55, 'formatted: %s %s', 1, 2)
+            _trace.assert_called_with(55, 'formatted: 1 2')
+            tracef(55, lambda x: 'called: %s' % (x,), 3)
+            _trace.assert_called_with(55, 'called: 3')
+            tracef(55, 'no args %s')
+            _trace.assert_called_with(55, 'no args %s')
+        dont_print(55)
+
+    def test_logf(self):
+        set_log_func(None)
+        dont_print(e_errors.INFO)
+        with mock.patch('Trace.log') as _log:
+            logf(e_errors.INFO, 'not formatted: %s', 1)
+            self.assertFalse(_log.called)
+            logf(e_errors.INFO, 'forced: %s', 1, force_print=1)
+            _log.assert_called_with(e_errors.INFO, 'forced: 1', force_print=1)
+            set_log_func(log_func_0)
+            logf(e_errors.INFO, 'logged: %s', 2)
+            _log.assert_called_with(e_errors.INFO, 'logged: 2')
+
     def test_flush_and_sync(self):
         flush_and_sync(sys.stdout)
 
@@ -0,0 +1,75 @@
+import unittest
+import mock
+import socket
+import threading
+import zlib
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import callback
+import e_errors
+
+
+def adler32(salt, msg, length):
+    return zlib.adler32(msg[:length], salt) & 0xffffffffL
+
+
+class TestStream(unittest.TestCase):
+
+    def setUp(self):
+        self.adler32 = mock.patch('checksum.adler32', side_effect=adler32)
+        self.adler32.start()
+        self.sender, self.receiver = socket.socketpair()
+
+    def tearDown(self):
+        self.adler32.stop()
+        self.sender.close()
+        self.receiver.close()
+
+    def send(self, records, frame_size):
+        # in a thread, frames do not fit in the socket buffer
+        result = []
+        t = threading.Thread(target=lambda: result.append(
+            callback.write_tcp_obj_stream(self.sender, records, frame_size)))
+        t.start()
+        return t, result
+
+    def test_round_trip(self):
+        records = [{'bfid': 'B%s' % (i,), 'size': i} for i in xrange(2500)]
+        t, count = self.send(iter(records), 1000)
+        got = list(callback.read_tcp_obj_stream(self.receiver))
+        t.join()
+        self.assertEqual(got, records)
+        self.assertEqual(count, [2500])
+
+    def test_frames(self):
+        t, count = self.send(xrange(5), 2)
+        frames = [callback.read_tcp_obj_new(self.receiver) for i in range(4)]
+        t.join()
+        self.assertEqual(frames, [[0, 1], [2, 3], [4], []])
+
+    def test_empty(self):
+        t, count = self.send([], 10)
+        self.assertEqual(list(callback.read_tcp_obj_stream(self.receiver)), [])
+        t.join()
+        self.assertEqual(count, [0])
+
+    def test_read_raw(self):
+        msg = 'x' * 200000
+        t = threading.Thread(target=callback.write_raw,
+                             args=(self.sender, msg))
+        t.start()
+        got, error = callback.read_raw(self.receiver)
+        t.join()
+        self.assertEqual(error, "")
+        self.assertEqual(got, msg)
+
+    def test_short_read(self):
+        self.sender.close()
+        self.assertRaises(e_errors.EnstoreError, list,
+                          callback.read_tcp_obj_stream(self.receiver, 1))
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
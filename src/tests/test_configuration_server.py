@@ -0,0 +1,188 @@
+import new
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import mock
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import configuration_server
+import e_errors
+import hostaddr
+import udp_common
+
+ETC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       '..', '..', 'etc')
+
+CONFIG = """
+configdict = {}
+configdict['test.mover'] = {'host': 'localhost', 'hostip': '127.0.0.1',
+                            'port': 7501,
+                            'library': ['test.library_manager'],
+                            'status': (e_errors.OK, None)}
+configdict['test.library_manager'] = {'host': 'localhost',
+                                      'hostip': '127.0.0.1', 'port': 7502}
+configdict['domains'] = {'valid_domains': ['127.0.0']}
+configdict['crons'] = {'web_node': 'localhost', 'crons_dir': '/tmp/crons'}
+"""
+
+
+class TestConfigurationServer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.tmp_dir, 'config')
+        self.write_config(CONFIG)
+        server = new.instance(configuration_server.ConfigurationServer, {})
+        configuration_server.ConfigurationDict.__init__(server)
+        self.assertEqual(server.load_config(self.config_file),
+                         (e_errors.OK, None))
+        server.server_socket = mock.Mock()
+        server.request_dict = {}
+        server._lock = threading.Lock()
+        server.binary_clients = {}
+        server.max_packet_size = 16384
+        server.cached_domains = {'domains': {'valid_domains': ['127.0.0']}}
+        self.server = server
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_config(self, code, mtime=None):
+        f = open(self.config_file, 'w')
+        f.write(code)
+        f.close()
+        if mtime:
+            os.utime(self.config_file, (mtime, mtime))
+
+    def test_copy_levels(self):
+        server = self.server
+        expected = server.get_dict_entry('test.mover')
+        keys = server.get_config_keys()
+        for level in (0, 1, 2, configuration_server.SNAPSHOT):
+            server.set_copy_level(level)
+            self.assertEqual(server.get_dict_entry('test.mover'), expected)
+            self.assertEqual(sorted(server.get_config_keys()), sorted(keys))
+            self.assertEqual(server.get_server_list()['test.mover'],
+                             ('localhost', '127.0.0.1', 7501))
+            self.assertRaises(KeyError, server.get_dict_entry, 'none')
+        # the snapshot does not share anything with configdict
+        server.configdict['test.mover']['port'] = 1
+        self.assertEqual(server.get_dict_entry('test.mover')['port'], 7501)
+
+    def test_reload(self):
+        server = self.server
+        snapshot = server.get_snapshot()
+        entry = server.get_dict_entry('test.mover')
+        self.write_config(CONFIG.replace('7501', '7601'), time.time() + 10)
+        self.assertEqual(server.load_config(self.config_file),
+                         (e_errors.OK, None))
+        self.assertNotEqual(server.get_snapshot(), snapshot)
+        self.assertEqual(server.get_dict_entry('test.mover')['port'], 7601)
+        # what was handed out before the reload is unchanged
+        self.assertEqual(entry['port'], 7501)
+        self.assertEqual(udp_common.r_eval(snapshot.encoded_dump)
+                         ['test.mover']['port'], 7501)
+
+    def lookup(self, ticket):
+        ticket['r_a'] = (('127.0.0.1', 7000), 1L, 'client-1')
+        self.server.lookup(ticket)
+        self.assertEqual(self.server.server_socket.sendto.call_count, 1)
+        msg, address = self.server.server_socket.sendto.call_args[0]
+        self.server.server_socket.reset_mock()
+        self.assertEqual(address, ('127.0.0.1', 7000))
+        return udp_common.r_eval(msg)
+
+    def test_lookup(self):
+        server = self.server
+        ticket = {'work': 'lookup', 'lookup': 'test.mover', 'new': 1}
+        number, snapshot_reply, t = self.lookup(dict(ticket))
+        self.assertEqual(number, 1L)
+        self.assertEqual(snapshot_reply['test.mover'],
+                         server.get_dict_entry('test.mover'))
+        self.assertEqual(snapshot_reply['status'], (e_errors.OK, None))
+        # a retry is answered with the same reply
+        self.assertEqual(server.request_dict['client-1'][1]['test.mover'],
+                         snapshot_reply['test.mover'])
+        server.set_copy_level(1)
+        reply = self.lookup(dict(ticket))[1]
+        self.assertEqual(reply, snapshot_reply)
+        server.set_copy_level(configuration_server.SNAPSHOT)
+        ticket['lookup'] = 'none'
+        reply = self.lookup(dict(ticket))[1]
+        self.assertEqual(reply['status'][0], e_errors.KEYERROR)
+
+    def test_dump(self):
+        server = self.server
+        ticket = {'work': 'dump', 'r_a': (('::1', 7000), 1L, 'client-1')}
+        reply, encoded = server._ConfigurationServer__make_dump(ticket)
+        self.assertEqual(udp_common.r_eval(
+            udp_common.r_repr_with(reply, encoded)), reply)
+        self.assertEqual(reply['dump'], server.configdict)
+        server.set_copy_level(2)
+        self.assertEqual(server._ConfigurationServer__make_dump(ticket),
+                         (reply, {}))
+
+
+class TestRoleIndexes(unittest.TestCase):
+
+    def sample_configs(self):
+        for name in sorted(os.listdir(ETC_DIR)):
+            path = os.path.join(ETC_DIR, name)
+            if not os.path.isfile(path):
+                continue
+            code = open(path).read()
+            if 'configdict' not in code:
+                continue
+            try:
+                compile(code, path, 'exec')
+            except SyntaxError:
+                continue  # a template
+            yield path
+
+    def load(self, path):
+        config = configuration_server.ConfigurationDict()
+        self.assertEqual(config.read_config(path), (e_errors.OK, None))
+        # do not resolve the hosts; conflicts do not matter here
+        with mock.patch.object(hostaddr, 'name_to_address', lambda n: n):
+            config.verify_and_update_config()
+        config.snapshot = configuration_server.ConfigSnapshot(
+            config.configdict, config.serverlist, time.time())
+        return config
+
+    def test_sample_configs(self):
+        paths = list(self.sample_configs())
+        self.assertTrue(len(paths) > 10, paths)
+        for path in paths:
+            config = self.load(path)
+            libraries = ['', None, 'no.library_manager']
+            for item in config.configdict.values():
+                for key in ('library', 'libraries'):
+                    value = item.get(key)
+                    if type(value) == type([]):
+                        libraries.extend(value)
+                    elif value:
+                        libraries.append(value)
+            for library in libraries + [{}]:
+                ticket = {'library': library}
+                config.set_copy_level(1)
+                scanned = config.get_movers_internal(ticket)
+                config.set_copy_level(configuration_server.SNAPSHOT)
+                indexed = config.get_movers_internal(ticket)
+                self.assertEqual(sorted(indexed), sorted(scanned),
+                                 (path, library))
+            self.assertEqual(config.get_movers_internal({}), [])
+            for role in configuration_server.SERVER_ROLES:
+                config.set_copy_level(1)
+                scanned = config.get_servers_internal(role)
+                config.set_copy_level(configuration_server.SNAPSHOT)
+                self.assertEqual(config.get_servers_internal(role), scanned,
+                                 (path, role))
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
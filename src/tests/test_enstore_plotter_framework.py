@@ -0,0 +1,107 @@
+import unittest
+import mock
+import os
+import shutil
+import tempfile
+import threading
+import time
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import enstore_plotter_framework
+import enstore_plotter_module
+
+
+class FakeDB:
+
+    def query(self, q):
+        time.sleep(0.05)
+        return q
+
+
+class SleepModule(enstore_plotter_module.EnstorePlotterModule):
+
+    def __init__(self, name, log, out_dir, dependencies=()):
+        enstore_plotter_module.EnstorePlotterModule.__init__(self, name)
+        self.log = log
+        self.out_dir = out_dir
+        self.dependencies = list(dependencies)
+
+    def book(self, frame):
+        pass
+
+    def fill(self, frame):
+        self.log.append(('start', self.name, threading.currentThread()))
+        db = enstore_plotter_framework.TimedDB(FakeDB(), frame,
+                                               frame.current.module_name)
+        db.query("select 1")
+        time.sleep(0.15)
+        self.log.append(('end', self.name))
+
+    def plot(self):
+        time.sleep(0.2)
+        open(os.path.join(self.out_dir, self.name), 'w').close()
+
+
+class TestFramework(unittest.TestCase):
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp()
+        self.log = []
+
+    def tearDown(self):
+        shutil.rmtree(self.out_dir)
+
+    def mk_frame(self, fill_threads, plot_processes, modules):
+        with mock.patch('configuration_client.ConfigurationClient'):
+            frame = enstore_plotter_framework.EnstorePlotterFramework(
+                fill_threads, plot_processes)
+        for name, dependencies in modules:
+            frame.add(SleepModule(name, self.log, self.out_dir, dependencies))
+        return frame
+
+    def test_sequential(self):
+        frame = self.mk_frame(1, 1, [('a', ()), ('b', ())])
+        frame.book()
+        frame.fill()
+        frame.plot()
+        self.assertEqual([entry[:2] for entry in self.log],
+                         [('start', 'a'), ('end', 'a'),
+                          ('start', 'b'), ('end', 'b')])
+        self.assertEqual(sorted(os.listdir(self.out_dir)), ['a', 'b'])
+        self.assertTrue(frame.times['a']['fill'] >= 0.2)
+        self.assertTrue(frame.times['a']['query'] >= 0.05)
+
+    def test_parallel_fill(self):
+        frame = self.mk_frame(4, 1, [('a', ()), ('b', ()), ('c', ('a',)),
+                                     ('d', ('missing',))])
+        t0 = time.time()
+        frame.fill()
+        elapsed = time.time() - t0
+        # c waits for a, the others run together
+        self.assertTrue(elapsed < 0.6, elapsed)
+        order = [entry[:2] for entry in self.log]
+        self.assertTrue(order.index(('end', 'a')) < order.index(('start', 'c')))
+        self.assertTrue(order.index(('start', 'b')) < order.index(('end', 'a')))
+        threads = {}
+        for entry in self.log:
+            if entry[0] == 'start':
+                threads[entry[2]] = 1
+        self.assertTrue(len(threads) > 1)
+        for name in 'abcd':
+            self.assertTrue(frame.times[name]['query'] >= 0.05)
+
+    def test_parallel_plot(self):
+        frame = self.mk_frame(1, 3, [(name, ()) for name in 'abcde'])
+        t0 = time.time()
+        frame.plot()
+        elapsed = time.time() - t0
+        self.assertTrue(elapsed < 0.9, elapsed)
+        self.assertEqual(sorted(os.listdir(self.out_dir)), list('abcde'))
+        for name in 'abcde':
+            self.assertTrue(frame.times[name]['plot'] >= 0.2)
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
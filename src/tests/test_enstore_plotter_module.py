@@ -0,0 +1,145 @@
+import unittest
+import mock
+import os
+import shutil
+import tempfile
+import time
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import enstore_plotter_module
+import bytes_per_day_plotter_module
+
+DAY = 86400
+
+
+def day(seconds):
+    return time.strftime("%Y-%m-%d", time.localtime(seconds))
+
+
+class TestAggregate(unittest.TestCase):
+
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.state_dir, 'sub', 'test.agg')
+
+    def tearDown(self):
+        shutil.rmtree(self.state_dir)
+
+    def test_update_and_reload(self):
+        aggregate = enstore_plotter_module.Aggregate(self.filename)
+        self.assertEqual(aggregate.since(), None)
+        since, mark = aggregate.get_interval()
+        self.assertEqual(since, None)
+        aggregate.update([('2026-10-17', 'w', 10L, 1L),
+                          ('2026-10-17', 'w', 5L, 2L),
+                          ('2026-10-18', 'r', 7L, 1L)], mark)
+        aggregate = enstore_plotter_module.Aggregate(self.filename)
+        self.assertEqual(aggregate.buckets,
+                         {'2026-10-17': {'w': [15L, 3L]},
+                          '2026-10-18': {'r': [7L, 1L]}})
+        # the next run starts at the mark
+        since, next_mark = aggregate.get_interval(time.time() + 60)
+        self.assertEqual(since, mark)
+        self.assertTrue(next_mark > mark)
+        aggregate.update([('2026-10-18', 'r', 1L, 1L)], next_mark)
+        self.assertEqual(aggregate.get(time.mktime((2026, 10, 18, 12, 0, 0,
+                                                    0, 0, -1))),
+                         {'2026-10-18': {'r': [8L, 2L]}})
+
+    def test_keep(self):
+        now = time.time()
+        aggregate = enstore_plotter_module.Aggregate(self.filename,
+                                                     keep=3 * DAY)
+        since = aggregate.since(now)
+        self.assertEqual(day(since), day(now - 3 * DAY))
+        aggregate.update([(day(now - 10 * DAY), 'w', 1L),
+                          (day(now - 2 * DAY), 'w', 2L),
+                          (day(now), 'w', 3L)], now)
+        self.assertEqual(sorted(aggregate.buckets.keys()),
+                         [day(now - 2 * DAY), day(now)])
+
+    def test_invalidate(self):
+        now = time.time()
+        aggregate = enstore_plotter_module.Aggregate(self.filename)
+        aggregate.update([(day(now - 2 * DAY), 'w', 1L),
+                          (day(now), 'w', 3L)], now)
+        aggregate.invalidate(now - DAY)
+        self.assertEqual(aggregate.buckets.keys(), [day(now - 2 * DAY)])
+        self.assertEqual(day(aggregate.since()), day(now - DAY))
+        aggregate.invalidate()
+        self.assertEqual((aggregate.buckets, aggregate.since()), ({}, None))
+
+    def test_broken_state(self):
+        os.makedirs(os.path.dirname(self.filename))
+        f = open(self.filename, 'w')
+        f.write('garbage')
+        f.close()
+        aggregate = enstore_plotter_module.Aggregate(self.filename)
+        self.assertEqual((aggregate.buckets, aggregate.mark), ({}, None))
+
+
+class FakeDB:
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def query(self, q):
+        self.queries.append(q)
+        result = mock.Mock()
+        result.getresult.return_value = self.rows
+        return result
+
+
+class TestBytesPerDay(unittest.TestCase):
+
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp()
+        self.frame = mock.Mock()
+        self.frame.get_aggregates_dir.return_value = self.state_dir
+        self.frame.recompute_aggregates = 0
+        self.module = bytes_per_day_plotter_module.BytesPerDayPlotterModule(
+            'bytes-per-day')
+        self.module.temp_dir = self.state_dir
+
+    def tearDown(self):
+        shutil.rmtree(self.state_dir)
+
+    def test_incremental(self):
+        today = day(time.time())
+        adb = FakeDB([(today, 'mover01', 'w', 100L, 2L),
+                      (today, 'mover02', 'r', 50L, 1L)])
+        aggregate = self.module._update_aggregate(self.frame, adb, 'mover',
+                                                  None)
+        self.assertTrue("date >" not in adb.queries[0])
+        mark = time.strftime(enstore_plotter_module.TIME,
+                             time.localtime(aggregate.mark))
+        # the next run reads only the new rows
+        adb = FakeDB([(today, 'mover01', 'w', 10L, 1L)])
+        aggregate = self.module._update_aggregate(self.frame, adb, 'mover',
+                                                  None)
+        self.assertTrue("and date > '%s'" % (mark,) in adb.queries[0])
+        self.assertEqual(aggregate.buckets[today],
+                         {('mover01', 'w'): [110L, 3L],
+                          ('mover02', 'r'): [50L, 1L]})
+        self.module._fill_aggregate(aggregate.get())
+        self.assertEqual(self.module.total_values['mover01']['w'],
+                         {'sum': 110L, 'average': 110 / 3., 'count': 3L})
+        self.module._fill_aggregate(aggregate.get(), 'enstore')
+        self.assertEqual(self.module.total_values['enstore']['w']['sum'],
+                         110L)
+        pts = open(self.module.pts_files_dict['enstore'].name).read()
+        self.assertEqual(pts.split()[:4], [today, 'enstore', '50', '110'])
+        # asked to recompute: all rows are read again
+        self.frame.recompute_aggregates = 1
+        adb = FakeDB([])
+        aggregate = self.module._update_aggregate(self.frame, adb, 'mover',
+                                                  None)
+        self.assertTrue("date >" not in adb.queries[0])
+        self.assertEqual(aggregate.buckets, {})
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import new
+import socket
+import time
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import event_relay
+
+
+class FakeSocket:
+
+    def __init__(self, bad=()):
+        self.sent = []
+        self.bad = bad
+
+    def sendto(self, msg, addr):
+        if addr in self.bad:
+            raise socket.error(111, 'Connection refused')
+        self.sent.append((msg, addr))
+        return len(msg)
+
+
+def mk_relay(bad=()):
+    # a Relay without the sockets and log client made by __init__
+    relay = new.instance(event_relay.Relay, {})
+    relay.clients = {}
+    relay.timeouts = {}
+    relay.subscribers = {}
+    relay.all_types = {}
+    relay.expirations = []
+    relay.events_in = 0L
+    relay.datagrams_out = 0L
+    relay.drops = 0L
+    relay.do_print = 0
+    relay.alive_msg = 'alive 127.0.0.1 55510 event_relay'
+    relay.send_socket = FakeSocket(bad)
+    return relay
+
+
+class TestRelay(unittest.TestCase):
+
+    def test_filter(self):
+        relay = mk_relay()
+        now = time.time()
+        relay.handle_message('notify 10.0.0.1 7001 encp_xfer alive', now)
+        relay.handle_message('notify 10.0.0.2 7002', now)
+        relay.handle_message('notify 10.0.0.3 7003 newconfigfile', now)
+        relay.handle_message('encp_xfer mover01', now)
+        self.assertEqual(sorted([addr for msg, addr in relay.send_socket.sent]),
+                         [('10.0.0.1', 7001), ('10.0.0.2', 7002)])
+        # subscribing again replaces the filter
+        relay.handle_message('notify 10.0.0.1 7001 newconfigfile', now)
+        self.assertFalse(relay.subscribers.has_key('encp_xfer'))
+        relay.send_socket.sent = []
+        relay.handle_message('newconfigfile', now)
+        self.assertEqual(sorted([addr for msg, addr in relay.send_socket.sent]),
+                         [('10.0.0.1', 7001), ('10.0.0.2', 7002),
+                          ('10.0.0.3', 7003)])
+        relay.handle_message('unsubscribe 10.0.0.2 7002', now)
+        self.assertEqual(relay.all_types, {})
+        self.assertEqual(relay.events_in, 2)
+        self.assertEqual(relay.datagrams_out, 5)
+
+    def test_expire(self):
+        relay = mk_relay()
+        now = time.time()
+        relay.handle_message('notify 10.0.0.1 7001', now)
+        relay.handle_message('notify 10.0.0.2 7002', now)
+        # 10.0.0.2 subscribes again and stays
+        later = now + relay.client_timeout / 2
+        relay.handle_message('notify 10.0.0.2 7002', later)
+        relay.handle_message('encp_xfer mover01',
+                             now + relay.client_timeout + 1)
+        self.assertEqual(relay.clients.keys(), [('10.0.0.2', 7002)])
+        self.assertEqual(relay.send_socket.sent,
+                         [('encp_xfer mover01', ('10.0.0.2', 7002))])
+        relay.send_message('alive', 'alive',
+                           later + relay.client_timeout + 1)
+        self.assertEqual(relay.clients, {})
+        self.assertEqual(relay.expirations, [])
+
+    def test_drops(self):
+        bad = ('10.0.0.9', 7009)
+        relay = mk_relay([bad])
+        now = time.time()
+        relay.handle_message('notify 10.0.0.1 7001', now)
+        relay.handle_message('notify 10.0.0.9 7009', now)
+        for i in range(event_relay.MAX_TIMEOUTS + 1):
+            relay.handle_message('encp_xfer mover01', now)
+        self.assertEqual(relay.drops, event_relay.MAX_TIMEOUTS + 1)
+        self.assertFalse(relay.clients.has_key(bad))
+        relay.handle_message('heartbeat', now)
+        msg, addr = relay.send_socket.sent[-1]
+        self.assertEqual(msg, 'alive 127.0.0.1 55510 event_relay '
+                         'events_in=21 datagrams_out=21 drops=21')
+
+    def test_recv_messages(self):
+        relay = mk_relay()
+        relay.listen_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        relay.listen_socket.bind(('127.0.0.1', 0))
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            for i in range(5):
+                sender.sendto('encp_xfer %s' % (i,),
+                              relay.listen_socket.getsockname())
+            time.sleep(0.1)
+            self.assertEqual(relay.recv_messages(),
+                             ['encp_xfer %s' % (i,) for i in range(5)])
+            self.assertEqual(relay.recv_messages(), [])
+        finally:
+            sender.close()
+            relay.listen_socket.close()
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
@@ -4,6 +4,7 @@ unit tests for enstore/src/generic_client.py
 Author Dennis Box, dbox@fnal.gov
 """
 import unittest
+import new
 import generic_client
 import sys
 import errno
@@ -23,6 +24,9 @@ import callback
 import hostaddr
 import mock
 import StringIO
+import threading
+import zlib
+import dispatching_worker
 # import fixtures.config.conf
 
 class TestClientError(unittest.TestCase):
@@ -261,5 +265,96 @@ class TestGenericClient(unittest.TestCase):
         expected = "call({'work': 'quit'}, None, 0, 0)"
         self.assertEqual(str(self._mocker.call_args), expected, "test_quit error")
 
+class TestLongReply(unittest.TestCase):
+    def setUp(self):
+        self.adler32 = mock.patch('checksum.adler32',
+                                  side_effect=lambda salt, msg, n: zlib.adler32(msg[:n], salt) & 0xffffffffL)
+        self.adler32.start()
+        self.server, self.client = socket.socketpair()
+        self.gc = new.instance(generic_client.GenericClient, {})
+        self.gc.u = mock.MagicMock()
+        self.gc.server_address = ('127.0.0.1', 7000)
+        self.gc.server_name = 'test.server'
+
+    def tearDown(self):
+        self.adler32.stop()
+        self.server.close()
+        self.client.close()
+
+    def test_send(self):
+        # the short answer over UDP tells where to read the long one
+        long_answer = {'status': (e_errors.OK, None), 'queue': range(5000)}
+        self.gc.u.send.return_value = {'status': (e_errors.OK, None),
+                                       'long_reply': 1,
+                                       'callback_addr': ('127.0.0.1', 7777)}
+        t = threading.Thread(target=callback.write_tcp_obj_new,
+                             args=(self.server, long_answer))
+        t.start()
+        with mock.patch('callback.connect_to_callback',
+                        return_value=self.client) as connect:
+            rslt = self.gc.send({'work': 'status'})
+        t.join()
+        connect.assert_called_with(('127.0.0.1', 7777))
+        self.assertEqual(rslt, long_answer)
+
+    def test_read_error(self):
+        self.server.close()
+        short = {'status': (e_errors.OK, None), 'long_reply': 1,
+                 'callback_addr': ('127.0.0.1', 7777)}
+        with mock.patch('callback.connect_to_callback',
+                        return_value=self.client):
+            rslt = self.gc.read_long_reply(short)
+        self.assertEqual(rslt['status'][0], e_errors.NET_ERROR)
+
+class TestStreamedReply(unittest.TestCase):
+    def setUp(self):
+        self.adler32 = mock.patch('checksum.adler32',
+                                  side_effect=lambda salt, msg, n: zlib.adler32(msg[:n], salt) & 0xffffffffL)
+        self.adler32.start()
+        self.server, self.client = socket.socketpair()
+
+    def tearDown(self):
+        self.adler32.stop()
+        self.client.close()
+
+    def serve(self, records):
+        # what the server does after send_reply_with_long_answer_part1()
+        send = dispatching_worker.DispatchingWorker.send_reply_with_streamed_answer_part2.im_func
+        t = threading.Thread(target=send,
+                             args=(None, self.server, {'work': 'tape_list3', 'status': (e_errors.OK, None)},
+                                   'tape_list', records))
+        t.start()
+        header = callback.read_tcp_obj_new(self.client)
+        self.assertEqual(header['stream_reply'], 'tape_list')
+        return t, generic_client.StreamedReply(header, 'tape_list', self.client)
+
+    def test_stream(self):
+        records = [{'bfid': 'B%s' % (i,)} for i in xrange(2345)]
+        t, reply = self.serve(iter(records))
+        self.assertEqual(list(reply), records)
+        t.join()
+        self.assertTrue(e_errors.is_ok(reply.ticket))
+        self.assertEqual(reply.ticket['count'], 2345)
+        self.assertEqual(reply.sock, None)
+
+    def test_error(self):
+        def records():
+            yield {'bfid': 'B1'}
+            raise e_errors.EnstoreError(None, 'query failed', e_errors.DATABASE_ERROR)
+        t, reply = self.serve(records())
+        self.assertEqual(list(reply), [{'bfid': 'B1'}])
+        t.join()
+        self.assertEqual(reply.ticket['status'][0], e_errors.DATABASE_ERROR)
+        self.assertEqual(reply.ticket['count'], 1)
+
+    def test_whole_answer(self):
+        # server not streaming
+        self.server.close()
+        reply = generic_client.StreamedReply({'status': (e_errors.OK, None),
+                                              'tape_list': [1, 2]}, 'tape_list')
+        self.assertEqual(list(reply), [1, 2])
+        self.assertFalse(reply.ticket.has_key('tape_list'))
+
+
 if __name__ == "__main__":   # pragma: no cover
     unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import random
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import histogram
+
+
+def fill_each(h, values, weights):
+    for x, w in zip(values, weights):
+        h.fill(x, w)
+
+
+class TestHistogram1D(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(17)
+        # the edges, out of the range and the last bin edge included
+        self.values = [random.gauss(5., 3.) for i in range(2000)] + \
+            [0., 10., -0.1, 10.1]
+        self.weights = [random.uniform(0.5, 2.) for x in self.values]
+
+    def mk(self, profile=False):
+        h = histogram.Histogram1D("h", "h", 20, 0., 10.)
+        h.set_profile(profile)
+        return h
+
+    def assertSame(self, h, other):
+        self.assertEqual(h.binarray, other.binarray)
+        self.assertEqual(h.sumarray, other.sumarray)
+        self.assertEqual((h.entries, h.underflow, h.overflow),
+                         (other.entries, other.underflow, other.overflow))
+        for name in ('mean', 'rms2', 'variance', 'mean_error',
+                     'variance_error', 'maximum', 'minimum'):
+            self.assertAlmostEqual(getattr(h, name), getattr(other, name),
+                                   places=9)
+
+    def test_fill_many(self):
+        h = self.mk()
+        fill_each(h, self.values, [1.] * len(self.values))
+        other = self.mk()
+        other.fill_many(self.values)
+        self.assertSame(h, other)
+        self.assertEqual((other.underflow, other.overflow),
+                         (len([x for x in self.values if x < 0.]),
+                          len([x for x in self.values if x > 10.])))
+
+    def test_fill_many_weights_profile(self):
+        h = self.mk(True)
+        fill_each(h, self.values, self.weights)
+        other = self.mk(True)
+        # in parts, the statistics go on from the entries filled before
+        other.fill_many(self.values[:500], self.weights[:500])
+        other.fill_many(self.values[500:], self.weights[500:])
+        other.fill_many([])
+        for i in range(other.n_bins()):
+            self.assertAlmostEqual(h.binarray[i], other.binarray[i], places=9)
+        h.binarray = other.binarray
+        self.assertSame(h, other)
+
+    def test_merge(self):
+        h = self.mk()
+        fill_each(h, self.values, [1.] * len(self.values))
+        first = self.mk()
+        first.fill_many(self.values[:1000])
+        second = self.mk()
+        second.fill_many(self.values[1000:])
+        first.merge(second)
+        self.assertSame(h, first)
+        self.assertSame(h, h.copy())
+        # merging an empty one changes nothing
+        first.merge(self.mk())
+        self.assertSame(h, first)
+        self.assertRaises(ValueError, first.merge,
+                          histogram.Histogram1D("g", "g", 10, 0., 10.))
+
+
+class TestHistogram2D(unittest.TestCase):
+
+    def mk(self):
+        return histogram.Histogram2D("h", "h", 10, 0., 10., 5, 0., 5.)
+
+    def test_fill_many_and_merge(self):
+        random.seed(17)
+        xs = [random.uniform(-1., 11.) for i in range(1000)]
+        ys = [random.uniform(-1., 6.) for i in range(1000)]
+        h = self.mk()
+        for x, y in zip(xs, ys):
+            h.fill(x, y, 2.)
+        first = self.mk()
+        first.fill_many(xs[:300], ys[:300], [2.] * 300)
+        second = self.mk()
+        second.fill_many(xs[300:], ys[300:], [2.] * 700)
+        first.merge(second)
+        self.assertEqual(h.binarray, first.binarray)
+        self.assertEqual((h.entries, h.underflow, h.overflow,
+                          h.maximum, h.minimum),
+                         (first.entries, first.underflow, first.overflow,
+                          first.maximum, first.minimum))
+        self.assertRaises(ValueError, first.merge,
+                          histogram.Histogram2D("g", "g", 10, 0., 10.,
+                                                5, 0., 6.))
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
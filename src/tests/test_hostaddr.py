@@ -0,0 +1,136 @@
+import unittest
+import mock
+import sys
+import socket
+import threading
+import time
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+# fixtures.mock_imports replaces hostaddr, this tests the real one
+saved_hostaddr = sys.modules.pop('hostaddr', None)
+import hostaddr
+if saved_hostaddr:
+    sys.modules['hostaddr'] = saved_hostaddr
+
+
+class TestAllow(unittest.TestCase):
+
+    def setUp(self):
+        self.saved_domains = hostaddr.known_domains
+        hostaddr.known_domains = {'invalid_domains': {},
+                                  'valid_domains': {}}
+        hostaddr.update_domains({'system_name': 'test',
+                                 'valid_domains': ['131.225', '10.0.0.0/8',
+                                                   '2620:6a:0'],
+                                 'invalid_domains': ['131.225.13']})
+        hostaddr.host_name = 'this.host.fnal.gov'
+        self.saved_localhost = hostaddr.localhost_addresses
+        hostaddr.localhost_addresses = {'127.0.0.1': True}
+        self.gethostbyaddr = mock.patch('socket.gethostbyaddr',
+                                        return_value=('other.host', [], []))
+        self.gethostbyaddr.start()
+
+    def tearDown(self):
+        self.gethostbyaddr.stop()
+        hostaddr.known_domains = self.saved_domains
+        hostaddr.localhost_addresses = self.saved_localhost
+        hostaddr.clear_allow_cache()
+
+    def test_allow(self):
+        self.assertEqual(hostaddr.allow(('131.225.80.1', 7000)), 1)
+        self.assertEqual(hostaddr.allow(('131.225.13.1', 7000)), 0)
+        self.assertEqual(hostaddr.allow(('131.22.1.1', 7000)), None)
+        self.assertEqual(hostaddr.allow(('10.12.13.14', 7000)), 1)
+        self.assertEqual(hostaddr.allow(('::ffff:131.225.80.1', 7000)), 1)
+        self.assertEqual(hostaddr.allow(('2620:6a:0:8421::96', 7000)), 1)
+        self.assertEqual(hostaddr.allow(('2620:6a:1:8421::96', 7000)), None)
+        self.assertEqual(hostaddr.allow(('127.0.0.1', 7000)), 1)
+        self.assertEqual(hostaddr.allow(('131.225.80.x', 7000)), 0)
+
+    def test_allow_cache(self):
+        hostaddr.clear_allow_cache()
+        stats = hostaddr.allow_cache_info()
+        hostaddr.allow(('131.225.80.1', 7000))
+        hostaddr.allow(('131.225.80.1', 7001))
+        info = hostaddr.allow_cache_info()
+        self.assertEqual(info['misses'] - stats['misses'], 1)
+        self.assertEqual(info['hits'] - stats['hits'], 1)
+        self.assertEqual(info['size'], 1)
+        # unchanged configuration keeps the cache
+        hostaddr.update_domains({'system_name': 'test',
+                                 'valid_domains': ['131.225', '10.0.0.0/8',
+                                                   '2620:6a:0'],
+                                 'invalid_domains': ['131.225.13']})
+        self.assertEqual(hostaddr.allow_cache_info()['size'], 1)
+        # new configuration invalidates it
+        hostaddr.update_domains({'system_name': 'test',
+                                 'valid_domains': ['131.225'],
+                                 'invalid_domains': ['131.225.80']})
+        self.assertEqual(hostaddr.allow_cache_info()['size'], 0)
+        self.assertEqual(hostaddr.allow(('131.225.80.1', 7000)), 0)
+
+    def test_lookup_failure_not_cached(self):
+        hostaddr.clear_allow_cache()
+        with mock.patch('socket.gethostbyaddr',
+                        side_effect=socket.herror(1, 'Unknown host')):
+            self.assertEqual(hostaddr.allow(('131.225.80.2', 7000)), 0)
+        self.assertEqual(hostaddr.allow_cache_info()['size'], 0)
+        self.assertEqual(hostaddr.allow(('131.225.80.2', 7000)), 1)
+
+    def test_string_address(self):
+        # a host given as a string is cached by the whole host
+        hostaddr.clear_allow_cache()
+        self.assertEqual(hostaddr.allow('131.225.80.1'), 1)
+        self.assertEqual(hostaddr.allow('131.225.13.1'), 0)
+        self.assertEqual(hostaddr.allow('1.2.3.4'), None)
+        self.assertEqual(hostaddr.allow_cache_info()['size'], 3)
+        self.assertEqual(hostaddr.allow(('131.225.80.1', 7000)), 1)
+        self.assertEqual(hostaddr.allow_cache_info()['size'], 3)
+
+    def test_concurrent_eviction(self):
+        hostaddr.clear_allow_cache()
+        errors = []
+
+        def check(first):
+            try:
+                for i in range(200):
+                    address = '131.225.%s.%s' % (first, i)
+                    if hostaddr.allow((address, 7000)) != 1:
+                        errors.append(address)
+            except Exception, e:
+                errors.append(e)
+        with mock.patch.object(hostaddr, 'ALLOW_CACHE_SIZE', 10):
+            workers = [threading.Thread(target=check, args=(first,))
+                       for first in range(80, 88)]
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+        self.assertEqual(errors, [])
+        self.assertTrue(hostaddr.allow_cache_info()['size'] <= 10)
+
+
+class TestAddressToName(unittest.TestCase):
+
+    def test_ttl(self):
+        hostaddr.known_ips.pop('131.225.80.3', None)
+        with mock.patch('socket.gethostbyaddr',
+                        return_value=('old.host', [], [])) as lookup:
+            self.assertEqual(hostaddr.address_to_name('131.225.80.3'),
+                             'old.host')
+            self.assertEqual(hostaddr.address_to_name('131.225.80.3'),
+                             'old.host')
+            self.assertEqual(lookup.call_count, 1)
+        now = time.time()
+        with mock.patch('socket.gethostbyaddr',
+                        return_value=('new.host', [], [])):
+            with mock.patch('time.time',
+                            return_value=now + hostaddr.NAME_CACHE_TTL + 1):
+                self.assertEqual(hostaddr.address_to_name('131.225.80.3'),
+                                 'new.host')
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import os
+import shutil
+import tempfile
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import log_index
+
+LINES = [
+    "00:00:01 mover01  012345 enstore I LTO8_01.MOVER  write CDMS152345678900000 to VR1234L8 MSG_TYPE=MV_WRITE\n",
+    "00:00:02 encp01   012346 user    I ENCP  encp01.fnal.gov-1760745600-1234-0 CDMS152345678900000\n",
+    "00:05:00 mover02  012347 enstore E LTO8_02.MOVER  read error VR1234L8 MSG_TYPE=MV_READ\n",
+    "00:05:00 last message repeated 3 times\n",
+    "00:15:00 lm01     012348 enstore I LTO8.LIBRARY_MANAGER  work queue 42\n",
+    "01:00:00 mover01  012349 enstore E LTO8_01.MOVER  write CDMS152345678900001 to VR1235L8\n",
+]
+
+
+class TestLogIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.logfile_name = os.path.join(self.log_dir, 'LOG-2026-10-18')
+
+    def tearDown(self):
+        shutil.rmtree(self.log_dir)
+
+    def write(self, lines, name=None):
+        f = open(name or self.logfile_name, 'a')
+        f.write("".join(lines))
+        f.close()
+
+    def log(self, indexer, lines):
+        self.write(lines)
+        for line in lines:
+            indexer.add(line)
+        indexer.flush()
+
+    def test_line_keys(self):
+        keys = log_index.line_keys(LINES[0])
+        self.assertEqual(keys[:3], ['S:I', 'H:mover01', 'N:LTO8_01.MOVER'])
+        self.assertTrue('T:MV_WRITE' in keys)
+        self.assertTrue('W:CDMS152345678900000' in keys)
+        self.assertTrue('W:VR1234L8' in keys)
+        self.assertTrue('W:encp01.fnal.gov-1760745600-1234-0' in
+                        log_index.line_keys(LINES[1]))
+        self.assertEqual(log_index.line_keys(LINES[3]), [])
+        self.assertFalse('W:012345' in keys)
+        self.assertTrue(log_index.is_indexed_word('VR1234L8'))
+        self.assertTrue(log_index.is_indexed_word('CDMS152345678900000'))
+        self.assertFalse(log_index.is_indexed_word('error'))
+        self.assertFalse(log_index.is_indexed_word('VR1234L8 x'))
+
+    def test_search(self):
+        indexer = log_index.LogIndexer(self.logfile_name)
+        self.log(indexer, LINES)
+        indexer.close()
+        matches = log_index.search(self.logfile_name, ['VR1234L8'])
+        self.assertEqual([line for offset, line in matches],
+                         [LINES[0], LINES[2]])
+        offset = len(LINES[0]) + len(LINES[1])
+        self.assertEqual(matches[1][0], offset)
+        matches = log_index.search(self.logfile_name, ['VR1234L8'],
+                                   severity='E')
+        self.assertEqual([line for offset, line in matches], [LINES[2]])
+        matches = log_index.search(self.logfile_name, severity='E',
+                                   start=3600)
+        self.assertEqual([line for offset, line in matches], [LINES[5]])
+        matches = log_index.search(self.logfile_name, severity='E', end=600)
+        self.assertEqual([line for offset, line in matches], [LINES[2]])
+        matches = log_index.search(self.logfile_name, msg_type='MV_READ',
+                                   host='mover02')
+        self.assertEqual([line for offset, line in matches], [LINES[2]])
+        self.assertEqual(log_index.search(self.logfile_name, ['XX9999']), [])
+        self.assertRaises(ValueError, log_index.search, self.logfile_name)
+
+    def test_unindexed_tail(self):
+        indexer = log_index.LogIndexer(self.logfile_name)
+        self.log(indexer, LINES[:3])
+        indexer.close()
+        # written after the index, e.g. the log server died
+        self.write(LINES[3:])
+        matches = log_index.search(self.logfile_name, severity='E')
+        self.assertEqual([line for offset, line in matches],
+                         [LINES[2], LINES[5]])
+
+    def test_catch_up(self):
+        self.write(LINES[:2])
+        indexer = log_index.LogIndexer(self.logfile_name)
+        self.log(indexer, LINES[2:4])
+        indexer.close()
+        self.write(LINES[4:])
+        # reopened by a restarted log server
+        indexer = log_index.LogIndexer(self.logfile_name)
+        indexer.close()
+        self.assertEqual(indexer.offset, os.stat(self.logfile_name).st_size)
+        self.assertEqual(log_index.read_marker(indexer.index_name),
+                         indexer.offset)
+        matches = log_index.search(self.logfile_name, ['CDMS152345678900000'])
+        self.assertEqual([line for offset, line in matches], LINES[:2])
+        matches = log_index.search(self.logfile_name, severity='E')
+        self.assertEqual([line for offset, line in matches],
+                         [LINES[2], LINES[5]])
+
+    def test_unfinished_index_line(self):
+        indexer = log_index.LogIndexer(self.logfile_name)
+        self.log(indexer, LINES[:2])
+        indexer.close()
+        f = open(indexer.index_name, 'a')
+        f.write("0 W:VR12")
+        f.close()
+        self.write(LINES[2:])
+        indexer = log_index.LogIndexer(self.logfile_name)
+        indexer.close()
+        matches = log_index.search(self.logfile_name, ['VR1234L8'])
+        self.assertEqual([line for offset, line in matches],
+                         [LINES[0], LINES[2]])
+
+    def test_rotated_and_rebuild(self):
+        rotated = "%s.1" % (self.logfile_name,)
+        self.write(LINES[:3])
+        self.write(LINES[3:], rotated)
+        for name in (self.logfile_name, rotated):
+            index_name = log_index.build_index(name)
+            self.assertEqual(index_name,
+                             os.path.join(self.log_dir, 'index',
+                                          os.path.basename(name) + '.idx'))
+        # rebuilding replaces the index
+        log_index.build_index(rotated)
+        self.assertEqual(log_index.read_postings(log_index.index_name(rotated),
+                                                 ['S:E'])[0],
+                         [len(LINES[3]) + len(LINES[4])])
+        matches = log_index.search(rotated, ['CDMS152345678900001'])
+        self.assertEqual(matches, [(len(LINES[3]) + len(LINES[4]), LINES[5])])
+        self.assertEqual(os.listdir(self.log_dir).count('index'), 1)
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
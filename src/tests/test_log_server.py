@@ -0,0 +1,127 @@
+import unittest
+import mock
+import new
+import os
+import shutil
+import tempfile
+import threading
+import time
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import log_server
+
+
+def mk_logger(log_dir, flush_bytes=1000, flush_interval=60.):
+    # a Logger without the servers and clients made by __init__
+    logger = new.instance(log_server.Logger, {})
+    logger.logfile_dir_path = log_dir
+    logger.no_debug = 0
+    logger.msg_type_logs = {}
+    logger.msg_type_keys = []
+    logger.extra_logfiles = {}
+    logger.lock = threading.Lock()
+    logger.repeat_count = 0
+    logger.last_message = ''
+    logger.flush_bytes = flush_bytes
+    logger.flush_interval = flush_interval
+    logger.unflushed = 0
+    logger.last_flush = time.time()
+    logger.logfile_size = 0L
+    logger.reply_address = ('131.225.80.1', 7000)
+    return logger
+
+
+def mk_ticket(i):
+    return {'work': 'log_message',
+            'message': '%.6d enstore I MOVER  message number %s' % (i, i)}
+
+
+class TestLogMessage(unittest.TestCase):
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.logfile_name = os.path.join(self.log_dir, 'LOG-2026-10-18')
+        self.logger = mk_logger(self.log_dir)
+        self.logger.open_logfile(self.logfile_name)
+
+    def tearDown(self):
+        self.logger.logfile.close()
+        self.logger.debug_logfile.close()
+        shutil.rmtree(self.log_dir)
+
+    def read(self):
+        f = open(self.logfile_name)
+        data = f.read()
+        f.close()
+        return data
+
+    @mock.patch('hostaddr.address_to_name', return_value='mover01')
+    def test_group_commit(self, address_to_name):
+        self.logger.log_message(mk_ticket(1))
+        # not flushed yet
+        self.assertEqual(self.read(), '')
+        self.assertTrue(self.logger.unflushed > 0)
+        i = 2
+        while self.logger.unflushed:
+            self.logger.log_message(mk_ticket(i))
+            i = i + 1
+        data = self.read()
+        self.assertEqual(len(data.splitlines()), i - 1)
+        self.assertTrue('mover01' in data)
+        self.assertTrue(len(data) >= self.logger.flush_bytes)
+
+    @mock.patch('hostaddr.address_to_name', return_value='mover01')
+    def test_flush_interval(self, address_to_name):
+        self.logger.log_message(mk_ticket(1))
+        self.assertEqual(self.read(), '')
+        self.logger.flush_logfiles()
+        self.assertEqual(len(self.read().splitlines()), 1)
+        self.logger.log_message(mk_ticket(2))
+        self.logger.last_flush = time.time() - self.logger.flush_interval
+        self.logger.log_message(mk_ticket(3))
+        self.assertEqual(len(self.read().splitlines()), 3)
+
+    @mock.patch('hostaddr.address_to_name', return_value='mover01')
+    def test_logfile_size(self, address_to_name):
+        for i in range(100):
+            self.logger.log_message(mk_ticket(i))
+        # same message is counted as repeated
+        self.logger.log_message(mk_ticket(99))
+        self.logger.log_message(mk_ticket(100))
+        self.logger.flush_logfiles()
+        self.assertEqual(self.logger.logfile_size,
+                         os.stat(self.logfile_name).st_size)
+        # the size of an existing file is picked up when it is opened
+        self.logger.logfile.close()
+        self.logger.debug_logfile.close()
+        self.logger.open_logfile(self.logfile_name)
+        self.assertEqual(self.logger.logfile_size,
+                         os.stat(self.logfile_name).st_size)
+
+    @mock.patch('hostaddr.address_to_name', return_value='mover01')
+    def test_query_log(self, address_to_name):
+        self.logger.logfile_name = self.logfile_name
+        for i in range(10):
+            self.logger.log_message(mk_ticket(i))
+        self.logger.log_message(
+            {'work': 'log_message',
+             'message': '000011 enstore E MOVER  mount failed VR1234L8'})
+        # not flushed yet, the query flushes the log file and its index
+        with mock.patch.object(self.logger,
+                               'send_reply_with_long_answer') as reply:
+            self.logger.query_log({'work': 'query_log',
+                                   'words': ['VR1234L8'],
+                                   'period': 'today'})
+        ticket = reply.call_args[0][0]
+        self.assertEqual(ticket['status'][0], 'ok')
+        self.assertEqual(len(ticket['matches']), 1)
+        lfile, offset, line = ticket['matches'][0]
+        self.assertEqual(lfile, self.logfile_name)
+        self.assertTrue(line.endswith('mount failed VR1234L8\n'))
+        self.assertEqual(self.read()[offset:], line)
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
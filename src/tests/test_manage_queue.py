@@ -9,7 +9,7 @@ import mpq  # binary search / put
 import Trace
 import e_errors
 import hostaddr
-from manage_queue import Request, SortedList, Queue, Atomic_Request_Queue, Request_Queue, compare_priority, compare_value
+from manage_queue import Request, SortedList, Queue, Atomic_Request_Queue, Request_Queue, compare_priority, compare_value, AGE_TIME, DELTA_PRI
 
 # utility functions to generate test tickets
 CID = 10
@@ -327,6 +327,33 @@ class TestQueue(unittest.TestCase):
         u1 = self.q.update_priority()
         self.assertNotEqual({}, u1, u1)
 
+    def test_update_priority_incremental(self):
+        self.q.update_priority()
+        # nothing is due before the aging quantum passes
+        u1 = self.q.update_priority()
+        self.assertEqual({}, u1, u1)
+        now = time.time()
+        with mock.patch('time.time', return_value=now + 30):
+            u1 = self.q.update_priority()
+        self.assertEqual({}, u1, u1)
+        # the top requests are re-aged every quantum
+        for quantum in (1, 2, 3):
+            later = now + quantum * self.q.aging_quantum + 1
+            with mock.patch('time.time', return_value=later):
+                u2 = self.q.update_priority()
+                u3 = self.q.update_priority()
+            self.assertEqual(sorted(u2.keys()), sorted(self.q.queue.keys()))
+            self.assertEqual({}, u3, u3)
+        # the aged priority grows by DELTA_PRI every AGE_TIME minutes
+        for req in u2.values():
+            self.assertEqual(req.pri, req.ticket['encp']['basepri'])
+        later = time.time() + AGE_TIME * 60 + 1
+        with mock.patch('time.time', return_value=later):
+            u2 = self.q.update_priority()
+        self.assertNotEqual({}, u2, u2)
+        for req in u2.values():
+            self.assertEqual(req.pri, req.ticket['encp']['basepri'] + DELTA_PRI)
+
 
 class TestAtomic_Request_Queue(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,232 @@
+import new
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import mock
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import media_changer
+from media_changer import EMPTY, BUSY
+
+STATUS = [
+    'Storage Changer /dev/changer:2 Drives, 5 Slots ( 1 Import/Export )',
+    'Data Transfer Element 257 Phys Loc F2,C1,R2,Z0 SN  00078D2B6E ID ULT3580-TD8 :Empty',
+    'Data Transfer Element 270 Phys Loc F2,C4,R4,Z0 SN  00078D2B59 ID ULT3580-TD8 :Full'
+    ' (Storage Element 1038 Loaded):VolumeTag = VQ0006L8',
+    'Storage Element 1025 Phys Loc F08,C02,R01,T00  :Full  :VolumeTag=VQ0033L8',
+    'Storage Element 1026 Phys Loc F08,C02,R02,T00  :Empty :VolumeTag=',
+    'Storage Element 1027 Phys Loc F08,C02,R03,T00  :Empty :VolumeTag=',
+    'Storage Element 1028 Phys Loc F08,C02,R04,T00  :Empty :VolumeTag=',
+    'Storage Element 1029 Phys Loc IMPORT/EXPORT  :Full  :VolumeTag=VQ0040L8',
+    '',
+    'pid_1',
+]
+
+
+class TestParseMtxStatus(unittest.TestCase):
+
+    def test_parse(self):
+        slots, drives = media_changer.parse_mtx_status(STATUS, [2])
+        self.assertEqual(drives,
+                         [{'address': 257, 'location': 'F2,C1,R2',
+                           'zone': 'Z0', 'SN': '00078D2B6E',
+                           'type': 'ULT3580-TD8', 'volume': EMPTY},
+                          {'address': 270, 'location': 'F2,C4,R4',
+                           'zone': 'Z0', 'SN': '00078D2B59',
+                           'type': 'ULT3580-TD8', 'volume': 'VQ0006L8'}])
+        self.assertEqual([(s['address'], s['volume']) for s in slots],
+                         [(1025, 'VQ0033L8'), (1026, EMPTY), (1027, BUSY),
+                          (1028, EMPTY), (1029, 'VQ0040L8')])
+
+
+class TestLibraryInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = media_changer.LibraryInventory()
+        self.inventory.reset(*media_changer.parse_mtx_status(STATUS))
+
+    def test_locate(self):
+        inventory = self.inventory
+        self.assertEqual(inventory.locate_volume('VQ0033L8'), (0, -1))
+        self.assertEqual(inventory.locate_volume('VQ0006L8'), (-1, 1))
+        self.assertEqual(inventory.locate_volume('VQ0040L8'), (4, -1))
+        self.assertEqual(inventory.locate_volume('XX0000L8'), (-1, -1))
+        # EMPTY is looked for in storage slots only
+        self.assertEqual(inventory.locate_volume(EMPTY), (1, -1))
+        self.assertEqual(inventory.locate_volume(EMPTY, [1026, 1027]), (3, -1))
+        self.assertEqual(inventory.locate_volume(EMPTY, [1026, 1027, 1028]),
+                         (-1, -1))
+        self.assertEqual(inventory.locate_drive(270), 1)
+        self.assertEqual(inventory.locate_drive('F2,C1,R2'), 0)
+        self.assertEqual(inventory.locate_drive(300), -1)
+        self.assertEqual(inventory.locate_slot(1029), 4)
+        self.assertEqual(inventory.locate_slot(1), -1)
+        self.assertEqual(inventory.locate_import_export(False), 4)
+        self.assertEqual(inventory.locate_import_export(True), -1)
+
+    def test_update(self):
+        inventory = self.inventory
+        # mount VQ0033L8 into drive 257
+        slot = inventory.slot(0)
+        slot['volume'] = EMPTY
+        inventory.set_slot(0, slot)
+        drive = inventory.drive(0)
+        drive['volume'] = 'VQ0033L8'
+        inventory.set_drive(0, drive)
+        self.assertEqual(inventory.locate_volume('VQ0033L8'), (-1, 0))
+        self.assertEqual(inventory.locate_volume(EMPTY), (0, -1))
+        # reserve a slot for dismount
+        slot = inventory.slot(2)
+        slot['volume'] = BUSY
+        inventory.set_slot(2, slot)
+        self.assertEqual(inventory.busy_slots(), [2])
+        self.assertEqual(inventory.slot(2)['volume'], BUSY)
+        self.assertEqual(len(inventory.slots()), inventory.slot_count())
+        # a new status drops the updates, but keeps the reservation
+        inventory.reset(*media_changer.parse_mtx_status(
+            STATUS, inventory.busy_slots()))
+        self.assertEqual(inventory.locate_volume('VQ0033L8'), (0, -1))
+        self.assertEqual(inventory.busy_slots(), [2])
+
+    def test_manager(self):
+        manager = media_changer.InventoryManager()
+        manager.start()
+        try:
+            inventory = manager.LibraryInventory()
+            inventory.reset(*media_changer.parse_mtx_status(STATUS))
+            self.assertEqual(inventory.locate_volume('VQ0006L8'), (-1, 1))
+            self.assertEqual(inventory.drive(1)['SN'], '00078D2B59')
+        finally:
+            manager.shutdown()
+
+
+FAKE_MTX = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'fixtures', 'mtx')
+
+
+class Value:
+
+    def __init__(self, value):
+        self.value = value
+
+
+class TestMTXNInventoryUpdates(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        state = os.path.join(self.tmp_dir, 'library')
+        f = open(state, 'w')
+        f.write('\n'.join(STATUS[1:-2]))
+        f.close()
+        self.log = os.path.join(self.tmp_dir, 'log')
+        self.start(state)
+
+    def start(self, state, fail=None):
+        cmd = [sys.executable, FAKE_MTX, '--log', self.log]
+        if fail:
+            cmd += ['--fail', fail]
+        self.mtx = subprocess.Popen(cmd + ['--server', state],
+                                    stdin=subprocess.PIPE,
+                                    stdout=subprocess.PIPE)
+        loader = new.instance(media_changer.MTXN_MediaLoader, {})
+        loader.name = 'test.media_changer'
+        loader.server_socket = mock.Mock()
+        loader.p2cwrite = self.mtx.stdin.fileno()
+        loader.c2pread = self.mtx.stdout.fileno()
+        loader.debug = loader.debug_messaging = False
+        loader.use_legacy_status = False
+        loader.cli_host = None
+        loader.status_timeout = loader.mount_timeout = 10
+        loader.mount_retries = 1
+        loader.status_min_interval = 40
+        loader.mtx_server_started = Value(1)
+        loader.last_updated_db = Value(0)
+        loader.inventory_stale = Value(0)
+        loader.inventory = media_changer.LibraryInventory()
+        loader.work_list = []
+        loader.work_query_list = []
+        self.loader = loader
+        self.assertEqual(loader.status_local()[0], media_changer.e_errors.OK)
+
+    def tearDown(self):
+        self.mtx.stdin.close()
+        self.mtx.wait()
+        shutil.rmtree(self.tmp_dir)
+
+    def commands(self):
+        return [l.split(',')[0] for l in open(self.log).read().split()]
+
+    def test_mount_dismount(self):
+        loader = self.loader
+        self.assertEqual(loader.locate_volume('VQ0033L8'), (0, -1))
+        rc = loader.mtx_mount('VQ0033L8', 257)
+        self.assertEqual(rc[1], media_changer.e_errors.OK)
+        self.assertEqual(loader.locate_volume('VQ0033L8'), (-1, 0))
+        rc = loader.mtx_dismount('VQ0033L8', 257)
+        self.assertEqual(rc[1], media_changer.e_errors.OK)
+        # dismounted into the first free slot
+        self.assertEqual(loader.locate_volume('VQ0033L8'), (0, -1))
+        self.assertEqual(loader.inventory.busy_slots(), [])
+        # the inventory was updated from the mount results only
+        self.assertEqual(self.commands().count('status'), 1)
+        self.assertEqual(self.commands().count('Load'), 1)
+        self.assertEqual(loader.inventory_stale.value, 0)
+        self.assertEqual(loader.getDriveState({'drive': 257})[0],
+                         media_changer.e_errors.OK)
+
+    def test_failures(self):
+        self.mtx.stdin.close()
+        self.mtx.wait()
+        os.remove(self.log)
+        self.start(os.path.join(self.tmp_dir, 'library'), '1026')
+        loader = self.loader
+        # dismount into the failing slot
+        rc = loader.mtx_dismount('VQ0006L8', 270)
+        self.assertNotEqual(rc[1], media_changer.e_errors.OK)
+        self.assertEqual(loader.inventory_stale.value, 1)
+        # the reserved slot is released
+        self.assertEqual(loader.inventory.busy_slots(), [])
+        loader.inventory_stale.value = 0
+        self.assertEqual(loader.mtx_mount('XX0000L8', 257)[1],
+                         media_changer.e_errors.ERROR)
+        self.assertEqual(loader.inventory_stale.value, 1)
+        loader.inventory_stale.value = 0
+        self.assertEqual(loader.getVolState({'external_label': 'XX0000L8'})[0],
+                         media_changer.e_errors.MC_VOLNOTFOUND)
+        self.assertEqual(loader.inventory_stale.value, 1)
+        # nothing of it did a full inventory
+        self.assertEqual(self.commands().count('status'), 1)
+
+    def test_check_inventory(self):
+        loader = self.loader
+        loader.DoWork = mock.Mock()
+        loader.check_inventory()
+        self.assertFalse(loader.DoWork.called)
+        loader.request_inventory('test')
+        # just refreshed
+        loader.check_inventory()
+        self.assertFalse(loader.DoWork.called)
+        loader.last_updated_db.value = int(time.time()) - 60
+        loader.work_list = [{'function': 'mount'}]
+        loader.check_inventory()
+        self.assertFalse(loader.DoWork.called)
+        loader.work_list = []
+        loader.check_inventory()
+        self.assertEqual(loader.DoWork.call_count, 1)
+        function, ticket = loader.DoWork.call_args[0]
+        self.assertEqual(function, loader.updatedb)
+        self.assertEqual(ticket['drive']['address'], None)
+        self.assertEqual(loader.inventory_stale.value, 0)
+        # the refresh itself
+        self.assertEqual(loader.updatedb(ticket)[0], media_changer.e_errors.OK)
+        self.assertEqual(self.commands().count('status'), 2)
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
@@ -326,6 +326,56 @@ class TestBuffer(unittest.TestCase):
         self.tb._freespace(buf)
         self.assertEqual(len(self.tb._freelist), 1)
 
+    def test_partial_block(self):
+        self.nd.open(mode=0)
+        self.tb.set_blocksize(100)
+        self.tb.set_wrapper(null_wrapper)
+        num = self.tb.block_read(50, self.nd)
+        self.assertEqual(num, 50)
+        self.assertEqual(self.tb.nbytes(), 50)
+        self.assertEqual(len(self.tb.peek()), 50)
+        block, length = self.tb.pull_block()
+        self.assertEqual((len(block), length), (100, 50))
+        self.tb.push(block, length)
+        self.tb.discard()
+        self.assertEqual(self.tb.nbytes(), 0)
+        # block went back to the pool and is reused
+        self.assertTrue(self.tb._getspace() is block)
+
+    def test_crc_pipeline(self):
+        crcs = []
+        for crc_pipeline in (0, 1):
+            tb = mover.Buffer(100, crc_pipeline=crc_pipeline)
+            tb.reset(None, 1)
+            tb.set_wrapper(null_wrapper)
+            nd = null_driver.NullDriver()
+            nd.open(mode=0)
+            for i in range(10):
+                tb.bytes_for_crc = 100
+                tb.block_read(100, nd)
+                tb.discard()
+            nd.close()
+            tb.crc_flush()
+            self.assertEqual(tb.sanity_bytes, 1000)
+            crcs.append(tb.complete_crc)
+            tb.clear()
+        self.assertEqual(crcs[0], crcs[1])
+
+    def test_crc_pipeline_error(self):
+        self.tb = mover.Buffer(100, crc_pipeline=1)
+        self.tb.reset((100, 0), 1)
+        self.tb.sanity_bytes = mover.SANITY_SIZE # compare sanity CRC
+        self.tb.set_wrapper(null_wrapper)
+        self.nd.open(mode=0)
+        self.tb.bytes_for_crc = 100
+        self.tb.block_read(100, self.nd)
+        with self.assertRaises(MoverError):
+            self.tb.crc_flush()
+        self.assertEqual(self.tb.crc_stage.error, 0)
+        with self.assertRaises(MoverError):
+            self.tb.block_read(100, self.nd)
+        self.tb.clear()
+
 
 # commenting these out for now, I am still
 # figuring out how to test these nested
@@ -0,0 +1,128 @@
+import unittest
+import mock
+import StringIO
+import random
+import skiplist
+import mpq
+
+
+class Req(object):
+    def __init__(self, size, priority, unique_id=None):
+        self.size = size
+        self.priority = priority
+        self.unique_id = unique_id
+
+    def __repr__(self):
+        return "<size=%s, priority=%s>" % (self.size, self.priority)
+
+
+def compare_priority(r1, r2):
+    return -cmp(r1.priority, r2.priority)
+
+
+def compare_size(r1, r2):
+    return cmp(r1.size, r2.size)
+
+
+def priority_key(r):
+    return -r.priority
+
+
+def size_key(r):
+    return r.size
+
+
+def unique_id(r):
+    return r.unique_id
+
+
+class TestSkipList(unittest.TestCase):
+
+    def setUp(self):
+        self.reqs = []
+        for i in range(1, 5):
+            self.reqs.append(Req(size=i, priority=i, unique_id="id%s" % (i,)))
+        self.prio_sl = skiplist.SkipList(priority_key, unique_id)
+        self.size_sl = skiplist.SkipList(size_key, unique_id)
+
+    def perform_insort(self):
+        for itm in self.reqs:
+            self.prio_sl.insort(itm)
+            self.size_sl.insort(itm)
+
+    def test___init__(self):
+        self.assertTrue(isinstance(self.prio_sl, skiplist.SkipList))
+        self.assertEqual(len(self.prio_sl), 0)
+
+    def test_insort(self):
+        self.perform_insort()
+        self.assertEqual(list(self.prio_sl), list(reversed(self.reqs)))
+        self.assertEqual(list(self.size_sl), self.reqs)
+        self.assertNotEqual(self.prio_sl[0], self.size_sl[0])
+        self.assertEqual(self.size_sl[-1], self.reqs[-1])
+        self.assertRaises(IndexError, self.size_sl.__getitem__, 4)
+
+    def test_bisect(self):
+        self.perform_insort()
+        req = Req(size=5, priority=5)
+        self.assertEqual(self.prio_sl.bisect(req), 0)
+        self.assertEqual(self.size_sl.bisect(req), len(self.size_sl) - 1)
+        req = Req(size=2, priority=2)
+        self.assertEqual(self.size_sl.bisect(req), 2)
+
+    def test_remove(self):
+        self.perform_insort()
+        req = Req(size=5, priority=5, unique_id="id5")
+        with mock.patch('sys.stdout', new=StringIO.StringIO()) as std_out:
+            self.prio_sl.remove(req)
+            self.assertTrue(
+                'exceptions.ValueError' in std_out.getvalue(),
+                std_out.getvalue())
+        itm = self.reqs[0]
+        self.assertTrue(itm in self.prio_sl)
+        self.prio_sl.remove(itm)
+        self.assertFalse(itm in self.prio_sl)
+        self.assertEqual(len(self.prio_sl), len(self.reqs) - 1)
+        self.assertEqual(list(self.prio_sl), list(reversed(self.reqs[1:])))
+
+    def test_lookup(self):
+        self.perform_insort()
+        self.assertTrue(self.prio_sl.lookup("id3") is self.reqs[2])
+        self.assertEqual(self.prio_sl.lookup("id9"), None)
+
+    def test___nonzero__(self):
+        self.assertFalse(self.prio_sl.__nonzero__())
+        self.perform_insort()
+        self.assertTrue(self.prio_sl.__nonzero__())
+
+    def test___repr__(self):
+        self.perform_insort()
+        self.assertTrue('<size=4, priority=4>' in repr(self.prio_sl))
+
+    def test_same_order_as_mpq(self):
+        # random inserts, removals, and bisections must give
+        # the same results as mpq.MPQ
+        rnd = random.Random(1234)
+        sl = skiplist.SkipList(size_key, unique_id)
+        q = mpq.MPQ(compare_size)
+        items = []
+        for i in range(2000):
+            if items and rnd.random() < 0.3:
+                itm = items.pop(rnd.randrange(len(items)))
+                sl.remove(itm)
+                q.remove(itm)
+            else:
+                itm = Req(size=rnd.randrange(100), priority=0, unique_id=i)
+                items.append(itm)
+                sl.insort(itm)
+                q.insort(itm)
+            probe = Req(size=rnd.randrange(110), priority=0)
+            self.assertEqual(sl.bisect(probe), q.bisect(probe))
+        self.assertEqual(len(sl), len(q))
+        self.assertEqual(list(sl), list(q))
+        for i in range(len(q)):
+            self.assertTrue(sl[i] is q[i])
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import mock
+import errno
+import time
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import udp_client
+import e_errors
+
+
+class FakeDeferred:
+    """The *_deferred() calls of a UDPClient, answering from delays."""
+
+    def __init__(self, delays):
+        # address: seconds to reply, None - never
+        self.delays = delays
+        self.sent = {}       # txn_id: (address, first send time)
+        self.sends = []      # addresses in send order
+        self.repeated = []
+        self.dropped = []
+        self.max_outstanding = 0
+
+    def send_deferred(self, data, address):
+        txn_id = len(self.sends) + 1
+        self.sends.append(address)
+        self.sent[txn_id] = (address, time.time())
+        self.max_outstanding = max(self.max_outstanding, len(self.sent))
+        return txn_id
+
+    def recv_deferred2(self, txn_ids, timeout):
+        end = time.time() + timeout
+        while 1:
+            now = time.time()
+            for txn_id in txn_ids:
+                address, t0 = self.sent[txn_id]
+                delay = self.delays[address]
+                if delay is not None and now - t0 >= delay:
+                    del self.sent[txn_id]
+                    return {'address': address}, txn_id
+            if now >= end:
+                raise e_errors.EnstoreError(errno.ETIMEDOUT, "",
+                                            e_errors.TIMEDOUT)
+            time.sleep(0.001)
+
+    def repeat_deferred(self, txn_ids):
+        self.repeated.extend(txn_ids)
+
+    def drop_deferred(self, txn_ids):
+        self.dropped.extend(txn_ids)
+        for txn_id in txn_ids:
+            del self.sent[txn_id]
+
+
+class TestScatterGather(unittest.TestCase):
+
+    def setUp(self):
+        with mock.patch.object(udp_client.UDPClient, 'reinit'):
+            self.u = udp_client.UDPClient()
+
+    def gather(self, delays, timeout, window=0, tries=1):
+        fake = FakeDeferred(delays)
+        for name in ('send_deferred', 'recv_deferred2', 'repeat_deferred',
+                     'drop_deferred'):
+            setattr(self.u, name, getattr(fake, name))
+        requests = [(address, {'work': 'status'}, address)
+                    for address in sorted(delays.keys())]
+        t0 = time.time()
+        result = self.u.scatter_gather(requests, timeout, window, tries)
+        return result, time.time() - t0, fake
+
+    def test_all_reply(self):
+        delays = dict([(('h%s' % (i,), 7000), 0.05) for i in range(20)])
+        (replies, latencies, late), elapsed, fake = self.gather(delays, 1.0)
+        self.assertEqual(late, [])
+        self.assertEqual(sorted(replies.keys()), sorted(delays.keys()))
+        for key, reply in replies.items():
+            self.assertEqual(reply['address'], key)
+            self.assertTrue(latencies[key] >= 0.05)
+        # all in parallel: the slowest, not the sum
+        self.assertTrue(elapsed < 0.5, elapsed)
+
+    def test_late(self):
+        delays = {('fast', 1): 0.0, ('hung', 1): None, ('slow', 1): 0.5}
+        (replies, latencies, late), elapsed, fake = self.gather(delays, 0.2)
+        self.assertEqual(replies.keys(), [('fast', 1)])
+        self.assertEqual(sorted(late), [('hung', 1), ('slow', 1)])
+        self.assertEqual(len(fake.dropped), 2)
+        self.assertTrue(0.2 <= elapsed < 0.4, elapsed)
+
+    def test_window(self):
+        delays = dict([(('h%s' % (i,), 7000), 0.01) for i in range(10)])
+        (replies, latencies, late), elapsed, fake = self.gather(delays, 1.0,
+                                                                window=3)
+        self.assertEqual(len(replies), 10)
+        self.assertEqual(fake.max_outstanding, 3)
+
+    def test_resend(self):
+        delays = {('hung', 1): None}
+        (replies, latencies, late), elapsed, fake = self.gather(delays, 0.3,
+                                                                tries=3)
+        self.assertEqual(late, [('hung', 1)])
+        self.assertEqual(fake.repeated, [1, 1])
+
+    def test_send_error(self):
+        delays = {('ok', 1): 0.0, ('bad', 1): 0.0}
+        fake = FakeDeferred(delays)
+
+        def send_deferred(data, address):
+            if address[0] == 'bad':
+                raise e_errors.EnstoreError(errno.EMSGSIZE, "too big",
+                                            e_errors.NET_ERROR)
+            return fake.send_deferred(data, address)
+        self.u.send_deferred = send_deferred
+        self.u.recv_deferred2 = fake.recv_deferred2
+        self.u.drop_deferred = fake.drop_deferred
+        replies, latencies, late = self.u.scatter_gather(
+            [('ok', {}, ('ok', 1)), ('bad', {}, ('bad', 1))], 0.5)
+        self.assertEqual(replies.keys(), ['ok'])
+        self.assertEqual(late, ['bad'])
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
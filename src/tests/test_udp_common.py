@@ -0,0 +1,102 @@
+import unittest
+import marshal
+import struct
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+import udp_common
+
+
+TICKET = {'work': 'mover_idle',
+          'mover': 'LTO8_1.mover',
+          'address': ('131.225.13.187', 7011),
+          'state': 'IDLE',
+          'time_in_state': 12.5,
+          'bytes': 12345678901234L,
+          'volume_family': None,
+          'status': ('ok', None),
+          'flags': [True, False],
+          u'unicode': u'text',
+          }
+
+
+class TestUDPCommonCodec(unittest.TestCase):
+
+    def test_repr_round_trip(self):
+        msg = udp_common.encode(TICKET)
+        self.assertEqual(msg, repr(TICKET))
+        self.assertFalse(udp_common.is_binary(msg))
+        self.assertEqual(udp_common.r_eval(msg), TICKET)
+
+    def test_binary_round_trip(self):
+        msg = udp_common.encode(TICKET, udp_common.BINARY)
+        self.assertTrue(udp_common.is_binary(msg))
+        self.assertEqual(udp_common.r_eval(msg), TICKET)
+
+    def test_nested_binary_message(self):
+        # the way UDPClient.protocolize wraps a message
+        body = udp_common.encode(('client-id', 3L, TICKET), udp_common.BINARY)
+        message = udp_common.encode((body, 1234L), udp_common.BINARY)
+        rbody, crc = udp_common.r_eval(message)
+        self.assertEqual(crc, 1234L)
+        self.assertEqual(udp_common.r_eval(rbody), ('client-id', 3L, TICKET))
+
+    def test_binary_falls_back_to_repr(self):
+        class Unmarshallable:
+            def __repr__(self):
+                return "None"
+        msg = udp_common.encode(Unmarshallable(), udp_common.BINARY)
+        self.assertEqual(msg, "None")
+
+    def test_rejects_non_literals(self):
+        code = compile("1", "<test>", "eval")
+        for obj in (set([1]), {'code': code}, [frozenset()]):
+            msg = udp_common.BINARY_HEADER + marshal.dumps(obj, 2)
+            self.assertRaises(SyntaxError, udp_common.r_eval, msg)
+
+    def test_rejects_malformed(self):
+        msg = udp_common.encode(TICKET, udp_common.BINARY)
+        self.assertRaises(SyntaxError, udp_common.r_eval, msg[:-3])
+        msg = udp_common.BINARY_MAGIC + '\x7f' + msg[2:]
+        self.assertRaises(SyntaxError, udp_common.r_eval, msg)
+        self.assertRaises(SyntaxError, udp_common.r_eval, "")
+
+    def test_rejects_oversized_lengths(self):
+        # lengths bigger than the message are refused before anything
+        # is allocated
+        huge = struct.pack('<i', 2**31 - 1)
+        for body in ('[' + huge, '(' + huge, 's' + huge, 'u' + huge,
+                     't' + huge + 'abc', 'l' + huge + '\x01\x00',
+                     '[' + struct.pack('<i', 3) + 'NN',
+                     's' + struct.pack('<i', -1),
+                     'R' + struct.pack('<i', 0)):
+            msg = udp_common.BINARY_HEADER + body
+            self.assertRaises(SyntaxError, udp_common.r_eval, msg)
+
+    def test_rejects_bad_structure(self):
+        deep = '[' + struct.pack('<i', 1)
+        for body in ('{NN', '{' + marshal.dumps([], 2) + 'N0',
+                     'NN', 'i\x01', deep * 1000 + 'N',
+                     'u' + struct.pack('<i', 1) + '\xff'):
+            msg = udp_common.BINARY_HEADER + body
+            self.assertRaises(SyntaxError, udp_common.r_eval, msg)
+
+    def test_decodes_like_marshal(self):
+        s = 'interned'
+        for obj in (2**40, -2**70, 1.5, 2j - 1, u'\xe9t\xe9', (),
+                    {}, [s, s, (s,)], {'a': {'b': [None, True]}}):
+            msg = udp_common.encode(obj, udp_common.BINARY)
+            self.assertEqual(udp_common.r_eval(msg), obj)
+            self.assertEqual(type(udp_common.r_eval(msg)), type(obj))
+
+    def test_repr_with(self):
+        encoded = {'address': udp_common.r_repr(TICKET['address']),
+                   'missing': "'not used'"}
+        msg = udp_common.r_repr_with(TICKET, encoded)
+        self.assertEqual(udp_common.r_eval(msg), TICKET)
+        self.assertEqual(udp_common.r_repr_with({}, encoded), repr({}))
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
@@ -0,0 +1,157 @@
+import new
+import re
+import sys
+import threading
+import time
+import unittest
+import mock
+try:
+    import Interfaces
+except ImportError:
+    import fixtures.mock_imports
+# the database modules are not needed, the db is faked below
+for name in ('psycopg2', 'psycopg2.extras', 'DBUtils', 'DBUtils.PooledDB'):
+    sys.modules.setdefault(name, mock.MagicMock())
+import edb
+import volume_clerk
+
+LIBRARY = 'LTO8'
+FAMILY = 'sg.ff.cpio_odc'
+
+
+def volume(label, declared, family=FAMILY, inhibit='none'):
+    storage_group, file_family, wrapper = family.split('.')
+    return {'label': label, 'declared': declared, 'library': LIBRARY,
+            'storage_group': storage_group, 'file_family': file_family,
+            'wrapper': wrapper, 'volume_family': family,
+            'system_inhibit_0': 'none', 'system_inhibit_1': inhibit,
+            'user_inhibit_0': 'none', 'user_inhibit_1': 'none',
+            'write_protected': 'n', 'remaining_bytes': 10L ** 12}
+
+
+class FakeDatabaseAccess:
+    """
+    The volume table in a dictionary.  Answers the write candidates
+    query and the queries DbTable uses to read and write a record.
+    """
+
+    def __init__(self, volumes):
+        self.volumes = dict([(v['label'], dict(v)) for v in volumes])
+        self.candidate_queries = 0
+        # called after running a write candidates query
+        self.after_query = None
+
+    def query_dictresult(self, q, values=None):
+        if type(values) != type({}):
+            # DbTable.retrieve_query
+            v = self.volumes.get(values[0])
+            return v and [dict(v)] or []
+        self.candidate_queries = self.candidate_queries + 1
+        res = []
+        for v in self.volumes.values():
+            if v['library'] == values['library'] and \
+               v['storage_group'] == values['storage_group'] and \
+               v['file_family'] == values['file_family'] and \
+               v['wrapper'] == values['wrapper'] and \
+               v['system_inhibit_1'] == 'none' and \
+               v['label'] not in values['veto']:
+                res.append(dict(v))
+        res.sort(key=lambda v: (v['declared'], v['label']))
+        if self.after_query:
+            self.after_query()
+        return res[:values['limit']]
+
+    def insert(self, table, record):
+        self.volumes[record['label']] = dict(record)
+
+    def update(self, q, values):
+        columns = re.findall(r'(\w+)=%s', q)
+        record = dict(zip(columns, values))
+        self.volumes[record['label']].update(record)
+
+
+class TestWriteCandidates(unittest.TestCase):
+
+    def setUp(self):
+        self.db = FakeDatabaseAccess([volume('VOL002', 2),
+                                      volume('VOL003', 3),
+                                      volume('OTHER1', 1,
+                                             'sg.other.cpio_odc')])
+        volumedb_dict = new.instance(edb.DbTable, {})
+        volumedb_dict.table = 'volume'
+        volumedb_dict.pkey = 'label'
+        volumedb_dict.retrieve_query = 'retrieve'
+        volumedb_dict.auto_journal = 0
+        volumedb_dict.dbaccess = self.db
+        clerk = new.instance(volume_clerk.VolumeClerkMethods, {})
+        clerk.volumedb_dict = volumedb_dict
+        clerk.write_candidates_ttl = volume_clerk.WRITE_CANDIDATES_TTL
+        clerk.write_candidates = {}
+        clerk.write_candidates_generation = 0
+        clerk.write_candidates_lock = threading.Lock()
+        volumedb_dict.write_callback = clerk.invalidate_write_candidates
+        self.clerk = clerk
+
+    def find(self, veto=[]):
+        v = self.clerk.find_matching_volume(LIBRARY, FAMILY, FAMILY, veto,
+                                            0, 0, exact_match=0)
+        return v.get('label')
+
+    def test_cache_hit(self):
+        self.assertEqual(self.find(), 'VOL002')
+        self.assertEqual(self.find(), 'VOL002')
+        # vetoed volumes are taken out of the cached candidates
+        self.assertEqual(self.find(['VOL002']), 'VOL003')
+        self.assertEqual(self.db.candidate_queries, 1)
+        # all candidates vetoed, and there are no more
+        self.assertEqual(self.find(['VOL002', 'VOL003']), None)
+        self.assertEqual(self.db.candidate_queries, 1)
+
+    def test_expires(self):
+        self.assertEqual(self.find(), 'VOL002')
+        now = time.time() + volume_clerk.WRITE_CANDIDATES_TTL + 1
+        with mock.patch('time.time', return_value=now):
+            self.assertEqual(self.find(), 'VOL002')
+        self.assertEqual(self.db.candidate_queries, 2)
+
+    def test_dropped_on_volume_update(self):
+        self.assertEqual(self.find(), 'VOL002')
+        record = self.clerk.volumedb_dict['VOL002']
+        record['system_inhibit_1'] = 'full'
+        self.clerk.volumedb_dict['VOL002'] = record
+        self.assertEqual(self.clerk.write_candidates, {})
+        self.assertEqual(self.find(), 'VOL003')
+        self.assertEqual(self.db.candidate_queries, 2)
+
+    def test_dropped_on_assignment(self):
+        self.assertEqual(self.find(), 'VOL002')
+        # a volume of another family, cached, is assigned to this one
+        self.clerk.find_matching_volume(LIBRARY, 'sg.other.cpio_odc',
+                                        'sg.other.cpio_odc', [], 0, 0,
+                                        exact_match=0)
+        self.assertEqual(len(self.clerk.write_candidates), 2)
+        record = self.clerk.volumedb_dict['OTHER1']
+        record.update({'file_family': 'ff', 'volume_family': FAMILY})
+        self.clerk.volumedb_dict['OTHER1'] = record
+        self.assertEqual(self.clerk.write_candidates, {})
+        self.assertEqual(self.find(), 'OTHER1')
+
+    def test_dropped_on_new_volume(self):
+        self.assertEqual(self.find(), 'VOL002')
+        self.clerk.volumedb_dict.insert_new_record('VOL001',
+                                                   volume('VOL001', 1))
+        self.assertEqual(self.find(), 'VOL001')
+
+    def test_write_after_query_not_cached(self):
+        def write():
+            self.db.after_query = None
+            self.clerk.volumedb_dict.insert_new_record('VOL001',
+                                                       volume('VOL001', 1))
+        self.db.after_query = write
+        self.assertEqual(self.find(), 'VOL002')
+        self.assertEqual(self.clerk.write_candidates, {})
+        self.assertEqual(self.find(), 'VOL001')
+
+
+if __name__ == "__main__":   # pragma: no cover
+    unittest.main()
@@ -58,6 +58,8 @@ class UDPClient:
     def __init__(self):
 
         self.thread_specific_data = threading.local() #Thread-specific data
+        # message encoding, see udp_common
+        self.codec = udp_common.default_codec()
 
         self.reinit()
 
@@ -152,11 +154,11 @@ class UDPClient:
         #add message creation timestamp
         if type(data) == types.DictType:
             data["send_ts"] = time.time()
-        body = udp_common.r_repr((tsd.ident, tsd.txn_counter, data))
+        body = udp_common.encode((tsd.ident, tsd.txn_counter, data), self.codec)
         crc = checksum.adler32(0L, body, len(body))
 
         #stringify message and check if it is too long
-        message = udp_common.r_repr((body, crc))
+        message = udp_common.encode((body, crc), self.codec)
 
         if len(message) > TRANSFER_MAX:
             errmsg = "send:message too big, size=%d, max=%d. Check the output" %(len(message), TRANSFER_MAX)
@@ -606,6 +608,87 @@ class UDPClient:
             except KeyError:
                 pass
 
+    def scatter_gather(self, requests, timeout, window=0, tries=1):
+        """
+        Send many messages and gather their replies, all within one
+        deadline.
+
+        At most window messages are outstanding at a time; the next one
+        is sent when a reply arrives.  Messages not answered are resent
+        every timeout / tries seconds.  The time to gather all the
+        replies is set by the slowest destination, not the sum of them.
+
+        :type requests: :obj:`list`
+        :arg requests: (key, data, address) of the messages to send
+        :type timeout: :obj:`float`
+        :arg timeout: time to wait for all of the replies
+        :type window: :obj:`int`
+        :arg window: maximum number of outstanding messages, 0 - no limit
+        :type tries: :obj:`int`
+        :arg tries: number of times to send each message
+        :rtype: :obj:`tuple` (:obj:`dict` - key: reply,
+                :obj:`dict` - key: seconds to reply,
+                :obj:`list` - keys without reply)
+        """
+        now = time.time()
+        deadline = now + timeout
+        resend_interval = float(timeout) / max(tries, 1)
+        pending = list(requests)
+        pending.reverse()
+        outstanding = {}   # txn_id: (key, first send time, last send time, sends)
+        replies = {}
+        latencies = {}
+        failed = []
+        while pending or outstanding:
+            while pending and (not window or len(outstanding) < window):
+                key, data, address = pending.pop()
+                try:
+                    txn_id = self.send_deferred(data, address)
+                except (socket.error, e_errors.EnstoreError), detail:
+                    Trace.log(e_errors.ERROR, "scatter_gather: send to %s %s: %s"
+                              % (key, address, detail))
+                    txn_id = -1
+                if txn_id == -1:
+                    failed.append(key)
+                    continue
+                now = time.time()
+                outstanding[txn_id] = (key, now, now, 1)
+            if not outstanding:
+                break
+            now = time.time()
+            if now >= deadline:
+                break
+            # wake up for the deadline or the earliest resend
+            wait = deadline - now
+            for txn_id, (key, t0, t1, sends) in outstanding.items():
+                if sends < tries:
+                    wait = min(wait, max(t1 + resend_interval - now, 0))
+            try:
+                reply, txn_id = self.recv_deferred2(outstanding.keys(), wait)
+            except (socket.error, e_errors.EnstoreError), detail:
+                if getattr(detail, "errno", None) != errno.ETIMEDOUT:
+                    raise
+                now = time.time()
+                resend = []
+                for txn_id, (key, t0, t1, sends) in outstanding.items():
+                    if sends < tries and now - t1 >= resend_interval - 0.001:
+                        resend.append(txn_id)
+                        outstanding[txn_id] = (key, t0, now, sends + 1)
+                if resend:
+                    self.repeat_deferred(resend)
+                continue
+            if not outstanding.has_key(txn_id):
+                continue
+            key, t0, t1, sends = outstanding[txn_id]
+            del outstanding[txn_id]
+            replies[key] = reply
+            latencies[key] = time.time() - t0
+
+        late = [v[0] for v in outstanding.values()]
+        late = late + failed + [r[0] for r in pending]
+        self.drop_deferred(outstanding.keys())
+        return replies, latencies, late
+
 
 if __name__ == "__main__":   # pragma: no cover
 
@@ -11,6 +11,9 @@ import socket
 import sys
 import exceptions
 import errno
+import os
+import marshal
+import struct
 
 # enstore imports
 import host_config
@@ -104,9 +107,172 @@ def get_callback(use_host=None, use_port=0):
 
 # These function deal with encoding and decoding the raw bytes from
 # udp messages.
+#
+# Two encodings are used on the wire:
+#   REPR   - python repr() of the message, decoded by en_eval.
+#            This is the original encoding.
+#   BINARY - BINARY_MAGIC, codec version byte and marshal dump of the
+#            message. It is much cheaper to decode than to parse python
+#            source, which is what en_eval does.
+# The first byte of each message tells which encoding it uses, so old
+# clients and servers which only know repr keep working.
+# Servers reply with the encoding of the request.
+# Clients use REPR unless ENSTORE_UDP_CODEC is set to "binary".
+
+REPR = "repr"
+BINARY = "binary"
+# repr() output never starts with this byte
+BINARY_MAGIC = '\x89'
+MARSHAL_VERSION = '\x01'  # codec version: marshal format version 2
+BINARY_HEADER = BINARY_MAGIC + MARSHAL_VERSION
+
+
+def default_codec():
+    if os.environ.get('ENSTORE_UDP_CODEC', REPR) == BINARY:
+        return BINARY
+    return REPR
+
+
+def is_binary(message):
+    return message[:1] == BINARY_MAGIC
+
+
+# marshal.loads() trusts the lengths in its input: it allocates
+# a list or a string of the declared size before reading it, so a
+# few bytes from the network can ask for gigabytes.  Binary messages
+# are decoded by _b_loads() instead, which reads the marshal types of
+# the literals that en_eval (ast.literal_eval) can produce, and nothing
+# else, and checks every length against the message size.
+_INT32 = struct.Struct('<i')
+_INT64 = struct.Struct('<q')
+_DOUBLE = struct.Struct('<d')
+_COMPLEX = struct.Struct('<dd')
+_MAX_DEPTH = 100
+
+
+def _b_loads(data):
+    # raise ValueError if data is not a marshal dump of a literal
+    end = len(data)
+    strings = []  # interned strings, referred to by 'R'
+
+    def length(pos, size):
+        # read the length at pos of an item of size bytes per unit
+        if pos + 4 > end:
+            raise ValueError("truncated message")
+        n = _INT32.unpack_from(data, pos)[0]
+        if n < 0 or pos + 4 + n * size > end:
+            raise ValueError("bad length %s" % (n,))
+        return n, pos + 4
+
+    def load(pos, depth):
+        if depth > _MAX_DEPTH:
+            raise ValueError("message nested too deep")
+        if pos >= end:
+            raise ValueError("truncated message")
+        code = data[pos]
+        pos = pos + 1
+        if code in 'st':
+            n, pos = length(pos, 1)
+            s = data[pos:pos + n]
+            if code == 't':
+                strings.append(s)
+            return s, pos + n
+        elif code == 'i':
+            if pos + 4 > end:
+                raise ValueError("truncated message")
+            return _INT32.unpack_from(data, pos)[0], pos + 4
+        elif code == '{':
+            d = {}
+            while pos < end and data[pos] != '0':
+                k, pos = load(pos, depth + 1)
+                v, pos = load(pos, depth + 1)
+                d[k] = v
+            if pos >= end:
+                raise ValueError("truncated message")
+            return d, pos + 1
+        elif code in '([':
+            # each item is at least one byte long
+            n, pos = length(pos, 1)
+            items = []
+            for i in xrange(n):
+                o, pos = load(pos, depth + 1)
+                items.append(o)
+            if code == '(':
+                items = tuple(items)
+            return items, pos
+        elif code == 'R':
+            if pos + 4 > end:
+                raise ValueError("truncated message")
+            i = _INT32.unpack_from(data, pos)[0]
+            if not 0 <= i < len(strings):
+                raise ValueError("bad string reference %s" % (i,))
+            return strings[i], pos + 4
+        elif code == 'N':
+            return None, pos
+        elif code == 'T':
+            return True, pos
+        elif code == 'F':
+            return False, pos
+        elif code == 'u':
+            n, pos = length(pos, 1)
+            return data[pos:pos + n].decode('utf8'), pos + n
+        elif code == 'l':
+            if pos + 4 > end:
+                raise ValueError("truncated message")
+            n = _INT32.unpack_from(data, pos)[0]
+            size = abs(n)
+            pos = pos + 4
+            if pos + 2 * size > end:
+                raise ValueError("bad length %s" % (n,))
+            # 15 bit digits, least significant first
+            value = 0L
+            for d in reversed(struct.unpack_from('<%sH' % (size,),
+                                                 data, pos)):
+                value = (value << 15) | d
+            if n < 0:
+                value = -value
+            return value, pos + 2 * size
+        elif code == 'I':
+            if pos + 8 > end:
+                raise ValueError("truncated message")
+            return _INT64.unpack_from(data, pos)[0], pos + 8
+        elif code == 'g':
+            if pos + 8 > end:
+                raise ValueError("truncated message")
+            return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+        elif code == 'y':
+            if pos + 16 > end:
+                raise ValueError("truncated message")
+            return complex(*_COMPLEX.unpack_from(data, pos)), pos + 16
+        raise ValueError("unsupported type code %s" % (repr(code),))
+
+    rc, pos = load(0, 0)
+    if pos != end:
+        raise ValueError("extra data after message")
+    return rc
+
+
+def b_eval(message_to_decode):
+    # Decode binary message.
+    # Raises SyntaxError for malformed messages, as en_eval does.
+    if message_to_decode[1:2] != MARSHAL_VERSION:
+        raise SyntaxError("unsupported codec version %s" %
+                          (repr(message_to_decode[1:2]),))
+    try:
+        rc = _b_loads(message_to_decode[2:])
+    except (ValueError, TypeError, struct.error), detail:
+        # TypeError: unhashable dictionary key
+        raise SyntaxError("malformed binary message: %s" % (detail,))
+    return rc
+
+
+def b_repr(message_to_encode):
+    return BINARY_HEADER + marshal.dumps(message_to_encode, 2)
 
 
 def r_eval(message_to_decode):
+    if is_binary(message_to_decode):
+        return b_eval(message_to_decode)
     try:
         # This uses the restricted eval.  The unstricted eval could have
         #  been used by doing: return eval(message_to_decode)
@@ -119,3 +285,30 @@ def r_eval(message_to_decode):
 def r_repr(message_to_encode):
     # We could have done something like "return `message_to_encode`" too.
     return repr(message_to_encode)
+
+
+def r_repr_with(message_to_encode, encoded):
+    """
+    r_repr() of a dictionary, using for the values of the keys in
+    encoded the strings there, already encoded with r_repr().
+    """
+    items = []
+    for key, value in message_to_encode.items():
+        if key in encoded:
+            items.append("%r: %s" % (key, encoded[key]))
+        else:
+            items.append("%r: %r" % (key, value))
+    return "{%s}" % (", ".join(items),)
+
+
+def encode(message_to_encode, codec=REPR):
+    """
+    Encode message with codec.
+    Binary encoding falls back to repr for messages marshal can not handle.
+    """
+    if codec == BINARY:
+        try:
+            return b_repr(message_to_encode)
+        except ValueError:
+            pass
+    return r_repr(message_to_encode)
@@ -133,6 +133,10 @@ class UDPServer:
         # keep requests in request dict for this many seconds
         #self.request_dict_ttl = 1800
         self.request_dict_ttl = 1000
+        # clients which send binary encoded requests (see udp_common)
+        # get binary encoded replies.
+        # client id: time of the last request
+        self.binary_clients = {}
 
         # set this socket to be closed in case of an exec
         if self.server_socket != None:
@@ -193,6 +197,10 @@ class UDPServer:
                     exc, msg = sys.exc_info()[:2]
                     Trace.trace(20, "purge_stale_entries: error %s %s"%(exc, msg))
 
+        for key, value in self.binary_clients.items():
+            if value < stale_time:
+                self.binary_clients.pop(key, None)
+
         Trace.trace(20,"purge_stale_entries count=%d"%(count,))
 
     def server_bind(self):
@@ -428,6 +436,9 @@ class UDPServer:
             self.server_socket.sendto(repr(reply), client_address)
             return None
 
+        if udp_common.is_binary(request):
+            self.binary_clients[idn] = time.time()
+
         reply_address = client_address
         client_number = number
         current_id = idn
@@ -535,6 +546,35 @@ class UDPServer:
         reply = (client_number, ticket, time.time())
         self.reply_with_list(reply, reply_address, current_id, interface_ip)
 
+    def reply_to_caller_encoded(self, ticket, encoded):
+        """
+        Like reply_to_caller(), for a ticket with values already encoded.
+        The values are sent as they are, without being copied and encoded
+        again; the caller must not modify them afterwards.
+        Binary clients get the reply from reply_to_caller().
+
+        :type ticket: :obj:`dict`
+        :arg ticket: ticket to send back to client
+        :type encoded: :obj:`dict`
+        :arg encoded: ticket key: the value encoded with udp_common.r_repr()
+        """
+        reply_address, client_number, current_id = ticket["r_a"]
+        if current_id in self.binary_clients:
+            self.reply_to_caller(ticket)
+            return
+
+        reply = (client_number, ticket, time.time())
+        wrapped_list = "(%r, %s, %r)" % (
+            client_number, udp_common.r_repr_with(ticket, encoded), reply[2])
+        if len(wrapped_list) > self.max_packet_size:
+            raise socket.error(errno.EMSGSIZE, os.strerror(errno.EMSGSIZE))
+        # retries are answered by reply_with_list()
+        self.request_dict[current_id] = reply
+
+        Trace.trace(16, "udp_server (reply encoded): to %s: request_dict %s" %
+                    (reply_address, current_id))
+        self.server_socket.sendto(wrapped_list, reply_address)
+
     def reply_with_list(self, list, reply_address, current_id,
                         interface_ip = None):
         """
@@ -579,7 +619,10 @@ class UDPServer:
         # sendto() in python 2.6 raises this EMSGSIZE socket exception if
         # the message size is to long for UDP.  In python 2.4, the message
         # is silently truncated.
-        wrapped_list = udp_common.r_repr(list_copy)
+        if current_id in self.binary_clients:
+            wrapped_list = udp_common.encode(list_copy, udp_common.BINARY)
+        else:
+            wrapped_list = udp_common.r_repr(list_copy)
         if len(wrapped_list) > self.max_packet_size:
             ### A long message can now be handled by generic_client and
             ### dispatching_worker.  Don't log a traceback here.
@@ -14,6 +14,7 @@ import select
 import socket
 import string
 import sys
+import threading
 import time
 import types
 
@@ -70,6 +71,67 @@ MAX_THREADS =  enstore_constants.MAX_THREADS
 # main thread)
 MAX_CONNECTIONS=MAX_THREADS+1
 
+# Candidate volumes for next_write_volume, see find_matching_volume().
+# Volumes in veto, a list, are excluded.
+WRITE_CANDIDATES_COLUMNS = """
+SELECT block_size,
+       capacity_bytes,
+       declared,
+       eod_cookie,
+       label,
+       first_access,
+       last_access,
+       library,
+       media_type,
+       non_del_files,
+       remaining_bytes,
+       sum_mounts,
+       sum_rd_access,
+       sum_rd_err,
+       sum_wr_access,
+       sum_wr_err,
+       system_inhibit_0,
+       system_inhibit_1,
+       si_time_0,
+       si_time_1,
+       user_inhibit_0,
+       user_inhibit_1,
+       storage_group,
+       file_family,
+       wrapper,
+       comment,
+       write_protected,
+       modification_time,
+       COALESCE(active_files,0) AS active_files,
+       COALESCE(deleted_files,0) AS deleted_files,
+       COALESCE(unknown_files,0) AS unknown_files,
+       COALESCE(active_bytes,0) AS active_bytes,
+       COALESCE(deleted_bytes,0) AS deleted_bytes,
+       COALESCE(unknown_bytes,0) AS unknown_bytes
+FROM volume
+WHERE library = %(library)s
+  AND storage_group = %(storage_group)s
+  AND file_family = %(file_family)s
+  AND wrapper = %(wrapper)s
+  AND system_inhibit_0 = 'none'
+  AND system_inhibit_1 = 'none'
+  AND user_inhibit_0 = 'none'
+  AND user_inhibit_1 = 'none'
+  AND write_protected = 'n'
+  AND label <> ALL(%(veto)s)
+"""
+SELECT_WRITE_CANDIDATES = WRITE_CANDIDATES_COLUMNS + """
+ORDER BY declared, label LIMIT %(limit)s
+"""
+# disk movers only write volumes named after their ip_map
+SELECT_DISK_WRITE_CANDIDATES = WRITE_CANDIDATES_COLUMNS + """
+  AND label LIKE %(label_like)s
+ORDER BY declared, label LIMIT %(limit)s
+"""
+WRITE_CANDIDATES = 10
+# seconds to keep write candidates of a volume family, 0 to not keep them
+WRITE_CANDIDATES_TTL = 5
+
 class VolumeClerkInfoMethods(dispatching_worker.DispatchingWorker):
     ### This class of Volume Clerk methods should only be readonly operations.
     ### This class is inherited by Info Server (to increase code reuse)
@@ -451,6 +513,54 @@ class VolumeClerkInfoMethods(dispatching_worker.DispatchingWorker):
         record['r_a'] = saved_reply_address
         self.reply_to_caller(record)
 
+    # inquire_vol of each of ticket['external_labels'], read in one query.
+    # ticket['volumes'] is {external_label: record}, each record with the
+    # status inquire_vol would reply with.  The answer is sent using
+    # send_reply_with_long_answer().
+    def inquire_vol_many(self, ticket):
+        external_labels = self.extract_value_from_ticket('external_labels',
+                                                         ticket)
+        if external_labels == None:
+            return #extract_value_from_ticket handles its own errors.
+
+        volumes = {}
+        valid_labels = []
+        for external_label in external_labels:
+            if not external_label:
+                message = "%s: key external_label is None" % (MY_NAME,)
+                volumes[external_label] = {
+                    'external_label': external_label,
+                    'status': (e_errors.KEYERROR, message)}
+            elif not enstore_functions3.is_volume(external_label):
+                message = "%s: external_label %s not valid" \
+                          % (MY_NAME, external_label,)
+                volumes[external_label] = {
+                    'external_label': external_label,
+                    'status': (e_errors.WRONG_FORMAT, message)}
+            else:
+                valid_labels.append(external_label)
+
+        records = self.volumedb_dict.get_many(valid_labels)
+        for external_label in valid_labels:
+            record = records.get(external_label)
+            if record:
+                record["status"] = (e_errors.OK, None)
+            else:
+                message = "%s: no such external_label %s" \
+                          % (MY_NAME, external_label,)
+                record = {'external_label': external_label,
+                          'status': (e_errors.NO_VOLUME, message)}
+            volumes[external_label] = record
+
+        # send the reply
+        ticket['volumes'] = volumes
+        ticket["status"] = (e_errors.OK, None)
+        try:
+            self.send_reply_with_long_answer(ticket)
+        except (socket.error, select.error), msg:
+            Trace.log(e_errors.INFO, "inquire_vol_many(): %s" % (str(msg),))
+            return
+
     #### DONE, probably not completely
     # return all the volumes in our dictionary.  Not so useful!
     def get_vols(self, ticket):
@@ -574,6 +684,23 @@ class VolumeClerkInfoMethods(dispatching_worker.DispatchingWorker):
     def __get_vols2(self, ticket):
 
         reply = {}
+        q = self.__get_vols2_query(ticket)
+
+        reply['header'] = 'FULL'
+
+        try:
+            res = self.volumedb_dict.query_dictresult(q)
+        except:
+            exc_type, exc_value = sys.exc_info()[:2]
+            mesg = 'get_vols(): '+str(exc_type)+' '+str(exc_value)+' query: '+q
+            Trace.log(e_errors.ERROR, mesg)
+            res = []
+        reply['volumes'] = edb.sanitize_datetime_values(res)
+
+        return reply
+
+    # query of the volumes selected by ticket
+    def __get_vols2_query(self, ticket):
         # q = "select * from volume "
         q = "select label, capacity_bytes, remaining_bytes, library, system_inhibit_0, system_inhibit_1, si_time_0, si_time_1, storage_group, file_family, wrapper, comment from volume "
         if ticket.has_key('in_state'):
@@ -631,20 +758,8 @@ class VolumeClerkInfoMethods(dispatching_worker.DispatchingWorker):
                 q = q + "where system_inhibit_0 = '%s'"%(string.upper(state))
             q = q + " and not label like '%%.deleted'"
 
-        reply['header'] = 'FULL'
-
         q = q + ' order by label;'
-
-        try:
-            res = self.volumedb_dict.query_dictresult(q)
-        except:
-            exc_type, exc_value = sys.exc_info()[:2]
-            mesg = 'get_vols(): '+str(exc_type)+' '+str(exc_value)+' query: '+q
-            Trace.log(e_errors.ERROR, mesg)
-            res = []
-        reply['volumes'] = edb.sanitize_datetime_values(res)
-
-        return reply
+        return q
 
     # return all the volumes in our dictionary.  Not so useful!
     #
@@ -700,6 +815,17 @@ class VolumeClerkInfoMethods(dispatching_worker.DispatchingWorker):
             return
 
         # get reply
+        if ticket.get('stream'):
+            # volumes are sent as they are read from the db
+            reply = {'header': 'FULL',
+                     'status': (e_errors.OK, None)}
+            q = self.__get_vols2_query(ticket)
+            self.send_reply_with_streamed_answer_part2(
+                control_socket, reply, 'volumes',
+                self.volumedb_dict.query_dictresult_iter(q))
+            Trace.log(e_errors.INFO, "stop listing all volumes (3)")
+            return
+
         reply = self.__get_vols2(ticket)
         reply['status'] = (e_errors.OK, None)
 
@@ -1085,6 +1211,15 @@ class VolumeClerkMethods(VolumeClerkInfoMethods):
                                           max_idle=int(self.max_connections*0.9+0.5))
 
         self.volumedb_dict.dbaccess.set_retries(MAX_CONNECTION_FAILURE)
+
+        # write candidates per volume family, see find_matching_volume()
+        self.write_candidates_ttl = self.keys.get('write_candidates_ttl',
+                                                  WRITE_CANDIDATES_TTL)
+        self.write_candidates = {}
+        self.write_candidates_generation = 0
+        self.write_candidates_lock = threading.Lock()
+        self.volumedb_dict.write_callback = self.invalidate_write_candidates
+
         self.parallelThreadQueue = Queue.Queue(self.parallelQueueSize)
         self.parallelThreads = []
         for i in range(self.numberOfParallelWorkers):
@@ -1267,6 +1402,66 @@ class VolumeClerkMethods(VolumeClerkInfoMethods):
         return ret
 
 
+    # Drop cached write candidates, which could have changed by writing
+    # record (None if deleted) of volume external_label: the families
+    # listing the volume and the family the volume is in now.
+    # Called by volumedb_dict on every write.
+    def invalidate_write_candidates(self, external_label, record=None):
+        family = None
+        if record:
+            try:
+                family = (record['library'],) + \
+                         tuple(string.split(record['volume_family'], '.'))
+            except (KeyError, TypeError):
+                # not a full record, drop all
+                family = None
+                external_label = None
+        self.write_candidates_lock.acquire()
+        try:
+            self.write_candidates_generation = self.write_candidates_generation + 1
+            if external_label is None:
+                self.write_candidates.clear()
+                return
+            for key, (t, res) in self.write_candidates.items():
+                if key[:4] == family:
+                    del self.write_candidates[key]
+                    continue
+                for v in res:
+                    if v['label'] == external_label:
+                        del self.write_candidates[key]
+                        break
+        finally:
+            self.write_candidates_lock.release()
+
+    # Write candidates of a volume family, without any veto, from cache
+    # or db.  Returns (candidates, complete), where complete is true if
+    # these are all the candidates there are.
+    def __get_write_candidates(self, q, values):
+        key = (values['library'], values['storage_group'],
+               values['file_family'], values['wrapper'],
+               values.get('label_like'))
+        now = time.time()
+        self.write_candidates_lock.acquire()
+        try:
+            t, res = self.write_candidates.get(key, (0, None))
+            if res is not None and now - t < self.write_candidates_ttl:
+                return res, len(res) < values['limit']
+            generation = self.write_candidates_generation
+        finally:
+            self.write_candidates_lock.release()
+
+        res = self.volumedb_dict.query_dictresult(q, values)
+
+        if self.write_candidates_ttl > 0:
+            self.write_candidates_lock.acquire()
+            try:
+                # unless a volume was written meanwhile
+                if generation == self.write_candidates_generation:
+                    self.write_candidates[key] = (now, res)
+            finally:
+                self.write_candidates_lock.release()
+        return res, len(res) < values['limit']
+
     # find volume that matches given volume family #### DONE
     def find_matching_volume(self, library, vol_fam, pool,
                              vol_veto_list, first_found,
@@ -1280,14 +1475,6 @@ class VolumeClerkMethods(VolumeClerkInfoMethods):
         # decomposit storage_group, file_family and wrapper
         storage_group, file_family, wrapper = string.split(pool, '.')
 
-        # figure out minimal space needed
-        required_bytes = max(long(min_remaining_bytes*SAFETY_FACTOR), MIN_LEFT)
-
-        # build vito list into where clause
-        veto_q = ""
-        for i in vol_veto_list:
-            veto_q = veto_q+" and label != '%s'"%(i)
-
         type_of_mover = mover.get('mover_type','Mover')
 
         # To be backward comparible
@@ -1297,119 +1484,53 @@ class VolumeClerkMethods(VolumeClerkInfoMethods):
         Trace.trace(20,  "volume family %s pool %s wrapper %s veto %s exact %s" %
                     (vol_fam, pool,wrapper, vol_veto_list, exact_match))
 
+        values = {'library': library,
+                  'storage_group': storage_group,
+                  'file_family': file_family,
+                  'wrapper': wrapper,
+                  'veto': [],
+                  'limit': WRITE_CANDIDATES}
         # special treatment for Disk Mover
         if type_of_mover == 'DiskMover':
-            mover_ip_map = mover.get('ip_map', '')
-
-            q = """
-            SELECT block_size,
-                   capacity_bytes,
-                   declared,
-                   eod_cookie,
-                   label,
-                   first_access,
-                   last_access,
-                   library,
-                   media_type,
-                   non_del_files,
-                   remaining_bytes,
-                   sum_mounts,
-                   sum_rd_access,
-                   sum_rd_err,
-                   sum_wr_access,
-                   sum_wr_err,
-                   system_inhibit_0,
-                   system_inhibit_1,
-                   si_time_0,
-                   si_time_1,
-                   user_inhibit_0,
-                   user_inhibit_1,
-                   storage_group,
-                   file_family,
-                   wrapper,
-                   comment,
-                   write_protected,
-                   modification_time,
-                   COALESCE(active_files,0) AS active_files,
-                   COALESCE(deleted_files,0) AS deleted_files,
-                   COALESCE(unknown_files,0) AS unknown_files,
-                   COALESCE(active_bytes,0) AS active_bytes,
-                   COALESCE(deleted_bytes,0) AS deleted_bytes,
-                   COALESCE(unknown_bytes,0) AS unknown_bytes
-            FROM volume
-            WHERE label like '{}:%'
-              AND library = '{}'
-              AND storage_group = '{}'
-              AND file_family = '{}'
-              AND wrapper = '{}'
-              AND system_inhibit_0 = 'none'
-              AND system_inhibit_1 = 'none'
-              AND user_inhibit_0 = 'none'
-              AND user_inhibit_1 = 'none'
-              AND write_protected = 'n'
-              {}
-            ORDER BY declared,label limit 10
-            """.format(mover_ip_map, library,
-                       storage_group, file_family, wrapper, veto_q)
+            values['label_like'] = mover.get('ip_map', '') + ':%'
+            q = SELECT_DISK_WRITE_CANDIDATES
         else: # normal case
-            q = """
-            SELECT block_size,
-                   capacity_bytes,
-                   declared,
-                   eod_cookie,
-                   label,
-                   first_access,
-                   last_access,
-                   library,
-                   media_type,
-                   non_del_files,
-                   remaining_bytes,
-                   sum_mounts,
-                   sum_rd_access,
-                   sum_rd_err,
-                   sum_wr_access,
-                   sum_wr_err,
-                   system_inhibit_0,
-                   system_inhibit_1,
-                   si_time_0,
-                   si_time_1,
-                   user_inhibit_0,
-                   user_inhibit_1,
-                   storage_group,
-                   file_family,
-                   wrapper,
-                   comment,
-                   write_protected,
-                   modification_time,
-                   COALESCE(active_files,0) AS active_files,
-                   COALESCE(deleted_files,0) AS deleted_files,
-                   COALESCE(unknown_files,0) AS unknown_files,
-                   COALESCE(active_bytes,0) AS active_bytes,
-                   COALESCE(deleted_bytes,0) AS deleted_bytes,
-                   COALESCE(unknown_bytes,0) AS unknown_bytes
-             FROM volume
-             WHERE library = '{}'
-               AND storage_group = '{}'
-               AND file_family = '{}'
-               AND wrapper = '{}'
-               AND system_inhibit_0 = 'none'
-               AND system_inhibit_1 = 'none'
-               AND user_inhibit_0 = 'none'
-               AND user_inhibit_1 = 'none'
-               AND write_protected = 'n'
-               {}
-             ORDER BY declared, label limit 10
-             """.format(library, storage_group,
-                        file_family, wrapper, veto_q)
-        Trace.trace(20, "start query: %s"%(q))
+            q = SELECT_WRITE_CANDIDATES
+
+        # The candidates are cached per volume family without veto.
+        # Taking out vetoed volumes leaves the first of the candidates
+        # the query with veto would find, as both are in the same order.
+        # Only if those are used up and there are more, the db is asked.
+        Trace.trace(20, "start query: %s %s"%(q, values))
         try:
-            res = self.volumedb_dict.query_dictresult(q)
+            res, complete = self.__get_write_candidates(q, values)
+            if vol_veto_list:
+                res = [v for v in res if v['label'] not in vol_veto_list]
         except:
             exc_type, exc_value = sys.exc_info()[:2]
             message = 'find_matching_volume(): '+str(exc_type)+' '+str(exc_value)+' query: '+q
             Trace.log(e_errors.ERROR, message)
-            res = []
+            res, complete = [], True
         Trace.trace(20, "finish query: found %d exact_match=%d"%(len(res), exact_match))
+        vol = self.__pick_write_volume(res, min_remaining_bytes, exact_match)
+        if vol or complete:
+            return vol
+
+        # the candidates left were vetoed or full, look further
+        values['veto'] = list(vol_veto_list)
+        try:
+            res = self.volumedb_dict.query_dictresult(q, values)
+        except:
+            exc_type, exc_value = sys.exc_info()[:2]
+            message = 'find_matching_volume(): '+str(exc_type)+' '+str(exc_value)+' query: '+q
+            Trace.log(e_errors.ERROR, message)
+            res = []
+        Trace.trace(20, "finish query with veto: found %d"%(len(res),))
+        return self.__pick_write_volume(res, min_remaining_bytes, exact_match)
+
+    # first of candidate volumes, in db format, with room for
+    # min_remaining_bytes if exact_match, or {}
+    def __pick_write_volume(self, res, min_remaining_bytes, exact_match):
         if len(res):
             if exact_match:
                 for v in res:
@@ -2604,6 +2725,7 @@ class VolumeClerkMethods(VolumeClerkInfoMethods):
         """
         try:
             res = self.volumedb_dict.update(q.format(count,external_label))
+            self.invalidate_write_candidates(external_label)
             record = self.volumedb_dict[external_label]
             # need to sync w/ journal
             self.volumedb_dict.jou[external_label] = record